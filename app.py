@@ -375,61 +375,39 @@ def api_status():
         db_status = f'error: {str(e)}'
         logger.error(f"Database health check failed: {e}")
 
-    return jsonify({
-        'service': CONFIG['server']['name'],
-        'status': 'operational',
-        'components': {
-            'upbit_api': upbit_status,
-            'database': db_status,
-            'authentication': 'operational',
-            'trading': 'operational'
-        },
-        'timestamp': datetime.now().isoformat()
-    }), 200
-
-
-@app.route('/api/telegram/webhook', methods=['POST'])
-def telegram_webhook():
-    """
-    Telegram bot webhook endpoint
-
-    Receives updates from Telegram and processes them through the bot
-    """
-    try:
-        # Check if telegram_bot is available
-        if not hasattr(app, 'telegram_bot'):
-            logger.warning("[Telegram] Webhook called but bot not initialized")
-            return jsonify({'status': 'error', 'message': 'Bot not initialized'}), 500
-
-        # Get update data from request
-        update_data = request.get_json()
-
-        if not update_data:
-            logger.warning("[Telegram] Webhook called with no data")
-            return jsonify({'status': 'error', 'message': 'No data'}), 400
-
-        logger.debug(f"[Telegram] Received webhook update: {update_data.get('update_id', 'unknown')}")
+    components = {
+        'upbit_api': upbit_status,
+        'database': db_status,
+        'authentication': 'operational',
+        'trading': 'operational'
+    }
 
-        # Process update asynchronously
-        import asyncio
-        import threading
+    # Leased background jobs hosted by this process
+    if hasattr(app, 'background_supervisor'):
+        components['background_jobs'] = app.background_supervisor.get_status()
 
-        def process_update_async():
-            """Process update in background"""
-            try:
-                asyncio.run(app.telegram_bot.process_update(update_data))
-            except Exception as e:
-                logger.error(f"[Telegram] Error processing update: {e}")
+    # Telegram webhook updates waiting for the bot, plus its queue depth and
+    # latencies when this process holds the alerts lease
+    if os.getenv('TELEGRAM_BOT_TOKEN'):
+        telegram_updates = {}
+        try:
+            from backend.services.telegram_update_relay import pending_count
+            telegram_updates['inbox_pending'] = pending_count()
+        except Exception as e:
+            telegram_updates['inbox_pending'] = f'error: {str(e)}'
 
-        update_thread = threading.Thread(target=process_update_async, daemon=True)
-        update_thread.start()
+        alerts = app.background_supervisor.get_handle('alerts') if hasattr(app, 'background_supervisor') else None
+        if alerts and 'telegram_update_worker' in alerts:
+            telegram_updates.update(alerts['telegram_update_worker'].get_stats())
 
-        # Return success immediately (Telegram expects quick response)
-        return jsonify({'status': 'ok'}), 200
+        components['telegram_updates'] = telegram_updates
 
-    except Exception as e:
-        logger.error(f"[Telegram] Webhook error: {e}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return jsonify({
+        'service': CONFIG['server']['name'],
+        'status': 'operational',
+        'components': components,
+        'timestamp': datetime.now().isoformat()
+    }), 200
 
 
 @app.route('/api/trading/policies', methods=['GET', 'POST'])
@@ -708,9 +686,10 @@ def handle_exception(error):
 # ============================================================================
 
 def init_background_services():
-    """Initialize background services (order sync, WebSocket, etc.)"""
+    """Initialize background services (WebSocket, and optionally the leased jobs)"""
 
     # Initialize WebSocket service (Phase 3)
+    # Runs in every web process: it fans prices out to that process's own clients
     try:
         ws_service = init_websocket_service(socketio)
         setup_socketio_handlers(socketio)
@@ -722,147 +701,25 @@ def init_background_services():
     except Exception as e:
         logger.error(f"Failed to start WebSocket service: {e}")
 
-    # Background order sync is DISABLED for multi-user architecture
-    # NOTE: Orders now use database-first strategy with per-user API keys.
-    # Each user's orders are synced on-demand when they access /api/orders.
-    # To re-enable, BackgroundSyncScheduler needs refactoring to loop through all users.
-    logger.info("Background order sync: DISABLED (multi-user mode, database-first strategy)")
+    # Trading loops, schedulers and the Telegram bot normally run in the
+    # dedicated worker process (worker.py). RUN_BACKGROUND_SERVICES=true also
+    # hosts them here; leases still keep one active instance per job.
+    if os.getenv('RUN_BACKGROUND_SERVICES', 'false').lower() != 'true':
+        logger.info("Background jobs: run by worker.py (set RUN_BACKGROUND_SERVICES=true to host them here)")
+        return
 
-    # Initialize subscription renewal scheduler (Phase 8)
     try:
-        from backend.services.subscription_scheduler import start_scheduler
+        from backend.services.background_jobs import create_supervisor
 
-        subscription_scheduler = start_scheduler()
+        supervisor = create_supervisor()
+        supervisor.start()
 
         # Store reference for later use
-        app.subscription_scheduler = subscription_scheduler
-
-        logger.info("Subscription renewal scheduler started (daily check at 00:00 KST)")
-    except Exception as e:
-        logger.error(f"Failed to start subscription renewal scheduler: {e}")
+        app.background_supervisor = supervisor
 
-    # Initialize backup scheduler (Production Stabilization)
-    try:
-        from backend.services.backup_scheduler import start_backup_scheduler
-
-        backup_scheduler = start_backup_scheduler()
-
-        # Store reference for later use
-        app.backup_scheduler = backup_scheduler
-
-        backup_time = os.getenv('BACKUP_TIME', '02:00')
-        logger.info(f"Database backup scheduler started (daily backup at {backup_time})")
-    except Exception as e:
-        logger.error(f"Failed to start backup scheduler: {e}")
-
-    # Initialize surge auto-trading worker (Phase 8 v2.0)
-    try:
-        from backend.services.surge_auto_trading_worker import get_auto_trading_worker
-
-        # 5 minutes interval (300 seconds)
-        auto_trading_worker = get_auto_trading_worker(check_interval=300)
-        auto_trading_worker.start()
-
-        # Store reference for later use
-        app.auto_trading_worker = auto_trading_worker
-
-        logger.info("Surge auto-trading worker started (5-minute check interval)")
-    except Exception as e:
-        logger.error(f"Failed to start auto-trading worker: {e}")
-
-    # Initialize position monitor service (Auto stop-loss/take-profit)
-    try:
-        from backend.services.position_monitor_service import get_position_monitor
-
-        # 10 seconds interval for real-time monitoring
-        position_monitor = get_position_monitor(check_interval=10)
-        position_monitor.start()
-
-        # Store reference for later use
-        app.position_monitor = position_monitor
-
-        logger.info("Position monitor started (10-second check interval, auto stop-loss/take-profit)")
-    except Exception as e:
-        logger.error(f"Failed to start position monitor: {e}")
-
-    # Initialize Telegram alert bot (Optional - requires TELEGRAM_BOT_TOKEN)
-    telegram_bot = None
-    try:
-        telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        if telegram_token:
-            from backend.services.telegram_bot import SurgeTelegramBot, TELEGRAM_AVAILABLE
-            from backend.services.surge_alert_scheduler import SurgeAlertScheduler
-
-            if TELEGRAM_AVAILABLE:
-                # Initialize Telegram bot
-                telegram_bot = SurgeTelegramBot(token=telegram_token)
-
-                # Setup webhook mode instead of polling (resolves 409 Conflict)
-                import asyncio
-                import threading
-
-                # Get webhook URL from environment or use default
-                webhook_base_url = os.getenv('WEBHOOK_BASE_URL', 'https://coinpulse.sinsi.ai')
-                webhook_url = f"{webhook_base_url}/api/telegram/webhook"
-
-                def setup_telegram_webhook():
-                    """Setup Telegram bot webhook"""
-                    try:
-                        asyncio.run(telegram_bot.start_webhook(webhook_url))
-                        logger.info(f"[Telegram] Webhook mode activated: {webhook_url}")
-                    except Exception as e:
-                        logger.error(f"Telegram webhook setup error: {e}")
-
-                webhook_thread = threading.Thread(target=setup_telegram_webhook, daemon=True)
-                webhook_thread.start()
-
-                # Initialize surge alert scheduler (5 minute interval)
-                surge_alert_scheduler = SurgeAlertScheduler(
-                    telegram_bot=telegram_bot,
-                    check_interval=300  # 5 minutes
-                )
-
-                # Start scheduler in background
-                def run_surge_alerts():
-                    """Run surge alert scheduler"""
-                    try:
-                        asyncio.run(surge_alert_scheduler.run())
-                    except Exception as e:
-                        logger.error(f"Surge alert scheduler error: {e}")
-
-                alert_thread = threading.Thread(target=run_surge_alerts, daemon=True)
-                alert_thread.start()
-
-                # Store references
-                app.telegram_bot = telegram_bot
-                app.surge_alert_scheduler = surge_alert_scheduler
-
-                logger.info("Telegram bot (webhook mode) and surge alert scheduler started (5 minute interval)")
-            else:
-                logger.warning("python-telegram-bot not installed - Telegram alerts disabled")
-        else:
-            logger.info("TELEGRAM_BOT_TOKEN not set - Telegram alerts disabled")
-    except Exception as e:
-        logger.error(f"Failed to start Telegram services: {e}")
-
-    # Initialize signal generation scheduler (Phase 5 - Auto Trading)
-    # NOTE: Must be initialized AFTER Telegram bot to enable signal notifications
-    try:
-        from backend.services.signal_scheduler import SignalScheduler
-
-        # Create scheduler with telegram_bot (if available)
-        signal_scheduler = SignalScheduler(telegram_bot=telegram_bot)
-        signal_scheduler.start()
-
-        # Store reference for later use
-        app.signal_scheduler = signal_scheduler
-
-        if telegram_bot:
-            logger.info("Signal generation scheduler started with Telegram notifications (surge analysis every 15 minutes)")
-        else:
-            logger.info("Signal generation scheduler started without Telegram notifications (surge analysis every 15 minutes)")
+        logger.info("Background job supervisor started (leader lease per job)")
     except Exception as e:
-        logger.error(f"Failed to start signal scheduler: {e}")
+        logger.error(f"Failed to start background job supervisor: {e}")
 
 
 # ============================================================================
@@ -4,17 +4,30 @@ Common modules shared between servers.
 Modules:
 - cache: Caching system for API responses
 - upbit_api: Unified Upbit API client
+- rate_governor: Per-endpoint-group token buckets for Upbit quotas
+- upbit_client_pool: Live per-user UpbitAPI clients
 - config_loader: Configuration loading utilities
 - utils: Common utility functions
 """
 
-from .cache import SimpleCache
-from .upbit_api import UpbitAPI
+from .cache import SimpleCache, get_cache_stats
+from .upbit_api import UpbitAPI, get_http_session, create_http_session
+from .rate_governor import RateGovernor, TokenBucket, get_rate_governor
+from .upbit_client_pool import UpbitClientPool, get_upbit_client_pool, key_fingerprint
 from .config_loader import load_server_config, setup_cors, load_api_keys
 
 __all__ = [
     'SimpleCache',
+    'get_cache_stats',
     'UpbitAPI',
+    'get_http_session',
+    'create_http_session',
+    'RateGovernor',
+    'TokenBucket',
+    'get_rate_governor',
+    'UpbitClientPool',
+    'get_upbit_client_pool',
+    'key_fingerprint',
     'load_server_config',
     'setup_cors',
     'load_api_keys',
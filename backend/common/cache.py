@@ -1,11 +1,29 @@
 """
 Simple caching system for API responses.
 
-Provides thread-safe caching with TTL (Time To Live) support.
+Provides thread-safe caching with per-entry TTL (Time To Live), an optional
+LRU size bound, amortized expiry sweeps, single-flight loading and
+hit/miss/eviction counters.
 """
 
 import time
 import threading
+import weakref
+from collections import OrderedDict
+
+
+# All live caches by name (for admin stats)
+_registry = weakref.WeakValueDictionary()
+_registry_lock = threading.Lock()
+
+
+class _Loading:
+    """In-flight get_or_load() call shared by concurrent callers."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
 
 
 class SimpleCache:
@@ -15,21 +33,59 @@ class SimpleCache:
     Usage:
         cache = SimpleCache(default_ttl=300)  # 5 minutes
         cache.set('key', 'value')
+        cache.set('short', 'value', ttl=5)    # per-entry TTL
         value = cache.get('key')
+        value = cache.get_or_load('key', lambda: fetch())  # one upstream call per miss
         cache.clear()
+
+    With max_size set, the least recently used entry is evicted when full.
+    Expired entries are removed lazily on access and by a sweep that runs
+    at most once every `sweep_interval` seconds during set().
     """
 
-    def __init__(self, default_ttl=300):
+    def __init__(self, default_ttl=300, max_size=None, name=None, sweep_interval=60):
         """
         Initialize cache.
 
         Args:
             default_ttl (int): Default time-to-live in seconds (default: 300)
+            max_size (int, optional): Maximum number of entries (default: unbounded)
+            name (str, optional): Name used to report stats via get_cache_stats()
+            sweep_interval (int): Minimum seconds between expiry sweeps (default: 60)
         """
-        self.cache = {}
+        self.cache = OrderedDict()  # key -> (value, expires_at)
         self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.name = name
+        self.sweep_interval = sweep_interval
         self.lock = threading.Lock()
 
+        self._loading = {}
+        self._last_sweep = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.loads = 0
+
+        if name:
+            with _registry_lock:
+                _registry[name] = self
+
+    def _get_entry(self, key, now):
+        """Return (found, value); caller holds the lock."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at <= now:
+            # Remove expired entry
+            del self.cache[key]
+            self.expirations += 1
+            return False, None
+        self.cache.move_to_end(key)
+        return True, value
+
     def get(self, key):
         """
         Get value from cache.
@@ -41,13 +97,11 @@ class SimpleCache:
             Cached value or None if not found/expired
         """
         with self.lock:
-            if key in self.cache:
-                data, timestamp = self.cache[key]
-                if time.time() - timestamp < self.default_ttl:
-                    return data
-                else:
-                    # Remove expired entry
-                    del self.cache[key]
+            found, value = self._get_entry(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
             return None
 
     def set(self, key, value, ttl=None):
@@ -59,8 +113,115 @@ class SimpleCache:
             value: Value to cache
             ttl (int, optional): Time-to-live in seconds (uses default if None)
         """
+        now = time.monotonic()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+
+        with self.lock:
+            self.cache[key] = (value, expires_at)
+            self.cache.move_to_end(key)
+
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+            if self.max_size is not None:
+                while len(self.cache) > self.max_size:
+                    self.cache.popitem(last=False)
+                    self.evictions += 1
+
+    def get_or_load(self, key, loader, ttl=None):
+        """
+        Get value from cache, calling loader once on a miss.
+
+        Concurrent callers missing the same key wait for the first caller's
+        loader instead of each calling upstream. A None result is returned
+        but not cached; loader exceptions propagate to every waiter.
+
+        Args:
+            key (str): Cache key
+            loader (callable): Zero-argument function producing the value
+            ttl (int, optional): Time-to-live in seconds (uses default if None)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        with self.lock:
+            found, value = self._get_entry(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+            loading = self._loading.get(key)
+            owner = loading is None
+            if owner:
+                loading = _Loading()
+                self._loading[key] = loading
+
+        if not owner:
+            loading.event.wait()
+            if loading.error is not None:
+                raise loading.error
+            return loading.value
+
+        try:
+            loading.value = loader()
+            with self.lock:
+                self.loads += 1
+            if loading.value is not None:
+                self.set(key, loading.value, ttl)
+            return loading.value
+        except Exception as e:
+            loading.error = e
+            raise
+        finally:
+            with self.lock:
+                self._loading.pop(key, None)
+            loading.event.set()
+
+    def is_loading(self, key):
+        """
+        Check whether a get_or_load() call is in flight for a key.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if a loader is currently running
+        """
+        with self.lock:
+            return key in self._loading
+
+    def delete(self, key):
+        """
+        Remove a single entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
         with self.lock:
-            self.cache[key] = (value, time.time())
+            return self.cache.pop(key, None) is not None
+
+    def _sweep(self, now):
+        """Drop all expired entries; caller holds the lock."""
+        expired = [key for key, (_, expires_at) in self.cache.items() if expires_at <= now]
+        for key in expired:
+            del self.cache[key]
+        self.expirations += len(expired)
+        self._last_sweep = now
+        return len(expired)
+
+    def sweep(self):
+        """
+        Remove all expired entries now.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self.lock:
+            return self._sweep(time.monotonic())
 
     def clear(self):
         """Clear all cache entries."""
@@ -86,3 +247,38 @@ class SimpleCache:
         """
         with self.lock:
             return list(self.cache.keys())
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: size, max_size, hits, misses, hit_rate, evictions, expirations, loads
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self.cache),
+                'max_size': self.max_size,
+                'default_ttl': self.default_ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'loads': self.loads,
+                'loading': len(self._loading)
+            }
+
+
+def get_cache_stats():
+    """
+    Get stats for every named SimpleCache in the process.
+
+    Returns:
+        dict: {name: stats}
+    """
+    with _registry_lock:
+        caches = list(_registry.items())
+    return {name: cache.stats() for name, cache in caches}
@@ -0,0 +1,214 @@
+"""
+Rate governor for Upbit API calls.
+
+Models Upbit's separate request quotas with one token bucket per
+endpoint group:
+- quotation: public market data (ticker, candles, markets), limited per IP
+- exchange: authenticated account/order queries, limited per API key
+- order: order placement and cancellation, limited per API key
+
+Callers block in acquire() until a token is available instead of
+sleeping a fixed interval between requests.
+"""
+
+import time
+import threading
+
+
+# Upbit published limits (requests per second)
+QUOTATION_RATE = 10
+EXCHANGE_RATE = 30
+ORDER_RATE = 8
+
+DEFAULT_GROUP_RATES = {
+    'quotation': QUOTATION_RATE,
+    'exchange': EXCHANGE_RATE,
+    'order': ORDER_RATE,
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Usage:
+        bucket = TokenBucket(rate=10)  # 10 requests/second
+        bucket.acquire()               # blocks until a token is available
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate (float): Tokens refilled per second
+            capacity (float, optional): Burst size (default: rate)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            tokens (float): Number of tokens to take (default: 1)
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def sync_remaining(self, remaining):
+        """
+        Clamp local tokens to the server-reported remaining quota.
+
+        Args:
+            remaining (int): Requests left in the current second (Remaining-Req 'sec')
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, float(remaining))
+
+    def drain(self, seconds):
+        """
+        Empty the bucket so the next acquire waits at least `seconds`.
+
+        Used after a 429 response to back off the whole group.
+
+        Args:
+            seconds (float): Minimum pause before the next token
+        """
+        with self.lock:
+            self.tokens = -seconds * self.rate
+            self.updated_at = time.monotonic()
+
+
+class RateGovernor:
+    """
+    Per-endpoint-group token buckets.
+
+    Quotation buckets are shared process-wide (Upbit limits them per IP);
+    exchange and order buckets are keyed by API access key.
+    """
+
+    def __init__(self, group_rates=None):
+        """
+        Initialize governor.
+
+        Args:
+            group_rates (dict, optional): {group: requests_per_second}
+        """
+        self.group_rates = dict(DEFAULT_GROUP_RATES)
+        if group_rates:
+            self.group_rates.update(group_rates)
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, group, key=None):
+        """
+        Get (or create) the bucket for an endpoint group.
+
+        Args:
+            group (str): 'quotation', 'exchange' or 'order'
+            key (str, optional): Access key for private groups
+
+        Returns:
+            TokenBucket: Bucket for this group/key
+        """
+        bucket_key = (group, None if group == 'quotation' else key)
+        with self.lock:
+            bucket = self.buckets.get(bucket_key)
+            if bucket is None:
+                bucket = TokenBucket(self.group_rates.get(group, QUOTATION_RATE))
+                self.buckets[bucket_key] = bucket
+            return bucket
+
+    def acquire(self, group, key=None):
+        """
+        Block until a request in this group may be sent.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        return self.bucket(group, key).acquire()
+
+    def observe(self, group, key, remaining_header):
+        """
+        Feed an Upbit 'Remaining-Req' header back into the bucket.
+
+        Header format: 'group=default; min=1800; sec=29'
+
+        Args:
+            group (str): Endpoint group of the request
+            key (str): Access key (ignored for quotation)
+            remaining_header (str): Raw header value
+        """
+        if not remaining_header:
+            return
+        for part in remaining_header.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == 'sec' and value.isdigit():
+                self.bucket(group, key).sync_remaining(int(value))
+                return
+
+    def discard(self, key):
+        """
+        Drop the private buckets of an access key (e.g. after key rotation).
+
+        Args:
+            key (str): Access key whose exchange/order buckets to drop
+        """
+        if not key:
+            return
+        with self.lock:
+            for bucket_key in [k for k in self.buckets if k[1] == key]:
+                del self.buckets[bucket_key]
+
+    def stats(self):
+        """
+        Get current token levels.
+
+        Returns:
+            dict: {'group[:key-prefix]': tokens}
+        """
+        with self.lock:
+            items = list(self.buckets.items())
+        result = {}
+        for (group, key), bucket in items:
+            label = group if not key else f"{group}:{key[:6]}"
+            result[label] = round(bucket.tokens, 2)
+        return result
+
+
+# Process-wide governor shared by all UpbitAPI instances
+_governor = RateGovernor()
+
+
+def get_rate_governor():
+    """
+    Get the process-wide rate governor.
+
+    Returns:
+        RateGovernor: Shared governor instance
+    """
+    return _governor
@@ -11,7 +11,56 @@ import hashlib
 import uuid
 import time
 import sys
-from urllib.parse import urlencode
+import threading
+from urllib.parse import urlencode, unquote
+from requests.adapters import HTTPAdapter
+
+from .rate_governor import get_rate_governor
+
+
+# HTTP transport settings
+REQUEST_TIMEOUT = 10  # seconds
+POOL_MAXSIZE = 32  # keep-alive connections kept per host
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.25  # seconds, doubled on each retry
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_http_session(pool_maxsize=POOL_MAXSIZE):
+    """
+    Create a keep-alive HTTP session with a bounded connection pool.
+
+    Args:
+        pool_maxsize (int): Keep-alive connections kept per host
+
+    Returns:
+        requests.Session: New session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session():
+    """
+    Get the process-wide pooled HTTP session used by all UpbitAPI instances.
+
+    Reusing one session keeps TLS connections to api.upbit.com alive
+    across calls instead of handshaking on every request.
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_http_session()
+        return _session
 
 
 class UpbitAPI:
@@ -25,7 +74,7 @@ class UpbitAPI:
     - Deposits/Withdraws history
     """
 
-    def __init__(self, access_key, secret_key, base_url='https://api.upbit.com'):
+    def __init__(self, access_key, secret_key, base_url='https://api.upbit.com', session=None, governor=None):
         """
         Initialize Upbit API client.
 
@@ -33,10 +82,14 @@ class UpbitAPI:
             access_key (str): Upbit API access key
             secret_key (str): Upbit API secret key
             base_url (str): Upbit API base URL (default: https://api.upbit.com)
+            session (requests.Session, optional): HTTP session (default: shared pooled session)
+            governor (RateGovernor, optional): Rate governor (default: process-wide governor)
         """
         self.access_key = access_key
         self.secret_key = secret_key
         self.base_url = base_url
+        self.session = session or get_http_session()
+        self.governor = governor or get_rate_governor()
 
     def _get_headers(self, query_hash=None):
         """
@@ -64,6 +117,68 @@ class UpbitAPI:
             'Content-Type': 'application/json'
         }
 
+    def _request(self, method, path, group='quotation', params=None, json=None):
+        """
+        Send a request through the shared session under the rate governor.
+
+        Private groups ('exchange', 'order') are signed with a fresh JWT on
+        every attempt. Throttled (429) and transient server/connection errors
+        are retried with exponential backoff; non-GET requests are only
+        retried on 429 so orders are never submitted twice.
+
+        Args:
+            method (str): HTTP method
+            path (str): API path (e.g., '/v1/ticker')
+            group (str): Rate limit group ('quotation', 'exchange', 'order')
+            params (dict, optional): Query parameters
+            json (dict, optional): JSON body (also hashed for signing)
+
+        Returns:
+            requests.Response: Final response
+
+        Raises:
+            requests.RequestException: If the last attempt fails to connect
+        """
+        url = f'{self.base_url}{path}'
+        signed = group != 'quotation'
+        query = json if json is not None else params
+        query_hash = None
+        if signed and query:
+            # Upbit hashes the unescaped query (e.g. "states[]=done&states[]=cancel")
+            query_string = unquote(urlencode(query, doseq=True))
+            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
+        idempotent = method.upper() == 'GET'
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.governor.acquire(group, self.access_key)
+            headers = self._get_headers(query_hash) if signed else None
+            backoff = BACKOFF_BASE * (2 ** attempt)
+
+            try:
+                response = self.session.request(
+                    method, url, params=params, json=json, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not idempotent or attempt == MAX_RETRIES:
+                    raise
+                print(f"[UpbitAPI] {method} {path} connection error, retrying in {backoff:.2f}s: {str(e)}")
+                time.sleep(backoff)
+                continue
+
+            self.governor.observe(group, self.access_key, response.headers.get('Remaining-Req'))
+
+            retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES)
+            if not retryable or attempt == MAX_RETRIES:
+                return response
+
+            print(f"[UpbitAPI] {method} {path} returned {response.status_code}, retrying in {backoff:.2f}s")
+            if response.status_code == 429:
+                self.governor.bucket(group, self.access_key).drain(backoff)
+            else:
+                time.sleep(backoff)
+
+        return response
+
     # ==================== Account Operations ====================
 
     def get_accounts(self):
@@ -74,8 +189,7 @@ class UpbitAPI:
             list: List of account balances or None on error
         """
         try:
-            headers = self._get_headers()
-            response = requests.get(f'{self.base_url}/v1/accounts', headers=headers)
+            response = self._request('GET', '/v1/accounts', group='exchange')
 
             if response.status_code == 200:
                 return response.json()
@@ -97,7 +211,7 @@ class UpbitAPI:
                 Each dict contains: market, korean_name, english_name
         """
         try:
-            response = requests.get(f'{self.base_url}/v1/market/all')
+            response = self._request('GET', '/v1/market/all')
 
             if response.status_code == 200:
                 return response.json()
@@ -121,7 +235,7 @@ class UpbitAPI:
             float: Current price or None on error
         """
         try:
-            response = requests.get(f'{self.base_url}/v1/ticker?markets={market}')
+            response = self._request('GET', '/v1/ticker', params={'markets': market})
 
             if response.status_code == 200:
                 data = response.json()
@@ -150,7 +264,7 @@ class UpbitAPI:
         try:
             markets_str = ','.join(markets)
             print(f"[UpbitAPI] Price query for: {markets_str}")
-            response = requests.get(f'{self.base_url}/v1/ticker?markets={markets_str}')
+            response = self._request('GET', '/v1/ticker', params={'markets': markets_str})
 
             if response.status_code == 200:
                 data = response.json()
@@ -185,7 +299,7 @@ class UpbitAPI:
             else:
                 markets_str = markets
 
-            response = requests.get(f'{self.base_url}/v1/ticker?markets={markets_str}')
+            response = self._request('GET', '/v1/ticker', params={'markets': markets_str})
 
             if response.status_code == 200:
                 return response.json()
@@ -219,7 +333,7 @@ class UpbitAPI:
             if to:
                 query_params['to'] = to
 
-            response = requests.get(f'{self.base_url}/v1/candles/days', params=query_params)
+            response = self._request('GET', '/v1/candles/days', params=query_params)
 
             if response.status_code == 200:
                 return response.json()
@@ -263,7 +377,7 @@ class UpbitAPI:
                 # Minutes: 1, 3, 5, 10, 15, 30, 60, 240
                 endpoint = f'minutes/{interval}'
 
-            response = requests.get(f'{self.base_url}/v1/candles/{endpoint}', params=query_params)
+            response = self._request('GET', f'/v1/candles/{endpoint}', params=query_params)
 
             if response.status_code == 200:
                 return response.json()
@@ -318,12 +432,8 @@ class UpbitAPI:
                     raise ValueError("Price (KRW amount) required for price order")
                 query_params['price'] = str(price)
 
-            query_string = urlencode(query_params, doseq=True)
-            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
-
-            headers = self._get_headers(query_hash)
             print(f"[UpbitAPI] Order API call: {self.base_url}/v1/orders, params: {query_params}")
-            response = requests.post(f'{self.base_url}/v1/orders', json=query_params, headers=headers)
+            response = self._request('POST', '/v1/orders', group='order', json=query_params)
 
             print(f"[UpbitAPI] Order API response: {response.status_code}")
             if response.status_code == 201:
@@ -366,12 +476,8 @@ class UpbitAPI:
         """
         try:
             query_params = {'uuid': order_uuid}
-            query_string = urlencode(query_params, doseq=True)
-            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
-
-            headers = self._get_headers(query_hash)
             print(f"[UpbitAPI] Cancel order API call: uuid={order_uuid}")
-            response = requests.delete(f'{self.base_url}/v1/order', params=query_params, headers=headers)
+            response = self._request('DELETE', '/v1/order', group='order', params=query_params)
 
             print(f"[UpbitAPI] Cancel order response: {response.status_code}")
             if response.status_code == 200:
@@ -408,12 +514,9 @@ class UpbitAPI:
         """
         try:
             query_params = {'uuid': order_uuid}
-            query_string = urlencode(query_params)
-            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
-            headers = self._get_headers(query_hash)
 
             print(f"[UpbitAPI] Query order by UUID: {order_uuid}", file=sys.stderr, flush=True)
-            response = requests.get(f'{self.base_url}/v1/order', params=query_params, headers=headers)
+            response = self._request('GET', '/v1/order', group='exchange', params=query_params)
 
             print(f"[UpbitAPI] UUID query response: {response.status_code}", file=sys.stderr, flush=True)
             if response.status_code == 200:
@@ -427,7 +530,8 @@ class UpbitAPI:
             print(f"[UpbitAPI] UUID query error: {str(e)}", file=sys.stderr, flush=True)
             return None
 
-    def get_orders_history(self, market=None, state='done', limit=100, page=1, include_trades=False, order_by='desc'):
+    def get_orders_history(self, market=None, state='done', limit=100, page=1, include_trades=False, order_by='desc',
+                           states=None, strict=False):
         """
         Get order history.
 
@@ -438,27 +542,29 @@ class UpbitAPI:
             page (int): Page number
             include_trades (bool): Include trade execution details
             order_by (str): Sort order ('asc' for oldest first, 'desc' for newest first)
+            states (list, optional): Several order states in one list (e.g. ['done', 'cancel']); overrides state
+            strict (bool): Return None instead of an empty list on error, so a
+                           failed request can be told apart from an empty page
 
         Returns:
-            list: List of orders or empty list on error
+            list: List of orders or empty list on error (None with strict=True)
         """
         try:
             query_params = {
-                'state': state,
                 'limit': limit,
                 'page': page,
                 'order_by': order_by
             }
+            if states:
+                query_params['states[]'] = list(states)
+            else:
+                query_params['state'] = state
 
             if market:
                 query_params['market'] = market
 
-            query_string = urlencode(query_params, doseq=True)
-            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
-
-            headers = self._get_headers(query_hash)
             print(f"[UpbitAPI] Orders API call: {self.base_url}/v1/orders, params: {query_params}")
-            response = requests.get(f'{self.base_url}/v1/orders', params=query_params, headers=headers)
+            response = self._request('GET', '/v1/orders', group='exchange', params=query_params)
 
             print(f"[UpbitAPI] API response: {response.status_code}", file=sys.stderr, flush=True)
             if response.status_code == 200:
@@ -471,6 +577,11 @@ class UpbitAPI:
                     detailed_orders = []
 
                     for order in orders:
+                        # Cancelled orders that never traded have no trades to fetch
+                        if float(order.get('executed_volume') or 0) <= 0:
+                            detailed_orders.append(order)
+                            continue
+
                         order_uuid = order.get('uuid')
                         detail = self.get_order_by_uuid(order_uuid)
 
@@ -495,8 +606,6 @@ class UpbitAPI:
                         else:
                             detailed_orders.append(order)
 
-                        time.sleep(0.05)  # Rate limiting
-
                     # Sort by execution time
                     detailed_orders.sort(
                         key=lambda x: x.get('executed_at', x.get('order_created_at', '')),
@@ -509,68 +618,10 @@ class UpbitAPI:
                     return orders
             else:
                 print(f"[UpbitAPI] Orders query failed: {response.status_code}, {response.text}")
-                return []
+                return None if strict else []
         except Exception as e:
             print(f"[UpbitAPI] Orders query error: {str(e)}")
-            return []
-
-    # ==================== Advanced Operations ====================
-
-    def calculate_real_avg_price(self, market):
-        """
-        Calculate real average buy price from all buy orders.
-
-        Args:
-            market (str): Market code (e.g., 'KRW-BTC')
-
-        Returns:
-            float: Average buy price or None on error
-        """
-        try:
-            print(f"[UpbitAPI] Calculating avg price for {market}")
-
-            all_buy_orders = []
-            page = 1
-
-            while True:
-                orders = self.get_orders_history(market=market, state='done', limit=100, page=page)
-                if not orders:
-                    break
-
-                buy_orders = [order for order in orders if order.get('side') == 'bid']
-                all_buy_orders.extend(buy_orders)
-
-                if len(orders) < 100:
-                    break
-
-                page += 1
-                time.sleep(0.1)
-
-            if not all_buy_orders:
-                print(f"[UpbitAPI] No buy history for {market}")
-                return None
-
-            total_cost = 0
-            total_volume = 0
-
-            for order in all_buy_orders:
-                executed_volume = float(order.get('executed_volume', 0))
-                avg_price = float(order.get('avg_price', 0))
-                total_cost += executed_volume * avg_price
-                total_volume += executed_volume
-
-            if total_volume == 0:
-                print(f"[UpbitAPI] Total volume is 0 for {market}")
-                return None
-
-            real_avg_price = total_cost / total_volume
-            print(f"[UpbitAPI] Avg price calculated: {real_avg_price:.2f} (from {len(all_buy_orders)} orders)")
-
-            return real_avg_price
-
-        except Exception as e:
-            print(f"[UpbitAPI] Avg price calculation error: {str(e)}")
-            return None
+            return None if strict else []
 
     # ==================== Deposits & Withdraws ====================
 
@@ -597,11 +648,7 @@ class UpbitAPI:
             if currency:
                 query_params['currency'] = currency
 
-            query_string = urlencode(query_params, doseq=True)
-            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
-
-            headers = self._get_headers(query_hash)
-            response = requests.get(f'{self.base_url}/v1/deposits', params=query_params, headers=headers)
+            response = self._request('GET', '/v1/deposits', group='exchange', params=query_params)
 
             if response.status_code == 200:
                 deposits = response.json()
@@ -637,11 +684,7 @@ class UpbitAPI:
             if currency:
                 query_params['currency'] = currency
 
-            query_string = urlencode(query_params, doseq=True)
-            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
-
-            headers = self._get_headers(query_hash)
-            response = requests.get(f'{self.base_url}/v1/withdraws', params=query_params, headers=headers)
+            response = self._request('GET', '/v1/withdraws', group='exchange', params=query_params)
 
             if response.status_code == 200:
                 withdraws = response.json()
@@ -0,0 +1,216 @@
+"""
+Per-user Upbit client pool.
+
+Keeps one live UpbitAPI client per user so trading and holdings calls
+reuse it instead of building (and, for encrypted keys, decrypting) a new
+client on every request:
+- Each client owns a small keep-alive HTTP session; its private requests
+  are paced by the rate governor's exchange/order buckets for its access key.
+- Entries are keyed by user id and a fingerprint of the stored credentials,
+  so a rotated key never reuses the old client.
+- Bounded (LRU) and idle clients are evicted; invalidate() drops a user's
+  client immediately when keys are saved or deleted.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .upbit_api import UpbitAPI, create_http_session
+from .rate_governor import get_rate_governor
+
+
+UPBIT_CLIENT_POOL_SIZE = int(os.getenv('UPBIT_CLIENT_POOL_SIZE', 500))
+UPBIT_CLIENT_IDLE_TTL = int(os.getenv('UPBIT_CLIENT_IDLE_TTL', 600))  # seconds
+CLIENT_POOL_MAXSIZE = 4  # keep-alive connections per client
+SWEEP_INTERVAL = 60  # seconds between idle sweeps
+
+
+def key_fingerprint(*parts):
+    """
+    Fingerprint stored credentials without keeping them as dictionary keys.
+
+    Args:
+        *parts (str): Access/secret key (plain or encrypted)
+
+    Returns:
+        str: Hex digest prefix
+    """
+    digest = hashlib.sha256('\0'.join(p or '' for p in parts).encode()).hexdigest()
+    return digest[:16]
+
+
+class _PooledClient:
+    __slots__ = ('client', 'fingerprint', 'last_used')
+
+    def __init__(self, client, fingerprint):
+        self.client = client
+        self.fingerprint = fingerprint
+        self.last_used = time.monotonic()
+
+
+class UpbitClientPool:
+    """
+    Bounded pool of live per-user UpbitAPI clients.
+
+    Usage:
+        pool = get_upbit_client_pool()
+        api = pool.get(user_id, key_fingerprint(access, secret), lambda: (access, secret))
+    """
+
+    def __init__(self, max_clients=UPBIT_CLIENT_POOL_SIZE, idle_ttl=UPBIT_CLIENT_IDLE_TTL,
+                 pool_maxsize=CLIENT_POOL_MAXSIZE):
+        """
+        Initialize pool.
+
+        Args:
+            max_clients (int): Maximum live clients (least recently used evicted)
+            idle_ttl (int): Seconds an unused client is kept
+            pool_maxsize (int): Keep-alive connections per client session
+        """
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.pool_maxsize = pool_maxsize
+        self.governor = get_rate_governor()
+
+        self._clients = OrderedDict()  # user_id -> _PooledClient
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.stats = {'hits': 0, 'misses': 0, 'rotations': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, user_id, fingerprint, load_credentials):
+        """
+        Get the live client for a user, creating it on a miss.
+
+        Args:
+            user_id (int): Owner of the keys
+            fingerprint (str): key_fingerprint() of the stored credentials
+            load_credentials (callable): Returns (access_key, secret_key); only
+                called on a miss, so decryption happens once per client
+
+        Returns:
+            UpbitAPI: Pooled client
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._clients.get(user_id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                entry.last_used = now
+                self._clients.move_to_end(user_id)
+                self.stats['hits'] += 1
+                client = entry.client
+            else:
+                client = None
+
+        if client is None:
+            client = self._create(user_id, fingerprint, load_credentials)
+
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self.evict_idle()
+        return client
+
+    def _create(self, user_id, fingerprint, load_credentials):
+        access_key, secret_key = load_credentials()
+        client = UpbitAPI(
+            access_key, secret_key,
+            session=create_http_session(self.pool_maxsize),
+            governor=self.governor
+        )
+
+        closed = []  # (client, key rotated away)
+        with self._lock:
+            entry = self._clients.get(user_id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                # Another thread created it first
+                closed.append((client, False))
+                client = entry.client
+                self.stats['hits'] += 1
+            else:
+                if entry is not None:
+                    self.stats['rotations'] += 1
+                    closed.append((entry.client, entry.client.access_key != access_key))
+                self._clients[user_id] = _PooledClient(client, fingerprint)
+                self._clients.move_to_end(user_id)
+                self.stats['misses'] += 1
+                while len(self._clients) > self.max_clients:
+                    _, evicted = self._clients.popitem(last=False)
+                    closed.append((evicted.client, False))
+                    self.stats['evictions'] += 1
+
+        for old_client, rotated in closed:
+            if rotated:
+                # The old key's buckets are no longer needed
+                self.governor.discard(old_client.access_key)
+            old_client.session.close()
+        return client
+
+    def evict_idle(self):
+        """
+        Close clients unused for longer than idle_ttl.
+
+        Returns:
+            int: Number of clients evicted
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._last_sweep = now
+            idle = [uid for uid, e in self._clients.items() if now - e.last_used > self.idle_ttl]
+            entries = [self._clients.pop(uid) for uid in idle]
+            self.stats['evictions'] += len(entries)
+
+        for entry in entries:
+            entry.client.session.close()
+        return len(entries)
+
+    def invalidate(self, user_id=None):
+        """
+        Drop a user's client now (e.g. after API keys were saved or deleted).
+
+        Args:
+            user_id (int, optional): User ID (None = every user)
+        """
+        with self._lock:
+            if user_id is None:
+                entries = list(self._clients.values())
+                self._clients.clear()
+            else:
+                entry = self._clients.pop(user_id, None)
+                entries = [entry] if entry else []
+            self.stats['invalidations'] += len(entries)
+
+        for entry in entries:
+            self.governor.discard(entry.client.access_key)
+            entry.client.session.close()
+
+    def get_stats(self):
+        """
+        Get pool counters.
+
+        Returns:
+            dict: hits, misses, rotations, evictions, invalidations, size
+        """
+        with self._lock:
+            return {**self.stats, 'size': len(self._clients), 'max_clients': self.max_clients}
+
+
+# Global instance
+_client_pool = None
+_client_pool_lock = threading.Lock()
+
+
+def get_upbit_client_pool():
+    """
+    Get or create the Upbit client pool singleton.
+
+    Returns:
+        UpbitClientPool: Shared pool
+    """
+    global _client_pool
+
+    with _client_pool_lock:
+        if _client_pool is None:
+            _client_pool = UpbitClientPool()
+
+    return _client_pool
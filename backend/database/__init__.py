@@ -7,6 +7,7 @@ Provides database connection, models, and ORM functionality.
 from .connection import get_db_session, init_database, engine, Base
 from .models import (
     Order, HoldingsHistory, PriceCache, TradingSignal, StrategyPerformance, SyncStatus, SystemLog,
+    CostBasisPosition, CostBasisTransfer, ServiceLease, TelegramUpdateInbox,
     User, UserConfig, SwingPosition, SwingPositionHistory, SwingTradingLog
 )
 
@@ -23,6 +24,12 @@ __all__ = [
     'StrategyPerformance',
     'SyncStatus',
     'SystemLog',
+    # Cost basis ledger models
+    'CostBasisPosition',
+    'CostBasisTransfer',
+    # Cross-process coordination models
+    'ServiceLease',
+    'TelegramUpdateInbox',
     # Swing trading multi-user models
     'User',
     'UserConfig',
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Database Migration: Keyset Pagination Indexes and Surge Alert Summary
+Adds composite/partial indexes for keyset paging of surge_alerts (sent_at, id)
+and orders (executed_at, uuid)
+Adds surge_alert_summary, kept current by triggers on surge_alerts, so
+surge history totals/stats no longer aggregate the whole table per request
+
+Re-running the migration rebuilds the summary from surge_alerts.
+"""
+
+import sys
+import os
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.database.connection import get_db_session
+
+
+INDEXES = [
+    # Admin listing (all users), newest first
+    "CREATE INDEX IF NOT EXISTS idx_surge_alerts_sent_at_id ON surge_alerts(sent_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_surge_alerts_user_status_sent_at ON surge_alerts(user_id, status, sent_at)",
+    "CREATE INDEX IF NOT EXISTS idx_surge_alerts_market_sent_at ON surge_alerts(market, sent_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_surge_alerts_status_sent_at ON surge_alerts(status, sent_at, id)",
+    # /api/orders: per user and state, optionally per market
+    "CREATE INDEX IF NOT EXISTS idx_orders_user_state_executed_at ON orders(user_id, state, executed_at, uuid)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_user_market_state_executed_at "
+    "ON orders(user_id, market, state, executed_at, uuid)",
+]
+
+SUMMARY_KEY = "day, market, signal_type, auto_traded, status"
+SUMMARY_VALUES = "alert_count, auto_traded_count, confidence_sum, profit_loss_sum, profitable_count, losing_count"
+
+
+def _summary_select(row, sign, day_expr):
+    """Summary key and counters of one surge_alerts row (row = NEW/OLD/table alias)"""
+    return f"""
+        {day_expr}, {row}.market, COALESCE({row}.signal_type, 'surge'),
+        COALESCE({row}.auto_traded, FALSE), COALESCE({row}.status, ''),
+        {sign},
+        {sign} * (CASE WHEN {row}.auto_traded THEN 1 ELSE 0 END),
+        {sign} * COALESCE({row}.confidence, 0),
+        {sign} * COALESCE({row}.profit_loss, 0),
+        {sign} * (CASE WHEN {row}.exit_price IS NOT NULL AND {row}.exit_price > {row}.entry_price THEN 1 ELSE 0 END),
+        {sign} * (CASE WHEN {row}.exit_price IS NOT NULL AND {row}.exit_price <= {row}.entry_price THEN 1 ELSE 0 END)
+    """
+
+
+def _summary_upsert(target=''):
+    """ON CONFLICT clause adding the excluded counters"""
+    prefix = f"{target}." if target else ''
+    updates = ', '.join(
+        f"{column} = {prefix}{column} + excluded.{column}" for column in SUMMARY_VALUES.split(', ')
+    )
+    return f"ON CONFLICT ({SUMMARY_KEY}) DO UPDATE SET {updates}"
+
+
+# Columns whose change moves a row between summary buckets or counters
+WATCHED_COLUMNS = "sent_at, market, signal_type, auto_traded, status, confidence, profit_loss, entry_price, exit_price"
+
+
+def _postgresql(session):
+    session.execute(text("""
+        CREATE TABLE IF NOT EXISTS surge_alert_summary (
+            day DATE NOT NULL,
+            market VARCHAR(20) NOT NULL,
+            signal_type VARCHAR(20) NOT NULL,
+            auto_traded BOOLEAN NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT '',
+            alert_count INTEGER NOT NULL DEFAULT 0,
+            auto_traded_count INTEGER NOT NULL DEFAULT 0,
+            confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            profit_loss_sum NUMERIC(24, 6) NOT NULL DEFAULT 0,
+            profitable_count INTEGER NOT NULL DEFAULT 0,
+            losing_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, market, signal_type, auto_traded, status)
+        );
+    """))
+
+    # Keep writers out until the trigger exists and the backfill is done
+    session.execute(text("LOCK TABLE surge_alerts IN SHARE ROW EXCLUSIVE MODE;"))
+
+    session.execute(text(f"""
+        CREATE OR REPLACE FUNCTION surge_alert_summary_apply(r surge_alerts, direction INTEGER)
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO surge_alert_summary AS s ({SUMMARY_KEY}, {SUMMARY_VALUES})
+            VALUES ({_summary_select('r', 'direction', 'CAST(r.sent_at AS DATE)')})
+            {_summary_upsert('s')};
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    session.execute(text("""
+        CREATE OR REPLACE FUNCTION surge_alert_summary_trigger()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM surge_alert_summary_apply(OLD, -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM surge_alert_summary_apply(NEW, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """))
+
+    session.execute(text("DROP TRIGGER IF EXISTS trg_surge_alert_summary ON surge_alerts;"))
+    session.execute(text("DROP TRIGGER IF EXISTS trg_surge_alert_summary_update ON surge_alerts;"))
+    session.execute(text("""
+        CREATE TRIGGER trg_surge_alert_summary
+        AFTER INSERT OR DELETE ON surge_alerts
+        FOR EACH ROW EXECUTE FUNCTION surge_alert_summary_trigger();
+    """))
+    session.execute(text(f"""
+        CREATE TRIGGER trg_surge_alert_summary_update
+        AFTER UPDATE OF {WATCHED_COLUMNS} ON surge_alerts
+        FOR EACH ROW EXECUTE FUNCTION surge_alert_summary_trigger();
+    """))
+
+    session.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_surge_alerts_auto_traded_sent_at
+        ON surge_alerts(sent_at, id) WHERE auto_traded = true;
+    """))
+
+    _backfill(session, 'CAST(a.sent_at AS DATE)')
+
+
+def _sqlite(session):
+    session.execute(text("""
+        CREATE TABLE IF NOT EXISTS surge_alert_summary (
+            day DATE NOT NULL,
+            market VARCHAR(20) NOT NULL,
+            signal_type VARCHAR(20) NOT NULL,
+            auto_traded BOOLEAN NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT '',
+            alert_count INTEGER NOT NULL DEFAULT 0,
+            auto_traded_count INTEGER NOT NULL DEFAULT 0,
+            confidence_sum REAL NOT NULL DEFAULT 0,
+            profit_loss_sum REAL NOT NULL DEFAULT 0,
+            profitable_count INTEGER NOT NULL DEFAULT 0,
+            losing_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, market, signal_type, auto_traded, status)
+        );
+    """))
+
+    def upsert(row, sign):
+        return f"""
+            INSERT INTO surge_alert_summary ({SUMMARY_KEY}, {SUMMARY_VALUES})
+            VALUES ({_summary_select(row, sign, f'date({row}.sent_at)')})
+            {_summary_upsert()};
+        """
+
+    triggers = {
+        'trg_surge_alert_summary_insert': ('AFTER INSERT', upsert('NEW', 1)),
+        'trg_surge_alert_summary_delete': ('AFTER DELETE', upsert('OLD', -1)),
+        'trg_surge_alert_summary_update': (f'AFTER UPDATE OF {WATCHED_COLUMNS}',
+                                           upsert('OLD', -1) + upsert('NEW', 1)),
+    }
+    for name, (timing, body) in triggers.items():
+        session.execute(text(f"DROP TRIGGER IF EXISTS {name};"))
+        session.execute(text(f"""
+            CREATE TRIGGER {name} {timing} ON surge_alerts
+            BEGIN
+                {body}
+            END;
+        """))
+
+    session.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_surge_alerts_auto_traded_sent_at
+        ON surge_alerts(sent_at, id) WHERE auto_traded = 1;
+    """))
+
+    _backfill(session, 'date(a.sent_at)')
+
+
+def _backfill(session, day_expr):
+    """Rebuild the summary from surge_alerts"""
+    session.execute(text("DELETE FROM surge_alert_summary;"))
+    session.execute(text(f"""
+        INSERT INTO surge_alert_summary ({SUMMARY_KEY}, {SUMMARY_VALUES})
+        SELECT {day_expr}, a.market, COALESCE(a.signal_type, 'surge'),
+               COALESCE(a.auto_traded, FALSE), COALESCE(a.status, ''),
+               COUNT(*),
+               SUM(CASE WHEN a.auto_traded THEN 1 ELSE 0 END),
+               SUM(COALESCE(a.confidence, 0)),
+               SUM(COALESCE(a.profit_loss, 0)),
+               SUM(CASE WHEN a.exit_price IS NOT NULL AND a.exit_price > a.entry_price THEN 1 ELSE 0 END),
+               SUM(CASE WHEN a.exit_price IS NOT NULL AND a.exit_price <= a.entry_price THEN 1 ELSE 0 END)
+        FROM surge_alerts a
+        GROUP BY 1, 2, 3, 4, 5;
+    """))
+
+
+def run_migration():
+    """
+    Run database migration to add keyset indexes and the surge alert summary
+    """
+    session = get_db_session()
+
+    try:
+        print("[Migration] Starting keyset pagination migration...")
+
+        # Check database type
+        db_url = os.getenv('DATABASE_URL', '')
+        is_postgresql = db_url.startswith('postgresql')
+
+        print("[Migration] Creating composite indexes...")
+        for statement in INDEXES:
+            session.execute(text(statement))
+
+        print("[Migration] Creating surge_alert_summary table and triggers...")
+        if is_postgresql:
+            _postgresql(session)
+        else:
+            _sqlite(session)
+
+        session.commit()
+
+        count = session.execute(text("SELECT COALESCE(SUM(alert_count), 0) FROM surge_alert_summary")).scalar()
+        print(f"  - Summary covers {count} surge alerts")
+        print("[Migration] Migration completed successfully!")
+
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"[Migration] ERROR: {e}")
+        return False
+
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Keyset Pagination Database Migration")
+    print("=" * 60)
+    success = run_migration()
+    sys.exit(0 if success else 1)
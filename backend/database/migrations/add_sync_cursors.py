@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Database Migration: Add Per-User Resumable Order Sync
+Adds user_id, cursor_page, full_sync_completed_at to sync_status table
+Widens sync_status.market to hold "<user_id>:<market>" sync keys
+"""
+
+import sys
+import os
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.database.connection import get_db_session
+
+
+def run_migration():
+    """
+    Run database migration to add per-user sync cursors
+    """
+    session = get_db_session()
+
+    try:
+        print("[Migration] Starting sync cursor migration...")
+
+        # Check database type
+        db_url = os.getenv('DATABASE_URL', '')
+        is_postgresql = db_url.startswith('postgresql')
+
+        print("[Migration] Adding cursor columns to sync_status table...")
+
+        if is_postgresql:
+            # PostgreSQL syntax
+            session.execute(text("""
+                ALTER TABLE sync_status
+                ALTER COLUMN market TYPE VARCHAR(50),
+                ADD COLUMN IF NOT EXISTS user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+                ADD COLUMN IF NOT EXISTS cursor_page INTEGER,
+                ADD COLUMN IF NOT EXISTS full_sync_completed_at TIMESTAMP;
+            """))
+
+            session.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_sync_status_user_id
+                ON sync_status(user_id);
+            """))
+        else:
+            # SQLite syntax - check if column exists first (VARCHAR length is not enforced)
+            result = session.execute(text("""
+                PRAGMA table_info(sync_status);
+            """))
+            existing_columns = [row[1] for row in result]
+
+            if 'user_id' not in existing_columns:
+                session.execute(text("""
+                    ALTER TABLE sync_status ADD COLUMN user_id INTEGER;
+                """))
+                print("  - Added user_id column")
+
+            if 'cursor_page' not in existing_columns:
+                session.execute(text("""
+                    ALTER TABLE sync_status ADD COLUMN cursor_page INTEGER;
+                """))
+                print("  - Added cursor_page column")
+
+            if 'full_sync_completed_at' not in existing_columns:
+                session.execute(text("""
+                    ALTER TABLE sync_status ADD COLUMN full_sync_completed_at DATETIME;
+                """))
+                print("  - Added full_sync_completed_at column")
+
+            session.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_sync_status_user_id
+                ON sync_status(user_id);
+            """))
+
+        session.commit()
+        print("[Migration] Migration completed successfully!")
+        print("[Migration] Added resumable per-user order sync support to database")
+
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"[Migration] ERROR: {e}")
+        return False
+
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Sync Cursor Database Migration")
+    print("=" * 60)
+    success = run_migration()
+    sys.exit(0 if success else 1)
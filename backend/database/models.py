@@ -4,7 +4,7 @@ Database Models Module
 Defines SQLAlchemy ORM models for all database tables.
 """
 
-from sqlalchemy import Column, String, Integer, Numeric, DateTime, Boolean, Text, JSON, ForeignKey, Index, func
+from sqlalchemy import Column, String, Integer, BigInteger, Numeric, DateTime, Boolean, Text, JSON, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from .connection import Base
 import json
@@ -67,6 +67,9 @@ class Order(Base):
     __table_args__ = (
         Index('idx_market_executed_at', 'market', 'executed_at'),
         Index('idx_strategy_state', 'strategy_name', 'state'),
+        # Keyset pagination of /api/orders (executed_at, uuid)
+        Index('idx_orders_user_state_executed_at', 'user_id', 'state', 'executed_at', 'uuid'),
+        Index('idx_orders_user_market_state_executed_at', 'user_id', 'market', 'state', 'executed_at', 'uuid'),
     )
 
     def to_dict(self):
@@ -160,6 +163,7 @@ class PriceCache(Base):
     low = Column(Numeric(20, 8), comment='Low price')
     close = Column(Numeric(20, 8), comment='Close price')
     volume = Column(Numeric(20, 8), comment='Trading volume')
+    trade_value = Column(Numeric(30, 8), comment='Accumulated trade value (KRW)')
 
     # Metadata
     cached_at = Column(DateTime, default=datetime.utcnow, comment='When cached')
@@ -178,7 +182,8 @@ class PriceCache(Base):
             'high': float(self.high) if self.high else None,
             'low': float(self.low) if self.low else None,
             'close': float(self.close) if self.close else None,
-            'volume': float(self.volume) if self.volume else None
+            'volume': float(self.volume) if self.volume else None,
+            'trade_value': float(self.trade_value) if self.trade_value else None
         }
 
 
@@ -297,13 +302,18 @@ class SyncStatus(Base):
     Sync Status table - Tracks API synchronization state.
 
     Monitors sync status for each market to enable incremental sync.
+    Per-user syncs use "<user_id>:<market or all>" keys; cursor_page lets an
+    interrupted full sync resume where it stopped.
     """
     __tablename__ = 'sync_status'
 
-    market = Column(String(20), primary_key=True, comment='Market code (or "all")')
+    market = Column(String(50), primary_key=True, comment='Sync key: market code (or "all"), "<user_id>:" prefixed per user')
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True, comment='User ID (per-user syncs)')
     last_sync = Column(DateTime, comment='Last successful sync time')
     last_order_uuid = Column(String(36), comment='Last synced order UUID')
     total_orders = Column(Integer, default=0, comment='Total orders synced')
+    cursor_page = Column(Integer, nullable=True, comment='Next page of an unfinished full sync')
+    full_sync_completed_at = Column(DateTime, nullable=True, comment='When the full history sync finished')
     last_error = Column(Text, comment='Last error message')
     sync_count = Column(Integer, default=0, comment='Number of syncs performed')
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -312,14 +322,125 @@ class SyncStatus(Base):
         """Convert model instance to dictionary."""
         return {
             'market': self.market,
+            'user_id': self.user_id,
             'last_sync': self.last_sync.isoformat() if self.last_sync else None,
             'last_order_uuid': self.last_order_uuid,
             'total_orders': self.total_orders,
+            'cursor_page': self.cursor_page,
+            'full_sync_completed_at': self.full_sync_completed_at.isoformat() if self.full_sync_completed_at else None,
             'sync_count': self.sync_count,
             'last_error': self.last_error
         }
 
 
+class CostBasisPosition(Base):
+    """
+    Cost Basis Positions table - Per-user, per-market average cost ledger.
+
+    Folded incrementally from filled orders and deposits/withdrawals
+    (see CostBasisLedger), so the average buy price is a single-row lookup.
+    """
+    __tablename__ = 'cost_basis_positions'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, comment='User ID')
+    market = Column(String(20), nullable=False, comment='Market code (KRW-BTC)')
+
+    # Position (average cost method)
+    quantity = Column(Numeric(28, 8), default=0, comment='Coins held according to the ledger')
+    uncosted_quantity = Column(Numeric(28, 8), default=0, comment='Part of quantity with unknown cost (deposits)')
+    total_cost = Column(Numeric(28, 8), default=0, comment='Cost of the costed quantity (KRW, excl. fees)')
+    realized_pnl = Column(Numeric(28, 8), default=0, comment='Realized profit on sells (KRW, excl. fees)')
+    fees = Column(Numeric(28, 8), default=0, comment='Trading fees paid (KRW)')
+
+    # Fold progress
+    event_count = Column(Integer, default=0, comment='Fills and transfers folded')
+    last_event_at = Column(DateTime, comment='Time of the latest folded event')
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_cost_basis_user_market', 'user_id', 'market', unique=True),
+    )
+
+    @property
+    def average_price(self):
+        """Average buy price of the costed quantity, or None if unknown"""
+        costed = float(self.quantity or 0) - float(self.uncosted_quantity or 0)
+        if costed <= 0:
+            return None
+        return float(self.total_cost or 0) / costed
+
+    def to_dict(self):
+        """Convert model instance to dictionary."""
+        return {
+            'market': self.market,
+            'quantity': float(self.quantity or 0),
+            'uncosted_quantity': float(self.uncosted_quantity or 0),
+            'total_cost': float(self.total_cost or 0),
+            'average_price': self.average_price,
+            'realized_pnl': float(self.realized_pnl or 0),
+            'fees': float(self.fees or 0),
+            'event_count': self.event_count,
+            'last_event_at': self.last_event_at.isoformat() if self.last_event_at else None
+        }
+
+
+class CostBasisTransfer(Base):
+    """
+    Cost Basis Transfers table - Completed deposits/withdrawals of coins.
+
+    Kept so the cost basis ledger can be rebuilt from the database alone.
+    """
+    __tablename__ = 'cost_basis_transfers'
+
+    uuid = Column(String(64), primary_key=True, comment='Upbit deposit/withdraw UUID')
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True, comment='User ID')
+    market = Column(String(20), nullable=False, comment='Market code (KRW-BTC)')
+    kind = Column(String(10), nullable=False, comment='deposit/withdraw')
+    amount = Column(Numeric(28, 8), nullable=False, comment='Transferred amount')
+    fee = Column(Numeric(28, 8), default=0, comment='Transfer fee (in coin)')
+    done_at = Column(DateTime, comment='Completion time')
+    raw_data = Column(JSON, comment='Original JSON from Upbit API')
+
+    def to_dict(self):
+        """Convert model instance to dictionary."""
+        return {
+            'uuid': self.uuid,
+            'market': self.market,
+            'kind': self.kind,
+            'amount': float(self.amount) if self.amount else 0,
+            'fee': float(self.fee) if self.fee else 0,
+            'done_at': self.done_at.isoformat() if self.done_at else None
+        }
+
+
+class ServiceLease(Base):
+    """
+    Service Leases table - One row per background job (see LeaderLease).
+
+    The holder keeps renewing expires_at; an expired row may be taken over.
+    """
+    __tablename__ = 'service_leases'
+
+    job = Column(String(64), primary_key=True, comment='Job name')
+    holder = Column(String(128), nullable=False, comment='Holder id (host:pid:random)')
+    acquired_at = Column(DateTime, nullable=False, comment='When the current holder took the lease')
+    expires_at = Column(DateTime, nullable=False, comment='Lease expiry unless renewed')
+
+
+class TelegramUpdateInbox(Base):
+    """
+    Telegram Update Inbox table - Webhook updates waiting for the bot owner.
+
+    Filled by the web processes, drained by TelegramUpdateRelay.
+    """
+    __tablename__ = 'telegram_update_inbox'
+
+    update_id = Column(BigInteger, primary_key=True, autoincrement=False, comment='Telegram update_id')
+    payload = Column(Text, nullable=False, comment='Update JSON')
+    received_at = Column(DateTime, nullable=False, comment='When the webhook delivered it')
+
+
 class SystemLog(Base):
     """
     System Logs table - Application logs for debugging.
@@ -4,8 +4,7 @@ Admin Authentication Middleware
 """
 from functools import wraps
 from flask import request, jsonify
-from backend.database.connection import get_db_session
-from backend.database.models import User
+from backend.middleware.principal import get_principal
 
 def admin_required(f):
     """관리자 권한 확인 데코레이터 (JWT 기반)"""
@@ -23,30 +22,25 @@ def admin_required(f):
                 'code': 'UNAUTHORIZED'
             }), 401
 
-        # 사용자 정보 조회
-        session = get_db_session()
-        try:
-            user = session.query(User).filter(User.id == user_id).first()
-
-            if not user:
-                return jsonify({
-                    'success': False,
-                    'error': 'User not found',
-                    'code': 'USER_NOT_FOUND'
-                }), 404
-
-            # 관리자 권한 확인
-            if not user.is_admin:
-                return jsonify({
-                    'success': False,
-                    'error': 'Admin access required',
-                    'code': 'FORBIDDEN'
-                }), 403
-
-            # Pass user object as first argument to the decorated function
-            return f(user, *args, **kwargs)
-
-        finally:
-            session.close()
+        # 사용자 정보 조회 (캐시된 principal)
+        user = get_principal(user_id)
+
+        if not user:
+            return jsonify({
+                'success': False,
+                'error': 'User not found',
+                'code': 'USER_NOT_FOUND'
+            }), 404
+
+        # 관리자 권한 확인
+        if not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required',
+                'code': 'FORBIDDEN'
+            }), 403
+
+        # Pass user principal as first argument to the decorated function
+        return f(user, *args, **kwargs)
 
     return decorated_function
\ No newline at end of file
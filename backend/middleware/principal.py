@@ -0,0 +1,305 @@
+"""
+Authenticated Principal Cache
+
+Snapshot of what request decorators need to know about a user (active and
+admin flags, subscription plan with its limits, Upbit API keys - plain or
+still encrypted), loaded with one query and shared by require_auth, admin_required, get_user_upbit_api and
+get_user_plan.
+
+- Request scope: the first lookup in a request is kept on flask.g, so the
+  decorators and helpers of one request never repeat it.
+- Process scope: a short-TTL cache (PRINCIPAL_CACHE_TTL, default 30s) serves
+  the burst of API calls a dashboard page fires.
+- Invalidation: ORM writes to users / user_subscriptions / upbit_api_keys and
+  raw SQL INSERT/UPDATE/DELETE on those tables drop the affected entries when
+  the session commits. The TTL bounds staleness across processes.
+"""
+
+import os
+import re
+import threading
+import logging
+from typing import Dict, Optional
+
+from flask import g, has_request_context
+from sqlalchemy import and_, event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql.elements import TextClause
+
+from backend.common.cache import SimpleCache
+from backend.database import get_db_session, User
+from backend.models.subscription_models import Subscription
+from backend.models.user_api_key import UpbitAPIKey
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 30))
+
+# Tables whose changes affect a principal
+_WATCHED_TABLES = ('users', 'user_subscriptions', 'upbit_api_keys')
+_WRITE_SQL = re.compile(
+    r'\b(?:update|insert\s+into|delete\s+from)\s+(?:users|user_subscriptions|upbit_api_keys)\b',
+    re.IGNORECASE
+)
+
+# session.info key collecting user ids to invalidate on commit (None = all)
+_PENDING_KEY = 'principal_invalidations'
+
+
+class Principal:
+    """
+    Read-only user snapshot passed to routes as current_user
+
+    Exposes the User attributes routes use (id, email, username, is_active,
+    is_admin, plan) without holding a database session.
+    """
+
+    __slots__ = ('id', 'email', 'username', 'is_active', 'is_admin', 'plan',
+                 'upbit_access_key', 'upbit_secret_key',
+                 'upbit_access_key_encrypted', 'upbit_secret_key_encrypted', '_plan_info')
+
+    def __init__(self, id, email, username, is_active, is_admin, plan,
+                 upbit_access_key=None, upbit_secret_key=None,
+                 upbit_access_key_encrypted=None, upbit_secret_key_encrypted=None):
+        self.id = id
+        self.email = email
+        self.username = username
+        self.is_active = bool(is_active)
+        self.is_admin = bool(is_admin)
+        self.plan = (plan or 'free').lower()
+        self.upbit_access_key = upbit_access_key
+        self.upbit_secret_key = upbit_secret_key
+        # Active upbit_api_keys row (Fernet ciphertext, decrypted only when a client is built)
+        self.upbit_access_key_encrypted = upbit_access_key_encrypted
+        self.upbit_secret_key_encrypted = upbit_secret_key_encrypted
+        self._plan_info = None
+
+    @property
+    def has_plain_upbit_keys(self) -> bool:
+        return bool(self.upbit_access_key and self.upbit_secret_key)
+
+    @property
+    def has_upbit_keys(self) -> bool:
+        return self.has_plain_upbit_keys or bool(
+            self.upbit_access_key_encrypted and self.upbit_secret_key_encrypted
+        )
+
+    @property
+    def plan_info(self) -> Dict:
+        """Plan code, name, limits and features (see subscription_check.get_plan_info)"""
+        if self._plan_info is None:
+            from backend.middleware.subscription_check import get_plan_info
+            self._plan_info = get_plan_info(self.plan)
+        return self._plan_info
+
+    def __repr__(self):
+        return f"<Principal(id={self.id}, email='{self.email}', plan='{self.plan}')>"
+
+
+class PrincipalCache:
+    """
+    Request-scoped plus short-TTL process-wide principal cache
+    """
+
+    def __init__(self, ttl: int = PRINCIPAL_CACHE_TTL, max_size: int = 10000):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds a loaded principal is served without a query
+            max_size: Maximum cached principals (LRU)
+        """
+        self._cache = SimpleCache(default_ttl=ttl, max_size=max_size, name='principals')
+        # Bumped by every invalidation so in-flight loads do not re-cache stale rows
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id) -> Optional[Principal]:
+        """
+        Get principal for a user
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Principal or None if the user does not exist
+        """
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        scoped = g.setdefault('_principals', {}) if has_request_context() else None
+        if scoped is not None and user_id in scoped:
+            return scoped[user_id]
+
+        generation = self._generation
+        principal = self._cache.get_or_load(user_id, lambda: self._load(user_id))
+        if generation != self._generation:
+            # Invalidated while loading: keep it for this request only
+            self._cache.delete(user_id)
+
+        if scoped is not None:
+            scoped[user_id] = principal
+        return principal
+
+    def _load(self, user_id) -> Optional[Principal]:
+        """Load user, active subscription plan and active API key row in one query"""
+        session = get_db_session()
+        try:
+            row = session.query(
+                User.id, User.email, User.username, User.is_active, User.is_admin,
+                User.upbit_access_key, User.upbit_secret_key, Subscription.plan,
+                UpbitAPIKey.access_key_encrypted, UpbitAPIKey.secret_key_encrypted
+            ).outerjoin(
+                Subscription, and_(Subscription.user_id == User.id, Subscription.status == 'active')
+            ).outerjoin(
+                UpbitAPIKey, and_(UpbitAPIKey.user_id == User.id, UpbitAPIKey.is_active == True)  # noqa: E712
+            ).filter(User.id == user_id).first()
+        finally:
+            session.close()
+
+        if row is None:
+            return None
+
+        return Principal(
+            id=row.id,
+            email=row.email,
+            username=row.username,
+            is_active=row.is_active,
+            is_admin=row.is_admin,
+            plan=row.plan,
+            upbit_access_key=row.upbit_access_key,
+            upbit_secret_key=row.upbit_secret_key,
+            upbit_access_key_encrypted=row.access_key_encrypted,
+            upbit_secret_key_encrypted=row.secret_key_encrypted
+        )
+
+    def invalidate(self, user_id=None):
+        """
+        Drop a cached principal (or all of them)
+
+        Args:
+            user_id: User ID (None = every user)
+        """
+        with self._lock:
+            self._generation += 1
+
+        if user_id is not None:
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                user_id = None
+
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(user_id)
+
+        if has_request_context() and '_principals' in g:
+            if user_id is None:
+                g._principals.clear()
+            else:
+                g._principals.pop(user_id, None)
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            dict: SimpleCache stats plus invalidation generation
+        """
+        return {**self._cache.stats(), 'generation': self._generation}
+
+
+# Global instance
+_principal_cache = None
+_principal_cache_lock = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    """
+    Get or create principal cache singleton
+
+    Returns:
+        PrincipalCache instance
+    """
+    global _principal_cache
+
+    with _principal_cache_lock:
+        if _principal_cache is None:
+            _principal_cache = PrincipalCache()
+
+    return _principal_cache
+
+
+def get_principal(user_id) -> Optional[Principal]:
+    """Get the cached principal for a user (None if not found)"""
+    return get_principal_cache().get(user_id)
+
+
+def invalidate_principal(user_id=None):
+    """Drop a user's cached principal now (None = all users)"""
+    get_principal_cache().invalidate(user_id)
+
+
+# ==================== Invalidation hooks ====================
+
+def _mark(session, user_id):
+    """Remember a user to invalidate when the session commits"""
+    if session is None:
+        invalidate_principal(user_id)
+        return
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    pending.add(user_id)
+
+
+def _on_user_change(mapper, connection, target):
+    _mark(object_session(target), target.id)
+
+
+def _on_user_ref_change(mapper, connection, target):
+    _mark(object_session(target), target.user_id)
+
+
+for _model, _handler in ((User, _on_user_change), (Subscription, _on_user_ref_change),
+                         (UpbitAPIKey, _on_user_ref_change)):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _handler)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _on_execute(orm_execute_state):
+    """Raw SQL and bulk ORM writes to watched tables"""
+    statement = orm_execute_state.statement
+
+    if isinstance(statement, TextClause):
+        if not _WRITE_SQL.search(statement.text):
+            return
+    elif orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(statement, 'table', None)
+        if getattr(table, 'name', None) not in _WATCHED_TABLES:
+            return
+    else:
+        return
+
+    params = orm_execute_state.parameters
+    user_id = params.get('user_id') if isinstance(params, dict) else None
+    _mark(orm_execute_state.session, user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _on_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if None in pending:
+        invalidate_principal()
+    else:
+        for user_id in pending:
+            invalidate_principal(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _on_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,369 @@
+"""
+Rate Limit Stores
+
+Token bucket state for middleware.security.RateLimiter.
+
+Every store implements the same two atomic operations:
+- consume(identifier, key, capacity, refill_rate): check the identifier's
+  IP block, refill bucket `key` and take one token, all in one step
+- block(identifier, duration_seconds)
+
+Buckets that were idle long enough to refill completely are equivalent to
+missing ones, so every store expires them lazily instead of running a
+cleanup job:
+- MemoryRateLimitStore: one process; buckets split over lock stripes so
+  concurrent requests rarely wait on each other
+- SQLiteRateLimitStore: processes on one host sharing a SQLite file (WAL);
+  one UPSERT ... RETURNING per request
+- RedisRateLimitStore: processes on any host; one Lua script call per
+  request. Works with any redis-py compatible client (e.g. fakeredis)
+
+Select with RATE_LIMIT_STORE=memory|sqlite|redis (see create_rate_limit_store).
+"""
+
+import os
+import math
+import time
+import sqlite3
+import threading
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class MemoryRateLimitStore:
+    """
+    Process-local buckets with striped locks
+    """
+
+    def __init__(self, idle_ttl=3600, stripes=64, sweep_every=1024):
+        """
+        Initialize store
+
+        Args:
+            idle_ttl: Seconds after which an untouched bucket is dropped
+                      (must be >= the longest refill time)
+            stripes: Number of independently locked bucket maps
+            sweep_every: Operations on a stripe between idle sweeps of it
+        """
+        self.idle_ttl = idle_ttl
+        self.sweep_every = sweep_every
+        # Each stripe: [lock, {key: [tokens, last_update]}, operations since sweep]
+        self._stripes = [[threading.Lock(), {}, 0] for _ in range(stripes)]
+
+        # Blocked identifiers: {identifier: block_until}
+        self._blocks = {}
+        self._blocks_lock = threading.Lock()
+
+    def _blocked_for(self, identifier, now):
+        if not self._blocks:
+            return 0
+        block_until = self._blocks.get(identifier)
+        if block_until is None:
+            return 0
+        if now < block_until:
+            return block_until - now
+        with self._blocks_lock:
+            if self._blocks.get(identifier) == block_until:
+                del self._blocks[identifier]
+        return 0
+
+    def consume(self, identifier, key, capacity, refill_rate):
+        """
+        Take one token
+
+        Returns:
+            (allowed: bool, retry_after: float seconds)
+        """
+        now = time.time()
+        blocked = self._blocked_for(identifier, now)
+        if blocked:
+            return False, blocked
+
+        stripe = self._stripes[hash(key) % len(self._stripes)]
+        with stripe[0]:
+            buckets = stripe[1]
+            bucket = buckets.get(key)
+            if bucket is None:
+                # New buckets start full
+                tokens = capacity
+                bucket = buckets[key] = [0.0, now]
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+
+            allowed = tokens >= 1
+            bucket[0] = tokens - 1 if allowed else tokens
+            bucket[1] = now
+
+            stripe[2] += 1
+            if stripe[2] >= self.sweep_every:
+                stripe[2] = 0
+                cutoff = now - self.idle_ttl
+                for idle_key in [k for k, b in buckets.items() if b[1] < cutoff]:
+                    del buckets[idle_key]
+
+        return (True, 0) if allowed else (False, (1 - tokens) / refill_rate)
+
+    def block(self, identifier, duration_seconds):
+        with self._blocks_lock:
+            self._blocks[identifier] = time.time() + duration_seconds
+
+    def cleanup(self):
+        """Drop every idle bucket and expired block now"""
+        now = time.time()
+        cutoff = now - self.idle_ttl
+        for lock, buckets, _ in self._stripes:
+            with lock:
+                for idle_key in [k for k, b in buckets.items() if b[1] < cutoff]:
+                    del buckets[idle_key]
+        with self._blocks_lock:
+            for identifier in [i for i, until in self._blocks.items() if until <= now]:
+                del self._blocks[identifier]
+
+    def get_stats(self):
+        return {
+            'store': 'memory',
+            'buckets': sum(len(buckets) for _, buckets, _ in self._stripes),
+            'blocked': len(self._blocks)
+        }
+
+
+class SQLiteRateLimitStore:
+    """
+    Buckets in a SQLite file shared by the processes of one host
+    """
+
+    # Refill, then take a token only if one is available; no row comes
+    # back when the request is denied
+    CONSUME_SQL = """
+        INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+        VALUES (:key, :capacity - 1, :now)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = MIN(:capacity, tokens + MAX(0, :now - updated_at) * :rate) - 1,
+            updated_at = :now
+        WHERE MIN(:capacity, tokens + MAX(0, :now - updated_at) * :rate) >= 1
+        RETURNING tokens
+    """
+
+    # Tokens a denied request would see (refill applied, same as CONSUME_SQL)
+    TOKENS_SQL = """
+        SELECT MIN(:capacity, tokens + MAX(0, :now - updated_at) * :rate)
+        FROM rate_limit_buckets WHERE key = :key
+    """
+
+    def __init__(self, path='data/rate_limits.db', idle_ttl=3600, sweep_every=10000):
+        """
+        Initialize store
+
+        Args:
+            path: SQLite file (created if missing)
+            idle_ttl: Seconds after which an untouched bucket is deleted
+            sweep_every: Operations (per process) between idle sweeps
+        """
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(f"SQLite {sqlite3.sqlite_version} lacks RETURNING (3.35+ required)")
+
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self.sweep_every = sweep_every
+        self._local = threading.local()
+        self._operations = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_blocks (
+                identifier TEXT PRIMARY KEY,
+                block_until REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_updated_at ON rate_limit_buckets(updated_at)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: each statement is its own (atomic) transaction
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def consume(self, identifier, key, capacity, refill_rate):
+        """
+        Take one token
+
+        Returns:
+            (allowed: bool, retry_after: float seconds)
+        """
+        now = time.time()
+        conn = self._conn()
+
+        row = conn.execute(
+            "SELECT block_until FROM rate_limit_blocks WHERE identifier = ?", (identifier,)
+        ).fetchone()
+        if row and row[0] > now:
+            return False, row[0] - now
+
+        params = {'key': key, 'capacity': capacity, 'rate': refill_rate, 'now': now}
+        allowed = conn.execute(self.CONSUME_SQL, params).fetchone() is not None
+
+        self._operations += 1
+        if self._operations >= self.sweep_every:
+            self._operations = 0
+            self._sweep(conn, now)
+
+        if allowed:
+            return True, 0
+
+        row = conn.execute(self.TOKENS_SQL, params).fetchone()
+        tokens = row[0] if row else 0
+        return False, max(0.0, 1 - tokens) / refill_rate
+
+    def _sweep(self, conn, now):
+        conn.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - self.idle_ttl,))
+        conn.execute("DELETE FROM rate_limit_blocks WHERE block_until <= ?", (now,))
+
+    def block(self, identifier, duration_seconds):
+        self._conn().execute(
+            "INSERT INTO rate_limit_blocks (identifier, block_until) VALUES (?, ?) "
+            "ON CONFLICT (identifier) DO UPDATE SET block_until = excluded.block_until",
+            (identifier, time.time() + duration_seconds)
+        )
+
+    def cleanup(self):
+        """Delete idle buckets and expired blocks now"""
+        self._sweep(self._conn(), time.time())
+
+    def get_stats(self):
+        conn = self._conn()
+        return {
+            'store': 'sqlite',
+            'path': self.path,
+            'buckets': conn.execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0],
+            'blocked': conn.execute(
+                "SELECT COUNT(*) FROM rate_limit_blocks WHERE block_until > ?", (time.time(),)
+            ).fetchone()[0]
+        }
+
+
+class RedisRateLimitStore:
+    """
+    Buckets in Redis (or a compatible server/stand-in) shared by every process
+    """
+
+    # KEYS: bucket, block   ARGV: capacity, refill rate (/s), now (s), bucket ttl (ms)
+    # Returns {allowed, retry_after_ms}
+    CONSUME_SCRIPT = """
+        local blocked = redis.call('PTTL', KEYS[2])
+        if blocked > 0 then
+            return {0, blocked}
+        end
+
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+
+        local tokens = capacity
+        local bucket = redis.call('HMGET', KEYS[1], 't', 'ts')
+        if bucket[1] then
+            tokens = math.min(capacity, tonumber(bucket[1]) + math.max(0, now - tonumber(bucket[2])) * rate)
+        end
+
+        local allowed = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+            allowed = 1
+        end
+
+        redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', ARGV[3])
+        -- A bucket left alone until full is the same as no bucket
+        redis.call('PEXPIRE', KEYS[1], ARGV[4])
+
+        if allowed == 1 then
+            return {1, 0}
+        end
+        return {0, math.ceil((1 - tokens) / rate * 1000)}
+    """
+
+    def __init__(self, url=None, client=None, prefix='coinpulse:rl:'):
+        """
+        Initialize store
+
+        Args:
+            url: Redis URL (e.g. redis://localhost:6379/0)
+            client: Ready redis-py compatible client (overrides url)
+            prefix: Key prefix
+        """
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("Redis rate limit store requires redis (pip install redis)")
+            client = redis.Redis.from_url(url or 'redis://localhost:6379/0')
+
+        self.client = client
+        self.prefix = prefix
+        self._consume = client.register_script(self.CONSUME_SCRIPT)
+
+    def consume(self, identifier, key, capacity, refill_rate):
+        """
+        Take one token
+
+        Returns:
+            (allowed: bool, retry_after: float seconds)
+        """
+        bucket_ttl_ms = math.ceil(capacity / refill_rate * 1000)
+        allowed, retry_after_ms = self._consume(
+            keys=[f"{self.prefix}b:{key}", f"{self.prefix}block:{identifier}"],
+            args=[capacity, refill_rate, repr(time.time()), bucket_ttl_ms]
+        )
+        return bool(allowed), int(retry_after_ms) / 1000
+
+    def block(self, identifier, duration_seconds):
+        self.client.set(f"{self.prefix}block:{identifier}", 1, px=int(duration_seconds * 1000))
+
+    def cleanup(self):
+        """Nothing to do: Redis expires idle buckets and blocks itself"""
+
+    def get_stats(self):
+        return {'store': 'redis'}
+
+
+def create_rate_limit_store(idle_ttl=3600):
+    """
+    Create the store selected by RATE_LIMIT_STORE
+
+    Environment:
+        RATE_LIMIT_STORE: memory (default), sqlite or redis
+        RATE_LIMIT_SQLITE_PATH: SQLite file (default: data/rate_limits.db)
+        RATE_LIMIT_REDIS_URL: Redis URL (default: REDIS_URL, then localhost)
+
+    Args:
+        idle_ttl: Seconds after which an untouched bucket may be dropped
+
+    Returns:
+        Store instance (memory store if the selected one is unavailable)
+    """
+    store_type = os.getenv('RATE_LIMIT_STORE', 'memory').lower()
+
+    try:
+        if store_type == 'sqlite':
+            return SQLiteRateLimitStore(os.getenv('RATE_LIMIT_SQLITE_PATH', 'data/rate_limits.db'), idle_ttl=idle_ttl)
+        if store_type == 'redis':
+            return RedisRateLimitStore(os.getenv('RATE_LIMIT_REDIS_URL') or os.getenv('REDIS_URL'))
+    except Exception as e:
+        print(f"[Security] {store_type} rate limit store unavailable ({e}), using in-memory store")
+
+    return MemoryRateLimitStore(idle_ttl=idle_ttl)
@@ -14,26 +14,118 @@ Features:
 - Security event logging
 """
 
-import time
-from collections import defaultdict
-from datetime import datetime, timedelta
+import math
+from functools import lru_cache
 from flask import request, jsonify, g
 import re
 import os
 
+from backend.middleware.rate_limit_store import create_rate_limit_store
+
+
+# Paths never rate limited (static files, JWT-secured high-frequency reads,
+# public polling endpoints); compiled once, checked on every request
+STATIC_EXTENSIONS = ('.html', '.css', '.js', '.json', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.woff', '.woff2', '.ttf', '.eot')
+
+EXEMPT_PATHS = frozenset([
+    # Root URL and main pages
+    '/', '',
+    # Auth and data GET endpoints (already secured by JWT tokens)
+    '/api/auth/me',
+    '/api/auth/check',
+    '/api/user/plan',
+    '/api/user/profile',  # User profile information (JWT secured)
+    '/api/user/api-keys',  # API keys full info (JWT secured)
+    '/api/user/api-keys/status',  # API keys status check (JWT secured)
+    '/api/holdings',
+    '/api/orders',
+    '/api/trading/orders',  # Alternative route for orders
+    '/api/account/balance',
+    '/api/subscription/current',  # User subscription status (old route)
+    '/api/user/subscription',  # User subscription status (new route)
+    '/api/subscription/transactions',  # User transaction history
+    '/api/user/signals/stats',  # User signal statistics
+    '/api/telegram/link/status',  # Telegram link status
+    '/api/trading/policies',  # Trading policy configuration
+    '/api/feedback/my',  # User's own feedback (JWT secured)
+    '/api/user/signals',  # User signals with query parameters (JWT secured)
+    # Login endpoints (Google OAuth and regular login)
+    '/api/auth/login',
+    '/api/auth/register',
+    '/api/auth/google-login',
+    '/api/auth/logout',
+    '/api/auth/refresh',
+])
+
+EXEMPT_PREFIXES = (
+    '/static/',
+    '/frontend/',
+    '/api/admin/',  # Already secured by admin_required decorator
+    '/api/coin-prices/',  # Public data
+    '/api/balance/',  # JWT secured, high frequency
+    '/api/referral/',  # JWT secured, high frequency
+    # Auto-trading GET endpoints (dynamic paths with user_id)
+    '/api/auto-trading/status/',
+    '/api/auto-trading/config/',
+    '/api/auto-trading/positions/',
+    '/api/auto-trading/history/',
+    # Upbit proxy endpoints (chart data, market info, accounts, orders)
+    '/api/upbit/candles/',
+    '/api/upbit/ticker',
+    '/api/upbit/market/',
+    '/api/upbit/accounts',
+    '/api/upbit/orders',
+    '/socket.io/',  # WebSocket (Socket.IO) real-time communication
+    '/api/surge',  # Surge monitoring (frequent polling and PUBLIC access)
+    '/api/stats/',  # Public landing page statistics
+    '/api/test/',  # Development and testing only
+)
+
+_EXEMPT_PREFIX_RE = re.compile('|'.join(re.escape(prefix) for prefix in EXEMPT_PREFIXES))
+
+# (category, pattern searched anywhere in the path), first match wins
+_CATEGORY_PATTERNS = (
+    ('auth', re.compile(r'/auth/|/login|/register')),
+    ('trading', re.compile(r'/api/auto-trading/|/api/surge/')),
+    ('admin', re.compile(r'/admin/')),
+)
+
+
+@lru_cache(maxsize=4096)
+def classify_path(path):
+    """
+    Rate limit category of a path
+
+    Args:
+        path: Request path (without query string)
+
+    Returns:
+        'auth', 'trading', 'admin', 'api', 'default', or None if exempt
+    """
+    if path in EXEMPT_PATHS or path.endswith(STATIC_EXTENSIONS) or _EXEMPT_PREFIX_RE.match(path):
+        return None
+
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(path):
+            return category
+    return 'api' if path.startswith('/api/') else 'default'
+
 
 class RateLimiter:
     """
     Token bucket rate limiter with IP and user-based limits
-    """
 
-    def __init__(self):
-        # Storage: {key: {'tokens': float, 'last_update': float}}
-        self.buckets = defaultdict(lambda: {'tokens': 0, 'last_update': time.time()})
+    Bucket state lives in a pluggable store (see rate_limit_store), so limits
+    can be shared by every worker process instead of multiplying with them.
+    """
 
-        # Blocked IPs: {ip: block_until_timestamp}
-        self.blocked_ips = {}
+    def __init__(self, store=None):
+        """
+        Initialize rate limiter
 
+        Args:
+            store: Rate limit store (default: create_rate_limit_store(), set by RATE_LIMIT_STORE)
+        """
         # Check if running in development mode
         is_dev = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
 
@@ -57,42 +149,15 @@ class RateLimiter:
                 'admin': {'requests': 10000, 'window': 60}  # 10000 admin calls per minute (effectively unlimited)
             }
 
-    def _get_limit_for_path(self, path):
-        """Determine rate limit based on request path"""
-        if '/auth/' in path or '/login' in path or '/register' in path:
-            return self.limits['auth']
-        elif '/api/auto-trading/' in path or '/api/surge/' in path:
-            return self.limits['trading']
-        elif '/admin/' in path:
-            return self.limits['admin']
-        elif path.startswith('/api/'):
-            return self.limits['api']
-        else:
-            return self.limits['default']
-
-    def _get_tokens(self, key, limit_config):
-        """Get current token count for a key"""
-        bucket = self.buckets[key]
-        now = time.time()
+        # category -> (capacity, refill rate per second)
+        self._buckets = {
+            category: (config['requests'], config['requests'] / config['window'])
+            for category, config in self.limits.items()
+        }
 
-        # Refill tokens based on elapsed time
-        elapsed = now - bucket['last_update']
-        refill_rate = limit_config['requests'] / limit_config['window']
-        tokens_to_add = elapsed * refill_rate
-
-        # Update bucket
-        bucket['tokens'] = min(
-            limit_config['requests'],
-            bucket['tokens'] + tokens_to_add
-        )
-        bucket['last_update'] = now
-
-        return bucket['tokens']
-
-    def _consume_token(self, key):
-        """Consume one token from bucket"""
-        bucket = self.buckets[key]
-        bucket['tokens'] -= 1
+        # A bucket idle for a full window has refilled and can be forgotten
+        idle_ttl = max(config['window'] for config in self.limits.values())
+        self.store = store or create_rate_limit_store(idle_ttl=idle_ttl)
 
     def is_allowed(self, identifier, path):
         """
@@ -105,129 +170,26 @@ class RateLimiter:
         Returns:
             (allowed: bool, retry_after: int)
         """
-        # Exclude static files and HTML pages from rate limiting
-        static_extensions = ('.html', '.css', '.js', '.json', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.woff', '.woff2', '.ttf', '.eot')
-        # Remove query parameters for checking
-        path_without_query = path.split('?')[0]
-
-        # Exclude root URL and main pages
-        if path_without_query == '/' or path_without_query == '':
-            return True, 0
-
-        if path_without_query.endswith(static_extensions) or path_without_query.startswith('/static/') or path_without_query.startswith('/frontend/'):
-            return True, 0
-
-        # Exclude admin endpoints from rate limiting (already secured by admin_required decorator)
-        if path_without_query.startswith('/api/admin/'):
-            return True, 0
-
-        # Exclude coin price endpoints (public data, no rate limit needed)
-        if path_without_query.startswith('/api/coin-prices/'):
-            return True, 0
-
-        # Exclude balance history endpoints (already secured by JWT tokens, high frequency)
-        if path_without_query.startswith('/api/balance/'):
-            return True, 0
-
-        # Exclude auth and data GET endpoints (already secured by JWT tokens)
-        auth_get_endpoints = [
-            '/api/auth/me',
-            '/api/auth/check',
-            '/api/user/plan',
-            '/api/user/profile',  # User profile information (JWT secured)
-            '/api/user/api-keys',  # API keys full info (JWT secured)
-            '/api/user/api-keys/status',  # API keys status check (JWT secured)
-            '/api/holdings',
-            '/api/orders',
-            '/api/trading/orders',  # Alternative route for orders
-            '/api/account/balance',
-            '/api/subscription/current',  # User subscription status (old route)
-            '/api/user/subscription',  # User subscription status (new route)
-            '/api/subscription/transactions',  # User transaction history
-            '/api/user/signals/stats',  # User signal statistics
-            '/api/telegram/link/status',  # Telegram link status
-            '/api/trading/policies',  # Trading policy configuration
-            '/api/feedback/my'  # User's own feedback (JWT secured)
-        ]
-        if path_without_query in auth_get_endpoints:
-            print(f"[RateLimit] ✅ Excluded: {path_without_query}")
-            return True, 0
-
-        # Exclude user signals with query parameters (JWT secured)
-        if path_without_query == '/api/user/signals':
-            return True, 0
-
-        # Exclude referral endpoints (JWT secured, high frequency)
-        if path_without_query.startswith('/api/referral/'):
-            return True, 0
-
-        # Exclude login endpoints (Google OAuth and regular login)
-        login_endpoints = [
-            '/api/auth/login',
-            '/api/auth/register',
-            '/api/auth/google-login',
-            '/api/auth/logout',
-            '/api/auth/refresh'
-        ]
-        if path_without_query in login_endpoints:
-            return True, 0
-
-        # Exclude auto-trading GET endpoints (dynamic paths with user_id)
-        if path_without_query.startswith('/api/auto-trading/status/') or \
-           path_without_query.startswith('/api/auto-trading/config/') or \
-           path_without_query.startswith('/api/auto-trading/positions/') or \
-           path_without_query.startswith('/api/auto-trading/history/'):
-            return True, 0
-
-        # Exclude Upbit proxy endpoints (chart data, market info, accounts, orders)
-        if path_without_query.startswith('/api/upbit/candles/') or \
-           path_without_query.startswith('/api/upbit/ticker') or \
-           path_without_query.startswith('/api/upbit/market/') or \
-           path_without_query.startswith('/api/upbit/accounts') or \
-           path_without_query.startswith('/api/upbit/orders'):
-            return True, 0
-
-        # Exclude WebSocket (Socket.IO) endpoints (real-time communication)
-        if path_without_query.startswith('/socket.io/'):
-            return True, 0
-
-        # Exclude Surge monitoring endpoints (frequent polling and PUBLIC access)
-        if path_without_query.startswith('/api/surge'):
+        category = classify_path(path.split('?')[0])
+        if category is None:
             return True, 0
 
-        # Exclude Stats endpoints (public landing page statistics)
-        if path_without_query.startswith('/api/stats/'):
+        capacity, refill_rate = self._buckets[category]
+        try:
+            allowed, retry_after = self.store.consume(
+                identifier, f"{category}:{identifier}", capacity, refill_rate
+            )
+        except Exception as e:
+            # Fail open: an unreachable shared store must not take the API down
+            print(f"[RateLimit] Store error, allowing request: {e}")
             return True, 0
 
-        # Exclude Test endpoints (development and testing only)
-        if path_without_query.startswith('/api/test/'):
+        if allowed:
             return True, 0
 
-        # Check if IP is blocked
-        if identifier in self.blocked_ips:
-            block_until = self.blocked_ips[identifier]
-            if time.time() < block_until:
-                retry_after = int(block_until - time.time())
-                return False, retry_after
-            else:
-                # Unblock expired blocks
-                del self.blocked_ips[identifier]
-
-        # Get limit configuration
-        limit_config = self._get_limit_for_path(path)
-
-        # Get current tokens
-        tokens = self._get_tokens(identifier, limit_config)
-
-        if tokens >= 1:
-            self._consume_token(identifier)
-            return True, 0
-        else:
-            # Calculate retry after
-            retry_after = int(limit_config['window'] / limit_config['requests'])
-            # Log rate limit info for debugging
-            print(f"[RateLimit] BLOCKED: {identifier} - Path: {path} - Tokens: {tokens:.2f} - Limit: {limit_config}")
-            return False, retry_after
+        # Log rate limit info for debugging
+        print(f"[RateLimit] BLOCKED: {identifier} - Path: {path} - Limit: {self.limits[category]}")
+        return False, max(1, math.ceil(retry_after))
 
     def block_ip(self, ip, duration_seconds=3600):
         """
@@ -237,27 +199,11 @@ class RateLimiter:
             ip: IP address to block
             duration_seconds: Block duration (default: 1 hour)
         """
-        self.blocked_ips[ip] = time.time() + duration_seconds
+        self.store.block(ip, duration_seconds)
 
     def cleanup(self):
-        """Remove old entries to prevent memory leaks"""
-        now = time.time()
-
-        # Remove buckets not accessed in last hour
-        old_keys = [
-            key for key, bucket in self.buckets.items()
-            if now - bucket['last_update'] > 3600
-        ]
-        for key in old_keys:
-            del self.buckets[key]
-
-        # Remove expired IP blocks
-        expired_blocks = [
-            ip for ip, block_until in self.blocked_ips.items()
-            if now > block_until
-        ]
-        for ip in expired_blocks:
-            del self.blocked_ips[ip]
+        """Remove idle buckets and expired blocks now (stores also expire them lazily)"""
+        self.store.cleanup()
 
 
 class SecurityValidator:
@@ -351,10 +297,6 @@ def setup_security_middleware(app):
     Args:
         app: Flask application instance
     """
-    # Cleanup rate limiter every hour
-    import schedule
-    schedule.every().hour.do(_rate_limiter.cleanup)
-
     @app.before_request
     def security_checks():
         """Run security checks before processing request"""
@@ -368,10 +310,7 @@ def setup_security_middleware(app):
             return
 
         # 1. Rate limiting
-        # Debug logging to diagnose 429 errors
-        print(f"[RateLimit] Checking path: {request.path} for IP: {client_ip}")
         allowed, retry_after = _rate_limiter.is_allowed(client_ip, request.path)
-        print(f"[RateLimit] Result: allowed={allowed}, retry_after={retry_after}")
 
         if not allowed:
             # Log rate limit exceeded
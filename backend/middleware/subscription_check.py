@@ -114,15 +114,17 @@ def get_user_plan(user_id: str = None, email: str = None) -> Dict[str, Any]:
         }
     """
     try:
-        from backend.database import get_db_session
-        from backend.models.subscription_models import Subscription
-        from backend.models.auth_models import User
+        from backend.middleware.principal import get_principal
 
-        session = get_db_session()
-
-        # 사용자 조회
+        # 이메일로 조회 시 user_id 확인
         if email:
-            user = session.query(User).filter_by(email=email).first()
+            from backend.database import get_db_session, User
+
+            session = get_db_session()
+            try:
+                user = session.query(User.id).filter_by(email=email).first()
+            finally:
+                session.close()
             if not user:
                 logger.warning(f"[SubscriptionCheck] User not found: {email}")
                 return get_default_plan()
@@ -132,20 +134,15 @@ def get_user_plan(user_id: str = None, email: str = None) -> Dict[str, Any]:
             logger.warning("[SubscriptionCheck] No user_id provided")
             return get_default_plan()
 
-        # 구독 조회
-        subscription = session.query(Subscription).filter_by(
-            user_id=user_id,
-            status='active'
-        ).first()
-
-        if not subscription:
-            logger.info(f"[SubscriptionCheck] No active subscription for user {user_id}, using FREE plan")
-            return get_plan_info('FREE')
+        # 구독 조회 (캐시된 principal: 활성 구독 플랜 포함)
+        principal = get_principal(user_id)
+        if not principal:
+            logger.warning(f"[SubscriptionCheck] User not found: {user_id}")
+            return get_default_plan()
 
-        plan_code = subscription.plan_code
-        logger.info(f"[SubscriptionCheck] User {user_id} has plan: {plan_code}")
+        logger.debug(f"[SubscriptionCheck] User {user_id} has plan: {principal.plan}")
 
-        return get_plan_info(plan_code)
+        return principal.plan_info
 
     except Exception as e:
         logger.error(f"[SubscriptionCheck] Error getting user plan: {e}")
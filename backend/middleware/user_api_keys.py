@@ -9,8 +9,9 @@ from functools import wraps
 import jwt
 import os
 
-from backend.database import get_db_session, User
-from backend.common import UpbitAPI
+from backend.common import get_upbit_client_pool, key_fingerprint
+from backend.middleware.principal import get_principal
+from backend.utils.crypto import decrypt_api_credentials
 
 
 def get_user_from_token():
@@ -42,6 +43,9 @@ def get_user_upbit_api(user_id=None):
     """
     Get UpbitAPI instance with user-specific API keys from database.
 
+    Clients are pooled per user (keep-alive session, keys decrypted once) and
+    rebuilt when the stored keys change.
+
     Args:
         user_id (int, optional): User ID. If None, extracts from JWT token.
 
@@ -55,28 +59,31 @@ def get_user_upbit_api(user_id=None):
         print("[UserAPIKeys] No user_id provided or found in token")
         return None
 
-    db = get_db_session()
     try:
-        # Query user's API keys from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Cached principal (no query when this request or a recent one loaded it)
+        user = get_principal(user_id)
 
         if not user:
             print(f"[UserAPIKeys] User {user_id} not found")
             return None
 
-        if not user.upbit_access_key or not user.upbit_secret_key:
+        if not user.has_upbit_keys:
             print(f"[UserAPIKeys] User {user_id} has no Upbit API keys")
             return None
 
-        # Create UpbitAPI instance with user's keys
-        print(f"[UserAPIKeys] Creating UpbitAPI for user {user_id} ({user.email})")
-        return UpbitAPI(user.upbit_access_key, user.upbit_secret_key)
+        # Plain keys on the user row take precedence over the encrypted key store
+        if user.has_plain_upbit_keys:
+            stored = (user.upbit_access_key, user.upbit_secret_key)
+            load_credentials = lambda: stored  # noqa: E731
+        else:
+            stored = (user.upbit_access_key_encrypted, user.upbit_secret_key_encrypted)
+            load_credentials = lambda: decrypt_api_credentials(*stored)  # noqa: E731
+
+        return get_upbit_client_pool().get(user.id, key_fingerprint(*stored), load_credentials)
 
     except Exception as e:
         print(f"[UserAPIKeys] Error getting user API keys: {e}")
         return None
-    finally:
-        db.close()
 
 
 def require_upbit_keys(f):
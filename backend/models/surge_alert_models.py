@@ -245,6 +245,13 @@ class SurgeAlert(Base):
         Index('idx_surge_alerts_market', 'market'),
         Index('idx_surge_alerts_sent_at', 'sent_at'),
         Index('idx_surge_alerts_auto_traded', 'auto_traded'),
+        # Keyset pagination of surge history (sent_at, id) per filter
+        Index('idx_surge_alerts_sent_at_id', 'sent_at', 'id'),
+        Index('idx_surge_alerts_user_status_sent_at', 'user_id', 'status', 'sent_at'),
+        Index('idx_surge_alerts_market_sent_at', 'market', 'sent_at', 'id'),
+        Index('idx_surge_alerts_status_sent_at', 'status', 'sent_at', 'id'),
+        Index('idx_surge_alerts_auto_traded_sent_at', 'sent_at', 'id',
+              postgresql_where=(auto_traded == True), sqlite_where=(auto_traded == True)),  # noqa: E712
         {'extend_existing': True}
     )
 
@@ -303,5 +303,51 @@ def update_user_plan(current_user, user_id):
         }), 500
 
 
+@admin_bp.route('/cache/stats', methods=['GET'])
+@admin_required
+def get_cache_statistics(current_user):
+    """In-process cache hit/miss/eviction counters"""
+    try:
+        from backend.common.cache import get_cache_stats
+
+        return jsonify({
+            "success": True,
+            "caches": get_cache_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@admin_bp.route('/websocket/stats', methods=['GET'])
+@admin_required
+def get_websocket_statistics(current_user):
+    """Real-time price feed and Socket.IO fan-out counters"""
+    try:
+        from backend.services.websocket_service import get_websocket_service
+        from backend.services.ticker_hub import get_ticker_hub
+
+        ws = get_websocket_service()
+
+        return jsonify({
+            "success": True,
+            "feed_mode": ws.feed_mode,
+            "stream": ws.ticker_stream.get_stats() if ws.ticker_stream else None,
+            "ticker_hub": get_ticker_hub().get_stats(),
+            "broadcaster": ws.price_broadcaster.get_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 # NOTE: /users endpoint is handled by users_admin.py to avoid route conflict
 # This duplicate route has been removed
@@ -7,7 +7,7 @@ from flask import Blueprint, request, jsonify
 from backend.database.connection import get_db_session
 from backend.models.user_api_key import UpbitAPIKey
 from backend.utils.crypto import encrypt_api_credentials, decrypt_api_credentials
-from backend.common import UpbitAPI
+from backend.common import UpbitAPI, get_upbit_client_pool
 from datetime import datetime
 import logging
 
@@ -154,6 +154,7 @@ def register_api_keys():
                 existing_key.mark_verified()
 
             session.commit()
+            get_upbit_client_pool().invalidate(int(user_id))
 
             logger.info(f"[APIKeys] Updated API keys for user {user_id}")
 
@@ -180,6 +181,7 @@ def register_api_keys():
 
             session.add(new_key)
             session.commit()
+            get_upbit_client_pool().invalidate(int(user_id))
 
             logger.info(f"[APIKeys] Registered new API keys for user {user_id}")
 
@@ -305,6 +307,7 @@ def delete_api_keys():
         ).delete()
 
         session.commit()
+        get_upbit_client_pool().invalidate(int(user_id))
 
         if deleted_count > 0:
             logger.info(f"[APIKeys] Deleted API keys for user {user_id}")
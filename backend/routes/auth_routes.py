@@ -12,6 +12,7 @@ import secrets
 import logging
 import traceback
 
+from backend.common import get_upbit_client_pool
 from backend.database.connection import get_db_session
 from backend.database.models import User, Session as UserSession, EmailVerification, PasswordReset, UserAPIKey
 from backend.services.auth_service import auth_service
@@ -589,6 +590,9 @@ def update_profile():
             user.updated_at = datetime.utcnow()
             session.commit()
 
+            if 'upbit_access_key' in data or 'upbit_secret_key' in data:
+                get_upbit_client_pool().invalidate(user.id)
+
             return jsonify({
                 'success': True,
                 'message': 'Profile updated successfully',
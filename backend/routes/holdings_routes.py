@@ -10,7 +10,6 @@ IMPORTANT: All routes use user-specific Upbit API keys from database.
 """
 
 from flask import Blueprint, jsonify, request, g, current_app
-import requests
 import datetime
 from datetime import timezone
 import logging
@@ -20,7 +19,12 @@ from backend.middleware.user_api_keys import get_user_upbit_api, get_user_from_t
 from backend.middleware.auth_middleware import require_auth
 from backend.middleware.subscription_check import check_feature_access, get_user_plan
 from backend.database.connection import get_db_session
+from backend.common.cache import SimpleCache
 from backend.services.surge_predictor import SurgePredictor
+from backend.services.ticker_hub import get_ticker_hub
+from backend.services.holdings_valuation import value_accounts
+from backend.services.cost_basis_ledger import get_cost_basis_ledger
+from backend.utils.pagination import encode_cursor, decode_cursor
 from sqlalchemy import text
 
 # Create Blueprint
@@ -33,21 +37,15 @@ logger = logging.getLogger(__name__)
 UPBIT_BASE_URL = 'https://api.upbit.com'
 
 # User-specific holdings cache (short TTL for real-time updates)
-_holdings_cache = {}  # {user_id: {'data': ..., 'timestamp': ...}}
 HOLDINGS_CACHE_TTL = 5  # 5 seconds cache
+_holdings_cache = SimpleCache(default_ttl=HOLDINGS_CACHE_TTL, max_size=10000, name='holdings')
 
 
 def cleanup_holdings_cache():
     """Remove expired cache entries (called periodically)"""
-    now = time.time()
-    expired_users = [
-        user_id for user_id, entry in _holdings_cache.items()
-        if now - entry['timestamp'] > 60  # Remove entries older than 60 seconds
-    ]
-    for user_id in expired_users:
-        del _holdings_cache[user_id]
-    if expired_users:
-        logger.info(f"[Holdings] Cache cleanup: removed {len(expired_users)} expired entries")
+    removed = _holdings_cache.sweep()
+    if removed:
+        logger.info(f"[Holdings] Cache cleanup: removed {removed} expired entries")
 
 
 def update_surge_alert_prices(alert_id, actual_entry_price, user_id):
@@ -147,17 +145,14 @@ def get_holdings():
         user_id = g.user_id
 
         # Check cache first
-        cache_entry = _holdings_cache.get(user_id)
-        if cache_entry:
-            age = time.time() - cache_entry['timestamp']
-            if age < HOLDINGS_CACHE_TTL:
-                logger.info(f"[Holdings] User {user_id}: Cache hit (age: {age:.2f}s)")
-                return jsonify(cache_entry['data'])
+        cached_data = _holdings_cache.get(user_id)
+        if cached_data is not None:
+            logger.info(f"[Holdings] User {user_id}: Cache hit")
+            return jsonify(cached_data)
 
         print(f"[Holdings] User {user_id}: Request received (cache miss)")
 
         # Get user-specific Upbit API instance
-        api_start = time.time()
         user_upbit_api = get_user_upbit_api()
 
         if not user_upbit_api:
@@ -167,185 +162,15 @@ def get_holdings():
                 "error_code": "NO_API_KEYS"
             }), 400
 
-        # Get accounts from user's Upbit API
-        accounts = user_upbit_api.get_accounts()
-        api_time = time.time() - api_start
-        logger.info(f"[Holdings] User {user_id}: Accounts fetch took {api_time:.3f}s")
-
-        if not accounts:
-            return jsonify({
-                "success": True,
-                "krw": 0,
-                "coins": [],
-                "summary": {
-                    "total_value_krw": 0,
-                    "total_invested_krw": 0,
-                    "total_profit_loss_krw": 0,
-                    "total_profit_rate": 0,
-                    "coin_count": 0
-                }
-            })
-
-        # Process holdings data
-        krw_balance = 0
-        coins = []
-        total_value_krw = 0
-        total_invested_krw = 0
-
-        # First pass: collect all markets and coin data
-        coin_data = []
-        markets = []
-
-        for account in accounts:
-            currency = account.get('currency', '')
-            balance = float(account.get('balance', 0))
-            locked = float(account.get('locked', 0))
-            avg_buy_price = float(account.get('avg_buy_price', 0))
-
-            if currency == 'KRW':
-                krw_balance = balance
-                total_value_krw += balance
-                continue
-
-            if balance > 0 or locked > 0:
-                market = f'KRW-{currency}'
-                markets.append(market)
-                coin_data.append({
-                    'currency': currency,
-                    'balance': balance,
-                    'locked': locked,
-                    'avg_buy_price': avg_buy_price,
-                    'market': market
-                })
-
-        # Batch fetch all prices at once (prevents rate limiting)
-        price_map = {}
-        if markets:
-            # Filter out known delisted coins to avoid 404 errors
-            DELISTED_COINS = {'KRW-ETHW', 'KRW-ETHF', 'KRW-LUNA', 'KRW-LUNC'}
-            markets = [m for m in markets if m not in DELISTED_COINS]
-
-            if not markets:
-                logger.info(f"[Holdings] User {user_id}: All markets are delisted, skipping price fetch")
-            else:
-                price_start = time.time()
-                try:
-                    # Upbit allows fetching multiple tickers at once
-                    markets_param = ','.join(markets)
-                    logger.info(f"[Holdings] User {user_id}: Fetching prices for {len(markets)} markets")
-                    response = requests.get(
-                        f'https://api.upbit.com/v1/ticker',
-                        params={'markets': markets_param},
-                        timeout=5
-                    )
-                    price_time = time.time() - price_start
-                    logger.info(f"[Holdings] User {user_id}: Price fetch took {price_time:.3f}s (status: {response.status_code})")
-                    if response.status_code == 200:
-                        ticker_data = response.json()
-                        logger.info(f"[Holdings] Received {len(ticker_data)} tickers")
-                        for ticker in ticker_data:
-                            price_map[ticker['market']] = ticker['trade_price']
-                    elif response.status_code == 404:
-                        # Batch request failed, use parallel requests
-                        logger.warning(f"[Holdings] Batch fetch failed (404), trying parallel requests")
-                        from concurrent.futures import ThreadPoolExecutor, as_completed
-
-                        def fetch_single_price(market):
-                            try:
-                                resp = requests.get(
-                                    f'https://api.upbit.com/v1/ticker',
-                                    params={'markets': market},
-                                    timeout=3
-                                )
-                                if resp.status_code == 200:
-                                    data = resp.json()
-                                    if data and len(data) > 0:
-                                        return market, data[0]['trade_price']
-                                else:
-                                    logger.warning(f"[Holdings] Market {market} returned {resp.status_code} (likely delisted)")
-                                    return market, None
-                            except Exception as e:
-                                logger.warning(f"[Holdings] Failed to fetch {market}: {e}")
-                                return market, None
-
-                        # Parallel fetch with max 10 workers (Upbit rate limit)
-                        with ThreadPoolExecutor(max_workers=10) as executor:
-                            futures = {executor.submit(fetch_single_price, market): market for market in markets}
-                            for future in as_completed(futures):
-                                market, price = future.result()
-                                if price is not None:
-                                    price_map[market] = price
-                    else:
-                        logger.error(f"[Holdings] Failed to fetch prices: {response.text}")
-                except Exception as e:
-                    logger.error(f"[Holdings] Error fetching batch prices: {e}")
-                    import traceback
-                    traceback.print_exc()
-
-        # Second pass: calculate values using batch prices
-        for coin_info in coin_data:
-            currency = coin_info['currency']
-            market = coin_info['market']
-            balance = coin_info['balance']
-            locked = coin_info['locked']
-            avg_buy_price = coin_info['avg_buy_price']
-
-            # Get current price from batch fetch (or fallback to avg_buy_price)
-            current_price = price_map.get(market, avg_buy_price)
-
-            # Handle None values
-            if current_price is None or current_price == 0:
-                current_price = avg_buy_price if avg_buy_price else 0
-            if avg_buy_price is None:
-                avg_buy_price = 0
-
-            total_balance = balance + locked
-            current_value = total_balance * current_price
-            invested_value = total_balance * avg_buy_price
-            profit_loss = current_value - invested_value
-            profit_rate = (profit_loss / invested_value * 100) if invested_value > 0 else 0
-
-            coins.append({
-                'coin': currency,
-                'name': currency,
-                'balance': total_balance,
-                'avg_price': avg_buy_price,
-                'current_price': current_price,
-                'total_value': current_value,
-                'profit_loss': profit_loss,
-                'profit_rate': profit_rate,
-                'market': market
-            })
-
-            total_value_krw += current_value
-            total_invested_krw += invested_value
-
-        total_profit_loss_krw = total_value_krw - total_invested_krw - krw_balance
-        total_profit_rate = (total_profit_loss_krw / total_invested_krw * 100) if total_invested_krw > 0 else 0
-
-        # Prepare response
-        response_data = {
-            "success": True,
-            "krw": krw_balance,
-            "coins": coins,
-            "summary": {
-                "total_value_krw": total_value_krw,
-                "total_invested_krw": total_invested_krw,
-                "total_profit_loss_krw": total_profit_loss_krw,
-                "total_profit_rate": total_profit_rate,
-                "coin_count": len(coins)
-            }
-        }
-
-        # Cache the response (5 second TTL)
-        _holdings_cache[user_id] = {
-            'data': response_data,
-            'timestamp': time.time()
-        }
+        # Single-flight: concurrent dashboard requests share one Upbit round-trip
+        response_data = _holdings_cache.get_or_load(
+            user_id, lambda: _load_holdings(user_id, user_upbit_api)
+        )
 
         # Log total time
         total_time = time.time() - start_time
-        print(f"[Holdings] User {user_id}: {len(coins)} coins, ₩{total_value_krw:,.0f} (total: {total_time:.3f}s)")
+        print(f"[Holdings] User {user_id}: {response_data['summary']['coin_count']} coins, "
+              f"₩{response_data['summary']['total_value_krw']:,.0f} (total: {total_time:.3f}s)")
 
         return jsonify(response_data)
 
@@ -354,26 +179,45 @@ def get_holdings():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def _load_holdings(user_id, user_upbit_api):
+    """
+    Build the /api/holdings response from the user's Upbit accounts.
+
+    One get_accounts() call; prices come from the shared ticker snapshot and
+    average prices from the user's cost basis ledger (Upbit's avg_buy_price
+    where the ledger does not cover the holding).
+
+    Args:
+        user_id: User ID
+        user_upbit_api: User's UpbitAPI instance
+
+    Returns:
+        dict: Holdings response data
+    """
+    # Get accounts from user's Upbit API
+    api_start = time.time()
+    accounts = user_upbit_api.get_accounts()
+    api_time = time.time() - api_start
+    logger.info(f"[Holdings] User {user_id}: Accounts fetch took {api_time:.3f}s")
+
+    return value_accounts(accounts, cost_basis=get_cost_basis_ledger().provider(user_id))
+
+
 @holdings_bp.route('/api/trading/current-price/<market>')
 def get_current_price(market):
     """Get current price for specific market (PUBLIC - no auth needed)"""
     try:
         print(f"[Price] Request: {market}")
-        url = f"{UPBIT_BASE_URL}/v1/ticker"
-        params = {"markets": market}
-        response = requests.get(url, params=params, timeout=5)
-
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0:
-                ticker = data[0]
-                return jsonify({
-                    "success": True,
-                    "price": ticker.get('trade_price', 0),
-                    "change_price": ticker.get('change_price', 0),
-                    "change_rate": ticker.get('change_rate', 0),
-                    "market": market
-                })
+        ticker = get_ticker_hub().get_ticker(market)
+
+        if ticker:
+            return jsonify({
+                "success": True,
+                "price": ticker.get('trade_price', 0),
+                "change_price": ticker.get('change_price', 0),
+                "change_rate": ticker.get('change_rate', 0),
+                "market": market
+            })
 
         return jsonify({"success": False, "error": "No data available"}), 404
 
@@ -442,21 +286,28 @@ def get_orders():
         market: Filter by market (e.g., KRW-BTC)
         state: Order state (default: done)
         limit: Max results (default: 100)
+        cursor: next_cursor of the previous page (keyset on executed_at, uuid)
         use_api: Force API query (default: false)
         order_by: asc or desc (default: desc)
     """
     from backend.database import get_db_session, Order
-    from sqlalchemy import desc, asc
+    from sqlalchemy import desc, asc, and_, or_
 
     market = request.args.get('market', None)
     state = request.args.get('state', 'done')
     limit = request.args.get('limit', 100, type=int)
+    cursor = request.args.get('cursor')
     use_api = request.args.get('use_api', 'false').lower() == 'true'
     order_by = request.args.get('order_by', 'desc')
 
     # Get user_id from Flask g object (set by @require_auth decorator)
     user_id = g.user_id
 
+    try:
+        cursor_at, cursor_uuid = decode_cursor(cursor) if cursor else (None, None)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
     try:
         print(f"[Orders] User {user_id}: market={market}, limit={limit}")
 
@@ -473,15 +324,30 @@ def get_orders():
                 if market:
                     query = query.filter(Order.market == market)
 
-                if order_by == 'asc':
-                    query = query.order_by(asc(Order.executed_at))
-                else:
-                    query = query.order_by(desc(Order.executed_at))
-
-                query = query.limit(limit)
-                orders_db = query.all()
-
-                if orders_db:
+                # Keyset pagination on (executed_at, uuid); unexecuted rows come last
+                ascending = order_by == 'asc'
+                if cursor:
+                    later_uuid = Order.uuid > cursor_uuid if ascending else Order.uuid < cursor_uuid
+                    if cursor_at is None:
+                        query = query.filter(Order.executed_at.is_(None), later_uuid)
+                    else:
+                        later_at = Order.executed_at > cursor_at if ascending else Order.executed_at < cursor_at
+                        query = query.filter(or_(
+                            later_at,
+                            and_(Order.executed_at == cursor_at, later_uuid),
+                            Order.executed_at.is_(None)
+                        ))
+
+                direction = asc if ascending else desc
+                query = query.order_by(direction(Order.executed_at).nulls_last(), direction(Order.uuid))
+
+                # One extra row tells whether another page exists
+                orders_db = query.limit(limit + 1).all()
+                has_more = len(orders_db) > limit
+                orders_db = orders_db[:limit]
+
+                # A cursor past the last page is an empty page, not a reason to ask the API
+                if orders_db or cursor:
                     processed_orders = []
                     for order in orders_db:
                         processed_orders.append({
@@ -504,11 +370,17 @@ def get_orders():
 
                     print(f"[Orders] User {user_id}: DB returned {len(processed_orders)} orders")
 
+                    next_cursor = None
+                    if has_more:
+                        next_cursor = encode_cursor(orders_db[-1].executed_at, orders_db[-1].uuid)
+
                     return jsonify({
                         "success": True,
                         "orders": processed_orders,
                         "source": "database",
-                        "count": len(processed_orders)
+                        "count": len(processed_orders),
+                        "has_more": has_more,
+                        "next_cursor": next_cursor
                     })
 
             except Exception as db_error:
@@ -2,14 +2,162 @@
 Surge Prediction History API Routes
 급등예측 이력 관리 API 엔드포인트
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import text, inspect
 from backend.database.connection import get_db_session
 from backend.middleware.auth import admin_required
+from backend.utils.pagination import encode_cursor, decode_cursor
+from backend.utils.streaming_export import (
+    EXPORT_FORMATS, PYARROW_AVAILABLE, iter_query_batches,
+    csv_chunks, ndjson_chunks, parquet_chunks, gzip_chunks
+)
 
 surge_history_bp = Blueprint('surge_history', __name__, url_prefix='/api/admin/surge-history')
 
+# Export columns: (column, CSV header, type)
+EXPORT_COLUMNS = [
+    ('id', 'ID', 'int'),
+    ('user_id', 'User ID', 'int'),
+    ('market', 'Market', 'str'),
+    ('coin', 'Coin', 'str'),
+    ('confidence', 'Confidence', 'float'),
+    ('signal_type', 'Signal Type', 'str'),
+    ('current_price', 'Current Price', 'float'),
+    ('target_price', 'Target Price', 'float'),
+    ('expected_return', 'Expected Return', 'float'),
+    ('telegram_sent', 'Telegram Sent', 'bool'),
+    ('sent_at', 'Sent At', 'datetime'),
+    ('entry_price', 'Entry Price', 'float'),
+    ('exit_price', 'Exit Price', 'float'),
+    ('stop_loss_price', 'Stop Loss Price', 'float'),
+    ('auto_traded', 'Auto Traded', 'bool'),
+    ('trade_amount', 'Trade Amount', 'float'),
+    ('order_id', 'Order ID', 'str'),
+    ('status', 'Status', 'str'),
+    ('profit_loss', 'Profit Loss', 'float'),
+    ('profit_loss_percent', 'Profit Loss %', 'float'),
+    ('executed_at', 'Executed At', 'datetime'),
+    ('closed_at', 'Closed At', 'datetime'),
+]
+
+
+def _build_filters(summary=False):
+    """
+    목록/내보내기 공통 필터 (market, signal_type, auto_traded, status, start_date, end_date)
+
+    Args:
+        summary: Build the clause for surge_alert_summary (dates match its day column)
+
+    Returns:
+        (where_sql, params) - where_sql is empty or starts with " WHERE "
+
+    Raises:
+        ValueError: Invalid date format
+    """
+    market = request.args.get('market')
+    signal_type = request.args.get('signal_type')
+    auto_traded = request.args.get('auto_traded')
+    status = request.args.get('status')
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+
+    where_clauses = []
+    params = {}
+
+    if market:
+        where_clauses.append("market = :market")
+        params['market'] = market
+
+    if signal_type:
+        where_clauses.append("signal_type = :signal_type")
+        params['signal_type'] = signal_type
+
+    if auto_traded is not None:
+        where_clauses.append("auto_traded = :auto_traded")
+        params['auto_traded'] = (auto_traded.lower() == 'true')
+
+    if status:
+        where_clauses.append("status = :status")
+        params['status'] = status
+
+    if start_date:
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        if summary:
+            where_clauses.append("day >= :start_date")
+            params['start_date'] = start.date()
+        else:
+            where_clauses.append("sent_at >= :start_date")
+            params['start_date'] = start
+
+    if end_date:
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if summary:
+            where_clauses.append("day <= :end_date")
+            params['end_date'] = end.date()
+        else:
+            where_clauses.append("sent_at <= :end_date")
+            params['end_date'] = end.replace(hour=23, minute=59, second=59)
+
+    where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    return where_sql, params
+
+
+# surge_alert_summary (and the triggers maintaining it) come from the
+# add_history_keyset_indexes migration; checked once per process
+_summary_available = None
+
+
+def _has_summary(session):
+    global _summary_available
+    if _summary_available is None:
+        _summary_available = inspect(session.get_bind()).has_table('surge_alert_summary')
+    return _summary_available
+
+
+def _load_stats(session, where_sql, params):
+    """
+    Totals and stats for the current filters
+
+    Read from surge_alert_summary (a few rows per day and market) when the
+    migration has been applied; otherwise aggregated from surge_alerts.
+    NOTE: exit_price comparison (not profit_loss) counts breakeven as a loss
+    """
+    if _has_summary(session):
+        summary_where, summary_params = _build_filters(summary=True)
+        row = session.execute(text(f"""
+            SELECT
+                SUM(alert_count), SUM(auto_traded_count), SUM(confidence_sum),
+                SUM(profit_loss_sum), SUM(profitable_count), SUM(losing_count)
+            FROM surge_alert_summary
+            {summary_where}
+        """), summary_params).fetchone()
+        total = int(row[0] or 0)
+        avg_confidence = float(row[2] or 0) / total if total else 0
+    else:
+        row = session.execute(text(f"""
+            SELECT
+                COUNT(*) as total_alerts,
+                SUM(CASE WHEN auto_traded = true THEN 1 ELSE 0 END) as auto_traded_count,
+                AVG(confidence) as avg_confidence,
+                SUM(COALESCE(profit_loss, 0)) as total_profit_loss,
+                SUM(CASE WHEN exit_price IS NOT NULL AND exit_price > entry_price THEN 1 ELSE 0 END) as profitable_trades,
+                SUM(CASE WHEN exit_price IS NOT NULL AND exit_price <= entry_price THEN 1 ELSE 0 END) as losing_trades
+            FROM surge_alerts
+            {where_sql}
+        """), params).fetchone()
+        total = int(row[0] or 0)
+        avg_confidence = float(row[2] or 0)
+
+    return {
+        'total_alerts': total,
+        'auto_traded_count': int(row[1] or 0),
+        'avg_confidence': round(avg_confidence, 4),
+        'total_profit_loss': int(row[3] or 0),
+        'profitable_trades': int(row[4] or 0),
+        'losing_trades': int(row[5] or 0)
+    }
+
 
 @surge_history_bp.route('', methods=['GET'])
 @admin_required
@@ -20,7 +168,8 @@ def get_surge_history(current_user):
     - 일반 사용자: 본인 데이터만 조회 가능
 
     Query Parameters:
-    - page: 페이지 번호 (default: 1)
+    - cursor: 이전 응답의 next_cursor (sent_at 정렬 시 keyset 페이지네이션)
+    - page: 페이지 번호 (default: 1, cursor 없이 사용 시 OFFSET 방식)
     - per_page: 페이지당 항목 수 (default: 50, max: 500)
     - market: 마켓 필터 (예: KRW-BTC)
     - signal_type: 신호 유형 필터 (예: surge)
@@ -39,7 +188,9 @@ def get_surge_history(current_user):
                 "page": 1,
                 "per_page": 50,
                 "total": 100,
-                "total_pages": 2
+                "total_pages": 2,
+                "has_more": true,
+                "next_cursor": "..." (sent_at 정렬만, 마지막 페이지는 null)
             },
             "stats": {
                 "total_alerts": 100,
@@ -53,14 +204,9 @@ def get_surge_history(current_user):
     """
     try:
         # Parse query parameters
+        cursor = request.args.get('cursor')
         page = max(1, int(request.args.get('page', 1)))
         per_page = min(500, max(1, int(request.args.get('per_page', 50))))
-        market = request.args.get('market')
-        signal_type = request.args.get('signal_type')
-        auto_traded = request.args.get('auto_traded')
-        status = request.args.get('status')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
         sort = request.args.get('sort', 'sent_at')
         order = request.args.get('order', 'desc').upper()
 
@@ -71,46 +217,26 @@ def get_surge_history(current_user):
         if order not in ['ASC', 'DESC']:
             order = 'DESC'
 
-        with get_db_session() as session:
-            # Build WHERE clauses
-            where_clauses = []
-            params = {}
-
-            if market:
-                where_clauses.append("market = :market")
-                params['market'] = market
-
-            if signal_type:
-                where_clauses.append("signal_type = :signal_type")
-                params['signal_type'] = signal_type
+        # Keyset on (sent_at, id): first page, or any page reached through a cursor
+        keyset = sort == 'sent_at' and (cursor is not None or page == 1)
 
-            if auto_traded is not None:
-                where_clauses.append("auto_traded = :auto_traded")
-                params['auto_traded'] = (auto_traded.lower() == 'true')
-
-            if status:
-                where_clauses.append("status = :status")
-                params['status'] = status
-
-            if start_date:
-                where_clauses.append("sent_at >= :start_date")
-                params['start_date'] = datetime.strptime(start_date, '%Y-%m-%d')
-
-            if end_date:
-                where_clauses.append("sent_at <= :end_date")
-                params['end_date'] = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
-
-            where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-
-            # Count total records
-            count_query = f"SELECT COUNT(*) FROM surge_alerts{where_sql}"
-            total = session.execute(text(count_query), params).scalar()
+        with get_db_session() as session:
+            where_sql, params = _build_filters()
 
-            # Calculate pagination
+            stats = _load_stats(session, where_sql, params)
+            total = stats['total_alerts']
             total_pages = (total + per_page - 1) // per_page
-            offset = (page - 1) * per_page
 
-            # Get paginated data
+            page_sql = where_sql
+            if keyset and cursor:
+                cursor_sent_at, cursor_id = decode_cursor(cursor)
+                op = '<' if order == 'DESC' else '>'
+                condition = f"(sent_at {op} :cursor_sent_at OR (sent_at = :cursor_sent_at AND id {op} :cursor_id))"
+                page_sql = f"{where_sql} AND {condition}" if where_sql else f" WHERE {condition}"
+                params['cursor_sent_at'] = cursor_sent_at
+                params['cursor_id'] = int(cursor_id)
+
+            # One extra row tells whether another page exists
             data_query = f"""
                 SELECT
                     id, user_id, market, coin, confidence, signal_type,
@@ -123,49 +249,32 @@ def get_surge_history(current_user):
                     status, profit_loss, profit_loss_percent,
                     executed_at, closed_at
                 FROM surge_alerts
-                {where_sql}
-                ORDER BY {sort} {order}
-                LIMIT :limit OFFSET :offset
+                {page_sql}
+                ORDER BY {sort} {order}, id {order}
+                LIMIT :limit
             """
+            params['limit'] = per_page + 1
 
-            params['limit'] = per_page
-            params['offset'] = offset
+            if not keyset:
+                data_query += " OFFSET :offset"
+                params['offset'] = (page - 1) * per_page
 
-            result = session.execute(text(data_query), params)
-            alerts = []
+            rows = [dict(row._mapping) for row in session.execute(text(data_query), params)]
+            has_more = len(rows) > per_page
+            rows = rows[:per_page]
+
+            next_cursor = None
+            if has_more and sort == 'sent_at':
+                next_cursor = encode_cursor(rows[-1]['sent_at'], rows[-1]['id'])
 
-            for row in result:
-                alert = dict(row._mapping)
+            alerts = []
+            for alert in rows:
                 # Convert datetime to ISO string
                 for key in ['sent_at', 'action_timestamp', 'executed_at', 'closed_at']:
                     if alert.get(key):
                         alert[key] = alert[key].isoformat()
                 alerts.append(alert)
 
-            # Get statistics
-            # NOTE: Use exit_price comparison instead of profit_loss to include breakeven as loss
-            stats_query = f"""
-                SELECT
-                    COUNT(*) as total_alerts,
-                    SUM(CASE WHEN auto_traded = true THEN 1 ELSE 0 END) as auto_traded_count,
-                    AVG(confidence) as avg_confidence,
-                    SUM(COALESCE(profit_loss, 0)) as total_profit_loss,
-                    SUM(CASE WHEN exit_price IS NOT NULL AND exit_price > entry_price THEN 1 ELSE 0 END) as profitable_trades,
-                    SUM(CASE WHEN exit_price IS NOT NULL AND exit_price <= entry_price THEN 1 ELSE 0 END) as losing_trades
-                FROM surge_alerts
-                {where_sql}
-            """
-
-            stats_result = session.execute(text(stats_query), params).fetchone()
-            stats = {
-                'total_alerts': stats_result[0] or 0,
-                'auto_traded_count': stats_result[1] or 0,
-                'avg_confidence': round(float(stats_result[2] or 0), 4),
-                'total_profit_loss': int(stats_result[3] or 0),
-                'profitable_trades': stats_result[4] or 0,
-                'losing_trades': stats_result[5] or 0
-            }
-
             return jsonify({
                 'success': True,
                 'data': alerts,
@@ -173,7 +282,9 @@ def get_surge_history(current_user):
                     'page': page,
                     'per_page': per_page,
                     'total': total,
-                    'total_pages': total_pages
+                    'total_pages': total_pages,
+                    'has_more': has_more,
+                    'next_cursor': next_cursor
                 },
                 'stats': stats
             }), 200
@@ -275,110 +386,72 @@ def get_available_markets(current_user):
 @admin_required
 def export_surge_history(current_user):
     """
-    급등예측 이력 CSV 내보내기
+    급등예측 이력 내보내기 (스트리밍)
 
-    Query Parameters: Same as get_surge_history
+    Rows are read through a server-side cursor and written batch by batch,
+    so memory stays flat regardless of history size.
+
+    Query Parameters: Same filters as get_surge_history, plus
+    - format: csv (default), ndjson, parquet (pyarrow from requirements.txt; 501 if not installed)
+    - compress: gzip (csv/ndjson only; parquet is always compressed)
 
     Returns:
-        200: CSV file
+        200: Streamed file
+        400: Invalid parameter or unsupported format
     """
     try:
-        # Same filters as get_surge_history
-        market = request.args.get('market')
-        signal_type = request.args.get('signal_type')
-        auto_traded = request.args.get('auto_traded')
-        status = request.args.get('status')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
-
-        with get_db_session() as session:
-            # Build WHERE clauses
-            where_clauses = []
-            params = {}
-
-            if market:
-                where_clauses.append("market = :market")
-                params['market'] = market
-
-            if signal_type:
-                where_clauses.append("signal_type = :signal_type")
-                params['signal_type'] = signal_type
-
-            if auto_traded is not None:
-                where_clauses.append("auto_traded = :auto_traded")
-                params['auto_traded'] = (auto_traded.lower() == 'true')
-
-            if status:
-                where_clauses.append("status = :status")
-                params['status'] = status
-
-            if start_date:
-                where_clauses.append("sent_at >= :start_date")
-                params['start_date'] = datetime.strptime(start_date, '%Y-%m-%d')
-
-            if end_date:
-                where_clauses.append("sent_at <= :end_date")
-                params['end_date'] = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
-
-            where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-
-            # Get all data (no pagination for export)
-            query = f"""
-                SELECT
-                    id, user_id, market, coin, confidence, signal_type,
-                    current_price, target_price, expected_return,
-                    telegram_sent, sent_at,
-                    entry_price, exit_price, stop_loss_price,
-                    auto_traded, trade_amount, order_id,
-                    status, profit_loss, profit_loss_percent,
-                    executed_at, closed_at
-                FROM surge_alerts
-                {where_sql}
-                ORDER BY sent_at DESC
-            """
+        export_format = request.args.get('format', 'csv').lower()
+        compress = request.args.get('compress', '').lower()
 
-            result = session.execute(text(query), params)
-
-            # Build CSV
-            import io
-            output = io.StringIO()
-            output.write('ID,User ID,Market,Coin,Confidence,Signal Type,Current Price,Target Price,Expected Return,Telegram Sent,Sent At,Entry Price,Exit Price,Stop Loss Price,Auto Traded,Trade Amount,Order ID,Status,Profit Loss,Profit Loss %,Executed At,Closed At\n')
-
-            for row in result:
-                row_dict = dict(row._mapping)
-                output.write(','.join([
-                    str(row_dict.get('id', '')),
-                    str(row_dict.get('user_id', '')),
-                    str(row_dict.get('market', '')),
-                    str(row_dict.get('coin', '')),
-                    str(row_dict.get('confidence', '')),
-                    str(row_dict.get('signal_type', '')),
-                    str(row_dict.get('current_price', '')),
-                    str(row_dict.get('target_price', '')),
-                    str(row_dict.get('expected_return', '')),
-                    str(row_dict.get('telegram_sent', '')),
-                    str(row_dict.get('sent_at', '')),
-                    str(row_dict.get('entry_price', '')),
-                    str(row_dict.get('exit_price', '')),
-                    str(row_dict.get('stop_loss_price', '')),
-                    str(row_dict.get('auto_traded', '')),
-                    str(row_dict.get('trade_amount', '')),
-                    str(row_dict.get('order_id', '')),
-                    str(row_dict.get('status', '')),
-                    str(row_dict.get('profit_loss', '')),
-                    str(row_dict.get('profit_loss_percent', '')),
-                    str(row_dict.get('executed_at', '')),
-                    str(row_dict.get('closed_at', ''))
-                ]) + '\n')
-
-            # Return CSV
-            from flask import make_response
-            output.seek(0)
-            response = make_response(output.getvalue())
-            response.headers['Content-Type'] = 'text/csv; charset=utf-8-sig'
-            response.headers['Content-Disposition'] = f'attachment; filename=surge_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-            return response
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported format: {export_format} (csv, ndjson, parquet)'
+            }), 400
+        if export_format == 'parquet' and not PYARROW_AVAILABLE:
+            return jsonify({
+                'success': False,
+                'error': 'Parquet export requires pyarrow on the server'
+            }), 501
+        if compress and (compress != 'gzip' or export_format == 'parquet'):
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported compression for {export_format}: {compress}'
+            }), 400
+
+        where_sql, params = _build_filters()
+
+        query = f"""
+            SELECT {', '.join(name for name, _, _ in EXPORT_COLUMNS)}
+            FROM surge_alerts
+            {where_sql}
+            ORDER BY sent_at DESC, id DESC
+        """
+
+        batches = iter_query_batches(query, params)
+        if export_format == 'csv':
+            body = csv_chunks(EXPORT_COLUMNS, batches)
+        elif export_format == 'ndjson':
+            body = ndjson_chunks(EXPORT_COLUMNS, batches)
+        else:
+            body = parquet_chunks(EXPORT_COLUMNS, batches)
+
+        content_type, extension = EXPORT_FORMATS[export_format]
+        filename = f'surge_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+        if compress:
+            body = gzip_chunks(body)
+            content_type = 'application/gzip'
+            filename += '.gz'
+
+        response = Response(stream_with_context(body), content_type=content_type)
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        return response
 
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid parameter: {str(e)}'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -7,9 +7,10 @@ NOTE: This service uses PUBLIC Upbit API (no authentication needed).
 Candle data and ticker information are publicly available.
 """
 from flask import Blueprint, jsonify
-from backend.common import UpbitAPI
+from backend.common import UpbitAPI, SimpleCache
 from backend.services.surge_predictor import SurgePredictor
 from backend.services.market_filter_service import MarketFilter
+from backend.services.market_scan_service import get_market_scanner
 from backend.services.signal_generation_service import signal_generator
 from backend.database.connection import get_db_session
 from sqlalchemy import text
@@ -19,12 +20,9 @@ from datetime import datetime, timedelta
 surge_bp = Blueprint('surge', __name__)
 
 # Cache for surge candidates (5 minutes TTL)
-_surge_cache = {
-    'data': None,
-    'timestamp': None,
-    'ttl': 300,  # 5 minutes
-    'is_fetching': False  # Lock to prevent concurrent fetches
-}
+SURGE_CACHE_TTL = 300  # 5 minutes
+SURGE_STALE_TTL = 3600  # Stale copy served while refreshing or rate limited
+_surge_cache = SimpleCache(default_ttl=SURGE_CACHE_TTL, max_size=8, name='surge_candidates')
 
 def check_enterprise_access():
     """
@@ -72,19 +70,24 @@ def check_enterprise_access():
 
 def get_cached_surge_data():
     """Get cached surge data if still valid"""
-    if _surge_cache['data'] and _surge_cache['timestamp']:
-        age = (datetime.now() - _surge_cache['timestamp']).total_seconds()
-        if age < _surge_cache['ttl']:
-            print(f"[Surge] Returning cached data (age: {age:.1f}s)")
-            return _surge_cache['data']
-    return None
+    data = _surge_cache.get('candidates')
+    if data:
+        print("[Surge] Returning cached data")
+    return data
+
+def get_stale_surge_data():
+    """Get last surge data and its age in seconds (may be past TTL)"""
+    entry = _surge_cache.get('candidates:stale')
+    if not entry:
+        return None, None
+    data, cached_at = entry
+    return data, (datetime.now() - cached_at).total_seconds()
 
 def set_surge_cache(data):
     """Set surge data cache"""
-    _surge_cache['data'] = data
-    _surge_cache['timestamp'] = datetime.now()
-    _surge_cache['is_fetching'] = False
-    print(f"[Surge] Cache updated at {_surge_cache['timestamp']}")
+    _surge_cache.set('candidates', data)
+    _surge_cache.set('candidates:stale', (data, datetime.now()), ttl=SURGE_STALE_TTL)
+    print(f"[Surge] Cache updated at {datetime.now()}")
 
 def calculate_backtest_stats(period_start=None, period_end=None, use_dynamic_period=True):
     """
@@ -399,110 +402,15 @@ def get_surge_candidates_legacy():
             cached_data['warning'] = 'LEGACY ENDPOINT - Use /surge-candidates instead'
             return jsonify(cached_data)
 
-        # Check if already fetching (prevent concurrent API calls)
-        if _surge_cache['is_fetching']:
-            print("[Surge] Already fetching, returning stale cache or wait message")
-            old_data = _surge_cache.get('data')
+        # Already refreshing: serve the stale copy instead of waiting
+        if _surge_cache.is_loading('candidates'):
+            old_data, _ = get_stale_surge_data()
             if old_data:
-                old_data['warning'] = 'Using stale cache while refreshing'
-                return jsonify(old_data)
-            else:
-                return jsonify({
-                    'success': False,
-                    'message': 'Analysis in progress, please try again in 10 seconds',
-                    'retry_after': 10
-                }), 202
-
-        # Set lock
-        _surge_cache['is_fetching'] = True
-        print("[Surge] Analyzing candidates (cache miss)...")
-
-        # Smart pre-filtering: Get volume surge candidates (1 API call + filtering)
-        # max_count=10 to stay well under Upbit rate limits (5초 소요)
-        monitored_markets = get_volume_surge_candidates(max_count=10)
-        print(f"[Surge] Analyzing {len(monitored_markets)} pre-filtered markets")
-
-        candidates = []
-
-        # Analyze all monitored coins
-        for market in monitored_markets:
-            try:
-                # Get candle data (30 days) - PUBLIC API
-                candle_data = upbit_api.get_candles_days(market=market, count=30)
-                if not candle_data or len(candle_data) < 20:
-                    continue
-
-                # Get current price
-                current_price = float(candle_data[0].get('trade_price', 0))
-                if current_price == 0:
-                    continue
-
-                # Analyze coin
-                analysis = predictor.analyze_coin(market, candle_data, current_price)
-
-                # Only include candidates with score >= 60
-                if analysis['score'] >= 60:
-                    # Calculate trading prices
-                    # Entry price = current price
-                    entry_price = int(current_price)
-
-                    # Target price = entry + expected return (typically 10-20% for high scores)
-                    expected_return = 15 if analysis['score'] >= 75 else 10  # Higher target for better scores
-                    target_price = int(entry_price * (1 + expected_return / 100))
-
-                    # Stop loss = entry - 5% (risk management)
-                    stop_loss_price = int(entry_price * 0.95)
-
-                    candidates.append({
-                        'market': market,
-                        'score': analysis['score'],
-                        'current_price': current_price,
-                        'entry_price': entry_price,
-                        'target_price': target_price,
-                        'stop_loss_price': stop_loss_price,
-                        'expected_return': expected_return,
-                        'signals': analysis['signals'],
-                        'recommendation': analysis['recommendation']
-                    })
-
-                # Rate limit (0.5s between requests to avoid 429 errors)
-                time.sleep(0.5)
-
-            except Exception as e:
-                print(f"[Surge] Error analyzing {market}: {e}")
-                continue
-
-        # Sort by score (highest first)
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-
-        print(f"[Surge] Found {len(candidates)} candidates")
-
-        # Auto-generate signals for high-confidence predictions (score >= 80)
-        high_confidence_candidates = [c for c in candidates if c['score'] >= 80]
-
-        signal_generation_result = None
-        if high_confidence_candidates:
-            print(f"[Surge] Generating signals for {len(high_confidence_candidates)} high-confidence predictions...")
-            signal_generation_result = signal_generator.batch_generate_from_candidates(high_confidence_candidates)
-            print(f"[Surge] Generated {signal_generation_result['generated']} signals, distributed to {signal_generation_result['distributed_total']} users")
-
-        # Calculate backtest statistics dynamically from database (auto-recalculation)
-        backtest_stats = calculate_backtest_stats()
-
-        # Prepare response data
-        response_data = {
-            'success': True,
-            'candidates': candidates,
-            'backtest_stats': backtest_stats,
-            'monitored_markets': len(monitored_markets),
-            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
-            'count': len(candidates),
-            'signals_generated': signal_generation_result['generated'] if signal_generation_result else 0,
-            'signals_distributed_to': signal_generation_result['distributed_total'] if signal_generation_result else 0
-        }
+                print("[Surge] Already fetching, returning stale cache")
+                return jsonify(dict(old_data, warning='Using stale cache while refreshing'))
 
-        # Cache the result
-        set_surge_cache(response_data)
+        # Single-flight: concurrent misses share one analysis run
+        response_data = _surge_cache.get_or_load('candidates', _analyze_surge_candidates_legacy)
 
         # Return results
         return jsonify(response_data)
@@ -511,17 +419,12 @@ def get_surge_candidates_legacy():
         error_msg = str(e)
         print(f"[Surge] Error: {error_msg}")
 
-        # Release lock
-        _surge_cache['is_fetching'] = False
-
         # If rate limit error and we have old cache, return it with warning
         if 'rate limit' in error_msg.lower() or '429' in error_msg:
-            old_cache = _surge_cache.get('data')
+            old_cache, cache_age = get_stale_surge_data()
             if old_cache:
                 print("[Surge] Rate limit hit, returning stale cache")
-                old_cache['warning'] = 'Using cached data due to rate limit'
-                old_cache['cache_age'] = (datetime.now() - _surge_cache['timestamp']).total_seconds()
-                return jsonify(old_cache)
+                return jsonify(dict(old_cache, warning='Using cached data due to rate limit', cache_age=cache_age))
 
         return jsonify({
             'success': False,
@@ -530,6 +433,87 @@ def get_surge_candidates_legacy():
         }), 500
 
 
+def _analyze_surge_candidates_legacy():
+    """
+    Run the legacy live surge analysis.
+
+    Returns:
+        dict: Response data for /surge-candidates-legacy
+    """
+    print("[Surge] Analyzing candidates (cache miss)...")
+
+    # Smart pre-filtering: Get volume surge candidates (1 API call + filtering)
+    # max_count=10 to stay well under Upbit rate limits (5초 소요)
+    monitored_markets = get_volume_surge_candidates(max_count=10)
+    print(f"[Surge] Analyzing {len(monitored_markets)} pre-filtered markets")
+
+    candidates = []
+
+    # Analyze all monitored coins (shared parallel scan)
+    scan_results = get_market_scanner().scan(monitored_markets, predictor, min_score=60)
+
+    for result in scan_results:
+        current_price = result['current_price']
+        analysis = result['analysis']
+
+        # Calculate trading prices
+        # Entry price = current price
+        entry_price = int(current_price)
+
+        # Target price = entry + expected return (typically 10-20% for high scores)
+        expected_return = 15 if analysis['score'] >= 75 else 10  # Higher target for better scores
+        target_price = int(entry_price * (1 + expected_return / 100))
+
+        # Stop loss = entry - 5% (risk management)
+        stop_loss_price = int(entry_price * 0.95)
+
+        candidates.append({
+            'market': result['market'],
+            'score': analysis['score'],
+            'current_price': current_price,
+            'entry_price': entry_price,
+            'target_price': target_price,
+            'stop_loss_price': stop_loss_price,
+            'expected_return': expected_return,
+            'signals': analysis['signals'],
+            'recommendation': analysis['recommendation']
+        })
+
+    # Sort by score (highest first)
+    candidates.sort(key=lambda x: x['score'], reverse=True)
+
+    print(f"[Surge] Found {len(candidates)} candidates")
+
+    # Auto-generate signals for high-confidence predictions (score >= 80)
+    high_confidence_candidates = [c for c in candidates if c['score'] >= 80]
+
+    signal_generation_result = None
+    if high_confidence_candidates:
+        print(f"[Surge] Generating signals for {len(high_confidence_candidates)} high-confidence predictions...")
+        signal_generation_result = signal_generator.batch_generate_from_candidates(high_confidence_candidates)
+        print(f"[Surge] Generated {signal_generation_result['generated']} signals, distributed to {signal_generation_result['distributed_total']} users")
+
+    # Calculate backtest statistics dynamically from database (auto-recalculation)
+    backtest_stats = calculate_backtest_stats()
+
+    # Prepare response data
+    response_data = {
+        'success': True,
+        'candidates': candidates,
+        'backtest_stats': backtest_stats,
+        'monitored_markets': len(monitored_markets),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'count': len(candidates),
+        'signals_generated': signal_generation_result['generated'] if signal_generation_result else 0,
+        'signals_distributed_to': signal_generation_result['distributed_total'] if signal_generation_result else 0
+    }
+
+    # Keep a stale copy for refresh/rate-limit fallbacks
+    set_surge_cache(response_data)
+
+    return response_data
+
+
 @surge_bp.route('/surge-analysis/<market>', methods=['GET'])
 def get_surge_analysis(market):
     """
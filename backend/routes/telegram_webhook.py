@@ -2,6 +2,9 @@
 """
 CoinPulse Telegram Webhook for Bank Transfer Notifications
 Automatically processes bank deposit notifications and activates subscriptions
+
+Other updates (bot commands etc.) are stored for the Telegram bot, which
+runs in the process holding the 'alerts' lease (see telegram_update_relay)
 """
 
 import os
@@ -17,6 +20,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from database.connection import get_db_session
 from backend.routes.payment_confirmation import PaymentConfirmation, PaymentConfirmStatus
 from backend.models.subscription_models import Subscription, SubscriptionPlan, SubscriptionStatus, BillingPeriod
+from backend.services.telegram_update_relay import store_update
 
 # Create Blueprint
 telegram_webhook_bp = Blueprint('telegram_webhook', __name__, url_prefix='/api/telegram')
@@ -260,12 +264,30 @@ def auto_match_and_approve(deposit_info):
         session.close()
 
 
+def relay_to_bot(update_data):
+    """
+    Store a non-deposit update for the Telegram bot
+
+    Telegram redelivers the update when it gets 503 (store unavailable)
+    """
+    try:
+        status = store_update(update_data)
+    except Exception as e:
+        print(f"[Telegram Webhook] Failed to store update for bot: {e}")
+        response = jsonify({'success': False, 'error': 'Update store unavailable'})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    return jsonify({'success': True, 'processed': False, 'relayed': status}), 200
+
+
 @telegram_webhook_bp.route('/webhook', methods=['POST'])
 def telegram_webhook():
     """
     Telegram bot webhook endpoint
 
-    Receives messages from Telegram bot and processes bank deposit notifications
+    Receives messages from Telegram bot and processes bank deposit notifications;
+    any other Telegram update is relayed to the bot
 
     Expected message format (forwarded from bank SMS):
     "[기업은행] 입금 \n169176889\n홍길동\n99,000원\n12/20 14:30"
@@ -285,19 +307,23 @@ def telegram_webhook():
 
         data = request.get_json(force=True)
 
-        if not data or 'message' not in data:
+        if not data or ('message' not in data and 'update_id' not in data):
             return jsonify({'success': False, 'error': 'Invalid webhook data'}), 400
 
-        message = data['message']
+        message = data.get('message') or {}
         chat_id = message.get('chat', {}).get('id')
         text = message.get('text', '')
 
+        # Parse bank SMS
+        deposit_info = parse_bank_sms(text) if text else None
+
+        if not deposit_info and 'update_id' in data:
+            # Bot commands, callbacks, chat: answered by the Telegram bot
+            return relay_to_bot(data)
+
         if not text:
             return jsonify({'success': True, 'processed': False, 'message': 'No text in message'}), 200
 
-        # Parse bank SMS
-        deposit_info = parse_bank_sms(text)
-
         if not deposit_info:
             # Not a valid bank deposit SMS
             send_telegram_message(
@@ -12,6 +12,8 @@ import jwt
 import os
 from functools import wraps
 
+from backend.services.candle_repository import get_candle_repository
+
 # Create Blueprint
 upbit_proxy_bp = Blueprint('upbit_proxy', __name__)
 
@@ -114,6 +116,17 @@ def get_candles(interval):
 
         logger.info(f"[UpbitProxy] Fetching {interval} candles for {market}, count={count}, unit={unit}")
 
+        # Serve from the local candle store first (fetches only the missing tail)
+        repository_interval = str(unit or 1) if interval == 'minutes' else \
+            {'days': 'day', 'weeks': 'week', 'months': 'month'}.get(interval)
+        if repository_interval is not None:
+            try:
+                candles = get_candle_repository().get_candles(market, repository_interval, count=count, to=to)
+                if candles:
+                    return jsonify(candles), 200
+            except Exception as e:
+                logger.warning(f"[UpbitProxy] Candle repository unavailable, proxying: {e}")
+
         # Make request to Upbit API
         response = requests.get(upbit_url, params=params, timeout=10)
 
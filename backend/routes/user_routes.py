@@ -368,7 +368,7 @@ def manage_api_keys():
     from backend.database.models import User
     from backend.models.user_api_key import UpbitAPIKey
     from backend.utils.crypto import encrypt_api_credentials, decrypt_api_credentials
-    from backend.common import UpbitAPI
+    from backend.common import UpbitAPI, get_upbit_client_pool
     from datetime import datetime
 
     session = get_db_session()
@@ -499,6 +499,7 @@ def manage_api_keys():
 
             session.add(new_key)
             session.commit()
+            get_upbit_client_pool().invalidate(user_id)
 
             return jsonify({
                 'success': True,
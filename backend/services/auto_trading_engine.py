@@ -15,6 +15,13 @@ import os
 import json
 from datetime import datetime
 
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 class AutoTradingEngine:
     """
@@ -287,14 +294,19 @@ class AutoTradingEngine:
             buy_signals = 0
             sell_signals = 0
 
-            for i in range(20, len(historical_data)):
-                current_price = float(historical_data[i]['trade_price'])
-                analysis = self.analyze_market_condition(coin_symbol, current_price, historical_data[i-20:i])
+            if NUMPY_AVAILABLE:
+                signals = self._backtest_signals(historical_data)
+                buy_signals = int(np.count_nonzero(signals == 1))
+                sell_signals = int(np.count_nonzero(signals == -1))
+            else:
+                for i in range(20, len(historical_data)):
+                    current_price = float(historical_data[i]['trade_price'])
+                    analysis = self.analyze_market_condition(coin_symbol, current_price, historical_data[i-20:i])
 
-                if analysis['signal'] == 'buy':
-                    buy_signals += 1
-                elif analysis['signal'] == 'sell':
-                    sell_signals += 1
+                    if analysis['signal'] == 'buy':
+                        buy_signals += 1
+                    elif analysis['signal'] == 'sell':
+                        sell_signals += 1
 
             return {
                 "status": "success",
@@ -307,3 +319,38 @@ class AutoTradingEngine:
 
         except Exception as e:
             return {"status": "error", "message": str(e)}
+
+    @staticmethod
+    def _backtest_signals(historical_data):
+        """
+        Vectorized analyze_market_condition() over every backtest step.
+
+        Step i uses the window historical_data[i-20:i] and price i, exactly
+        like the loop in backtest_policy(), but all windows are evaluated
+        at once from a single price array.
+
+        Returns:
+            np.ndarray: 1 (buy), -1 (sell) or 0 (hold) per step
+        """
+        prices = np.array([float(c['trade_price']) for c in historical_data])
+        windows = sliding_window_view(prices, 20)[:-1]
+        current = prices[20:]
+
+        sma_5 = windows[:, :5].mean(axis=1)
+        sma_20 = windows.mean(axis=1)
+        price_vs_sma5 = (current - sma_5) / sma_5
+        price_vs_sma20 = (current - sma_20) / sma_20
+
+        # Same "simple" RSI: average of gains / losses over the changes that occurred
+        change = windows[:, :-1] - windows[:, 1:]
+        is_gain = change > 0
+        gain_count = is_gain.sum(axis=1)
+        loss_count = change.shape[1] - gain_count
+        avg_gain = np.where(is_gain, change, 0.0).sum(axis=1) / np.maximum(gain_count, 1)
+        avg_loss = np.where(is_gain, 0.0, -change).sum(axis=1) / np.maximum(loss_count, 1)
+        rs = np.where(avg_loss > 0, avg_gain / np.where(avg_loss > 0, avg_loss, 1.0), 100)
+        rsi = 100 - (100 / (1 + rs))
+
+        buy = (price_vs_sma5 > 0.02) & (price_vs_sma20 > 0.01) & (rsi < 70)
+        sell = ~buy & ((price_vs_sma5 < -0.02) | (rsi > 80))
+        return np.select([buy, sell], [1, -1], 0)
@@ -0,0 +1,191 @@
+"""
+Background Jobs
+
+The schedulers and trading loops that must run exactly once across all
+processes. Each job is started by the LeaseSupervisor only while this
+process holds the job's lease, so they can be hosted by the dedicated
+worker (worker.py) or, with RUN_BACKGROUND_SERVICES=true, by web processes
+without duplicating trades or alerts.
+
+Jobs:
+- order_sync: multi-user order sync (ORDER_SYNC_ENABLED=true)
+- subscription_renewal: daily subscription renewal check
+- backup: daily database backup
+- auto_trading: SurgeAutoTradingWorker
+- position_monitor: automatic stop-loss/take-profit
+- alerts: Telegram bot, surge alert scheduler and signal scheduler; one
+  job because the schedulers send through the bot. The holder points the
+  bot's webhook at the web tier (WEBHOOK_BASE_URL) and receives the
+  updates the web processes store, through TelegramUpdateRelay
+"""
+
+import os
+import asyncio
+import threading
+import logging
+
+from backend.services.leader_lease import LeaseSupervisor
+
+logger = logging.getLogger(__name__)
+
+SURGE_ALERT_STOP_TIMEOUT = 60  # seconds to let a running surge check finish
+
+
+# ==================== Job start/stop ====================
+
+def _start_order_sync():
+    from backend.services.background_sync import BackgroundSyncScheduler
+
+    sync_interval = int(os.getenv('ORDER_SYNC_INTERVAL', 300))
+    scheduler = BackgroundSyncScheduler(sync_interval_seconds=sync_interval)
+    scheduler.start()
+    logger.info(f"Background order sync started for all users (every {sync_interval}s)")
+    return scheduler
+
+
+def _start_subscription_renewal():
+    from backend.services.subscription_scheduler import start_scheduler
+
+    scheduler = start_scheduler()
+    logger.info("Subscription renewal scheduler started (daily check at 00:00 KST)")
+    return scheduler
+
+
+def _start_backup():
+    from backend.services.backup_scheduler import start_backup_scheduler
+
+    scheduler = start_backup_scheduler()
+    logger.info(f"Database backup scheduler started (daily backup at {os.getenv('BACKUP_TIME', '02:00')})")
+    return scheduler
+
+
+def _start_auto_trading():
+    from backend.services.surge_auto_trading_worker import get_auto_trading_worker
+
+    # 5 minutes interval (300 seconds)
+    worker = get_auto_trading_worker(check_interval=300)
+    worker.start()
+    logger.info("Surge auto-trading worker started (5-minute check interval)")
+    return worker
+
+
+def _start_position_monitor():
+    from backend.services.position_monitor_service import get_position_monitor
+
+    # 10 seconds interval for real-time monitoring
+    monitor = get_position_monitor(check_interval=10)
+    monitor.start()
+    logger.info("Position monitor started (10-second check interval, auto stop-loss/take-profit)")
+    return monitor
+
+
+def _start_alerts():
+    handles = {}
+    try:
+        return _start_alert_services(handles)
+    except Exception:
+        # Don't leave a half-started bot running
+        _stop_alerts(handles)
+        raise
+
+
+def _start_alert_services(handles):
+    # Telegram alert bot (Optional - requires TELEGRAM_BOT_TOKEN)
+    telegram_bot = None
+    telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    if telegram_token:
+        from backend.services.telegram_bot import SurgeTelegramBot, TELEGRAM_AVAILABLE
+
+        if TELEGRAM_AVAILABLE:
+            from backend.services.telegram_update_worker import TelegramUpdateWorker
+            from backend.services.telegram_update_relay import TelegramUpdateRelay
+            from backend.services.surge_alert_scheduler import SurgeAlertScheduler
+
+            telegram_bot = SurgeTelegramBot(token=telegram_token)
+
+            # Only the lease holder sets the webhook; web processes store the
+            # updates and the relay hands them to this bot's loop
+            webhook_base_url = os.getenv('WEBHOOK_BASE_URL', 'https://coinpulse.sinsi.ai')
+            webhook_url = f"{webhook_base_url}/api/telegram/webhook"
+
+            update_worker = TelegramUpdateWorker(telegram_bot)
+            update_worker.start(setup=telegram_bot.start_webhook(webhook_url))
+            handles['telegram_update_worker'] = update_worker
+
+            update_relay = TelegramUpdateRelay(update_worker)
+            update_relay.start()
+            handles['telegram_update_relay'] = update_relay
+
+            surge_alert_scheduler = SurgeAlertScheduler(telegram_bot=telegram_bot, check_interval=300)
+
+            def run_surge_alerts():
+                """Run surge alert scheduler"""
+                try:
+                    asyncio.run(surge_alert_scheduler.run())
+                except Exception as e:
+                    logger.error(f"Surge alert scheduler error: {e}")
+
+            surge_alert_thread = threading.Thread(target=run_surge_alerts, daemon=True)
+            surge_alert_thread.start()
+            handles['surge_alert_scheduler'] = surge_alert_scheduler
+            handles['surge_alert_thread'] = surge_alert_thread
+
+            logger.info(f"Telegram bot (webhook: {webhook_url}) and surge alert scheduler started (5 minute interval)")
+        else:
+            logger.warning("python-telegram-bot not installed - Telegram alerts disabled")
+    else:
+        logger.info("TELEGRAM_BOT_TOKEN not set - Telegram alerts disabled")
+
+    # Signal generation scheduler (sends through the bot when available)
+    from backend.services.signal_scheduler import SignalScheduler
+
+    signal_scheduler = SignalScheduler(telegram_bot=telegram_bot)
+    signal_scheduler.start()
+    handles['signal_scheduler'] = signal_scheduler
+    logger.info("Signal generation scheduler started (surge analysis every 15 minutes)")
+
+    return handles
+
+
+def _stop_alerts(handles):
+    for name in ('telegram_update_relay', 'signal_scheduler', 'surge_alert_scheduler', 'telegram_update_worker'):
+        service = handles.get(name)
+        if service is not None:
+            service.stop()
+        if name == 'surge_alert_scheduler' and 'surge_alert_thread' in handles:
+            # Let the current check finish before the bot it sends through stops
+            thread = handles['surge_alert_thread']
+            thread.join(timeout=SURGE_ALERT_STOP_TIMEOUT)
+            if thread.is_alive():
+                logger.warning(f"Surge alert scheduler still running after {SURGE_ALERT_STOP_TIMEOUT}s, "
+                               f"stopping the bot anyway")
+
+
+def _stop(service):
+    service.stop()
+
+
+# ==================== Supervisor ====================
+
+def create_supervisor() -> LeaseSupervisor:
+    """
+    Create a supervisor with every background job registered
+
+    Returns:
+        LeaseSupervisor (not started)
+    """
+    supervisor = LeaseSupervisor()
+
+    # Opt in with ORDER_SYNC_ENABLED=true
+    if os.getenv('ORDER_SYNC_ENABLED', 'false').lower() == 'true':
+        supervisor.register('order_sync', _start_order_sync, _stop)
+    else:
+        logger.info("Background order sync: DISABLED (set ORDER_SYNC_ENABLED=true to sync all users)")
+
+    supervisor.register('subscription_renewal', _start_subscription_renewal, _stop)
+    supervisor.register('backup', _start_backup, _stop)
+    supervisor.register('auto_trading', _start_auto_trading, _stop)
+    supervisor.register('position_monitor', _start_position_monitor, _stop)
+    supervisor.register('alerts', _start_alerts, _stop_alerts)
+
+    return supervisor
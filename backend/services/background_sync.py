@@ -2,12 +2,16 @@
 Background Sync Scheduler
 
 Runs incremental order synchronization in the background every 5 minutes.
+
+With a single UpbitAPI instance it syncs that account; without one it syncs
+every user with API keys through the OrderSyncEngine.
 """
 
 import threading
 import time
 from datetime import datetime
 from backend.services.order_sync_service import OrderSyncService
+from backend.services.order_sync_engine import get_order_sync_engine
 
 
 class BackgroundSyncScheduler:
@@ -17,19 +21,21 @@ class BackgroundSyncScheduler:
     Runs in a separate thread and syncs orders every 5 minutes.
     """
 
-    def __init__(self, upbit_api, sync_interval_seconds=300):
+    def __init__(self, upbit_api=None, sync_interval_seconds=300):
         """
         Initialize background sync scheduler.
 
         Args:
-            upbit_api: UpbitAPI instance
+            upbit_api: UpbitAPI instance (None = all users with API keys)
             sync_interval_seconds: Sync interval in seconds (default: 300 = 5 minutes)
         """
         self.upbit_api = upbit_api
         self.sync_interval = sync_interval_seconds
-        self.sync_service = OrderSyncService(upbit_api)
+        self.sync_service = OrderSyncService(upbit_api) if upbit_api else None
+        self.sync_engine = None if upbit_api else get_order_sync_engine()
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Wakes the loop on stop()
 
         print(f"[BackgroundSync] Initialized (interval: {sync_interval_seconds}s = {sync_interval_seconds//60} minutes)")
 
@@ -40,6 +46,7 @@ class BackgroundSyncScheduler:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._sync_loop, daemon=True)
         self.thread.start()
         print("[BackgroundSync] Started")
@@ -47,8 +54,10 @@ class BackgroundSyncScheduler:
     def stop(self):
         """Stop the background sync thread."""
         self.running = False
+        self._stop_event.set()
         if self.thread:
-            self.thread.join(timeout=10)
+            self.thread.join()
+            self.thread = None
         print("[BackgroundSync] Stopped")
 
     def _sync_loop(self):
@@ -56,7 +65,7 @@ class BackgroundSyncScheduler:
         print("[BackgroundSync] Loop started")
 
         # Wait 60 seconds before first sync (let server start)
-        time.sleep(60)
+        self._stop_event.wait(60)
 
         while self.running:
             try:
@@ -65,7 +74,7 @@ class BackgroundSyncScheduler:
                 print(f"[BackgroundSync] ❌ Sync error: {e}")
 
             # Wait for next sync
-            time.sleep(self.sync_interval)
+            self._stop_event.wait(self.sync_interval)
 
     def _run_incremental_sync(self):
         """Run incremental sync for all markets."""
@@ -77,7 +86,7 @@ class BackgroundSyncScheduler:
 
         try:
             # Run incremental sync (only fetches new orders since last sync)
-            result = self.sync_service.incremental_sync(market=None)
+            result = self._sync()
 
             duration = (datetime.now() - start_time).total_seconds()
 
@@ -108,4 +117,19 @@ class BackgroundSyncScheduler:
             dict: Sync result
         """
         print("[BackgroundSync] Manual sync triggered")
-        return self.sync_service.incremental_sync(market=None)
+        return self._sync()
+
+    def _sync(self):
+        """Sync the configured account, or every user concurrently (unfinished full syncs resume)."""
+        if self.sync_service:
+            return self.sync_service.incremental_sync(market=None)
+
+        summary = self.sync_engine.sync_all()
+        if summary['failed']:
+            print(f"[BackgroundSync] {summary['failed']}/{summary['jobs']} user syncs failed")
+        return {
+            'success': summary['success'],
+            'synced_count': summary['synced_count'],
+            'users': summary['users'],
+            'error': None if summary['success'] else f"{summary['failed']} user syncs failed"
+        }
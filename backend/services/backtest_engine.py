@@ -0,0 +1,569 @@
+# -*- coding: utf-8 -*-
+"""
+Backtest Engine
+
+Vectorized surge-strategy backtests over the local candle store.
+
+- Daily histories are loaded once per market (CandleRepository, so only
+  candles missing from price_cache touch the Upbit API) and aligned into a
+  CandleDataset: one (markets x days) float array per OHLCV field.
+- SurgePredictor scores for every (market, day) are computed in a single
+  surge_feature_kernel pass over all 30-day windows.
+- Entries at the signal day's close are replayed against the following
+  days' highs/lows with take-profit, stop-loss and time-exit rules, again
+  as array operations over all candidate trades at once.
+- Trades and the summary are written in bulk to backtest_results /
+  backtest_summaries.
+
+Scores do not depend on the trade parameters, so one scored dataset can be
+simulated many times with different thresholds (see simulate()).
+"""
+
+import os
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from backend.services import surge_feature_kernel as kernel
+from backend.services.surge_predictor import SurgePredictor
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('open', 'high', 'low', 'close', 'value')
+
+CANDLE_KEYS = {
+    'open': 'opening_price',
+    'high': 'high_price',
+    'low': 'low_price',
+    'close': 'trade_price',
+    'value': 'candle_acc_trade_price'
+}
+
+DEFAULT_PARAMS = {
+    'min_score': 60,
+    'take_profit_percent': 10.0,
+    'stop_loss_percent': -5.0,
+    'holding_days': 3
+}
+
+
+# Upbit KRW market tick sizes: (minimum price, tick), highest band first
+KRW_TICK_SIZES = (
+    (2_000_000, 1000),
+    (1_000_000, 500),
+    (500_000, 100),
+    (100_000, 50),
+    (10_000, 10),
+    (1_000, 1),
+    (100, 0.1),
+    (10, 0.01),
+    (1, 0.001),
+    (0.1, 0.0001),
+    (0.01, 0.00001),
+    (0.001, 0.000001),
+    (0, 0.0000001),
+)
+
+
+def krw_tick_size(price: np.ndarray) -> np.ndarray:
+    """Upbit KRW tick size for each price"""
+    return np.select([price >= floor for floor, _ in KRW_TICK_SIZES],
+                     [tick for _, tick in KRW_TICK_SIZES], KRW_TICK_SIZES[-1][1])
+
+
+def round_up_to_tick(price: np.ndarray) -> np.ndarray:
+    """Smallest valid KRW order price >= price"""
+    tick = krw_tick_size(price)
+    # Round the quotient first so exact multiples are not bumped a tick up by float error
+    return np.ceil(np.round(price / tick, 6)) * tick
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+class CandleDataset:
+    """
+    Day candles of many markets aligned on one calendar
+
+    Column j of every array is the day start_date + j (KST trading day);
+    missing candles are NaN.
+    """
+
+    def __init__(self, markets: List[str], start_date: date, arrays: Dict[str, np.ndarray]):
+        """
+        Initialize dataset
+
+        Args:
+            markets: Market codes, one per row
+            start_date: Date of column 0
+            arrays: {field: (markets x days) float array} for every field in FIELDS
+        """
+        self.markets = list(markets)
+        self.start_date = start_date
+        self.arrays = arrays
+        self.num_days = arrays['close'].shape[1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.arrays['high']
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.arrays['low']
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.arrays['close']
+
+    def date_at(self, index: int) -> date:
+        return self.start_date + timedelta(days=int(index))
+
+    def index_of(self, day) -> int:
+        return (_to_date(day) - self.start_date).days
+
+    def save(self, directory: str):
+        """
+        Write the dataset as one .npy file per field plus meta.json
+
+        Args:
+            directory: Target directory (created if missing)
+        """
+        os.makedirs(directory, exist_ok=True)
+        for field in FIELDS:
+            np.save(os.path.join(directory, f'{field}.npy'), np.ascontiguousarray(self.arrays[field]))
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'markets': self.markets, 'start_date': self.start_date.isoformat()}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True):
+        """
+        Open a dataset written by save()
+
+        Args:
+            directory: Dataset directory
+            mmap: Memory-map the arrays read-only (shared page cache across processes)
+
+        Returns:
+            CandleDataset
+        """
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {
+            field: np.load(os.path.join(directory, f'{field}.npy'), mmap_mode='r' if mmap else None)
+            for field in FIELDS
+        }
+        return cls(meta['markets'], _to_date(meta['start_date']), arrays)
+
+    @classmethod
+    def from_candles(cls, market_candles: Dict[str, List[Dict]]):
+        """
+        Build a dataset from Upbit day candles
+
+        Args:
+            market_candles: {market: candles} (any order)
+
+        Returns:
+            CandleDataset covering the earliest to latest candle date
+        """
+        parsed = {}
+        for market, candles in market_candles.items():
+            rows = []
+            for candle in candles or []:
+                stamp = candle.get('candle_date_time_kst') or candle.get('candle_date_time_utc')
+                if not stamp:
+                    continue
+                rows.append((_to_date(stamp), candle))
+            if rows:
+                parsed[market] = rows
+
+        markets = list(parsed)
+        if not markets:
+            raise ValueError("no candles to build a dataset from")
+
+        start = min(day for rows in parsed.values() for day, _ in rows)
+        end = max(day for rows in parsed.values() for day, _ in rows)
+        num_days = (end - start).days + 1
+
+        arrays = {field: np.full((len(markets), num_days), np.nan) for field in FIELDS}
+        for row, market in enumerate(markets):
+            for day, candle in parsed[market]:
+                col = (day - start).days
+                for field, key in CANDLE_KEYS.items():
+                    value = candle.get(key)
+                    if value is not None:
+                        arrays[field][row, col] = float(value)
+
+        return cls(markets, start, arrays)
+
+
+class BacktestEngine:
+    """
+    Loads, scores and replays surge backtests
+    """
+
+    def __init__(self, predictor: Optional[SurgePredictor] = None, candle_repository=None):
+        """
+        Initialize engine
+
+        Args:
+            predictor: Predictor used for recommendations (default: SurgePredictor({}))
+            candle_repository: Candle source (default: shared CandleRepository)
+        """
+        self.predictor = predictor or SurgePredictor({})
+        self._candle_repository = candle_repository
+
+    @property
+    def candle_repository(self):
+        if self._candle_repository is None:
+            from backend.services.candle_repository import get_candle_repository
+            self._candle_repository = get_candle_repository()
+        return self._candle_repository
+
+    # ==================== Loading ====================
+
+    def load_dataset(self, markets: Iterable[str], start_date, end_date,
+                     holding_days: int = DEFAULT_PARAMS['holding_days']) -> CandleDataset:
+        """
+        Load day candles for a backtest period, one repository call per market
+
+        The window starts WINDOW-1 days before start_date (scoring lookback)
+        and ends holding_days after end_date (exit lookahead).
+
+        Args:
+            markets: Market codes
+            start_date: First signal date
+            end_date: Last signal date
+            holding_days: Maximum holding period
+
+        Returns:
+            CandleDataset
+        """
+        first = _to_date(start_date) - timedelta(days=kernel.WINDOW - 1)
+        last = _to_date(end_date) + timedelta(days=holding_days)
+        count = (last - first).days + 1
+
+        # 'to' is exclusive; the day candle for `last` opens at last 00:00 UTC
+        to = None
+        if last < datetime.utcnow().date():
+            to = (last + timedelta(days=1)).strftime('%Y-%m-%dT00:00:00')
+
+        market_candles = {}
+        for market in markets:
+            try:
+                market_candles[market] = self.candle_repository.get_candles(market, 'day', count=count, to=to)
+            except Exception as e:
+                logger.error(f"[BacktestEngine] Candle load failed for {market}: {e}")
+
+        dataset = CandleDataset.from_candles(market_candles)
+        logger.info(f"[BacktestEngine] Loaded {len(dataset.markets)} markets x {dataset.num_days} days")
+        return dataset
+
+    # ==================== Scoring ====================
+
+    def score(self, dataset: CandleDataset, start_index: int = 0, end_index: Optional[int] = None) -> Dict:
+        """
+        Score every market on every day in [start_index, end_index]
+
+        Args:
+            dataset: Candle dataset
+            start_index: First signal column
+            end_index: Last signal column (default: last column)
+
+        Returns:
+            dict with 'features' (kernel output for the flattened batch),
+            'score' (markets x days, NaN where no full window) and
+            'start'/'end' column bounds
+        """
+        window = kernel.WINDOW
+        end_index = dataset.num_days - 1 if end_index is None else end_index
+        start_index = max(start_index, window - 1)
+        num_markets = len(dataset.markets)
+        scores = np.full((num_markets, dataset.num_days), np.nan)
+        if end_index < start_index:
+            return {'features': None, 'score': scores, 'start': start_index, 'end': end_index}
+
+        # Window k covers columns k..k+WINDOW-1 and ends on day k+WINDOW-1;
+        # reversed to the kernel's newest-first layout
+        first, last = start_index - window + 1, end_index - window + 1
+        batch = {}
+        for field in ('high', 'low', 'close', 'value'):
+            windows = sliding_window_view(dataset.arrays[field], window, axis=1)[:, first:last + 1, ::-1]
+            batch[field] = windows.reshape(-1, window)
+
+        valid = np.ones(len(batch['close']), dtype=bool)
+        for values in batch.values():
+            valid &= np.isfinite(values).all(axis=1)
+
+        features = kernel.compute_features(
+            batch['close'], batch['high'], batch['low'], batch['value'], batch['close'][:, 0]
+        )
+        total = np.maximum(features['score_a'], features['score_b']).astype(np.float64)
+        total[~valid] = np.nan
+        scores[:, start_index:end_index + 1] = total.reshape(num_markets, -1)
+
+        return {'features': features, 'score': scores, 'start': start_index, 'end': end_index}
+
+    # ==================== Simulation ====================
+
+    def simulate(self, dataset: CandleDataset, scored: Dict, min_score: float = DEFAULT_PARAMS['min_score'],
+                 take_profit_percent: float = DEFAULT_PARAMS['take_profit_percent'],
+                 stop_loss_percent: float = DEFAULT_PARAMS['stop_loss_percent'],
+                 holding_days: int = DEFAULT_PARAMS['holding_days']) -> Dict[str, np.ndarray]:
+        """
+        Replay every signal with take-profit / stop-loss / time-exit rules
+
+        A trade enters at the signal day's close. On each of the next
+        holding_days days it exits at the stop price if the low reaches it,
+        else at the target price if the high reaches it (stop first when a
+        day touches both), else at the last day's close. Signals whose
+        holding window runs past the data are skipped.
+
+        Args:
+            dataset: Candle dataset
+            scored: Result of score()
+            min_score: Minimum score to enter
+            take_profit_percent: Target in % above entry
+            stop_loss_percent: Stop in % relative to entry (negative)
+            holding_days: Maximum holding period in days
+
+        Returns:
+            dict of equal-length trade arrays: row, col, score, entry, target,
+            stop, exit, high, low, hold_days, return_pct, reason
+        """
+        holding_days = int(holding_days)
+        scores = scored['score']
+        with np.errstate(invalid='ignore'):
+            rows, cols = np.nonzero(scores >= min_score)
+        keep = cols + holding_days < dataset.num_days
+        rows, cols = rows[keep], cols[keep]
+
+        entry = dataset.close[rows, cols]
+        # Round to the next valid tick above: the stop toward the entry (never a
+        # larger loss than configured), the target never short of its percent
+        target = round_up_to_tick(entry * (1 + take_profit_percent / 100))
+        stop = round_up_to_tick(entry * (1 + stop_loss_percent / 100))
+
+        ahead = cols[:, None] + np.arange(1, holding_days + 1)
+        highs = dataset.high[rows[:, None], ahead]
+        lows = dataset.low[rows[:, None], ahead]
+        closes = dataset.close[rows[:, None], ahead]
+        complete = np.isfinite(highs).all(axis=1) & np.isfinite(lows).all(axis=1) & np.isfinite(closes[:, -1])
+
+        with np.errstate(invalid='ignore'):
+            hit_stop = lows <= stop[:, None]
+            hit_target = highs >= target[:, None]
+        first_stop = np.where(hit_stop.any(axis=1), hit_stop.argmax(axis=1), holding_days)
+        first_target = np.where(hit_target.any(axis=1), hit_target.argmax(axis=1), holding_days)
+
+        stopped = (first_stop < holding_days) & (first_stop <= first_target)
+        targeted = ~stopped & (first_target < holding_days)
+        exit_day = np.select([stopped, targeted], [first_stop, first_target], holding_days - 1)
+        exit_price = np.select([stopped, targeted], [stop, target], closes[:, -1])
+        reason = np.select([stopped, targeted], ['stop_loss', 'take_profit'], 'time_exit')
+
+        # High/low actually seen while the position was open
+        held = np.arange(holding_days) <= exit_day[:, None]
+        with np.errstate(invalid='ignore'):
+            actual_high = np.where(held, highs, -np.inf).max(axis=1)
+            actual_low = np.where(held, lows, np.inf).min(axis=1)
+            return_pct = (exit_price - entry) / entry * 100
+
+        trades = {
+            'row': rows, 'col': cols, 'score': scores[rows, cols],
+            'entry': entry, 'target': target, 'stop': stop, 'exit': exit_price,
+            'high': actual_high, 'low': actual_low, 'hold_days': exit_day + 1,
+            'return_pct': return_pct, 'reason': reason
+        }
+        return {key: values[complete] for key, values in trades.items()}
+
+    @staticmethod
+    def summarize(returns) -> Dict:
+        """
+        Summary statistics over trade returns (same fields as BacktestSummary)
+
+        Args:
+            returns: Trade returns in %
+
+        Returns:
+            dict: total/winning/losing trades, win_rate, avg_return, avg_win,
+            avg_loss, best_trade, worst_trade
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        total = len(returns)
+        wins = returns[returns > 0]
+        losses = returns[returns <= 0]
+        return {
+            'total_trades': total,
+            'winning_trades': len(wins),
+            'losing_trades': len(losses),
+            'win_rate': round(len(wins) / total * 100, 2) if total else 0,
+            'avg_return': round(float(returns.mean()), 2) if total else 0,
+            'avg_win': round(float(wins.mean()), 2) if len(wins) else 0,
+            'avg_loss': round(float(losses.mean()), 2) if len(losses) else 0,
+            'best_trade': round(float(returns.max()), 2) if total else None,
+            'worst_trade': round(float(returns.min()), 2) if total else None
+        }
+
+    # ==================== Full run ====================
+
+    def run(self, markets: Iterable[str], start_date, end_date, step_days: int = 1,
+            dataset: Optional[CandleDataset] = None, **params) -> Dict:
+        """
+        Backtest the surge strategy over a period
+
+        Args:
+            markets: Market codes (ignored if dataset is given)
+            start_date: First signal date
+            end_date: Last signal date
+            step_days: Test every Nth day (1 = every day, 7 = weekly)
+            dataset: Preloaded dataset (default: load_dataset())
+            **params: min_score, take_profit_percent, stop_loss_percent, holding_days
+
+        Returns:
+            dict: 'params', 'start_date', 'end_date', 'trades' (list of dicts
+            in BacktestResult field names) and 'summary'
+        """
+        params = {**DEFAULT_PARAMS, **params}
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        if dataset is None:
+            dataset = self.load_dataset(markets, start_date, end_date, params['holding_days'])
+
+        scored = self.score(dataset, dataset.index_of(start_date), dataset.index_of(end_date))
+        if step_days > 1:
+            test_days = np.zeros(dataset.num_days, dtype=bool)
+            test_days[dataset.index_of(start_date)::step_days] = True
+            scored['score'][:, ~test_days] = np.nan
+
+        trades = self.simulate(dataset, scored, **params)
+        rows = self._trade_rows(dataset, scored, trades)
+
+        summary = self.summarize(trades['return_pct'])
+        logger.info(f"[BacktestEngine] {start_date} ~ {end_date}: {summary['total_trades']} trades, "
+                    f"win rate {summary['win_rate']}%")
+
+        return {
+            'params': params,
+            'start_date': start_date,
+            'end_date': end_date,
+            'trades': rows,
+            'summary': summary
+        }
+
+    def _trade_rows(self, dataset: CandleDataset, scored: Dict, trades: Dict) -> List[Dict]:
+        """Convert trade arrays to BacktestResult-shaped dicts (signals built only for trades)"""
+        features = scored['features']
+        days = scored['end'] - scored['start'] + 1
+        rows = []
+
+        for i in range(len(trades['row'])):
+            row, col = int(trades['row'][i]), int(trades['col'][i])
+            market = dataset.markets[row]
+            index = row * days + (col - scored['start'])
+
+            signals_a, signals_b = kernel.build_signals(features, index)
+            if features['score_a'][index] >= features['score_b'][index]:
+                signals, pattern_type, timing = signals_a, 'A_Accumulation', str(features['timing_a'][index])
+            else:
+                signals, pattern_type, timing = signals_b, 'B_OversoldBounce', str(features['timing_b'][index])
+            score = int(trades['score'][i])
+            return_pct = float(trades['return_pct'][i])
+
+            rows.append({
+                'market': market,
+                'coin': market.replace('KRW-', ''),
+                'trade_date': dataset.date_at(col),
+                'confidence_score': score,
+                'prediction_signals': json.dumps(signals, ensure_ascii=False),
+                'entry_price': float(trades['entry'][i]),
+                'target_price': float(trades['target'][i]),
+                'stop_loss_price': float(trades['stop'][i]),
+                'actual_high': float(trades['high'][i]),
+                'actual_low': float(trades['low'][i]),
+                'exit_price': float(trades['exit'][i]),
+                'return_pct': round(return_pct, 2),
+                'hold_days': int(trades['hold_days'][i]),
+                'success': return_pct > 0,
+                'reason': str(trades['reason'][i]),
+                'notes': f"{pattern_type}, entry timing: {timing}, "
+                         f"recommendation: {self.predictor._recommend(score, timing)}"
+            })
+
+        return rows
+
+    # ==================== Persistence ====================
+
+    def save(self, result: Dict, session=None, replace: bool = False,
+             description: Optional[str] = None, version: str = '2.0') -> int:
+        """
+        Write a run() result to backtest_results / backtest_summaries in bulk
+
+        Args:
+            result: run() result
+            session: Database session (default: new session, closed afterwards)
+            replace: Delete existing results of the same markets and period first;
+                     otherwise trades already stored for (market, trade_date) are skipped
+            description: Summary description
+            version: Summary version label
+
+        Returns:
+            int: Number of trade rows inserted
+        """
+        from backend.database.connection import get_db_session
+        from backend.models.backtest_models import BacktestResult, BacktestSummary
+
+        own_session = session is None
+        session = session or get_db_session()
+        trades = result['trades']
+        markets = sorted({t['market'] for t in trades})
+        in_period = (
+            BacktestResult.trade_date >= result['start_date'],
+            BacktestResult.trade_date <= result['end_date']
+        )
+
+        try:
+            if replace and markets:
+                session.query(BacktestResult).filter(
+                    BacktestResult.market.in_(markets), *in_period
+                ).delete(synchronize_session=False)
+            elif markets:
+                existing = set(session.query(BacktestResult.market, BacktestResult.trade_date).filter(
+                    BacktestResult.market.in_(markets), *in_period
+                ).all())
+                trades = [t for t in trades if (t['market'], t['trade_date']) not in existing]
+
+            if trades:
+                session.bulk_insert_mappings(BacktestResult, trades)
+
+            params = result['params']
+            summary = result['summary']
+            session.add(BacktestSummary(
+                start_date=result['start_date'],
+                end_date=result['end_date'],
+                description=description or (
+                    f"Engine backtest (min score {params['min_score']}, "
+                    f"TP {params['take_profit_percent']}%, SL {params['stop_loss_percent']}%, "
+                    f"hold {params['holding_days']}d)"
+                ),
+                version=version,
+                **summary
+            ))
+            session.commit()
+            print(f"[BacktestEngine] Saved {len(trades)} trades ({result['start_date']} ~ {result['end_date']})")
+            return len(trades)
+
+        except Exception as e:
+            session.rollback()
+            print(f"[BacktestEngine] Save failed: {e}")
+            raise
+        finally:
+            if own_session:
+                session.close()
@@ -31,6 +31,9 @@ class BackupScheduler:
         self.backup_time = backup_time
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Wakes the loop on stop()
+        # Own job list so stop() does not clear other services' schedule jobs
+        self.scheduler = schedule.Scheduler()
 
         # Path to backup script
         self.backup_script = os.path.join(
@@ -71,8 +74,8 @@ class BackupScheduler:
         print(f"[BackupScheduler] Schedule loop started")
 
         while self.running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            self.scheduler.run_pending()
+            self._stop_event.wait(60)  # Check every minute
 
         print(f"[BackupScheduler] Schedule loop stopped")
 
@@ -83,15 +86,16 @@ class BackupScheduler:
             return
 
         # Schedule daily backup
-        schedule.every().day.at(self.backup_time).do(self.run_backup)
+        self.scheduler.every().day.at(self.backup_time).do(self.run_backup)
 
         # Start background thread
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._schedule_loop, daemon=True)
         self.thread.start()
 
         print(f"[BackupScheduler] Started - Daily backups at {self.backup_time}")
-        print(f"[BackupScheduler] Next backup: {schedule.next_run()}")
+        print(f"[BackupScheduler] Next backup: {self.scheduler.next_run}")
 
     def stop(self):
         """Stop the backup scheduler"""
@@ -100,11 +104,13 @@ class BackupScheduler:
             return
 
         self.running = False
-        schedule.clear()
+        self._stop_event.set()
+        self.scheduler.clear()
 
         # Wait for thread to finish
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5)
+        if self.thread:
+            self.thread.join()
+            self.thread = None
 
         print(f"[BackupScheduler] Stopped")
 
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Candle Repository
+
+Local-first OHLCV store backed by the price_cache table.
+
+Requests are served from the database; only the missing tail (candles
+newer than the latest stored one, plus that one in case it was still
+open when stored) is fetched from Upbit, merged and bulk-upserted.
+Closed candles never change, so repeated scans, backtests and chart
+loads mostly stop hitting the quotation API.
+
+Candles are returned in Upbit's response format (newest first) so the
+repository is a drop-in replacement for UpbitAPI.get_candles*().
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_
+
+from backend.common import UpbitAPI
+from backend.database.connection import get_db_session
+from backend.database.models import PriceCache
+
+logger = logging.getLogger(__name__)
+
+UPBIT_MAX_COUNT = 200
+KST_OFFSET = timedelta(hours=9)
+
+# UpbitAPI.get_candles interval -> price_cache.timeframe
+TIMEFRAMES = {
+    '1': '1m', '3': '3m', '5': '5m', '10': '10m', '15': '15m', '30': '30m',
+    '60': '60m', '240': '240m',
+    'day': '1d', 'days': '1d',
+    'week': '1w', 'weeks': '1w',
+    'month': '1M', 'months': '1M',
+}
+
+# Candle length in seconds (months use the longest month so gap checks stay conservative)
+TIMEFRAME_SECONDS = {
+    '1m': 60, '3m': 180, '5m': 300, '10m': 600, '15m': 900, '30m': 1800,
+    '60m': 3600, '240m': 14400,
+    '1d': 86400, '1w': 604800, '1M': 2678400,
+}
+
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+
+def parse_upbit_time(value) -> Optional[datetime]:
+    """
+    Parse a candle time or Upbit 'to' parameter into naive UTC
+
+    Args:
+        value: datetime, 'YYYY-MM-DDTHH:MM:SS[Z|+09:00]' or 'YYYY-MM-DD HH:MM:SS'
+
+    Returns:
+        Naive UTC datetime, or None if it cannot be parsed
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text_value = str(value).strip().replace(' ', 'T')
+        if text_value.endswith('Z'):
+            text_value = text_value[:-1] + '+00:00'
+        try:
+            dt = datetime.fromisoformat(text_value)
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+class CandleRepository:
+    """
+    Local-first candle store for all Upbit candle consumers
+    """
+
+    def __init__(self, upbit_api: Optional[UpbitAPI] = None):
+        """
+        Initialize repository
+
+        Args:
+            upbit_api: Upbit API client used for missing candles (default: public client)
+        """
+        self.upbit_api = upbit_api or UpbitAPI(None, None)
+        self.stats = {'requests': 0, 'local_hits': 0, 'fetched_candles': 0, 'upstream_calls': 0}
+        self._stats_lock = threading.Lock()
+
+    # ==================== Public API ====================
+
+    def get_candles(self, market: str, interval: str = 'day', count: int = 200, to=None) -> List[Dict]:
+        """
+        Get candles, serving from local storage first
+
+        Args:
+            market: Market code (e.g., 'KRW-BTC')
+            interval: UpbitAPI.get_candles interval ('1'...'240', 'day', 'week', 'month')
+            count: Number of candles (may exceed Upbit's 200 per call)
+            to: Exclusive end time (default: latest)
+
+        Returns:
+            List of candles in Upbit format, newest first (empty list on error)
+        """
+        timeframe = TIMEFRAMES.get(str(interval))
+        to_dt = parse_upbit_time(to)
+        if timeframe is None or (to is not None and to_dt is None):
+            # Unknown interval/time format: pass straight through
+            return self._fetch(market, interval, count, to)
+
+        self._count('requests')
+        period = timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+
+        try:
+            local = self._load(market, timeframe, count, to_dt)
+        except Exception as e:
+            logger.error(f"[CandleRepository] Local read failed for {market} {timeframe}: {e}")
+            return self._fetch(market, interval, count, to)
+
+        if to_dt is not None:
+            # Historical window: closed candles, complete if contiguous up to `to`
+            if self._is_complete(local, count, period, to_dt):
+                self._count('local_hits')
+                return [self._row_to_candle(row, market) for row in local]
+            fetched = self._fetch(market, interval, count, to)
+            self._save(market, timeframe, fetched)
+            return fetched[:count] if fetched else [self._row_to_candle(row, market) for row in local]
+
+        # Latest window: refetch only the tail since the newest stored candle
+        now = datetime.utcnow()
+        if len(local) >= count and self._is_contiguous(local, period):
+            newest = local[0].timestamp
+            missing = int((now - newest) / period) + 2
+        else:
+            missing = count
+        missing = min(missing, count)
+
+        fetched = self._fetch(market, interval, missing)
+        if not fetched:
+            return [self._row_to_candle(row, market) for row in local]
+        self._save(market, timeframe, fetched)
+
+        if missing >= count:
+            return fetched[:count]
+
+        # Merge fresh tail over local rows (fresh values win for the same timestamp)
+        merged = {parse_upbit_time(c.get('candle_date_time_utc')): c for c in fetched}
+        for row in local:
+            if row.timestamp not in merged:
+                merged[row.timestamp] = self._row_to_candle(row, market)
+        ordered = [merged[ts] for ts in sorted(merged, reverse=True)]
+        return ordered[:count]
+
+    def get_candles_days(self, market: str, count: int = 200, to=None) -> List[Dict]:
+        """Drop-in replacement for UpbitAPI.get_candles_days()"""
+        return self.get_candles(market, 'day', count=count, to=to)
+
+    def get_stats(self) -> Dict:
+        """
+        Get request/hit counters
+
+        Returns:
+            Dict of counters
+        """
+        with self._stats_lock:
+            return dict(self.stats)
+
+    # ==================== Storage ====================
+
+    def _load(self, market: str, timeframe: str, count: int, to_dt: Optional[datetime]) -> List[PriceCache]:
+        session = get_db_session()
+        try:
+            filters = [PriceCache.market == market, PriceCache.timeframe == timeframe]
+            if to_dt is not None:
+                filters.append(PriceCache.timestamp < to_dt)
+            return session.query(PriceCache)\
+                .filter(and_(*filters))\
+                .order_by(PriceCache.timestamp.desc())\
+                .limit(count)\
+                .all()
+        finally:
+            session.close()
+
+    def _save(self, market: str, timeframe: str, candles: List[Dict]):
+        """Bulk upsert candles into price_cache with one multi-row statement"""
+        if not candles:
+            return
+
+        now = datetime.utcnow()
+        rows = {}
+        for candle in candles:
+            ts = parse_upbit_time(candle.get('candle_date_time_utc'))
+            if ts is None:
+                continue
+            rows[ts] = {
+                'market': market,
+                'timeframe': timeframe,
+                'timestamp': ts,
+                'open': candle.get('opening_price'),
+                'high': candle.get('high_price'),
+                'low': candle.get('low_price'),
+                'close': candle.get('trade_price'),
+                'volume': candle.get('candle_acc_trade_volume'),
+                'trade_value': candle.get('candle_acc_trade_price'),
+                'cached_at': now
+            }
+        if not rows:
+            return
+
+        session = get_db_session()
+        try:
+            if session.bind.dialect.name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            stmt = insert(PriceCache).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['market', 'timeframe', 'timestamp'],
+                set_={
+                    'open': stmt.excluded.open,
+                    'high': stmt.excluded.high,
+                    'low': stmt.excluded.low,
+                    'close': stmt.excluded.close,
+                    'volume': stmt.excluded.volume,
+                    'trade_value': stmt.excluded.trade_value,
+                    'cached_at': stmt.excluded.cached_at
+                }
+            )
+            session.execute(stmt)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"[CandleRepository] Upsert failed for {market} {timeframe}: {e}")
+        finally:
+            session.close()
+
+    # ==================== Upstream ====================
+
+    def _fetch(self, market: str, interval: str, count: int, to=None) -> List[Dict]:
+        """Fetch candles from Upbit, paging backwards past the 200-per-call limit"""
+        candles = []
+        cursor = to
+        while len(candles) < count:
+            batch_size = min(UPBIT_MAX_COUNT, count - len(candles))
+            self._count('upstream_calls')
+            batch = self.upbit_api.get_candles(market, interval=interval, count=batch_size, to=cursor)
+            if not batch:
+                break
+            candles.extend(batch)
+            if len(batch) < batch_size:
+                break
+            oldest = parse_upbit_time(batch[-1].get('candle_date_time_utc'))
+            if oldest is None:
+                break
+            cursor = oldest.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
+
+        self._count('fetched_candles', len(candles))
+        return candles
+
+    # ==================== Helpers ====================
+
+    @staticmethod
+    def _is_contiguous(rows: List[PriceCache], period: timedelta) -> bool:
+        """Rows (newest first) have no gaps larger than one candle"""
+        for newer, older in zip(rows, rows[1:]):
+            if newer.timestamp - older.timestamp > period:
+                return False
+        return True
+
+    def _is_complete(self, rows: List[PriceCache], count: int, period: timedelta, to_dt: datetime) -> bool:
+        if len(rows) < count or not rows:
+            return False
+        if to_dt - rows[0].timestamp > period * 2:
+            return False
+        return self._is_contiguous(rows, period)
+
+    @staticmethod
+    def _row_to_candle(row: PriceCache, market: str) -> Dict:
+        """Convert a price_cache row to Upbit candle format"""
+        ts = row.timestamp
+        return {
+            'market': market,
+            'candle_date_time_utc': ts.strftime('%Y-%m-%dT%H:%M:%S'),
+            'candle_date_time_kst': (ts + KST_OFFSET).strftime('%Y-%m-%dT%H:%M:%S'),
+            'opening_price': _to_float(row.open),
+            'high_price': _to_float(row.high),
+            'low_price': _to_float(row.low),
+            'trade_price': _to_float(row.close),
+            'timestamp': int(ts.replace(tzinfo=timezone.utc).timestamp() * 1000),
+            'candle_acc_trade_price': _to_float(row.trade_value),
+            'candle_acc_trade_volume': _to_float(row.volume)
+        }
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+
+# Global instance
+_candle_repository = None
+_candle_repository_lock = threading.Lock()
+
+
+def get_candle_repository() -> CandleRepository:
+    """
+    Get or create candle repository singleton
+
+    Returns:
+        CandleRepository instance
+    """
+    global _candle_repository
+
+    with _candle_repository_lock:
+        if _candle_repository is None:
+            _candle_repository = CandleRepository()
+
+    return _candle_repository
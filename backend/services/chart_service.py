@@ -37,7 +37,48 @@ class ChartService:
 
     def get_candles(self, timeframe, market, count=200, unit=None, to=None):
         """
-        Retrieve candle data from Upbit API.
+        Retrieve candle data, local candle store first, then Upbit API.
+
+        Args:
+            timeframe (str): Timeframe for candles ('minutes', 'days', 'weeks', 'months')
+            market (str): Market symbol (e.g., 'KRW-BTC')
+            count (int): Number of candles to retrieve (max 200)
+            unit (int): Unit for minute candles (1, 3, 5, 10, 15, 30, 60, 240)
+            to (str): End datetime for candles (ISO format or 'YYYY-MM-DD HH:MM:SS')
+
+        Returns:
+            list: List of candle data dictionaries, or None if error
+        """
+        # Serve from the local candle store (fetches only the missing tail)
+        interval = self._repository_interval(timeframe, unit)
+        if interval is not None:
+            try:
+                from backend.services.candle_repository import get_candle_repository
+                to_param = urllib.parse.unquote(str(to).strip()) if to else None
+                data = get_candle_repository().get_candles(market, interval, count=min(count, 200), to=to_param)
+                if data:
+                    print(f"[ChartService] REPOSITORY: {timeframe} data for {market}, count={len(data)}")
+                    return data
+            except Exception as e:
+                print(f"[ChartService] Repository unavailable, falling back to API: {str(e)}")
+
+        return self._fetch_candles(timeframe, market, count=count, unit=unit, to=to)
+
+    @staticmethod
+    def _repository_interval(timeframe, unit=None):
+        """
+        Map ChartService timeframe/unit to a CandleRepository interval.
+
+        Returns:
+            str: Interval ('1'...'240', 'day', 'week', 'month') or None if unsupported
+        """
+        if timeframe == 'minutes':
+            return str(unit or 1)
+        return {'days': 'day', 'weeks': 'week', 'months': 'month'}.get(timeframe)
+
+    def _fetch_candles(self, timeframe, market, count=200, unit=None, to=None):
+        """
+        Retrieve candle data directly from Upbit API with retries.
 
         Args:
             timeframe (str): Timeframe for candles ('minutes', 'days', 'weeks', 'months')
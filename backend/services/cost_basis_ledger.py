@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+Cost Basis Ledger
+
+Per-user, per-market average cost positions folded from the orders table.
+
+- OrderSyncService hands every batch of ingested orders (and completed
+  deposits/withdrawals) to ingest_orders()/ingest_transfers(); only the
+  new events are folded into the stored CostBasisPosition rows.
+- Events older than what a position has already folded (e.g. a full sync
+  walking history newest-first) trigger a rebuild of that one market
+  from the database, so the fold order is always chronological.
+- Average buy price is a single-row lookup instead of paging through the
+  whole order history (UpbitAPI.calculate_real_avg_price).
+
+Accounting (average cost method, fees tracked separately):
+- Buy: quantity and total cost grow by the filled volume / funds.
+- Sell (partial or full): cost leaves at the current average price;
+  the difference to the sell funds is realized PnL.
+- Deposit: coins arrive at the current average price (unchanged average);
+  into an empty position they are "uncosted" and excluded from the average.
+- Withdraw: coins (amount + fee) leave at the current average price.
+"""
+
+import threading
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from backend.database import get_db_session, Order, CostBasisPosition, CostBasisTransfer
+
+logger = logging.getLogger(__name__)
+
+# Orders that traded something: market buys end as 'cancel' with fills
+FILLED_STATES = ('done', 'cancel')
+
+# Dust left by rounding is treated as an empty position
+EPSILON = 1e-12
+
+# Relative difference between ledger and account quantity still trusted
+QUANTITY_TOLERANCE = 1e-6
+
+# Upbit transfer states that moved coins
+DEPOSIT_DONE_STATES = ('accepted',)
+WITHDRAW_DONE_STATES = ('done',)
+
+
+def _to_float(value) -> float:
+    return float(value) if value else 0.0
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """Parse Upbit time strings the way OrderSyncService stores them (offset dropped)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        if 'T' in value:
+            return datetime.fromisoformat(value.split('+')[0].split('Z')[0])
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def order_event(order) -> Optional[Dict]:
+    """
+    Normalize a filled order (Order row or Upbit order dict) into a ledger event
+
+    Returns:
+        dict or None if the order did not fill anything
+    """
+    get = order.get if isinstance(order, dict) else lambda key: getattr(order, key, None)
+
+    if get('state') not in FILLED_STATES:
+        return None
+    volume = _to_float(get('executed_volume'))
+    if volume <= 0:
+        return None
+
+    # executed_funds is exact; avg_price/price are fallbacks for older rows
+    funds = _to_float(get('executed_funds'))
+    if funds <= 0:
+        funds = volume * _to_float(get('avg_price') or get('price'))
+
+    return {
+        'id': get('uuid'),
+        'market': get('market'),
+        'kind': get('side'),
+        'volume': volume,
+        'funds': funds,
+        'fee': _to_float(get('paid_fee')),
+        'time': _parse_time(get('executed_at') or get('created_at'))
+    }
+
+
+def transfer_event(transfer) -> Dict:
+    """
+    Normalize a CostBasisTransfer row into a ledger event
+    """
+    volume = _to_float(transfer.amount)
+    if transfer.kind == 'withdraw':
+        # The withdrawal fee is paid in coin on top of the amount
+        volume += _to_float(transfer.fee)
+
+    return {
+        'id': transfer.uuid,
+        'market': transfer.market,
+        'kind': transfer.kind,
+        'volume': volume,
+        'funds': 0.0,
+        'fee': 0.0,
+        'time': transfer.done_at
+    }
+
+
+def _event_key(event):
+    return (event['time'] or datetime.min, event['id'] or '')
+
+
+def apply_event(position, event):
+    """
+    Fold one event into a position (any object with the CostBasisPosition fields)
+
+    Args:
+        position: Position to update in place
+        event: Normalized event from order_event()/transfer_event()
+    """
+    quantity = _to_float(position.quantity)
+    uncosted = _to_float(position.uncosted_quantity)
+    total_cost = _to_float(position.total_cost)
+    realized = _to_float(position.realized_pnl)
+    fees = _to_float(position.fees)
+
+    kind = event['kind']
+    volume = event['volume']
+    costed = quantity - uncosted
+    average = total_cost / costed if costed > EPSILON else 0.0
+
+    if kind == 'bid':
+        quantity += volume
+        total_cost += event['funds']
+        fees += event['fee']
+
+    elif kind == 'deposit':
+        if costed > EPSILON:
+            total_cost += volume * average
+        else:
+            uncosted += volume
+        quantity += volume
+
+    elif kind in ('ask', 'withdraw'):
+        # Volume beyond the position predates the synced history
+        moved = min(volume, quantity)
+        if volume - moved > EPSILON:
+            logger.debug(f"[CostBasisLedger] {event['market']}: {volume - moved:.8f} {kind} beyond ledger quantity")
+
+        # Costed and uncosted coins leave in proportion
+        moved_uncosted = moved * uncosted / quantity if quantity > EPSILON else 0.0
+        moved_costed = moved - moved_uncosted
+        released_cost = moved_costed * average
+
+        if kind == 'ask':
+            fees += event['fee']
+            if volume > EPSILON:
+                realized += event['funds'] * moved_costed / volume - released_cost
+
+        quantity -= moved
+        uncosted -= moved_uncosted
+        total_cost -= released_cost
+
+    if quantity <= EPSILON:
+        quantity = uncosted = total_cost = 0.0
+
+    position.quantity = quantity
+    position.uncosted_quantity = max(uncosted, 0.0)
+    position.total_cost = max(total_cost, 0.0)
+    position.realized_pnl = realized
+    position.fees = fees
+    position.event_count = (position.event_count or 0) + 1
+    if event['time'] and (position.last_event_at is None or event['time'] > position.last_event_at):
+        position.last_event_at = event['time']
+
+
+def _reset(position):
+    position.quantity = 0
+    position.uncosted_quantity = 0
+    position.total_cost = 0
+    position.realized_pnl = 0
+    position.fees = 0
+    position.event_count = 0
+    position.last_event_at = None
+
+
+class CostBasisLedger:
+    """
+    Incremental cost basis positions per (user, market)
+    """
+
+    def __init__(self):
+        # One writer per user keeps folds of concurrent syncs ordered
+        self._user_locks: Dict[int, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self.stats = {'folded': 0, 'rebuilds': 0, 'lookups': 0}
+
+    def _user_lock(self, user_id) -> threading.Lock:
+        with self._locks_lock:
+            return self._user_locks.setdefault(user_id, threading.Lock())
+
+    # ==================== Ingest ====================
+
+    def ingest_orders(self, user_id: int, orders: Iterable) -> int:
+        """
+        Fold newly synced orders (already stored in the orders table)
+
+        Args:
+            user_id: Owner of the orders
+            orders: Upbit order dicts or Order rows
+
+        Returns:
+            int: Number of fill events folded
+        """
+        events = [e for e in (order_event(o) for o in orders) if e and e['market']]
+        return self._apply(user_id, events)
+
+    def ingest_transfers(self, user_id: int, deposits: Iterable[Dict] = (), withdraws: Iterable[Dict] = ()) -> int:
+        """
+        Store completed deposits/withdrawals and fold the new ones
+
+        Args:
+            user_id: Owner of the transfers
+            deposits: UpbitAPI.get_deposits() entries
+            withdraws: UpbitAPI.get_withdraws() entries
+
+        Returns:
+            int: Number of new transfers folded
+        """
+        rows = []
+        for kind, entries, done_states in (('deposit', deposits, DEPOSIT_DONE_STATES),
+                                            ('withdraw', withdraws, WITHDRAW_DONE_STATES)):
+            for entry in entries:
+                currency = entry.get('currency')
+                if not entry.get('uuid') or not currency or currency == 'KRW':
+                    continue
+                if str(entry.get('state', '')).lower() not in done_states:
+                    continue
+                rows.append(CostBasisTransfer(
+                    uuid=entry['uuid'],
+                    user_id=user_id,
+                    market=f'KRW-{currency}',
+                    kind=kind,
+                    amount=_to_float(entry.get('amount')),
+                    fee=_to_float(entry.get('fee')),
+                    done_at=_parse_time(entry.get('done_at') or entry.get('created_at')),
+                    raw_data=entry
+                ))
+        if not rows:
+            return 0
+
+        db = get_db_session()
+        try:
+            known = {
+                uuid for (uuid,) in db.query(CostBasisTransfer.uuid).filter(
+                    CostBasisTransfer.uuid.in_([r.uuid for r in rows])
+                )
+            }
+            new_rows = [r for r in rows if r.uuid not in known]
+            if not new_rows:
+                return 0
+            db.add_all(new_rows)
+            db.commit()
+            events = [transfer_event(r) for r in new_rows]
+        finally:
+            db.close()
+
+        return self._apply(user_id, events)
+
+    def _apply(self, user_id: int, events: List[Dict]) -> int:
+        """Fold events per market; rebuild markets that received out-of-order events"""
+        if not events:
+            return 0
+
+        by_market: Dict[str, List[Dict]] = {}
+        for event in events:
+            by_market.setdefault(event['market'], []).append(event)
+
+        with self._user_lock(user_id):
+            db = get_db_session()
+            try:
+                positions = {
+                    p.market: p for p in db.query(CostBasisPosition).filter(
+                        CostBasisPosition.user_id == user_id,
+                        CostBasisPosition.market.in_(list(by_market))
+                    )
+                }
+
+                rebuild = []
+                for market, market_events in by_market.items():
+                    market_events.sort(key=_event_key)
+                    position = positions.get(market)
+                    # A new position may have history synced before the ledger existed
+                    if position is None or (
+                            position.last_event_at is not None and
+                            (market_events[0]['time'] is None or market_events[0]['time'] <= position.last_event_at)):
+                        rebuild.append(market)
+                        continue
+
+                    for event in market_events:
+                        apply_event(position, event)
+                    self.stats['folded'] += len(market_events)
+
+                if rebuild:
+                    self._rebuild(db, user_id, rebuild, positions)
+
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        return len(events)
+
+    # ==================== Rebuild ====================
+
+    def rebuild(self, user_id: int, markets: Optional[List[str]] = None) -> int:
+        """
+        Recompute positions from the orders and transfers tables
+
+        Args:
+            user_id: User to rebuild
+            markets: Markets to rebuild (default: every market with history)
+
+        Returns:
+            int: Number of positions written
+        """
+        with self._user_lock(user_id):
+            db = get_db_session()
+            try:
+                positions = {
+                    p.market: p for p in db.query(CostBasisPosition).filter(CostBasisPosition.user_id == user_id)
+                }
+                if markets is None:
+                    markets = sorted(
+                        {m for (m,) in db.query(Order.market).filter(Order.user_id == user_id).distinct()}
+                        | {m for (m,) in db.query(CostBasisTransfer.market).filter(
+                            CostBasisTransfer.user_id == user_id).distinct()}
+                        | set(positions)
+                    )
+                count = self._rebuild(db, user_id, markets, positions)
+                db.commit()
+                return count
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    def _rebuild(self, db, user_id: int, markets: List[str], positions: Dict[str, CostBasisPosition]) -> int:
+        """Refold markets from scratch inside the caller's session"""
+        if not markets:
+            return 0
+
+        events: Dict[str, List[Dict]] = {m: [] for m in markets}
+
+        orders = db.query(Order).filter(
+            Order.user_id == user_id,
+            Order.market.in_(markets),
+            Order.state.in_(FILLED_STATES),
+            Order.executed_volume > 0
+        )
+        for order in orders:
+            event = order_event(order)
+            if event:
+                events[order.market].append(event)
+
+        transfers = db.query(CostBasisTransfer).filter(
+            CostBasisTransfer.user_id == user_id,
+            CostBasisTransfer.market.in_(markets)
+        )
+        for transfer in transfers:
+            events[transfer.market].append(transfer_event(transfer))
+
+        for market, market_events in events.items():
+            position = positions.get(market)
+            if position is None:
+                if not market_events:
+                    continue
+                position = CostBasisPosition(user_id=user_id, market=market)
+                positions[market] = position
+                db.add(position)
+            _reset(position)
+            for event in sorted(market_events, key=_event_key):
+                apply_event(position, event)
+
+        self.stats['rebuilds'] += len(markets)
+        logger.info(f"[CostBasisLedger] User {user_id}: rebuilt {len(markets)} markets")
+        return len(markets)
+
+    # ==================== Reads ====================
+
+    def get_positions(self, user_id: int) -> Dict[str, Dict]:
+        """
+        Get all ledger positions of a user
+
+        Returns:
+            Dict of {market: position dict}
+        """
+        db = get_db_session()
+        try:
+            return {
+                p.market: p.to_dict() for p in db.query(CostBasisPosition).filter(
+                    CostBasisPosition.user_id == user_id
+                )
+            }
+        finally:
+            db.close()
+
+    def provider(self, user_id: int) -> Callable[[str, Dict], Optional[float]]:
+        """
+        Cost basis provider for holdings valuation (one query on first use)
+
+        The ledger average is used only while the ledger quantity matches the
+        account's balance + locked; otherwise (history older than the synced
+        orders, unsynced transfers) None falls back to Upbit's avg_buy_price.
+
+        Args:
+            user_id: User whose positions to load
+
+        Returns:
+            callable(market, account) -> average price or None
+        """
+        positions = None
+
+        def cost_basis(market: str, account: Dict) -> Optional[float]:
+            nonlocal positions
+            if positions is None:
+                try:
+                    positions = self.get_positions(user_id)
+                except Exception as e:
+                    logger.warning(f"[CostBasisLedger] User {user_id}: positions unavailable: {e}")
+                    positions = {}
+
+            self.stats['lookups'] += 1
+            position = positions.get(market)
+            if not position or position['average_price'] is None:
+                return None
+            held = _to_float(account.get('balance')) + _to_float(account.get('locked'))
+            if abs(position['quantity'] - held) > max(held, EPSILON) * QUANTITY_TOLERANCE:
+                return None
+            return position['average_price']
+
+        return cost_basis
+
+    def get_stats(self) -> Dict:
+        """
+        Get ledger counters
+
+        Returns:
+            dict: folded events, rebuilt markets, provider lookups
+        """
+        return dict(self.stats)
+
+
+# Global instance
+_cost_basis_ledger = None
+_cost_basis_ledger_lock = threading.Lock()
+
+
+def get_cost_basis_ledger() -> CostBasisLedger:
+    """
+    Get or create cost basis ledger singleton
+
+    Returns:
+        CostBasisLedger instance
+    """
+    global _cost_basis_ledger
+
+    with _cost_basis_ledger_lock:
+        if _cost_basis_ledger is None:
+            _cost_basis_ledger = CostBasisLedger()
+
+    return _cost_basis_ledger
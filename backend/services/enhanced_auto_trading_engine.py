@@ -19,6 +19,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.database import get_db_session, UserConfig, SwingTradingLog
 from backend.services.db_position_tracker import DBPositionTracker
+from backend.services.indicator_state import get_indicator_store
 
 
 class EnhancedAutoTradingEngine:
@@ -100,20 +101,9 @@ class EnhancedAutoTradingEngine:
             price_vs_sma5 = (current_price - sma_5) / sma_5
             price_vs_sma20 = (current_price - sma_20) / sma_20
 
-            # Calculate RSI (14-period)
-            gains = []
-            losses = []
-            for i in range(1, min(15, len(prices))):
-                change = prices[i-1] - prices[i]
-                if change > 0:
-                    gains.append(change)
-                else:
-                    losses.append(abs(change))
-
-            avg_gain = sum(gains) / len(gains) if gains else 0.001
-            avg_loss = sum(losses) / len(losses) if losses else 0.001
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            # RSI (14-period, Wilder) from the shared indicator state
+            indicators = get_indicator_store().update(coin_symbol, 'day', historical_data).snapshot()
+            rsi = indicators['rsi'] if indicators['rsi'] is not None else 50.0
 
             # Calculate MACD (simplified)
             ema_12 = sum(prices[:12]) / 12
@@ -4,7 +4,8 @@ Holdings Service Module
 Provides portfolio holdings data retrieval and management functionality.
 """
 
-import time
+from backend.services.market_registry import get_market_registry
+from backend.services.ticker_hub import get_ticker_hub
 
 
 class HoldingsService:
@@ -24,13 +25,15 @@ class HoldingsService:
         Initialize HoldingsService.
 
         Args:
-            upbit_api: UpbitAPI instance for account and price data
+            upbit_api: UpbitAPI instance for account data
         """
         self.upbit_api = upbit_api
 
     def get_real_holdings_data(self, legacy_format=True):
         """
-        Retrieve real holdings data from Upbit API (including withdrawal history).
+        Retrieve real holdings data from Upbit API.
+
+        Costs one get_accounts() call; prices come from the shared ticker snapshot.
 
         Args:
             legacy_format (bool): If True, returns old format with KRW and TOTAL in list.
@@ -53,50 +56,13 @@ class HoldingsService:
 
             print(f"[HoldingsService] Account retrieval successful: {len(accounts)} accounts")
 
-            # Get withdrawal history
-            print("[HoldingsService] Retrieving withdrawal history...")
-            withdraws = self.upbit_api.get_withdraws(state='done', limit=100)
-
-            # Calculate withdrawal totals by coin
-            withdraw_amounts = {}
-            for withdraw in withdraws:
-                currency = withdraw.get('currency')
-                amount = float(withdraw.get('amount', 0))
-                if currency and amount > 0:
-                    withdraw_amounts[currency] = withdraw_amounts.get(currency, 0) + amount
-
-            print(f"[HoldingsService] Withdrawal history retrieved: {len(withdraw_amounts)} coins, {len(withdraws)} total withdrawals")
-            for currency, amount in withdraw_amounts.items():
-                print(f"  - {currency}: {amount} withdrawn")
-
             # Filter non-KRW coins (include if balance or locked is greater than 0)
             crypto_accounts = [acc for acc in accounts if acc['currency'] != 'KRW' and (float(acc['balance']) > 0 or float(acc['locked']) > 0)]
 
-            # Add withdrawn coins (zero balance but has withdrawal history)
-            existing_currencies = set(acc['currency'] for acc in crypto_accounts)
-            for currency, withdraw_amount in withdraw_amounts.items():
-                if currency not in existing_currencies and currency != 'KRW':
-                    # Display zero-balance withdrawn coins in portfolio (to preserve history)
-                    crypto_accounts.append({
-                        "currency": currency,
-                        "balance": "0",
-                        "locked": "0",
-                        "avg_buy_price": "0",
-                        "unit_state": "withdrawn",
-                        "withdraw_only": True
-                    })
-
-            # Get current prices (all held coins plus KRW-BTC/ETH)
+            # Current prices from the shared ticker snapshot (delisted markets skipped)
             markets_to_fetch = [f'KRW-{acc["currency"]}' for acc in crypto_accounts]
-            markets_to_fetch.extend(['KRW-BTC', 'KRW-ETH'])  # Include major coins
-            markets_to_fetch = list(set(markets_to_fetch))
-
-            current_prices = self.upbit_api.get_current_prices(markets_to_fetch)
-
-            # Real average price calculation cache (minimize API calls)
-            avg_prices_cache = {}
-            max_calculate = 5  # Calculate real average price for max 5 coins
-            calculated_count = 0
+            markets_to_fetch = get_market_registry().filter_listed(markets_to_fetch)
+            current_prices = get_ticker_hub().get_tickers(markets_to_fetch) if markets_to_fetch else {}
 
             # Check KRW balance (cash assets)
             krw_account = next((acc for acc in accounts if acc['currency'] == 'KRW'), None)
@@ -131,53 +97,11 @@ class HoldingsService:
                 locked = float(account['locked'])
                 amount = balance + locked
 
-                # 2. Calculate real average price (max 5 coins with balance)
-                should_calculate = (balance > 0 or locked > 0) and calculated_count < max_calculate
-                if should_calculate and market not in avg_prices_cache:
-                    print(f"[HoldingsService] {calculated_count+1}/{max_calculate} Calculating {currency} real average price...")
-                    try:
-                        real_avg_price = self.upbit_api.calculate_real_avg_price(market)
-                        avg_prices_cache[market] = real_avg_price
-                        calculated_count += 1
-                        time.sleep(0.05)  # Minimal delay to prevent API overload
-                    except Exception as e:
-                        print(f"[HoldingsService] {currency} average price calculation failed: {e}")
-                        avg_prices_cache[market] = None
-
-                real_avg_price = avg_prices_cache.get(market)
-
-                # Fallback: Use Upbit API provided average price (faster)
-                if real_avg_price is None or real_avg_price == 0:
-                    avg_buy_price = float(account.get('avg_buy_price', 0))
-                    if should_calculate:
-                        print(f"[HoldingsService] {currency} Using fallback average price: {avg_buy_price:,.0f} KRW")
-                else:
-                    avg_buy_price = real_avg_price
-                    print(f"[HoldingsService] {currency} Real average price: {avg_buy_price:,.0f} KRW")
+                avg_buy_price = float(account.get('avg_buy_price', 0))
 
                 price_info = current_prices.get(market, {})
                 current_price = float(price_info.get('trade_price', 0))
 
-                # If current price is 0, try individual query (with delay)
-                if current_price == 0 and market != 'KRW-KRW':
-                    print(f"[HoldingsService] {currency} current price 0, attempting individual query...")
-                    time.sleep(0.1)  # Short delay for individual query
-                    try:
-                        individual_prices = self.upbit_api.get_current_prices([market])
-                        if individual_prices and market in individual_prices:
-                            current_price = float(individual_prices[market].get('trade_price', 0))
-                            print(f"[HoldingsService] {currency} individual query success: {current_price}")
-                        else:
-                            print(f"[HoldingsService] {currency} individual query failed")
-                    except Exception as e:
-                        print(f"[HoldingsService] {currency} individual query error: {e}")
-                        current_price = 0
-
-                # Skip withdrawal-only entries (zero balance, zero avg_buy_price)
-                if amount == 0 and avg_buy_price == 0 and account.get('withdraw_only', False):
-                    # Don't include in withdrawal history (not actual holdings)
-                    continue
-
                 # Calculations
                 total_value = amount * current_price
                 total_buy_price = amount * avg_buy_price  # FIXED: Use amount (balance + locked) instead of balance only
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Holdings Valuation
+
+Turns one get_accounts() response into the /api/holdings payload.
+
+- Current prices come from the shared TickerHub snapshot (no per-request
+  ticker calls or thread pools).
+- Delisted markets are recognised through MarketRegistry and valued at
+  their average buy price instead of failing the price batch.
+- Average buy prices come from a cost-basis provider; by default the
+  avg_buy_price Upbit maintains on the account itself.
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+from backend.services.market_registry import get_market_registry
+from backend.services.ticker_hub import get_ticker_hub
+
+logger = logging.getLogger(__name__)
+
+# (market, account) -> average buy price, or None to use the account's avg_buy_price
+CostBasisProvider = Callable[[str, Dict], Optional[float]]
+
+
+def empty_holdings() -> Dict:
+    """Holdings payload for an account without any assets"""
+    return {
+        "success": True,
+        "krw": 0,
+        "coins": [],
+        "summary": {
+            "total_value_krw": 0,
+            "total_invested_krw": 0,
+            "total_profit_loss_krw": 0,
+            "total_profit_rate": 0,
+            "coin_count": 0
+        }
+    }
+
+
+def value_accounts(accounts: List[Dict], cost_basis: Optional[CostBasisProvider] = None) -> Dict:
+    """
+    Value Upbit accounts at current prices
+
+    Args:
+        accounts: UpbitAPI.get_accounts() result
+        cost_basis: Optional average buy price provider
+
+    Returns:
+        dict: /api/holdings response data
+    """
+    if not accounts:
+        return empty_holdings()
+
+    krw_balance = 0
+    coin_data = []
+
+    for account in accounts:
+        currency = account.get('currency', '')
+        balance = float(account.get('balance', 0))
+        locked = float(account.get('locked', 0))
+
+        if currency == 'KRW':
+            krw_balance = balance
+            continue
+
+        if balance > 0 or locked > 0:
+            market = f'KRW-{currency}'
+            avg_buy_price = cost_basis(market, account) if cost_basis else None
+            if not avg_buy_price:
+                avg_buy_price = float(account.get('avg_buy_price', 0) or 0)
+            coin_data.append({
+                'currency': currency,
+                'market': market,
+                'amount': balance + locked,
+                'avg_buy_price': avg_buy_price
+            })
+
+    markets = [c['market'] for c in coin_data]
+    listed = get_market_registry().filter_listed(markets)
+    price_map = get_ticker_hub().get_prices(listed) if listed else {}
+    delisted = set(markets) - set(listed)
+    if delisted:
+        logger.info(f"[HoldingsValuation] Delisted holdings valued at average price: {sorted(delisted)}")
+
+    coins = []
+    total_value_krw = krw_balance
+    total_invested_krw = 0
+
+    for coin in coin_data:
+        avg_buy_price = coin['avg_buy_price']
+        # Unpriced (delisted or unavailable) coins fall back to their average price
+        current_price = price_map.get(coin['market']) or avg_buy_price
+
+        current_value = coin['amount'] * current_price
+        invested_value = coin['amount'] * avg_buy_price
+        profit_loss = current_value - invested_value
+        profit_rate = (profit_loss / invested_value * 100) if invested_value > 0 else 0
+
+        coins.append({
+            'coin': coin['currency'],
+            'name': coin['currency'],
+            'balance': coin['amount'],
+            'avg_price': avg_buy_price,
+            'current_price': current_price,
+            'total_value': current_value,
+            'profit_loss': profit_loss,
+            'profit_rate': profit_rate,
+            'market': coin['market'],
+            'delisted': coin['market'] in delisted
+        })
+
+        total_value_krw += current_value
+        total_invested_krw += invested_value
+
+    total_profit_loss_krw = total_value_krw - total_invested_krw - krw_balance
+    total_profit_rate = (total_profit_loss_krw / total_invested_krw * 100) if total_invested_krw > 0 else 0
+
+    return {
+        "success": True,
+        "krw": krw_balance,
+        "coins": coins,
+        "summary": {
+            "total_value_krw": total_value_krw,
+            "total_invested_krw": total_invested_krw,
+            "total_profit_loss_krw": total_profit_loss_krw,
+            "total_profit_rate": total_profit_rate,
+            "coin_count": len(coins)
+        }
+    }
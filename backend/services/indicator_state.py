@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""
+Indicator State
+
+Incrementally maintained technical indicators, shared by every service.
+
+- One IndicatorState per (market, timeframe) holds Wilder-smoothed RSI and
+  ATR, rolling SMA sums, a rolling trade-value mean/std and a rolling
+  highest high. Each newly closed candle updates them in O(1).
+- The candle still forming is kept separately; snapshot() applies it
+  provisionally (one more Wilder step) without committing it, so values
+  are current between closes.
+- IndicatorStore keeps the states for the whole process. Services either
+  pass candles they already fetched (update()) or let the store fetch only
+  the candles closed since its last update (refresh()), so every strategy
+  reads the same numbers without re-reading a full history per scan.
+"""
+
+import math
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.services.candle_repository import (
+    TIMEFRAMES, TIMEFRAME_SECONDS, get_candle_repository, parse_upbit_time
+)
+
+logger = logging.getLogger(__name__)
+
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+SMA_PERIODS = (5, 10, 20)
+VOLUME_PERIOD = 20
+# Candles kept for rolling windows (highest high, oldest close)
+WINDOW = 100
+
+
+def _wilder(average: float, value: float, period: int) -> float:
+    return (average * (period - 1) + value) / period
+
+
+def _rsi(avg_gain: Optional[float], avg_loss: Optional[float]) -> Optional[float]:
+    if avg_gain is None or avg_loss is None:
+        return None
+    if avg_loss == 0:
+        return 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class IndicatorState:
+    """
+    Indicators of one market/timeframe, updated one closed candle at a time
+    """
+
+    def __init__(self, rsi_period: int = RSI_PERIOD, atr_period: int = ATR_PERIOD,
+                 sma_periods: Iterable[int] = SMA_PERIODS, volume_period: int = VOLUME_PERIOD,
+                 window: int = WINDOW):
+        """
+        Initialize empty state
+
+        Args:
+            rsi_period: RSI period (Wilder smoothing)
+            atr_period: ATR period (Wilder smoothing)
+            sma_periods: Close SMA periods
+            volume_period: Trade value mean/std period
+            window: Candles kept for highest_high / oldest_close
+        """
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.sma_periods = tuple(sma_periods)
+        self.volume_period = volume_period
+        self.window = max(window, max(self.sma_periods, default=0) + 1, volume_period + 1)
+
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all candles"""
+        self.last_time: Optional[datetime] = None
+        self.count = 0
+        self.forming: Optional[Dict] = None
+
+        self._closes = deque(maxlen=self.window)
+        self._values = deque(maxlen=self.window)
+        # (index, high) with decreasing highs: front is the window maximum
+        self._highs = deque()
+
+        self._seed_gains = []
+        self._seed_losses = []
+        self._avg_gain = None
+        self._avg_loss = None
+
+        self._seed_trs = []
+        self._atr = None
+
+        self._sma_sums = {p: 0.0 for p in self.sma_periods}
+        self._value_sum = 0.0
+        self._value_sumsq = 0.0
+
+    # ==================== Updates ====================
+
+    def update(self, candle: Dict) -> bool:
+        """
+        Apply one closed candle (oldest first)
+
+        Args:
+            candle: Upbit candle dict
+
+        Returns:
+            bool: False if the candle is not newer than the last one applied
+        """
+        candle_time = parse_upbit_time(candle.get('candle_date_time_utc'))
+        if candle_time is not None and self.last_time is not None and candle_time <= self.last_time:
+            return False
+
+        close = float(candle['trade_price'])
+        high = float(candle['high_price'])
+        low = float(candle['low_price'])
+        value = float(candle.get('candle_acc_trade_price') or 0)
+        prev_close = self._closes[-1] if self._closes else None
+
+        if prev_close is not None:
+            change = close - prev_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if self._avg_gain is None:
+                self._seed_gains.append(gain)
+                self._seed_losses.append(loss)
+                if len(self._seed_gains) == self.rsi_period:
+                    self._avg_gain = sum(self._seed_gains) / self.rsi_period
+                    self._avg_loss = sum(self._seed_losses) / self.rsi_period
+                    self._seed_gains, self._seed_losses = [], []
+            else:
+                self._avg_gain = _wilder(self._avg_gain, gain, self.rsi_period)
+                self._avg_loss = _wilder(self._avg_loss, loss, self.rsi_period)
+
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            if self._atr is None:
+                self._seed_trs.append(tr)
+                if len(self._seed_trs) == self.atr_period:
+                    self._atr = sum(self._seed_trs) / self.atr_period
+                    self._seed_trs = []
+            else:
+                self._atr = _wilder(self._atr, tr, self.atr_period)
+
+        # Rolling sums: drop the value leaving each window before appending
+        for period in self.sma_periods:
+            if len(self._closes) >= period:
+                self._sma_sums[period] -= self._closes[-period]
+            self._sma_sums[period] += close
+        if len(self._values) >= self.volume_period:
+            leaving = self._values[-self.volume_period]
+            self._value_sum -= leaving
+            self._value_sumsq -= leaving * leaving
+        self._value_sum += value
+        self._value_sumsq += value * value
+
+        self._closes.append(close)
+        self._values.append(value)
+
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((self.count, high))
+        while self._highs[0][0] <= self.count - self.window:
+            self._highs.popleft()
+
+        self.count += 1
+        self.last_time = candle_time
+
+        if self.count % self.window == 0:
+            # Resync the rolling sums to stop floating-point drift
+            closes, values = list(self._closes), list(self._values)[-self.volume_period:]
+            self._sma_sums = {p: sum(closes[-p:]) for p in self.sma_periods}
+            self._value_sum = sum(values)
+            self._value_sumsq = sum(v * v for v in values)
+        return True
+
+    # ==================== Reads ====================
+
+    @property
+    def rsi(self) -> Optional[float]:
+        """Wilder RSI of closed candles (None until rsi_period + 1 candles)"""
+        return _rsi(self._avg_gain, self._avg_loss)
+
+    @property
+    def atr(self) -> Optional[float]:
+        """Wilder ATR of closed candles (None until atr_period + 1 candles)"""
+        return self._atr
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return self._closes[-1] if self._closes else None
+
+    def sma(self, period: int) -> Optional[float]:
+        """Close SMA for one of sma_periods (None until enough candles)"""
+        if period not in self._sma_sums or len(self._closes) < period:
+            return None
+        return self._sma_sums[period] / period
+
+    @property
+    def volume_mean(self) -> Optional[float]:
+        if len(self._values) < self.volume_period:
+            return None
+        return self._value_sum / self.volume_period
+
+    @property
+    def volume_std(self) -> Optional[float]:
+        """Sample std of trade value over volume_period"""
+        n = self.volume_period
+        if len(self._values) < n or n < 2:
+            return None
+        variance = (self._value_sumsq - self._value_sum * self._value_sum / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def highest_high(self) -> Optional[float]:
+        """Highest high over the last `window` closed candles"""
+        return self._highs[0][1] if self._highs else None
+
+    @property
+    def oldest_close(self) -> Optional[float]:
+        """Close of the oldest candle still in the window"""
+        return self._closes[0] if self._closes else None
+
+    def snapshot(self) -> Dict:
+        """
+        Current indicator values, including the forming candle provisionally
+
+        Returns:
+            dict: price, rsi, atr, sma_<p>, volume_mean, volume_std,
+            volume_ratio, highest_high, oldest_close, candles
+        """
+        with self.lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict:
+        rsi, atr = self.rsi, self.atr
+        price = self.last_close
+        highest = self.highest_high
+        volume_ratio = None
+        forming = self.forming
+        prev_close = self.last_close
+
+        if forming is not None and self.last_time is not None:
+            forming_time = parse_upbit_time(forming.get('candle_date_time_utc'))
+            if forming_time is not None and forming_time <= self.last_time:
+                forming = None  # Closed and applied since it was recorded
+
+        if forming is not None and prev_close is not None:
+            price = float(forming['trade_price'])
+            high, low = float(forming['high_price']), float(forming['low_price'])
+            change = price - prev_close
+            if self._avg_gain is not None:
+                rsi = _rsi(_wilder(self._avg_gain, max(change, 0.0), self.rsi_period),
+                           _wilder(self._avg_loss, max(-change, 0.0), self.rsi_period))
+            if self._atr is not None:
+                tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+                atr = _wilder(self._atr, tr, self.atr_period)
+            highest = max(highest, high) if highest is not None else high
+            mean = self.volume_mean
+            if mean:
+                volume_ratio = float(forming.get('candle_acc_trade_price') or 0) / mean
+
+        result = {
+            'price': price,
+            'rsi': rsi,
+            'atr': atr,
+            'volume_mean': self.volume_mean,
+            'volume_std': self.volume_std,
+            'volume_ratio': volume_ratio,
+            'highest_high': highest,
+            'oldest_close': self.oldest_close,
+            'candles': self.count
+        }
+        for period in self.sma_periods:
+            result[f'sma_{period}'] = self.sma(period)
+        return result
+
+
+class IndicatorStore:
+    """
+    Process-wide IndicatorState registry keyed by (market, timeframe)
+    """
+
+    def __init__(self, candle_repository=None, warmup: int = WINDOW):
+        """
+        Initialize store
+
+        Args:
+            candle_repository: Candle source for refresh() (default: shared CandleRepository)
+            warmup: Candles loaded the first time a state is refreshed
+        """
+        self._candle_repository = candle_repository
+        self.warmup = warmup
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+        self.stats = {'updates': 0, 'applied_candles': 0, 'rebuilds': 0, 'refreshes': 0}
+
+    @property
+    def candle_repository(self):
+        if self._candle_repository is None:
+            self._candle_repository = get_candle_repository()
+        return self._candle_repository
+
+    def get(self, market: str, interval: str = 'day') -> Optional[IndicatorState]:
+        """Get a state without updating it (None if never updated)"""
+        with self._lock:
+            return self._states.get((market, TIMEFRAMES.get(str(interval), str(interval))))
+
+    def update(self, market: str, interval: str, candles: List[Dict]) -> IndicatorState:
+        """
+        Feed candles a caller already has
+
+        Candles closed after the state's last one are applied; the newest
+        candle, if still open, becomes the forming candle. If the list does
+        not reach back to the state's last candle (a gap), the state is
+        rebuilt from the list.
+
+        Args:
+            market: Market code
+            interval: UpbitAPI.get_candles interval ('15', 'day', ...)
+            candles: Upbit candles, newest first
+
+        Returns:
+            IndicatorState
+        """
+        timeframe = TIMEFRAMES.get(str(interval), str(interval))
+        with self._lock:
+            state = self._states.get((market, timeframe))
+            if state is None:
+                state = self._states[(market, timeframe)] = IndicatorState()
+
+        period = TIMEFRAME_SECONDS.get(timeframe, 0)
+        now = datetime.utcnow()
+        closed, forming = [], None
+        for candle in reversed(candles or []):
+            start = parse_upbit_time(candle.get('candle_date_time_utc'))
+            if start is not None and (start - now).total_seconds() + period > 0:
+                forming = candle
+            else:
+                closed.append(candle)
+
+        with state.lock:
+            if closed and state.last_time is not None:
+                oldest = parse_upbit_time(closed[0].get('candle_date_time_utc'))
+                if oldest is not None and oldest > state.last_time:
+                    # Cannot tell whether candles were missed: start over
+                    state.reset()
+                    self.stats['rebuilds'] += 1
+            applied = sum(1 for candle in closed if state.update(candle))
+            if forming is not None or applied:
+                state.forming = forming
+
+        self.stats['updates'] += 1
+        self.stats['applied_candles'] += applied
+        return state
+
+    def refresh(self, market: str, interval: str = 'day') -> IndicatorState:
+        """
+        Bring a state up to date, fetching only candles closed since its last update
+
+        Args:
+            market: Market code
+            interval: UpbitAPI.get_candles interval
+
+        Returns:
+            IndicatorState
+        """
+        timeframe = TIMEFRAMES.get(str(interval), str(interval))
+        state = self.get(market, interval)
+        count = self.warmup
+        if state is not None and state.last_time is not None:
+            period = TIMEFRAME_SECONDS.get(timeframe, 60)
+            elapsed = int((datetime.utcnow() - state.last_time).total_seconds() // period)
+            # Overlap the last applied candle so update() sees no gap
+            count = min(self.warmup, max(elapsed + 1, 2))
+
+        self.stats['refreshes'] += 1
+        candles = self.candle_repository.get_candles(market, interval, count=count)
+        return self.update(market, interval, candles)
+
+    def get_stats(self) -> Dict:
+        """
+        Get store counters
+
+        Returns:
+            dict: counters plus number of tracked states
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['states'] = len(self._states)
+        return stats
+
+
+# Global instance
+_indicator_store = None
+_indicator_store_lock = threading.Lock()
+
+
+def get_indicator_store() -> IndicatorStore:
+    """
+    Get or create indicator store singleton
+
+    Returns:
+        IndicatorStore instance
+    """
+    global _indicator_store
+
+    with _indicator_store_lock:
+        if _indicator_store is None:
+            _indicator_store = IndicatorStore()
+
+    return _indicator_store
@@ -0,0 +1,323 @@
+"""
+Leader Lease
+
+DB-backed leases that keep exactly one active instance of each background
+job across every web/worker process.
+
+- Each job has one row in service_leases (job, holder, expires_at). A
+  process holds the job while it keeps renewing the row before expires_at;
+  anyone may take over a row whose lease has expired.
+- Acquire/renew is a single conditional UPDATE (or INSERT for a new job),
+  so two processes can never both succeed; it works on PostgreSQL and SQLite.
+- A holder that cannot renew (DB unreachable) treats the lease as lost
+  well before another process can take it over.
+- LeaseSupervisor runs the renew loop and starts/stops each job as its
+  lease is gained or lost. Starts and stops run in their own thread so a
+  slow job startup or shutdown never delays renewing the other leases; a
+  job is not started again until its previous instance has fully stopped.
+
+LEADER_LEASE_TTL should comfortably exceed the clock skew between hosts.
+"""
+
+import os
+import time
+import uuid
+import socket
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from backend.database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE_TTL = int(os.getenv('LEADER_LEASE_TTL', 30))  # seconds
+
+
+def default_holder_id() -> str:
+    """Unique id of this process (host:pid:random)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaderLease:
+    """
+    Lease on one job
+    """
+
+    def __init__(self, job: str, holder: Optional[str] = None, ttl: int = LEADER_LEASE_TTL):
+        """
+        Initialize lease
+
+        Args:
+            job: Job name (row key)
+            holder: Holder id (default: default_holder_id())
+            ttl: Seconds a lease is valid without renewal
+        """
+        self.job = job
+        self.holder = holder or default_holder_id()
+        self.ttl = ttl
+        # Local deadline; past it we no longer consider ourselves leader
+        self._valid_until = 0.0
+
+    @property
+    def is_held(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def try_acquire(self) -> bool:
+        """
+        Acquire or renew the lease
+
+        Returns:
+            True if this process holds the lease
+        """
+        started = time.monotonic()
+        now = datetime.utcnow()
+        params = {
+            'job': self.job,
+            'holder': self.holder,
+            'now': now,
+            'expires_at': now + timedelta(seconds=self.ttl)
+        }
+
+        session = get_db_session()
+        try:
+            # Renew our own lease or take over an expired one
+            result = session.execute(text("""
+                UPDATE service_leases
+                SET acquired_at = CASE WHEN holder = :holder THEN acquired_at ELSE :now END,
+                    holder = :holder,
+                    expires_at = :expires_at
+                WHERE job = :job
+                AND (holder = :holder OR expires_at < :now)
+            """), params)
+            acquired = result.rowcount == 1
+
+            if not acquired:
+                exists = session.execute(
+                    text("SELECT 1 FROM service_leases WHERE job = :job"), params
+                ).fetchone()
+                if exists is None:
+                    session.execute(text("""
+                        INSERT INTO service_leases (job, holder, acquired_at, expires_at)
+                        VALUES (:job, :holder, :now, :expires_at)
+                    """), params)
+                    acquired = True
+
+            session.commit()
+
+        except IntegrityError:
+            # Another process inserted the row first
+            session.rollback()
+            acquired = False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"[LeaderLease] {self.job}: lease check failed: {e}")
+            # Keep what we had until the local deadline passes
+            return self.is_held
+        finally:
+            session.close()
+
+        if acquired:
+            # Stop considering ourselves leader a third of the TTL early
+            self._valid_until = started + self.ttl * 2 / 3
+        else:
+            self._valid_until = 0.0
+        return acquired
+
+    def release(self):
+        """Give the lease up so another process can take over immediately"""
+        self._valid_until = 0.0
+        session = get_db_session()
+        try:
+            session.execute(
+                text("DELETE FROM service_leases WHERE job = :job AND holder = :holder"),
+                {'job': self.job, 'holder': self.holder}
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"[LeaderLease] {self.job}: release failed: {e}")
+        finally:
+            session.close()
+
+
+class _Job:
+    __slots__ = ('name', 'start', 'stop', 'lease', 'handle', 'active', 'starter', 'stopper')
+
+    def __init__(self, name, start, stop, lease):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.lease = lease
+        self.handle = None
+        self.active = False
+        self.starter = None  # Thread running start(), while it runs
+        self.stopper = None  # Thread running stop(), while it runs
+
+
+class LeaseSupervisor:
+    """
+    Runs background jobs only while this process holds their lease
+
+    Usage:
+        supervisor = LeaseSupervisor()
+        supervisor.register('position_monitor', start_monitor, stop_monitor)
+        supervisor.start()
+    """
+
+    def __init__(self, ttl: int = LEADER_LEASE_TTL, holder: Optional[str] = None):
+        """
+        Initialize supervisor
+
+        Args:
+            ttl: Lease TTL in seconds (renewed every ttl / 3)
+            holder: Holder id shared by all of this process's leases
+        """
+        self.ttl = ttl
+        self.holder = holder or default_holder_id()
+        self.renew_interval = max(1.0, ttl / 3)
+
+        self._jobs: Dict[str, _Job] = {}
+        self._running = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def register(self, name: str, start: Callable, stop: Optional[Callable] = None):
+        """
+        Register a job
+
+        Args:
+            name: Job (lease) name
+            start: Called when the lease is gained; its return value is passed to stop
+            stop: Called with start's return value when the lease is lost or released
+        """
+        self._jobs[name] = _Job(name, start, stop, LeaderLease(name, self.holder, self.ttl))
+
+    def start(self):
+        """Start the renew loop in a background thread"""
+        if self._running:
+            return
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name='LeaseSupervisor')
+        self._thread.start()
+        logger.info(f"[LeaseSupervisor] Started as {self.holder} (jobs: {', '.join(self._jobs)})")
+
+    def run_forever(self):
+        """Run the renew loop in the calling thread (worker entry point)"""
+        self._running = True
+        self._loop()
+
+    def request_stop(self):
+        """Make the renew loop return (safe to call from a signal handler)"""
+        self._running = False
+        self._stop_event.set()
+
+    def stop(self):
+        """Stop every active job, then release its lease"""
+        self.request_stop()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.renew_interval + 5)
+
+        # A job still starting is stopped once its start() returns
+        for job in self._jobs.values():
+            if job.starter is not None:
+                job.starter.join()
+                job.starter = None
+
+        held = [job for job in self._jobs.values() if job.active]
+        # Stop in parallel, but only hand the lease over once the job is down
+        for job in held:
+            self._deactivate(job)
+        for job in self._jobs.values():
+            if job.stopper is not None:
+                job.stopper.join()
+                job.stopper = None
+        for job in held:
+            job.lease.release()
+        logger.info("[LeaseSupervisor] Stopped")
+
+    def _loop(self):
+        while self._running:
+            self.check_leases()
+            self._stop_event.wait(self.renew_interval)
+
+    def check_leases(self):
+        """Acquire/renew every lease once and start/stop jobs accordingly"""
+        for job in self._jobs.values():
+            if job.stopper is not None:
+                if job.stopper.is_alive():
+                    # Previous instance still shutting down; leave the lease
+                    # to others rather than run two instances here
+                    continue
+                job.stopper = None
+
+            held = job.lease.try_acquire()
+
+            if job.starter is not None:
+                if job.starter.is_alive():
+                    # Keep renewing while start() runs; a lost lease is
+                    # handled once the job is up
+                    continue
+                job.starter = None
+
+            if held and not job.active:
+                logger.info(f"[LeaseSupervisor] Lease acquired: {job.name}")
+                job.starter = threading.Thread(target=self._run_start, args=(job,), daemon=True,
+                                               name=f'LeaseSupervisor-start-{job.name}')
+                job.starter.start()
+
+            elif not held and job.active:
+                logger.warning(f"[LeaseSupervisor] Lease lost: {job.name}, stopping")
+                self._deactivate(job)
+
+    def _run_start(self, job: _Job):
+        try:
+            job.handle = job.start()
+            job.active = True
+        except Exception as e:
+            logger.error(f"[LeaseSupervisor] Failed to start {job.name}: {e}")
+            # Let another process try
+            job.lease.release()
+
+    def _deactivate(self, job: _Job):
+        job.active = False
+        handle, job.handle = job.handle, None
+        if job.stop is None:
+            return
+        job.stopper = threading.Thread(target=self._run_stop, args=(job, handle), daemon=True,
+                                       name=f'LeaseSupervisor-stop-{job.name}')
+        job.stopper.start()
+
+    def _run_stop(self, job: _Job, handle):
+        try:
+            job.stop(handle)
+        except Exception as e:
+            logger.error(f"[LeaseSupervisor] Error stopping {job.name}: {e}")
+        logger.info(f"[LeaseSupervisor] Stopped {job.name}")
+
+    def get_handle(self, name: str):
+        """Return value of the job's start() while it is active here, else None"""
+        job = self._jobs.get(name)
+        return job.handle if job is not None and job.active else None
+
+    def get_status(self) -> Dict:
+        """
+        Get job states
+
+        Returns:
+            dict: holder, {job: active} and jobs still starting/stopping
+        """
+        return {
+            'holder': self.holder,
+            'jobs': {name: job.active for name, job in self._jobs.items()},
+            'starting': [name for name, job in self._jobs.items()
+                         if job.starter is not None and job.starter.is_alive()],
+            'stopping': [name for name, job in self._jobs.items()
+                         if job.stopper is not None and job.stopper.is_alive()]
+        }
@@ -61,7 +61,6 @@ class MarketFilter:
                 tickers = self.upbit_api.get_current_prices(markets=batch)
                 if tickers:
                     all_tickers.extend(tickers.values())  # Convert dict to list
-                time.sleep(0.1)  # Rate limit
 
             # 5. 거래대금 기준 정렬 (내림차순)
             all_tickers.sort(
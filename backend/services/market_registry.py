@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Market Registry
+
+Process-wide list of markets currently listed on Upbit.
+
+Upbit answers /v1/ticker with 404 for the whole request if any market in
+it is not listed, so callers drop delisted markets before batching. The
+listing comes from /v1/market/all (refreshed every `ttl` seconds); a held
+coin whose market is missing from it is delisted.
+"""
+
+import time
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from backend.common import UpbitAPI
+
+logger = logging.getLogger(__name__)
+
+
+class MarketRegistry:
+    """
+    Listed / delisted market lookup
+    """
+
+    def __init__(self, upbit_api: Optional[UpbitAPI] = None, ttl: float = 3600.0, retry_after: float = 60.0):
+        """
+        Initialize registry
+
+        Args:
+            upbit_api: Upbit API client (default: public client)
+            ttl: Seconds between listing refreshes
+            retry_after: Seconds before retrying a failed listing fetch
+        """
+        self.upbit_api = upbit_api or UpbitAPI(None, None)
+        self.ttl = ttl
+        self.retry_after = retry_after
+
+        self._listed: Set[str] = set()
+        self._loaded_at = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the listing if it is older than ttl
+
+        Args:
+            force: Reload regardless of age
+
+        Returns:
+            bool: True if a listing is available
+        """
+        now = time.monotonic()
+        if not force and self._loaded_at is not None and now - self._loaded_at < self.ttl:
+            return True
+        if not force and now < self._next_attempt:
+            return self._loaded_at is not None
+
+        with self._refresh_lock:
+            if not force and self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return True
+
+            markets = self.upbit_api.get_markets()
+            if not markets:
+                self._next_attempt = time.monotonic() + self.retry_after
+                logger.warning("[MarketRegistry] Market listing unavailable")
+                return self._loaded_at is not None
+
+            listed = {m['market'] for m in markets if m.get('market')}
+            with self._lock:
+                newly_delisted = self._listed - listed
+                self._listed = listed
+                self._loaded_at = time.monotonic()
+            if newly_delisted:
+                logger.info(f"[MarketRegistry] Delisted since last refresh: {sorted(newly_delisted)}")
+            return True
+
+    def is_listed(self, market: str) -> bool:
+        """
+        Check whether a market is listed
+
+        Unknown (no listing could be loaded) counts as listed.
+        """
+        available = self.refresh()
+        with self._lock:
+            return market in self._listed if available else True
+
+    def filter_listed(self, markets: Iterable[str]) -> List[str]:
+        """
+        Drop delisted markets, keeping order
+
+        Args:
+            markets: Market codes
+
+        Returns:
+            Listed markets (all markets if no listing could be loaded)
+        """
+        available = self.refresh()
+        with self._lock:
+            if not available:
+                return list(markets)
+            return [m for m in markets if m in self._listed]
+
+    def get_stats(self) -> Dict:
+        """
+        Get registry state
+
+        Returns:
+            dict: listed count, listing age
+        """
+        with self._lock:
+            return {
+                'listed_markets': len(self._listed),
+                'listing_age': None if self._loaded_at is None else round(time.monotonic() - self._loaded_at, 1)
+            }
+
+
+# Global instance
+_market_registry = None
+_market_registry_lock = threading.Lock()
+
+
+def get_market_registry() -> MarketRegistry:
+    """
+    Get or create market registry singleton
+
+    Returns:
+        MarketRegistry instance
+    """
+    global _market_registry
+
+    with _market_registry_lock:
+        if _market_registry is None:
+            _market_registry = MarketRegistry()
+
+    return _market_registry
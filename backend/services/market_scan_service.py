@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Market Scan Service
+
+Bounded-concurrency candle fetch + SurgePredictor scoring for a whole
+market universe. Shared by SurgeAlertScheduler, SurgeAutoTradingWorker and
+the legacy /surge-candidates-legacy route so one scan cycle downloads each
+market's candles once.
+
+- Candle downloads fan out over a small thread pool; pacing is left to the
+  UpbitAPI rate governor, so a cycle takes roughly the quotation-limit floor.
+- Candles come from the local candle repository, so only each market's
+  newest candles are actually downloaded.
+- Results are kept for `max_age` seconds and concurrent requests for the
+  same market share a single in-flight download.
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from backend.services.candle_repository import CandleRepository, get_candle_repository
+
+logger = logging.getLogger(__name__)
+
+
+class MarketScanner:
+    """
+    Parallel candle fetcher and scorer for surge detection
+    """
+
+    def __init__(self, candle_repository: Optional[CandleRepository] = None, max_workers: int = 8, max_age: int = 60):
+        """
+        Initialize scanner
+
+        Args:
+            candle_repository: Candle source (default: shared local-first repository)
+            max_workers: Maximum concurrent candle downloads
+            max_age: Seconds fetched candles are reused across callers
+        """
+        self.candle_repository = candle_repository or get_candle_repository()
+        self.max_age = max_age
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='market-scan')
+
+        # (market, count) -> (fetched_at, candles)
+        self._candles: Dict[tuple, tuple] = {}
+        # (market, count) -> Future of an in-flight download
+        self._inflight: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _download(self, key: tuple) -> List[Dict]:
+        market, count = key
+        try:
+            candles = self.candle_repository.get_candles_days(market, count=count) or []
+        except Exception as e:
+            logger.error(f"[MarketScanner] Candle fetch failed for {market}: {e}")
+            candles = []
+
+        with self._lock:
+            if candles:
+                self._candles[key] = (time.time(), candles)
+            self._inflight.pop(key, None)
+
+        return candles
+
+    def fetch_candles(self, markets: List[str], count: int = 30, max_age: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        Get daily candles for many markets, downloading stale ones in parallel
+
+        Args:
+            markets: Market codes (e.g., ['KRW-BTC', 'KRW-ETH'])
+            count: Number of daily candles per market
+            max_age: Reuse candles fetched within this many seconds (default: self.max_age)
+
+        Returns:
+            Dict of {market: candles}; markets that failed map to an empty list
+        """
+        max_age = self.max_age if max_age is None else max_age
+        now = time.time()
+        result = {}
+        pending = {}
+
+        with self._lock:
+            for market in markets:
+                key = (market, count)
+                cached = self._candles.get(key)
+                if cached and now - cached[0] < max_age:
+                    result[market] = cached[1]
+                    continue
+
+                future = self._inflight.get(key)
+                if future is None:
+                    future = self.executor.submit(self._download, key)
+                    self._inflight[key] = future
+                pending[market] = future
+
+        for market, future in pending.items():
+            try:
+                result[market] = future.result()
+            except Exception as e:
+                logger.error(f"[MarketScanner] Candle fetch failed for {market}: {e}")
+                result[market] = []
+
+        return result
+
+    def scan(self, markets: List[str], predictor, min_score: float = 0, count: int = 30,
+             max_age: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch candles for all markets and score them with a SurgePredictor
+
+        Args:
+            markets: Market codes to scan
+            predictor: SurgePredictor instance (caller's own config)
+            min_score: Only return markets scoring at least this much
+            count: Number of daily candles per market
+            max_age: Candle reuse window in seconds (default: self.max_age)
+
+        Returns:
+            List of dicts with market, candles, current_price and analysis,
+            in the order of `markets`
+        """
+        started = time.time()
+        candles_by_market = self.fetch_candles(markets, count=count, max_age=max_age)
+
+        eligible = {}
+        for market in markets:
+            candle_data = candles_by_market.get(market)
+            if not candle_data or len(candle_data) < 20:
+                continue
+            if float(candle_data[0].get('trade_price', 0)) == 0:
+                continue
+            eligible[market] = candle_data
+
+        # Score the whole universe in one vectorized pass when supported
+        if hasattr(predictor, 'analyze_batch'):
+            analyses = predictor.analyze_batch(eligible)
+        else:
+            analyses = {
+                market: predictor.analyze_coin(market, candle_data, float(candle_data[0].get('trade_price', 0)))
+                for market, candle_data in eligible.items()
+            }
+
+        results = []
+        for market, candle_data in eligible.items():
+            analysis = analyses.get(market)
+            if analysis and analysis['score'] >= min_score:
+                results.append({
+                    'market': market,
+                    'candles': candle_data,
+                    'current_price': float(candle_data[0].get('trade_price', 0)),
+                    'analysis': analysis
+                })
+
+        logger.info(f"[MarketScanner] Scanned {len(markets)} markets in {time.time() - started:.1f}s "
+                    f"({len(results)} >= {min_score})")
+        return results
+
+    def invalidate(self, market: Optional[str] = None):
+        """
+        Drop cached candles
+
+        Args:
+            market: Only drop this market (default: all)
+        """
+        with self._lock:
+            if market is None:
+                self._candles.clear()
+            else:
+                for key in [k for k in self._candles if k[0] == market]:
+                    del self._candles[key]
+
+
+# Global instance
+_market_scanner = None
+_market_scanner_lock = threading.Lock()
+
+
+def get_market_scanner() -> MarketScanner:
+    """
+    Get or create market scanner singleton
+
+    Returns:
+        MarketScanner instance
+    """
+    global _market_scanner
+
+    with _market_scanner_lock:
+        if _market_scanner is None:
+            _market_scanner = MarketScanner()
+
+    return _market_scanner
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Order Sync Engine
+
+Runs OrderSyncService jobs for many users (and markets) concurrently.
+
+- One job per (user, market); jobs of different users run in parallel on a
+  thread pool, each user's requests paced by the rate governor bucket of
+  that user's access key.
+- A user whose full history sync has not finished (no SyncStatus
+  completion, or a saved page cursor) gets a resumable full sync;
+  everybody else gets an incremental sync.
+- A job already running for a (user, market) is skipped, so the periodic
+  sweep and on-demand syncs never overlap.
+- Users are loaded with the same key precedence as get_user_upbit_api:
+  plain keys on the user row, else the active encrypted upbit_api_keys row,
+  decrypted once per pooled client.
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from backend.common import UpbitAPI, get_upbit_client_pool, key_fingerprint
+from backend.database import get_db_session, User, SyncStatus
+from backend.models.user_api_key import UpbitAPIKey
+from backend.services.order_sync_service import OrderSyncService
+from backend.utils.crypto import decrypt_api_credentials
+
+logger = logging.getLogger(__name__)
+
+
+class OrderSyncEngine:
+    """
+    Concurrent per-user order synchronization
+    """
+
+    def __init__(self, max_workers: int = 8, page_window: int = 4, max_orders: int = 10000):
+        """
+        Initialize engine
+
+        Args:
+            max_workers: Concurrent sync jobs
+            page_window: Pages fetched concurrently within one full sync
+            max_orders: Safety limit per full sync run (the cursor resumes the rest)
+        """
+        self.max_workers = max_workers
+        self.page_window = page_window
+        self.max_orders = max_orders
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='order-sync')
+        self._running = set()
+        self._lock = threading.Lock()
+        self.stats = {'jobs': 0, 'skipped': 0, 'failed': 0, 'orders': 0}
+
+    def load_users(self) -> List[Tuple[int, UpbitAPI]]:
+        """
+        Load active users with Upbit API keys (one query) and their pooled clients
+
+        Users whose stored keys cannot be decrypted are logged and skipped.
+
+        Returns:
+            List of (user_id, UpbitAPI)
+        """
+        db = get_db_session()
+        try:
+            rows = db.query(
+                User.id, User.upbit_access_key, User.upbit_secret_key,
+                UpbitAPIKey.access_key_encrypted, UpbitAPIKey.secret_key_encrypted
+            ).outerjoin(
+                UpbitAPIKey, and_(UpbitAPIKey.user_id == User.id, UpbitAPIKey.is_active == True)  # noqa: E712
+            ).filter(
+                User.is_active == True,  # noqa: E712
+                or_(
+                    and_(User.upbit_access_key.isnot(None), User.upbit_secret_key.isnot(None)),
+                    UpbitAPIKey.id.isnot(None)
+                )
+            ).all()
+        finally:
+            db.close()
+
+        pool = get_upbit_client_pool()
+        users = []
+        for row in rows:
+            # Plain keys on the user row take precedence over the encrypted key store
+            if row.upbit_access_key and row.upbit_secret_key:
+                stored = (row.upbit_access_key, row.upbit_secret_key)
+                load_credentials = lambda stored=stored: stored  # noqa: E731
+            else:
+                stored = (row.access_key_encrypted, row.secret_key_encrypted)
+                load_credentials = lambda stored=stored: decrypt_api_credentials(*stored)  # noqa: E731
+
+            try:
+                users.append((row.id, pool.get(row.id, key_fingerprint(*stored), load_credentials)))
+            except Exception as e:
+                logger.error(f"[OrderSyncEngine] User {row.id}: cannot load Upbit API keys: {e}")
+        return users
+
+    def _needs_full_sync(self, service: OrderSyncService, market: Optional[str]) -> bool:
+        """Full sync until one has completed for this sync key"""
+        db = get_db_session()
+        try:
+            status = db.query(SyncStatus).filter_by(market=service.sync_key(market)).first()
+            return status is None or status.full_sync_completed_at is None or status.cursor_page is not None
+        finally:
+            db.close()
+
+    def sync_user(self, user_id: int, upbit_api: UpbitAPI, market: Optional[str] = None,
+                  full: Optional[bool] = None) -> Dict:
+        """
+        Run one sync job in the calling thread
+
+        Args:
+            user_id: User to sync
+            upbit_api: UpbitAPI instance with the user's keys
+            market: Market code (default: all markets)
+            full: Force full (True) or incremental (False) sync; None decides from SyncStatus
+
+        Returns:
+            dict: OrderSyncService result (with 'user_id', 'market', 'mode')
+        """
+        job = (user_id, market)
+        with self._lock:
+            if job in self._running:
+                self.stats['skipped'] += 1
+                return {'success': True, 'skipped': True, 'user_id': user_id, 'market': market}
+            self._running.add(job)
+
+        try:
+            service = OrderSyncService(upbit_api, user_id=user_id, page_window=self.page_window)
+            if full is None:
+                full = self._needs_full_sync(service, market)
+
+            if full:
+                result = service.initial_full_sync(market=market, max_orders=self.max_orders)
+            else:
+                result = service.incremental_sync(market=market)
+
+            with self._lock:
+                self.stats['jobs'] += 1
+                self.stats['orders'] += result.get('synced_count', 0)
+                if not result.get('success'):
+                    self.stats['failed'] += 1
+
+            result.update(user_id=user_id, market=market, mode='full' if full else 'incremental')
+            return result
+
+        except Exception as e:
+            logger.error(f"[OrderSyncEngine] User {user_id} ({market or 'all'}) sync error: {e}")
+            with self._lock:
+                self.stats['failed'] += 1
+            return {'success': False, 'error': str(e), 'user_id': user_id, 'market': market}
+
+        finally:
+            with self._lock:
+                self._running.discard(job)
+
+    def submit(self, user_id: int, upbit_api: UpbitAPI, market: Optional[str] = None, full: Optional[bool] = None):
+        """
+        Run one sync job on the pool (e.g. right after a user saves API keys)
+
+        Returns:
+            Future resolving to the sync_user() result
+        """
+        return self._executor.submit(self.sync_user, user_id, upbit_api, market, full)
+
+    def sync_all(self, markets: Optional[Iterable[str]] = None, full: Optional[bool] = None,
+                 users: Optional[List[Tuple[int, UpbitAPI]]] = None) -> Dict:
+        """
+        Sync every user with API keys concurrently and wait for completion
+
+        Args:
+            markets: Markets to sync per user (default: all markets in one job)
+            full: Force full/incremental sync (default: decided per job)
+            users: (user_id, UpbitAPI) list (default: load_users())
+
+        Returns:
+            dict: Summary with per-job results
+        """
+        started = time.time()
+        users = self.load_users() if users is None else users
+        markets = list(markets) if markets else [None]
+
+        futures = [
+            self.submit(user_id, upbit_api, market, full)
+            for user_id, upbit_api in users
+            for market in markets
+        ]
+        results = [future.result() for future in futures]
+
+        summary = {
+            'success': all(r.get('success') for r in results),
+            'users': len(users),
+            'jobs': len(results),
+            'failed': sum(1 for r in results if not r.get('success')),
+            'synced_count': sum(r.get('synced_count', 0) for r in results),
+            'duration': round(time.time() - started, 2),
+            'results': results
+        }
+        logger.info(
+            f"[OrderSyncEngine] {summary['jobs']} jobs for {summary['users']} users: "
+            f"{summary['synced_count']} orders, {summary['failed']} failed ({summary['duration']}s)"
+        )
+        return summary
+
+    def get_stats(self) -> Dict:
+        """
+        Get engine counters
+
+        Returns:
+            dict: jobs, skipped, failed, orders, running
+        """
+        with self._lock:
+            return {**self.stats, 'running': len(self._running), 'max_workers': self.max_workers}
+
+    def shutdown(self):
+        """Stop accepting jobs and wait for running ones"""
+        self._executor.shutdown(wait=True)
+
+
+# Global instance
+_order_sync_engine = None
+_order_sync_engine_lock = threading.Lock()
+
+
+def get_order_sync_engine() -> OrderSyncEngine:
+    """
+    Get or create order sync engine singleton
+
+    Returns:
+        OrderSyncEngine instance
+    """
+    global _order_sync_engine
+
+    with _order_sync_engine_lock:
+        if _order_sync_engine is None:
+            _order_sync_engine = OrderSyncEngine()
+
+    return _order_sync_engine
@@ -4,9 +4,77 @@ Order Sync Service Module
 Synchronizes trading orders from Upbit API to local database.
 """
 
-import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from backend.database import get_db_session, Order, SyncStatus
+from backend.services.cost_basis_ledger import get_cost_basis_ledger, FILLED_STATES
+
+# Orders per Upbit page (API maximum)
+PAGE_SIZE = 100
+
+# Incremental sync pages through at most this many pages looking for the last synced order
+MAX_INCREMENTAL_PAGES = 10
+
+
+def collapse_trades(rows):
+    """
+    Merge per-trade rows from get_orders_history(include_trades=True) back into orders.
+
+    The API helper returns one row per execution (sharing the order UUID), which
+    would otherwise hit the same primary key several times in one bulk upsert.
+
+    Args:
+        rows (list): Orders and/or per-trade rows
+
+    Returns:
+        list: One dict per order, newest first, with trades, executed_funds and avg_price filled in
+    """
+    orders = {}
+
+    for row in rows:
+        uuid = row.get('uuid')
+        if not uuid:
+            continue
+
+        if 'order_created_at' not in row:
+            # Order without trade details
+            orders.setdefault(uuid, dict(row))
+            continue
+
+        order = orders.get(uuid)
+        if order is None:
+            order = {k: v for k, v in row.items() if k not in ('order_created_at', 'price', 'volume', 'funds')}
+            order['created_at'] = row.get('order_created_at')
+            order['executed_at'] = None
+            order['executed_funds'] = 0.0
+            order['trades'] = []
+            orders[uuid] = order
+
+        order['trades'].append({
+            'price': row.get('price'),
+            'volume': row.get('volume'),
+            'funds': row.get('funds'),
+            'created_at': row.get('executed_at')
+        })
+        order['executed_funds'] += float(row.get('funds') or 0)
+        if row.get('executed_at') and (not order['executed_at'] or row['executed_at'] > order['executed_at']):
+            order['executed_at'] = row['executed_at']
+
+    for order in orders.values():
+        executed_volume = float(order.get('executed_volume') or 0)
+        if order.get('trades') and not order.get('avg_price') and executed_volume > 0:
+            order['avg_price'] = order['executed_funds'] / executed_volume
+
+    return sorted(orders.values(), key=lambda o: o.get('created_at') or '', reverse=True)
+
+
+def _dialect_insert(db_session):
+    """Return the dialect's INSERT construct supporting ON CONFLICT"""
+    if db_session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
 
 
 class OrderSyncService:
@@ -14,26 +82,79 @@ class OrderSyncService:
     Service class for synchronizing Upbit orders to database.
 
     Features:
-    - Initial full sync (all historical orders)
+    - Initial full sync (all historical orders), resumable from a page cursor
     - Incremental sync (new orders only)
-    - Automatic retry on failures
+    - One multi-row upsert per page
     - Progress tracking
+    - Cost basis ledger folding of new fills (when syncing for a user)
+
+    Requests are paced by the UpbitAPI rate governor (per access key), so
+    several pages can be in flight without explicit sleeps.
     """
 
-    def __init__(self, upbit_api):
+    def __init__(self, upbit_api, user_id=None, page_window=4):
         """
         Initialize OrderSyncService.
 
         Args:
             upbit_api: UpbitAPI instance for fetching orders
+            user_id (int, optional): Owner of the orders; enables per-user sync status and the cost basis ledger
+            page_window (int): Pages fetched concurrently during a full sync
         """
         self.upbit_api = upbit_api
+        self.user_id = user_id
+        self.page_window = max(1, page_window)
+
+    def sync_key(self, market=None):
+        """
+        SyncStatus key for a market (or all markets).
+
+        Args:
+            market (str, optional): Market code
+
+        Returns:
+            str: "KRW-BTC" / "all", prefixed with "<user_id>:" for per-user syncs
+        """
+        key = market or 'all'
+        return key if self.user_id is None else f'{self.user_id}:{key}'
+
+    def fetch_page(self, market=None, page=1):
+        """
+        Fetch one page of closed orders with execution details.
+
+        Both 'done' and 'cancel' orders are fetched: market buys (and partly
+        filled limit orders) end as 'cancel' with fills.
+
+        Args:
+            market (str, optional): Market code to filter
+            page (int): Page number (newest first)
+
+        Returns:
+            list: Orders (one entry per order; empty past the last page),
+                  or None if the request failed
+        """
+        rows = self.upbit_api.get_orders_history(
+            market=market,
+            states=FILLED_STATES,
+            limit=PAGE_SIZE,
+            page=page,
+            order_by='desc',
+            include_trades=True,  # Include execution details
+            strict=True
+        )
+        if rows is None:
+            return None
+        return collapse_trades(rows) if rows else []
 
     def initial_full_sync(self, market=None, max_orders=10000):
         """
         Perform initial full synchronization of all orders.
 
         Fetches all completed orders from Upbit API (up to API limit ~3 months).
+        Each page is written together with the next-page cursor, so an
+        interrupted sync continues from the last written page. New orders
+        arriving meanwhile only shift older ones to later pages, which are
+        re-read rather than skipped.
 
         Args:
             market (str, optional): Market code to filter (e.g., 'KRW-BTC')
@@ -46,74 +167,102 @@ class OrderSyncService:
         print(f"Starting Initial Full Sync")
         if market:
             print(f"Market: {market}")
+        if self.user_id is not None:
+            print(f"User: {self.user_id}")
         print(f"{'='*60}\n")
 
         db = get_db_session()
         synced_count = 0
-        page = 1
-        total_pages_estimated = "?"
+        synced_orders = []
         errors = []
+        completed = False
+        fetch_failed = False
 
         try:
-            while synced_count < max_orders:
-                print(f"[Sync] Fetching page {page}/{total_pages_estimated}... ", end='', flush=True)
-
-                # Fetch orders from Upbit API
-                orders = self.upbit_api.get_orders_history(
-                    market=market,
-                    state='done',
-                    limit=100,
-                    page=page,
-                    order_by='desc',
-                    include_trades=True  # Include execution details
-                )
-
-                if not orders:
-                    print("No more orders")
-                    break
-
-                print(f"Got {len(orders)} orders")
-
-                # Save to database
-                for order in orders:
-                    try:
-                        self.upsert_order(db, order)
-                        synced_count += 1
-
-                        if synced_count % 100 == 0:
-                            print(f"[Sync] Progress: {synced_count} orders synced")
-
-                    except Exception as e:
-                        error_msg = f"Failed to sync order {order.get('uuid', 'unknown')}: {str(e)}"
-                        print(f"[Sync] ERROR: {error_msg}")
-                        errors.append(error_msg)
-
-                # Commit batch
-                db.commit()
-
-                # Stop if we got fewer orders than requested (last page)
-                if len(orders) < 100:
-                    print(f"[Sync] Reached last page (got {len(orders)} < 100)")
-                    break
-
-                page += 1
-                time.sleep(0.15)  # Rate limit protection (6-7 requests/second)
+            sync_status = self.get_sync_status(db, market)
+            page = sync_status.cursor_page or 1
+            if page > 1:
+                print(f"[Sync] Resuming full sync from page {page}")
+
+            with ThreadPoolExecutor(max_workers=self.page_window) as executor:
+                while synced_count < max_orders and not completed and not fetch_failed:
+                    # Fetch a window of pages concurrently, write them in order
+                    pages = list(range(page, page + self.page_window))
+                    results = list(executor.map(lambda p: self.fetch_page(market, p), pages))
+
+                    for current_page, orders in zip(pages, results):
+                        if orders is None:
+                            # Not the end of history: keep the cursor and resume here next run
+                            error_msg = f"Failed to fetch page {current_page}"
+                            print(f"[Sync] ERROR: {error_msg}, will resume from page {current_page}")
+                            errors.append(error_msg)
+                            fetch_failed = True
+                            break
+
+                        if not orders:
+                            print(f"[Sync] Page {current_page}: no more orders")
+                            completed = True
+                            break
+
+                        try:
+                            self.upsert_orders(db, orders)
+                        except Exception as e:
+                            db.rollback()
+                            error_msg = f"Failed to sync page {current_page}: {str(e)}"
+                            print(f"[Sync] ERROR: {error_msg}")
+                            errors.append(error_msg)
+                            self.record_sync_error(market, error_msg)
+                            raise
+
+                        synced_orders.extend(orders)
+                        synced_count += len(orders)
+
+                        # Newest order at the start of the sync: incremental syncs stop there
+                        if current_page == 1:
+                            sync_status.last_order_uuid = orders[0]['uuid']
+                        sync_status.cursor_page = current_page + 1
+                        sync_status.total_orders = (sync_status.total_orders or 0) + len(orders)
+                        db.commit()
+
+                        print(f"[Sync] Page {current_page}: {len(orders)} orders (total {synced_count})")
+
+                        # Stop if we got fewer orders than requested (last page)
+                        if len(orders) < PAGE_SIZE:
+                            print(f"[Sync] Reached last page (got {len(orders)} < {PAGE_SIZE})")
+                            completed = True
+                            break
+
+                        if synced_count >= max_orders:
+                            break
+
+                    page = pages[-1] + 1
 
             # Update sync status
-            self.update_sync_status(db, market, synced_count)
+            if completed:
+                sync_status.cursor_page = None
+                sync_status.full_sync_completed_at = datetime.utcnow()
+            sync_status.last_sync = datetime.utcnow()
+            sync_status.sync_count = (sync_status.sync_count or 0) + 1
+            sync_status.last_error = None
             db.commit()
 
+            if fetch_failed:
+                self.record_sync_error(market, errors[-1])
+
+            self.update_cost_basis(synced_orders, include_transfers=True)
+
             print(f"\n{'='*60}")
-            print(f"Initial Sync Complete!")
+            print(f"Initial Sync {'Complete' if completed else 'Paused (will resume)'}!")
             print(f"Total synced: {synced_count} orders")
             if errors:
                 print(f"Errors: {len(errors)}")
             print(f"{'='*60}\n")
 
             return {
-                'success': True,
+                'success': not fetch_failed,
                 'synced_count': synced_count,
-                'pages': page,
+                'completed': completed,
+                'next_page': sync_status.cursor_page,
                 'errors': errors
             }
 
@@ -132,7 +281,9 @@ class OrderSyncService:
         """
         Perform incremental synchronization (new orders only).
 
-        Fetches only orders created after the last sync.
+        Fetches pages of the newest orders until the last synced order shows up.
+        If it does not show up within MAX_INCREMENTAL_PAGES, the orders behind
+        them are left to a full sync resuming after the pages read here.
         Should be run periodically (e.g., every 5 minutes).
 
         Args:
@@ -145,94 +296,159 @@ class OrderSyncService:
 
         db = get_db_session()
         synced_count = 0
+        synced_orders = []
         errors = []
 
         try:
             # Get last sync info
-            sync_status = db.query(SyncStatus).filter_by(market=market or 'all').first()
-            last_uuid = sync_status.last_order_uuid if sync_status else None
+            sync_status = self.get_sync_status(db, market)
+            last_uuid = sync_status.last_order_uuid
 
             print(f"[Sync] Last synced order: {last_uuid or 'None (first sync)'}")
 
-            # Fetch latest orders
-            orders = self.upbit_api.get_orders_history(
-                market=market,
-                state='done',
-                limit=100,
-                order_by='desc',
-                include_trades=True
-            )
+            newest_uuid = None
+            gap = False
+            for page in range(1, MAX_INCREMENTAL_PAGES + 1):
+                orders = self.fetch_page(market, page)
+                if orders is None:
+                    # Nothing is committed, so the anchor stays where it was
+                    raise RuntimeError(f"Failed to fetch page {page}")
+                if not orders:
+                    break
 
-            if not orders:
-                print("[Sync] No new orders")
-                return {'success': True, 'synced_count': 0}
+                if newest_uuid is None:
+                    newest_uuid = orders[0]['uuid']
 
-            # Sync until we reach the last synced order
-            for order in orders:
-                if order['uuid'] == last_uuid:
+                # Keep only orders newer than the last synced one
+                uuids = [order['uuid'] for order in orders]
+                reached = last_uuid in uuids
+                if reached:
+                    orders = orders[:uuids.index(last_uuid)]
+
+                if orders:
+                    self.upsert_orders(db, orders)
+                    synced_orders.extend(orders)
+                    synced_count += len(orders)
+
+                if reached:
                     print(f"[Sync] Reached last synced order: {last_uuid[:8]}...")
                     break
+                if last_uuid is None or len(uuids) < PAGE_SIZE:
+                    break
+            else:
+                gap = last_uuid is not None
+
+            if gap:
+                # More new orders than the pages read: finish with a full sync from the next page
+                print(f"[Sync] WARNING: Last synced order {last_uuid[:8]}... not within {MAX_INCREMENTAL_PAGES} pages, "
+                      f"resuming full sync from page {MAX_INCREMENTAL_PAGES + 1}")
+                sync_status.full_sync_completed_at = None
+                sync_status.cursor_page = MAX_INCREMENTAL_PAGES + 1
 
-                try:
-                    self.upsert_order(db, order)
-                    synced_count += 1
-                except Exception as e:
-                    error_msg = f"Failed to sync order {order['uuid']}: {str(e)}"
-                    print(f"[Sync] ERROR: {error_msg}")
-                    errors.append(error_msg)
+            if newest_uuid is None:
+                print("[Sync] No new orders")
 
             # Update sync status
-            if synced_count > 0:
-                self.update_sync_status(db, market, synced_count, orders[0]['uuid'])
+            sync_status.last_sync = datetime.utcnow()
+            sync_status.sync_count = (sync_status.sync_count or 0) + 1
+            sync_status.total_orders = (sync_status.total_orders or 0) + synced_count
+            sync_status.last_error = None
+            if newest_uuid:
+                sync_status.last_order_uuid = newest_uuid
 
             db.commit()
 
+            self.update_cost_basis(synced_orders, include_transfers=True)
+
             print(f"[Sync] Incremental sync complete: {synced_count} new orders")
 
             return {
                 'success': True,
                 'synced_count': synced_count,
+                'gap': gap,
                 'errors': errors
             }
 
         except Exception as e:
             db.rollback()
             print(f"[Sync] ERROR: {str(e)}")
+            self.record_sync_error(market, str(e))
             return {'success': False, 'error': str(e)}
         finally:
             db.close()
 
-    def upsert_order(self, db_session, order_data):
+    def update_cost_basis(self, orders, include_transfers=False):
         """
-        Insert or update order in database using native SQLite/PostgreSQL upsert.
+        Fold newly synced orders (and completed deposits/withdrawals) into the cost basis ledger.
+
+        Ledger errors are logged and never fail the sync; the next out-of-order
+        event or an explicit rebuild repairs the affected markets.
+
+        Args:
+            orders: Order dicts just written to the database
+            include_transfers (bool): Also fetch the latest deposits/withdrawals
+        """
+        if self.user_id is None:
+            return
+
+        ledger = get_cost_basis_ledger()
+        try:
+            folded = ledger.ingest_orders(self.user_id, orders)
+            if include_transfers:
+                folded += ledger.ingest_transfers(
+                    self.user_id,
+                    deposits=self.upbit_api.get_deposits(),
+                    withdraws=self.upbit_api.get_withdraws()
+                )
+            if folded:
+                print(f"[Sync] Cost basis ledger: {folded} events folded")
+        except Exception as e:
+            print(f"[Sync] WARNING: Cost basis ledger update failed: {e}")
+
+    def upsert_orders(self, db_session, orders):
+        """
+        Insert or update many orders with one multi-row INSERT ... ON CONFLICT.
 
         Args:
             db_session: SQLAlchemy session
-            order_data: Order data dict from Upbit API
+            orders (list): Order data dicts from Upbit API
+
+        Returns:
+            int: Number of rows written
         """
-        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-        from sqlalchemy.dialects.postgresql import insert as pg_insert
-        from datetime import datetime
-
-        fields = self.extract_order_fields(order_data)
-        fields['updated_at'] = datetime.utcnow()
-
-        # Use native upsert for both SQLite and PostgreSQL
-        # This is much more efficient than merge() for batch operations
-        if 'sqlite' in str(db_session.bind.url):
-            stmt = sqlite_insert(Order).values(**fields)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['uuid'],
-                set_={k: v for k, v in fields.items() if k != 'uuid'}
-            )
-        else:  # PostgreSQL
-            stmt = pg_insert(Order).values(**fields)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['uuid'],
-                set_={k: v for k, v in fields.items() if k != 'uuid'}
-            )
+        if not orders:
+            return 0
+
+        now = datetime.utcnow()
+        rows = {}
+        for order_data in orders:
+            fields = self.extract_order_fields(order_data)
+            fields['updated_at'] = now
+            if self.user_id is not None:
+                fields['user_id'] = self.user_id
+            # The same UUID twice in one statement is rejected by PostgreSQL
+            rows[fields['uuid']] = fields
+
+        insert = _dialect_insert(db_session)
+        stmt = insert(Order).values(list(rows.values()))
+        columns = next(iter(rows.values())).keys()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['uuid'],
+            set_={k: stmt.excluded[k] for k in columns if k != 'uuid'}
+        )
 
         db_session.execute(stmt)
+        return len(rows)
+
+    def upsert_order(self, db_session, order_data):
+        """
+        Insert or update a single order (see upsert_orders).
+
+        Args:
+            db_session: SQLAlchemy session
+            order_data: Order data dict from Upbit API
+        """
+        self.upsert_orders(db_session, [order_data])
 
     def extract_order_fields(self, order_data):
         """
@@ -296,34 +512,65 @@ class OrderSyncService:
             print(f"[Sync] WARNING: Failed to parse datetime '{dt_string}': {e}")
             return None
 
-    def update_sync_status(self, db_session, market, order_count, last_uuid=None):
+    def get_sync_status(self, db_session, market=None):
         """
-        Update synchronization status in database.
+        Get (or create, uncommitted) the SyncStatus row for a market.
 
         Args:
             db_session: SQLAlchemy session
             market: Market code (or None for all)
-            order_count: Number of orders synced
-            last_uuid: UUID of last synced order
+
+        Returns:
+            SyncStatus: Status row attached to the session
         """
-        market_key = market or 'all'
+        market_key = self.sync_key(market)
 
         sync_status = db_session.query(SyncStatus).filter_by(market=market_key).first()
-
-        if sync_status:
-            sync_status.last_sync = datetime.utcnow()
-            sync_status.total_orders += order_count
-            sync_status.sync_count += 1
-            if last_uuid:
-                sync_status.last_order_uuid = last_uuid
-        else:
+        if sync_status is None:
             sync_status = SyncStatus(
                 market=market_key,
-                last_sync=datetime.utcnow(),
-                last_order_uuid=last_uuid,
-                total_orders=order_count,
-                sync_count=1
+                user_id=self.user_id,
+                total_orders=0,
+                sync_count=0
             )
             db_session.add(sync_status)
 
+        return sync_status
+
+    def record_sync_error(self, market, error):
+        """
+        Store the last error on the SyncStatus row (separate session, best effort).
+
+        Args:
+            market: Market code (or None for all)
+            error (str): Error message
+        """
+        db = get_db_session()
+        try:
+            self.get_sync_status(db, market).last_error = error[:1000]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[Sync] WARNING: Failed to record sync error: {e}")
+        finally:
+            db.close()
+
+    def update_sync_status(self, db_session, market, order_count, last_uuid=None):
+        """
+        Update synchronization status in database.
+
+        Args:
+            db_session: SQLAlchemy session
+            market: Market code (or None for all)
+            order_count: Number of orders synced
+            last_uuid: UUID of last synced order
+        """
+        sync_status = self.get_sync_status(db_session, market)
+
+        sync_status.last_sync = datetime.utcnow()
+        sync_status.total_orders = (sync_status.total_orders or 0) + order_count
+        sync_status.sync_count = (sync_status.sync_count or 0) + 1
+        if last_uuid:
+            sync_status.last_order_uuid = last_uuid
+
         db_session.commit()
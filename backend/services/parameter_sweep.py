@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter Sweep
+
+Grid / random search over surge strategy thresholds on all CPU cores.
+
+- The candle dataset and its SurgePredictor score matrix are computed once
+  and written to disk as .npy files (see CandleDataset.save()).
+- Worker processes memory-map those files read-only, so every worker shares
+  the same page cache instead of holding its own copy of the data.
+- Each worker replays its share of parameter combinations with
+  BacktestEngine.simulate(); scores do not depend on the parameters, so no
+  combination recomputes features.
+- Results are ranked by average return, win rate and max drawdown and
+  exported as a CSV/JSON leaderboard.
+"""
+
+import os
+import csv
+import json
+import random
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backend.services.backtest_engine import BacktestEngine, CandleDataset
+
+logger = logging.getLogger(__name__)
+
+SCORE_FILE = 'score.npy'
+
+# Default search space (min_score maps to min_surge_probability_score / telegram_min_score)
+DEFAULT_GRID = {
+    'min_score': [50, 55, 60, 65, 70, 75, 80],
+    'take_profit_percent': [3.0, 5.0, 7.0, 10.0, 15.0],
+    'stop_loss_percent': [-3.0, -5.0, -7.0, -10.0],
+    'holding_days': [1, 2, 3, 5, 7]
+}
+
+# Worker process state (set by _init_worker)
+_worker = {}
+
+
+def grid_combinations(grid: Dict[str, Iterable]) -> List[Dict]:
+    """
+    Every combination of a parameter grid
+
+    Args:
+        grid: {param: values}
+
+    Returns:
+        List of {param: value} dicts
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def random_combinations(grid: Dict[str, Iterable], samples: int, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Random distinct combinations drawn from a parameter grid
+
+    Args:
+        grid: {param: values}
+        samples: Number of combinations (capped at the grid size)
+        seed: Random seed
+
+    Returns:
+        List of {param: value} dicts
+    """
+    combinations = grid_combinations(grid)
+    rng = random.Random(seed)
+    return rng.sample(combinations, min(samples, len(combinations)))
+
+
+def evaluate(dataset: CandleDataset, scores: np.ndarray, params: Dict, engine: Optional[BacktestEngine] = None) -> Dict:
+    """
+    Backtest one parameter combination on a scored dataset
+
+    Drawdown is measured on the equity curve of equal-stake trades
+    (cumulative % return) ordered by exit day.
+
+    Args:
+        dataset: Candle dataset
+        scores: Score matrix from BacktestEngine.score()
+        params: min_score, take_profit_percent, stop_loss_percent, holding_days
+
+    Returns:
+        dict: params plus summary fields, total_return and max_drawdown
+    """
+    engine = engine or BacktestEngine()
+    trades = engine.simulate(dataset, {'score': scores}, **params)
+    returns = trades['return_pct']
+
+    result = dict(params)
+    result.update(engine.summarize(returns))
+    result['total_return'] = round(float(returns.sum()), 2)
+
+    if len(returns):
+        equity = np.cumsum(returns[np.argsort(trades['col'] + trades['hold_days'], kind='stable')])
+        peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+        result['max_drawdown'] = round(float((peak - equity).max()), 2)
+    else:
+        result['max_drawdown'] = 0.0
+    return result
+
+
+def _init_worker(directory: str):
+    _worker['dataset'] = CandleDataset.load(directory, mmap=True)
+    _worker['scores'] = np.load(os.path.join(directory, SCORE_FILE), mmap_mode='r')
+    _worker['engine'] = BacktestEngine()
+
+
+def _evaluate_chunk(chunk: List[Dict]) -> List[Dict]:
+    return [evaluate(_worker['dataset'], _worker['scores'], params, _worker['engine']) for params in chunk]
+
+
+def rank_results(results: List[Dict], min_trades: int = 10) -> List[Dict]:
+    """
+    Rank combinations by average return, win rate and max drawdown
+
+    Each combination gets its rank on the three metrics (higher return,
+    higher win rate, smaller drawdown are better); the leaderboard is sorted
+    by the mean of those ranks, then by total return. Combinations with fewer
+    than min_trades trades are dropped.
+
+    Args:
+        results: evaluate() results
+        min_trades: Minimum number of trades to qualify
+
+    Returns:
+        Sorted results with 'rank' and 'rank_score' added
+    """
+    eligible = [dict(r) for r in results if r['total_trades'] >= min_trades]
+    if not eligible:
+        return []
+
+    def ranks(values):
+        # Average rank of each value, 1 = best (values already oriented so that larger is better)
+        values = np.asarray(values, dtype=np.float64)
+        order = (-values).argsort(kind='stable')
+        ranked = np.empty(len(values))
+        ranked[order] = np.arange(1, len(values) + 1)
+        for value in np.unique(values):
+            tied = values == value
+            ranked[tied] = ranked[tied].mean()
+        return ranked
+
+    rank_score = (
+        ranks([r['avg_return'] for r in eligible]) +
+        ranks([r['win_rate'] for r in eligible]) +
+        ranks([-r['max_drawdown'] for r in eligible])
+    ) / 3
+
+    for result, score in zip(eligible, rank_score):
+        result['rank_score'] = round(float(score), 2)
+    eligible.sort(key=lambda r: (r['rank_score'], -r['total_return']))
+    for i, result in enumerate(eligible, 1):
+        result['rank'] = i
+    return eligible
+
+
+class ParameterSweep:
+    """
+    Parallel parameter search over one scored candle dataset
+    """
+
+    def __init__(self, directory: str, workers: Optional[int] = None):
+        """
+        Initialize sweep
+
+        Args:
+            directory: Directory holding the dataset and score files
+            workers: Worker processes (default: CPU count)
+        """
+        self.directory = directory
+        self.workers = workers or os.cpu_count() or 1
+
+    def prepare(self, dataset: CandleDataset, start_date, end_date, engine: Optional[BacktestEngine] = None):
+        """
+        Score a dataset once and write it (plus scores) for the workers
+
+        Args:
+            dataset: Dataset loaded with the largest holding_days of the search
+            start_date: First signal date
+            end_date: Last signal date
+        """
+        engine = engine or BacktestEngine()
+        scored = engine.score(dataset, dataset.index_of(start_date), dataset.index_of(end_date))
+        dataset.save(self.directory)
+        np.save(os.path.join(self.directory, SCORE_FILE), scored['score'])
+        logger.info(f"[ParameterSweep] Prepared {len(dataset.markets)} markets x {dataset.num_days} days "
+                    f"in {self.directory}")
+
+    def run(self, combinations: List[Dict], chunk_size: int = 16) -> List[Dict]:
+        """
+        Evaluate combinations across the process pool
+
+        Args:
+            combinations: Parameter dicts (see grid_combinations / random_combinations)
+            chunk_size: Combinations per task
+
+        Returns:
+            evaluate() results in input order
+        """
+        chunks = [combinations[i:i + chunk_size] for i in range(0, len(combinations), chunk_size)]
+        if self.workers <= 1:
+            _init_worker(self.directory)
+            return [r for chunk in chunks for r in _evaluate_chunk(chunk)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.directory,)) as executor:
+            for chunk_results in executor.map(_evaluate_chunk, chunks):
+                results.extend(chunk_results)
+        return results
+
+    @staticmethod
+    def export(leaderboard: List[Dict], path: str):
+        """
+        Write a leaderboard as CSV or JSON (by file extension)
+
+        Args:
+            leaderboard: rank_results() output
+            path: Output file (.csv or .json)
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(leaderboard, f, ensure_ascii=False, indent=2)
+            return
+
+        columns = ['rank', 'rank_score', 'min_score', 'take_profit_percent', 'stop_loss_percent',
+                   'holding_days', 'total_trades', 'win_rate', 'avg_return', 'total_return',
+                   'max_drawdown', 'avg_win', 'avg_loss', 'best_trade', 'worst_trade']
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(leaderboard)
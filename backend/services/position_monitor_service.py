@@ -20,6 +20,9 @@ from backend.database.connection import get_db_session
 from backend.models.surge_alert_models import SurgeAlert
 from backend.common import UpbitAPI, load_api_keys
 from backend.services.surge_predictor import SurgePredictor
+from backend.services.ticker_hub import get_ticker_hub
+from backend.services.market_scan_service import get_market_scanner
+from backend.services.indicator_state import get_indicator_store
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +45,7 @@ class PositionMonitorService:
         self.check_interval = check_interval
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Wakes the loop on stop()
 
         # Initialize Upbit API for market data
         access_key, secret_key = load_api_keys()
@@ -60,6 +64,11 @@ class PositionMonitorService:
         }
         self.predictor = SurgePredictor(self.config)
 
+        # market -> S/R state derived from closed candles (rebuilt when a new candle closes)
+        self._sr_state: Dict[str, Dict] = {}
+        # (market, newest candle time, price) -> AI analysis, reset every cycle
+        self._cycle_analysis: Dict[tuple, Optional[Dict]] = {}
+
         logger.info(f"[PositionMonitor] Initialized with AI + Support/Resistance analysis (interval: {check_interval}s)")
 
     def calculate_atr(self, candles: List[Dict], period: int = 14) -> float:
@@ -93,13 +102,16 @@ class PositionMonitorService:
         atr = sum(recent_trs) / len(recent_trs)
         return atr
 
-    def calculate_support_resistance(self, candles: List[Dict], current_price: float) -> Dict:
+    def calculate_support_resistance(self, candles: List[Dict], current_price: float,
+                                     state: Optional[Dict] = None) -> Dict:
         """
         Calculate support and resistance levels using pivot points + ATR
 
         Args:
             candles: List of candle data (at least 50 candles recommended)
             current_price: Current market price
+            state: Closed-candle state from get_sr_state() to skip the ATR and
+                   pivot search (default: compute from scratch)
 
         Returns:
             Dict with 'supports' and 'resistances' lists, each containing price and strength
@@ -109,16 +121,88 @@ class PositionMonitorService:
             return {'supports': [], 'resistances': []}
 
         lookback = 5  # 5 candles lookback/forward for pivot points
-        levels = []
+
+        if state is None:
+            state = self._build_sr_state(candles, lookback)
 
         # Calculate ATR for dynamic tolerance
-        atr = self.calculate_atr(candles, 14)
+        atr = state['atr']
         dynamic_tolerance = (atr / current_price) if atr > 0 else 0.015  # Fallback to 1.5%
 
         logger.debug(f"[SR] Using dynamic tolerance: {dynamic_tolerance*100:.2f}%, ATR: {atr:.2f}")
 
+        # Only the first pivot window reaches the still-forming candle (index 0)
+        levels = self._find_pivots(candles, lookback, lookback, lookback + 1) + state['levels']
+
+        # Merge similar levels (clustering)
+        merged_levels = self._merge_similar_levels(levels, dynamic_tolerance)
+
+        # Calculate strength for each level
+        all_prices = [candles[0]['high_price'], candles[0]['low_price']] + state['closed_prices']
+
+        for level in merged_levels:
+            level['strength'] = self._calculate_level_strength(level['price'], all_prices, dynamic_tolerance)
+            level['distance_from_current'] = abs(level['price'] - current_price) / current_price
+            # Score: strength * (1 + proximity bonus)
+            level['score'] = level['strength'] * (1 + (1 - min(level['distance_from_current'] * 2, 1)))
+
+        # Sort by score and separate supports/resistances
+        merged_levels.sort(key=lambda x: x['score'], reverse=True)
+
+        supports = [l for l in merged_levels if l['type'] == 'support'][:3]
+        resistances = [l for l in merged_levels if l['type'] == 'resistance'][:3]
+
+        logger.debug(f"[SR] Found {len(supports)} supports, {len(resistances)} resistances")
+
+        return {
+            'supports': supports,
+            'resistances': resistances
+        }
+
+    def get_sr_state(self, market: str, candles: List[Dict]) -> Dict:
+        """
+        Get the closed-candle part of the S/R calculation for a market
+
+        ATR, pivots that do not touch the forming candle and the closed
+        candles' high/low prices only change when a new candle closes, so
+        they are rebuilt only when the newest closed candle changes.
+
+        Args:
+            market: Market code
+            candles: Candles, newest first (index 0 is the forming candle)
+
+        Returns:
+            Dict with 'atr', 'levels' and 'closed_prices'
+        """
+        key = (len(candles), candles[1].get('candle_date_time_utc') if len(candles) > 1 else None)
+        state = self._sr_state.get(market)
+        if state is None or state['key'] != key:
+            # Shared Wilder ATR of the closed daily candles (same value every service sees)
+            atr = get_indicator_store().update(market, 'day', candles).atr
+            state = self._build_sr_state(candles, 5, atr)
+            state['key'] = key
+            self._sr_state[market] = state
+        return state
+
+    def _build_sr_state(self, candles: List[Dict], lookback: int, atr: Optional[float] = None) -> Dict:
+        closed_prices = []
+        for c in candles[1:]:
+            closed_prices.extend([c['high_price'], c['low_price']])
+
+        return {
+            # calculate_atr() averages the last TRs of the list, which never include the forming candle
+            'atr': atr if atr is not None else self.calculate_atr(candles, 14),
+            'levels': self._find_pivots(candles, lookback, lookback + 1, len(candles) - lookback),
+            'closed_prices': closed_prices
+        }
+
+    @staticmethod
+    def _find_pivots(candles: List[Dict], lookback: int, start: int, stop: int) -> List[Dict]:
+        """Pivot highs/lows for candle indexes in [start, stop)"""
+        levels = []
+
         # Find pivot points
-        for i in range(lookback, len(candles) - lookback):
+        for i in range(start, min(stop, len(candles) - lookback)):
             candle = candles[i]
             is_resistance = True
             is_support = True
@@ -151,32 +235,7 @@ class PositionMonitorService:
                     'index': i
                 })
 
-        # Merge similar levels (clustering)
-        merged_levels = self._merge_similar_levels(levels, dynamic_tolerance)
-
-        # Calculate strength for each level
-        all_prices = []
-        for c in candles:
-            all_prices.extend([c['high_price'], c['low_price']])
-
-        for level in merged_levels:
-            level['strength'] = self._calculate_level_strength(level['price'], all_prices, dynamic_tolerance)
-            level['distance_from_current'] = abs(level['price'] - current_price) / current_price
-            # Score: strength * (1 + proximity bonus)
-            level['score'] = level['strength'] * (1 + (1 - min(level['distance_from_current'] * 2, 1)))
-
-        # Sort by score and separate supports/resistances
-        merged_levels.sort(key=lambda x: x['score'], reverse=True)
-
-        supports = [l for l in merged_levels if l['type'] == 'support'][:3]
-        resistances = [l for l in merged_levels if l['type'] == 'resistance'][:3]
-
-        logger.debug(f"[SR] Found {len(supports)} supports, {len(resistances)} resistances")
-
-        return {
-            'supports': supports,
-            'resistances': resistances
-        }
+        return levels
 
     def _merge_similar_levels(self, levels: List[Dict], tolerance: float) -> List[Dict]:
         """Merge nearby price levels"""
@@ -253,7 +312,8 @@ class PositionMonitorService:
     def check_position(
         self,
         position: SurgeAlert,
-        current_price: float
+        current_price: float,
+        candles: Optional[List[Dict]] = None
     ) -> Optional[str]:
         """
         Check if position should be closed using AI + Support/Resistance analysis
@@ -267,6 +327,8 @@ class PositionMonitorService:
         Args:
             position: SurgeAlert object
             current_price: Current market price
+            candles: 50 daily candles for the market, newest first
+                     (default: fetched for this call)
 
         Returns:
             Action to take: 'take_profit', 'stop_loss', 'resistance_exit', 'support_hold',
@@ -295,13 +357,15 @@ class PositionMonitorService:
             logger.info(f"  Entry: {entry_price:,} -> Current: {current_price:,} ({loss_pct:.2f}%)")
             return 'stop_loss'
 
+        if candles is None:
+            candles = self.upbit_api.get_candles_days(position.market, count=50) or []
+
         # Priority 2.5: Support/Resistance analysis (NEW!)
         try:
-            # Get fresh candle data for S/R analysis
-            candles = self.upbit_api.get_candles_days(position.market, count=50)
-
             if candles and len(candles) >= 50:
-                sr_levels = self.calculate_support_resistance(candles, current_price)
+                sr_levels = self.calculate_support_resistance(
+                    candles, current_price, state=self.get_sr_state(position.market, candles)
+                )
                 current_profit_pct = ((current_price - entry_price) / entry_price) * 100
 
                 # Check resistance levels (매도 신호)
@@ -342,22 +406,15 @@ class PositionMonitorService:
 
         if current_profit_pct >= -2.0:  # Only analyze if loss < 2%
             try:
-                # Get fresh market data for AI analysis
-                candles = self.upbit_api.get_candles_days(position.market, count=30)
+                # AI analysis uses the 30 most recent candles
+                candles = candles[:30]
 
                 if not candles or len(candles) < 20:
                     logger.warning(f"[PositionMonitor] Insufficient data for AI analysis: {position.market}")
                     return None
 
-                # Re-analyze surge signal with current data
-                # Extract coin symbol from market (e.g., "KRW-AXL" -> "AXL")
-                coin_symbol = position.market.split('-')[1] if '-' in position.market else position.market
-
-                analysis_result = self.predictor.analyze_coin(
-                    coin_symbol=coin_symbol,
-                    candle_data=candles,
-                    current_price=current_price
-                )
+                # Re-analyze surge signal with current data (shared by positions in the same market)
+                analysis_result = self._analyze(position.market, candles, current_price)
 
                 if not analysis_result:
                     return None
@@ -408,6 +465,32 @@ class PositionMonitorService:
 
         return None
 
+    def _analyze(self, market: str, candles: List[Dict], current_price: float) -> Optional[Dict]:
+        """Run SurgePredictor once per market, candle set and price within a cycle"""
+        key = (market, candles[0].get('candle_date_time_utc'), current_price)
+        if key not in self._cycle_analysis:
+            # Extract coin symbol from market (e.g., "KRW-AXL" -> "AXL")
+            coin_symbol = market.split('-')[1] if '-' in market else market
+
+            self._cycle_analysis[key] = self.predictor.analyze_coin(
+                coin_symbol=coin_symbol,
+                candle_data=candles,
+                current_price=current_price
+            )
+        return self._cycle_analysis[key]
+
+    def prefetch_candles(self, markets: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Fetch 50 daily candles once per market for this cycle
+
+        Args:
+            markets: Markets with open positions
+
+        Returns:
+            Dict of {market: candles}; markets that failed map to an empty list
+        """
+        return get_market_scanner().fetch_candles(markets, count=50, max_age=self.check_interval)
+
     def execute_close_position(
         self,
         position: SurgeAlert,
@@ -521,21 +604,20 @@ class PositionMonitorService:
             # Get current prices for all markets
             markets = list(set([p.market for p in positions]))
 
-            # Get ticker data
-            from backend.common import UpbitAPI
-            public_api = UpbitAPI(None, None)  # Public API
-
-            tickers = public_api.get_ticker(markets=','.join(markets))
+            # Prices from the shared ticker hub (one batched poll for all services)
+            price_map = get_ticker_hub().get_prices(markets)
 
-            if not tickers:
+            if not price_map:
                 logger.warning("[PositionMonitor] Failed to get ticker data")
                 return
 
-            # Create price map
-            price_map = {
-                ticker['market']: float(ticker['trade_price'])
-                for ticker in tickers
-            }
+            # One candle download per market, shared by every position in it
+            candles_by_market = self.prefetch_candles(markets)
+            self._cycle_analysis = {}
+
+            # Drop S/R state for markets no longer held
+            for market in [m for m in self._sr_state if m not in candles_by_market]:
+                del self._sr_state[market]
 
             # Check each position
             for position in positions:
@@ -546,7 +628,7 @@ class PositionMonitorService:
                     continue
 
                 # Check if action needed
-                action = self.check_position(position, current_price)
+                action = self.check_position(position, current_price, candles_by_market.get(position.market, []))
 
                 if action:
                     # Execute close
@@ -571,11 +653,11 @@ class PositionMonitorService:
                 self.monitor_positions()
 
                 # Wait for next cycle
-                time.sleep(self.check_interval)
+                self._stop_event.wait(self.check_interval)
 
             except Exception as e:
                 logger.error(f"[PositionMonitor] Error in loop: {e}")
-                time.sleep(60)  # Wait and retry
+                self._stop_event.wait(60)  # Wait and retry
 
     def start(self):
         """
@@ -586,6 +668,7 @@ class PositionMonitorService:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self.run_monitor_loop, daemon=True)
         self.thread.start()
 
@@ -600,9 +683,12 @@ class PositionMonitorService:
             return
 
         self.running = False
+        self._stop_event.set()
 
+        # Wait for the current cycle to finish so a restart never overlaps it
         if self.thread:
-            self.thread.join(timeout=10)
+            self.thread.join()
+            self.thread = None
 
         logger.info("[PositionMonitor] ✅ Monitor stopped")
 
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Price Broadcaster
+
+Coalesced, delta-only Socket.IO price fan-out for WebSocketService.
+
+- Price updates are only recorded when they arrive; a flush thread sends
+  them on a fixed tick, so many ticker updates between ticks coalesce into one.
+- Sessions with the same market set and update rate share a Socket.IO room
+  ("group"), so each frame is encoded once per group rather than per market
+  or per client.
+- Each frame ('price_batch') carries every changed market of the group and
+  only the fields that changed since that group's previous frame. A session
+  joining a group first receives a full snapshot of its markets.
+- Clients choose their update interval (set_update_rate); per-group frame
+  and fan-out counters are kept for monitoring.
+"""
+
+import time
+import hashlib
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every update and are not worth a frame on their own
+VOLATILE_FIELDS = ('timestamp',)
+
+
+class PriceBroadcaster:
+    """
+    Batches price updates per subscriber group and emits deltas
+    """
+
+    def __init__(self, socketio_instance, tick: float = 0.25, default_interval: float = 1.0,
+                 min_interval: float = 0.25, max_interval: float = 60.0, namespace: str = '/'):
+        """
+        Initialize broadcaster
+
+        Args:
+            socketio_instance: Flask-SocketIO instance
+            tick: Flush loop resolution in seconds
+            default_interval: Update interval for sessions that never set one
+            min_interval: Fastest interval a client may request
+            max_interval: Slowest interval a client may request
+            namespace: Socket.IO namespace of the sessions
+        """
+        self.socketio = socketio_instance
+        self.tick = tick
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.namespace = namespace
+
+        # market -> latest price data
+        self._latest: Dict[str, dict] = {}
+        # sid -> {'markets': set, 'interval': float, 'room': str or None}
+        self._sessions: Dict[str, dict] = {}
+        # room -> {'markets', 'interval', 'members', 'last_sent', 'next_due', 'frames', 'fanout'}
+        self._groups: Dict[str, dict] = {}
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self.is_running = False
+
+    # ==================== Lifecycle ====================
+
+    def start(self):
+        """Start the flush thread"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._flush_loop, name='price-broadcaster', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread"""
+        self.is_running = False
+
+    # ==================== Updates ====================
+
+    def update(self, market: str, price_data: dict):
+        """
+        Record the latest price data for a market (sent on the next due flush)
+
+        Args:
+            market: Market code
+            price_data: Price dict as built by WebSocketService._format_price
+        """
+        with self._lock:
+            self._latest[market] = price_data
+
+    # ==================== Sessions ====================
+
+    def subscribe(self, sid: str, market: str):
+        """Add a market to a session's subscription"""
+        with self._lock:
+            session = self._session(sid)
+            if market in session['markets']:
+                return
+            session['markets'].add(market)
+            self._regroup(sid, session)
+
+    def unsubscribe(self, sid: str, market: str):
+        """Remove a market from a session's subscription"""
+        with self._lock:
+            session = self._sessions.get(sid)
+            if not session or market not in session['markets']:
+                return
+            session['markets'].discard(market)
+            self._regroup(sid, session)
+
+    def set_interval(self, sid: str, interval: float) -> float:
+        """
+        Set a session's update interval
+
+        Args:
+            sid: Socket.IO session id
+            interval: Seconds between frames (clamped to [min_interval, max_interval])
+
+        Returns:
+            The interval applied
+        """
+        interval = min(self.max_interval, max(self.min_interval, float(interval)))
+        with self._lock:
+            session = self._session(sid)
+            if session['interval'] != interval:
+                session['interval'] = interval
+                self._regroup(sid, session)
+        return interval
+
+    def remove_session(self, sid: str):
+        """Forget a disconnected session"""
+        with self._lock:
+            session = self._sessions.pop(sid, None)
+            if session:
+                self._leave_group(sid, session.get('room'))
+
+    def _session(self, sid: str) -> dict:
+        session = self._sessions.get(sid)
+        if session is None:
+            session = {'markets': set(), 'interval': self.default_interval, 'room': None}
+            self._sessions[sid] = session
+        return session
+
+    def _regroup(self, sid: str, session: dict):
+        """Move a session into the group matching its markets and interval; caller holds the lock"""
+        old_room = session.get('room')
+        markets = frozenset(session['markets'])
+        new_room = self._room_name(markets, session['interval']) if markets else None
+        if new_room == old_room:
+            return
+
+        self._leave_group(sid, old_room)
+        session['room'] = new_room
+        if new_room is None:
+            return
+
+        group = self._groups.get(new_room)
+        if group is None:
+            group = {
+                'markets': markets,
+                'interval': session['interval'],
+                'members': set(),
+                'last_sent': {},
+                'next_due': 0.0,
+                'frames': 0,
+                'fanout': 0
+            }
+            self._groups[new_room] = group
+        group['members'].add(sid)
+        self.socketio.server.enter_room(sid, new_room, namespace=self.namespace)
+
+        # Deltas assume the group's previous frames; bring the newcomer up to date
+        snapshot = {m: self._strip(group['last_sent'].get(m) or self._latest[m])
+                    for m in markets if m in self._latest or m in group['last_sent']}
+        if snapshot:
+            self._emit({'full': True, 'prices': snapshot}, sid)
+
+    def _leave_group(self, sid: str, room: Optional[str]):
+        if room is None:
+            return
+        group = self._groups.get(room)
+        if group is not None:
+            group['members'].discard(sid)
+            if not group['members']:
+                del self._groups[room]
+        try:
+            self.socketio.server.leave_room(sid, room, namespace=self.namespace)
+        except Exception:
+            pass  # Session already disconnected
+
+    @staticmethod
+    def _room_name(markets: Iterable[str], interval: float) -> str:
+        digest = hashlib.sha1(','.join(sorted(markets)).encode('utf-8')).hexdigest()[:16]
+        return f"prices:{int(interval * 1000)}:{digest}"
+
+    # ==================== Flushing ====================
+
+    def _flush_loop(self):
+        while self.is_running:
+            started = time.monotonic()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"[PriceBroadcaster] Flush error: {e}")
+            time.sleep(max(0.0, self.tick - (time.monotonic() - started)))
+
+    def flush(self, now: Optional[float] = None):
+        """
+        Emit one delta frame to every due group with changes
+
+        Args:
+            now: Monotonic time (default: current)
+        """
+        now = time.monotonic() if now is None else now
+        frames = []
+
+        with self._lock:
+            for room, group in self._groups.items():
+                if now < group['next_due']:
+                    continue
+                delta = {}
+                for market in group['markets']:
+                    latest = self._latest.get(market)
+                    if latest is None:
+                        continue
+                    changed = self._diff(group['last_sent'].get(market), latest)
+                    if changed:
+                        delta[market] = changed
+                        group['last_sent'][market] = latest
+                if not delta:
+                    continue
+                group['next_due'] = now + group['interval']
+                group['frames'] += 1
+                group['fanout'] += len(group['members'])
+                frames.append((room, delta))
+
+        for room, delta in frames:
+            self._emit({'prices': delta}, room)
+
+    @classmethod
+    def _diff(cls, previous: Optional[dict], current: dict) -> dict:
+        """Fields of current that differ from previous (all fields if previous is None)"""
+        if previous is None:
+            return cls._strip(current)
+        return {
+            key: value for key, value in current.items()
+            if key not in VOLATILE_FIELDS and previous.get(key) != value
+        }
+
+    @staticmethod
+    def _strip(price_data: dict) -> dict:
+        return {k: v for k, v in price_data.items() if k not in VOLATILE_FIELDS}
+
+    def _emit(self, payload: dict, room: str):
+        payload['timestamp'] = datetime.utcnow().isoformat()
+        self.socketio.emit('price_batch', payload, room=room, namespace=self.namespace)
+
+    # ==================== Monitoring ====================
+
+    def get_stats(self) -> dict:
+        """
+        Get per-group frame and fan-out counters
+
+        Returns:
+            dict: sessions, groups and per-room stats
+        """
+        with self._lock:
+            rooms = {
+                room: {
+                    'markets': len(group['markets']),
+                    'interval': group['interval'],
+                    'members': len(group['members']),
+                    'frames': group['frames'],
+                    'fanout': group['fanout']
+                }
+                for room, group in self._groups.items()
+            }
+            return {
+                'sessions': len(self._sessions),
+                'groups': len(rooms),
+                'markets': len(self._latest),
+                'rooms': rooms
+            }
@@ -5,7 +5,7 @@ Signal Distribution Service
 """
 
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, insert, select
 from backend.database.connection import get_db_session
 from backend.models.trading_signal import TradingSignal, UserSignalHistory, ExecutionStatus, SignalStatus
 from backend.models.plan_limits import PlanLimits
@@ -73,51 +73,85 @@ class SignalDistributor:
 
         return can_receive, message, is_bonus
 
-    def get_eligible_users(self, signal_id):
+    def get_eligible_users(self, signal_id, session=None):
         """
         시그널을 받을 수 있는 사용자 목록 조회
 
+        One query: active subscriptions joined with users (email, Telegram
+        chat id) and this month's usage per user (GROUP BY subquery).
+        Users who already received this signal are skipped.
+
         Args:
             signal_id (int): 시그널 ID
+            session: DB session to reuse (default: own session)
 
         Returns:
-            list: [(user_id, email, plan, is_bonus), ...]
+            list: [{'user_id', 'email', 'plan', 'is_bonus', 'priority', 'telegram_chat_id'}, ...]
         """
-        session = get_db_session()
+        own_session = session is None
+        if own_session:
+            session = get_db_session()
         try:
-            # 활성 구독자 조회 (User와 조인하여 email 가져오기)
-            active_subscriptions = session.query(Subscription, User).join(
+            now = datetime.utcnow()
+            month_start = datetime(now.year, now.month, 1)
+
+            # 이번 달 사용자별 수신 횟수 (한 번의 GROUP BY)
+            usage = session.query(
+                UserSignalHistory.user_id.label('user_id'),
+                func.count(UserSignalHistory.id).label('used')
+            ).filter(
+                UserSignalHistory.received_at >= month_start
+            ).group_by(UserSignalHistory.user_id).subquery()
+
+            already_received = select(UserSignalHistory.user_id).where(
+                UserSignalHistory.signal_id == signal_id
+            )
+
+            # 활성 구독자 + email/chat id + 사용량
+            rows = session.query(
+                Subscription.user_id, Subscription.plan,
+                User.email, User.telegram_chat_id,
+                func.coalesce(usage.c.used, 0)
+            ).join(
                 User, Subscription.user_id == User.id
+            ).outerjoin(
+                usage, usage.c.user_id == Subscription.user_id
             ).filter(
-                Subscription.status == SubscriptionStatus.ACTIVE,
-                Subscription.current_period_end > datetime.utcnow()
+                Subscription.status == SubscriptionStatus.ACTIVE.value,
+                Subscription.current_period_end > now,
+                ~Subscription.user_id.in_(already_received)
             ).all()
 
-            eligible_users = []
+            eligible = {}
 
-            for sub, user in active_subscriptions:
-                user_id = sub.user_id
-                plan = sub.plan.value
+            for user_id, plan, email, telegram_chat_id, used in rows:
+                plan = (plan or 'free').lower()
 
                 # 제한 확인
-                can_receive, message, is_bonus = self.can_receive_signal(user_id, plan)
-
-                if can_receive:
-                    eligible_users.append({
-                        'user_id': user_id,
-                        'email': user.email,
-                        'plan': plan,
-                        'is_bonus': is_bonus,
-                        'priority': self._get_priority(plan)
-                    })
+                can_receive, _ = PlanLimits.check_can_receive_signal(plan, used)
+                if not can_receive:
+                    continue
+
+                priority = self._get_priority(plan)
+                # 구독이 여러 개면 우선순위가 높은 플랜 기준
+                if user_id in eligible and eligible[user_id]['priority'] >= priority:
+                    continue
+
+                eligible[user_id] = {
+                    'user_id': user_id,
+                    'email': email,
+                    'plan': plan,
+                    'is_bonus': PlanLimits.is_bonus_signal(plan, used),
+                    'priority': priority,
+                    'telegram_chat_id': telegram_chat_id
+                }
 
             # 우선순위로 정렬 (Enterprise > Pro > Basic > Free)
-            eligible_users.sort(key=lambda x: x['priority'], reverse=True)
-
-            return eligible_users
+            return sorted(eligible.values(), key=lambda x: x['priority'], reverse=True)
 
         finally:
-            session.close()
+            if own_session:
+                session.close()
 
     def _get_priority(self, plan):
         """
@@ -176,36 +210,36 @@ class SignalDistributor:
                     'errors': [f"Signal {signal_id} has expired"]
                 }
 
-            # 적격 사용자 조회
-            eligible_users = self.get_eligible_users(signal_id)
+            # 적격 사용자 조회 (사용량, chat id 포함 단일 쿼리)
+            eligible_users = self.get_eligible_users(signal_id, session=session)
 
-            distributed_users = []
-            errors = []
-
-            for user_info in eligible_users:
-                try:
-                    # UserSignalHistory 생성
-                    history = UserSignalHistory(
-                        user_id=user_info['user_id'],
-                        signal_id=signal_id,
-                        received_at=datetime.utcnow(),
-                        is_bonus=user_info['is_bonus'],
-                        execution_status=ExecutionStatus.NOT_EXECUTED
-                    )
-                    session.add(history)
-
-                    distributed_users.append({
+            # UserSignalHistory 일괄 생성 (단일 bulk insert)
+            received_at = datetime.utcnow()
+            if eligible_users:
+                session.execute(insert(UserSignalHistory), [
+                    {
                         'user_id': user_info['user_id'],
-                        'email': user_info['email'],
-                        'plan': user_info['plan'],
-                        'is_bonus': user_info['is_bonus']
-                    })
-
-                except Exception as e:
-                    errors.append(f"User {user_info['user_id']}: {str(e)}")
+                        'signal_id': signal_id,
+                        'received_at': received_at,
+                        'is_bonus': user_info['is_bonus'],
+                        'execution_status': ExecutionStatus.NOT_EXECUTED
+                    }
+                    for user_info in eligible_users
+                ])
+
+            distributed_users = [
+                {
+                    'user_id': user_info['user_id'],
+                    'email': user_info['email'],
+                    'plan': user_info['plan'],
+                    'is_bonus': user_info['is_bonus']
+                }
+                for user_info in eligible_users
+            ]
+            errors = []
 
-            # 시그널 통계 업데이트
-            signal.distributed_to = len(distributed_users)
+            # 시그널 통계 업데이트 (이미 받은 사용자는 제외되므로 누적)
+            signal.distributed_to = (signal.distributed_to or 0) + len(distributed_users)
             signal.status = SignalStatus.ACTIVE
 
             session.commit()
@@ -219,8 +253,8 @@ class SignalDistributor:
                 print(f"  ... and {len(distributed_users) - 5} more")
 
             # Send Telegram notifications (if telegram_bot is available)
-            if self.telegram_bot and distributed_users:
-                self._send_telegram_notifications(signal, distributed_users)
+            if self.telegram_bot and eligible_users:
+                self._send_telegram_notifications(signal, eligible_users)
 
             return {
                 'distributed_count': len(distributed_users),
@@ -350,28 +384,20 @@ class SignalDistributor:
 
         Args:
             signal: TradingSignal object
-            distributed_users: List of user dicts with telegram_chat_id
+            distributed_users: Eligible user dicts (telegram_chat_id resolved by get_eligible_users)
         """
         try:
             import asyncio
-            from backend.models.user import User
-
-            print(f"[SignalDistributor] Sending Telegram notifications to {len(distributed_users)} users...")
 
-            session = get_db_session()
+            recipients = [u for u in distributed_users if u.get('telegram_chat_id')]
+            print(f"[SignalDistributor] Sending Telegram notifications to {len(recipients)} users...")
 
             notification_count = 0
-            for user_info in distributed_users:
+            for user_info in recipients:
                 try:
-                    # Get user's telegram_chat_id from database
-                    user = session.query(User).filter(User.id == user_info['user_id']).first()
-
-                    if not user or not hasattr(user, 'telegram_chat_id') or not user.telegram_chat_id:
-                        continue
-
                     # Prepare signal data for telegram notification
                     signal_data = {
-                        'telegram_chat_id': user.telegram_chat_id,
+                        'telegram_chat_id': user_info['telegram_chat_id'],
                         'signal_id': signal.signal_id,
                         'market': signal.market,
                         'confidence': signal.confidence,
@@ -389,8 +415,6 @@ class SignalDistributor:
                 except Exception as e:
                     print(f"[SignalDistributor] Failed to send Telegram notification to user {user_info['user_id']}: {e}")
 
-            session.close()
-
             if notification_count > 0:
                 print(f"[SignalDistributor] Telegram notifications queued for {notification_count} users")
 
@@ -15,13 +15,13 @@ Runs every 5 minutes to ensure timely closures.
 """
 
 import time
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 from sqlalchemy import text
 
 from backend.database.connection import get_db_session
+from backend.services.ticker_hub import get_ticker_hub
 
 # Logging setup
 logging.basicConfig(
@@ -57,7 +57,7 @@ class SignalMonitorService:
 
     def get_current_price(self, market: str) -> Optional[int]:
         """
-        Get current price from Upbit API
+        Get current price from the shared ticker hub
 
         Args:
             market: Market symbol (e.g., 'KRW-BTC')
@@ -66,16 +66,9 @@ class SignalMonitorService:
             Current price in KRW, or None if failed
         """
         try:
-            response = requests.get(
-                f"{self.upbit_api_base}/ticker",
-                params={'markets': market},
-                timeout=5
-            )
-
-            if response.status_code == 200:
-                ticker_data = response.json()
-                if ticker_data and len(ticker_data) > 0:
-                    return int(ticker_data[0]['trade_price'])
+            price = get_ticker_hub().get_price(market)
+            if price:
+                return int(price)
 
         except Exception as e:
             logger.error(f"[SignalMonitor] Failed to get price for {market}: {e}")
@@ -94,9 +94,6 @@ class SignalScheduler:
                             'recommendation': analysis['recommendation']
                         })
 
-                    # Rate limit (0.5s between requests to avoid 429 errors)
-                    time.sleep(0.5)
-
                 except Exception as e:
                     print(f"[Scheduler] Error analyzing {market}: {e}")
                     continue
@@ -35,6 +35,9 @@ class SubscriptionScheduler:
     def __init__(self):
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Wakes the loop on stop()
+        # Own job list: schedule.clear() elsewhere must not drop the renewal check
+        self.scheduler = schedule.Scheduler()
         print("[SubscriptionScheduler] Initialized")
 
     def check_expiring_subscriptions(self):
@@ -232,16 +235,16 @@ class SubscriptionScheduler:
 
         # Schedule daily check at 00:00 KST (UTC+9)
         # Note: schedule library uses local time
-        schedule.every().day.at("00:00").do(self.check_expiring_subscriptions)
+        self.scheduler.every().day.at("00:00").do(self.check_expiring_subscriptions)
 
         # Also run immediately on startup (for testing)
         # self.check_expiring_subscriptions()
 
-        self.running = True
-
         while self.running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            self.scheduler.run_pending()
+            self._stop_event.wait(60)  # Check every minute
+
+        self.scheduler.clear()
 
     def start(self):
         """
@@ -251,6 +254,8 @@ class SubscriptionScheduler:
             print("[SubscriptionScheduler] Already running")
             return
 
+        self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self.run_scheduler, daemon=True)
         self.thread.start()
         print("[SubscriptionScheduler] Started in background thread")
@@ -260,8 +265,10 @@ class SubscriptionScheduler:
         Stop the scheduler.
         """
         self.running = False
+        self._stop_event.set()
         if self.thread:
-            self.thread.join(timeout=5)
+            self.thread.join()
+            self.thread = None
         print("[SubscriptionScheduler] Stopped")
 
 
@@ -23,6 +23,8 @@ from backend.models.surge_candidates_cache_models import SurgeCandidatesCache
 from backend.models.surge_system_settings import SurgeSystemSettings
 from backend.services.websocket_service import get_websocket_service
 from backend.services.dynamic_market_selector import get_market_selector
+from backend.services.market_scan_service import get_market_scanner
+from backend.services.ticker_hub import get_ticker_hub
 
 # Logging setup
 logging.basicConfig(
@@ -70,6 +72,11 @@ class SurgeAlertScheduler:
         # Track alerted candidates (to avoid duplicate alerts)
         self.alerted_candidates: Set[str] = set()  # Set of market names
 
+        self.running = False
+        # Set from stop() (any thread) to cut the current wait short
+        self._loop = None
+        self._wake = None
+
         # Telegram alert threshold from DB (higher for quality)
         self.min_score = self.system_settings.telegram_min_score
 
@@ -117,40 +124,22 @@ class SurgeAlertScheduler:
         """
         candidates = []
 
-        for market in self.monitor_coins:
-            try:
-                # Get candle data
-                candle_data = self.upbit_api.get_candles_days(market=market, count=30)
-                if not candle_data or len(candle_data) < 20:
-                    continue
-
-                # Get current price
-                current_price = float(candle_data[0].get('trade_price', 0))
-                if current_price == 0:
-                    continue
-
-                # Analyze
-                analysis = self.predictor.analyze_coin(market, candle_data, current_price)
-
-                # Add to candidates if score >= min_score
-                if analysis['score'] >= self.min_score:
-                    coin = market.replace('KRW-', '')
-                    candidates.append({
-                        'market': market,
-                        'coin': coin,
-                        'score': analysis['score'],
-                        'current_price': int(current_price),
-                        'signals': analysis['signals'],
-                        'recommendation': analysis['recommendation'],
-                        'analysis': analysis  # Store full analysis for cache
-                    })
-
-                # Rate limit
-                time.sleep(0.1)
-
-            except Exception as e:
-                logger.error(f"[SurgeAlertScheduler] Error analyzing {market}: {e}")
-                continue
+        # Shared parallel scan (candles reused by other scanners in this cycle)
+        scan_results = get_market_scanner().scan(self.monitor_coins, self.predictor, min_score=self.min_score)
+
+        for result in scan_results:
+            market = result['market']
+            analysis = result['analysis']
+            coin = market.replace('KRW-', '')
+            candidates.append({
+                'market': market,
+                'coin': coin,
+                'score': analysis['score'],
+                'current_price': int(result['current_price']),
+                'signals': analysis['signals'],
+                'recommendation': analysis['recommendation'],
+                'analysis': analysis  # Store full analysis for cache
+            })
 
         return candidates
 
@@ -289,21 +278,14 @@ class SurgeAlertScheduler:
 
                 logger.info(f"[SurgeAlertScheduler] Checking {len(pending_signals)} pending signals for closure")
 
-                # Batch fetch current prices (avoid rate limit)
+                # Current prices from the shared ticker hub (batched, 100 markets per call)
                 unique_markets = list(set([s['market'] for s in pending_signals]))
-                all_prices = {}
-
-                # Upbit allows up to 100 markets per request
-                for i in range(0, len(unique_markets), 100):
-                    batch_markets = unique_markets[i:i+100]
-                    try:
-                        ticker_data = self.upbit_api.get_ticker(batch_markets)
-                        for ticker in ticker_data:
-                            all_prices[ticker['market']] = int(ticker.get('trade_price', 0))
-                    except Exception as e:
-                        logger.warning(f"[SurgeAlertScheduler] Failed to fetch batch prices: {e}")
+                all_prices = {
+                    market: int(price)
+                    for market, price in get_ticker_hub().get_prices(unique_markets).items()
+                }
 
-                logger.info(f"[SurgeAlertScheduler] Fetched prices for {len(all_prices)} markets in {(len(unique_markets) + 99) // 100} batch(es)")
+                logger.info(f"[SurgeAlertScheduler] Got prices for {len(all_prices)}/{len(unique_markets)} markets")
 
                 closed_count = 0
                 for signal in pending_signals:
@@ -620,13 +602,19 @@ class SurgeAlertScheduler:
         """
         logger.info(f"[SurgeAlertScheduler] Starting scheduler loop (interval: {self.check_interval}s)")
 
+        self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+
         # Initial check
         await self.check_and_alert()
 
         # Periodic check
-        while True:
+        while self.running:
             try:
-                await asyncio.sleep(self.check_interval)
+                await self._sleep(self.check_interval)
+                if not self.running:
+                    break
                 await self.check_and_alert()
 
             except KeyboardInterrupt:
@@ -635,7 +623,27 @@ class SurgeAlertScheduler:
             except Exception as e:
                 logger.error(f"[SurgeAlertScheduler] Error in run loop: {e}")
                 # Wait and retry
-                await asyncio.sleep(60)
+                await self._sleep(60)
+
+        logger.info("[SurgeAlertScheduler] Scheduler loop stopped")
+
+    async def _sleep(self, seconds: float):
+        """Sleep until the timeout or stop(), whichever comes first"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self):
+        """
+        Stop the scheduler loop after the current check
+        """
+        self.running = False
+        if self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # Loop already closed
 
 
 async def main():
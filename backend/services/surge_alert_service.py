@@ -16,6 +16,7 @@ from sqlalchemy import func
 from backend.models.surge_alert_models import SurgeAlert, SurgeAutoTradingSettings
 from backend.models.plan_features import get_user_features, PLAN_FEATURES
 from backend.database.connection import get_db_session
+from backend.services.indicator_state import get_indicator_store
 
 logger = logging.getLogger(__name__)
 
@@ -163,6 +164,74 @@ class SurgeAlertService:
             logger.error(f"[SurgeAlert] Error getting coin position info for user {user_id}, coin {coin}: {str(e)}")
             return {'count': 0, 'total_amount': 0}
 
+    def get_user_states(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Load weekly counts and open positions for many users at once
+
+        Two grouped queries replace the per-user weekly count, open position
+        and coin position queries of can_auto_trade().
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            {user_id: {'weekly_count': int,
+                       'positions': {coin: {'count': int, 'total_amount': int}}}}
+        """
+        states = {user_id: {'weekly_count': 0, 'positions': {}} for user_id in user_ids}
+        if not user_ids:
+            return states
+
+        current_week = SurgeAlert.get_current_week_number()
+
+        weekly = self.session.query(SurgeAlert.user_id, func.count(SurgeAlert.id))\
+            .filter(
+                SurgeAlert.user_id.in_(user_ids),
+                SurgeAlert.week_number == current_week,
+                SurgeAlert.auto_traded == True
+            )\
+            .group_by(SurgeAlert.user_id)\
+            .all()
+
+        for user_id, count in weekly:
+            states[user_id]['weekly_count'] = count or 0
+
+        positions = self.session.query(
+                SurgeAlert.user_id,
+                SurgeAlert.coin,
+                func.count(SurgeAlert.id),
+                func.sum(SurgeAlert.trade_amount)
+            )\
+            .filter(
+                SurgeAlert.user_id.in_(user_ids),
+                SurgeAlert.auto_traded == True,
+                SurgeAlert.status.in_(['pending', 'executed'])
+            )\
+            .group_by(SurgeAlert.user_id, SurgeAlert.coin)\
+            .all()
+
+        for user_id, coin, count, total_amount in positions:
+            states[user_id]['positions'][coin] = {
+                'count': count or 0,
+                'total_amount': total_amount or 0
+            }
+
+        logger.info(f"[SurgeAlert] Loaded trading state for {len(user_ids)} users")
+        return states
+
+    @staticmethod
+    def _apply_trade_to_state(user_state: Dict, coin: str, amount) -> None:
+        """Reflect a newly recorded auto-trade in a get_user_states() entry"""
+        user_state['weekly_count'] += 1
+        position = user_state['positions'].setdefault(coin.upper(), {'count': 0, 'total_amount': 0})
+        position['count'] += 1
+        position['total_amount'] += amount or 0
+
+    def _coin_position_info(self, user_id: int, coin: str, user_state: Optional[Dict]) -> Dict:
+        if user_state is not None:
+            return user_state['positions'].get(coin.upper(), {'count': 0, 'total_amount': 0})
+        return self.get_coin_position_info(user_id, coin)
+
     def _check_high_price_entry(self, coin: str) -> Tuple[bool, str]:
         """
         Check if current price is too high for entry (avoid buying at peak)
@@ -179,23 +248,18 @@ class SurgeAlertService:
             (is_high_price: bool, reason: str)
         """
         try:
-            from backend.common import UpbitAPI
-
             market = f"KRW-{coin.upper()}"
 
-            # Get public API instance (no auth needed for candles)
-            api = UpbitAPI(None, None)
+            # Shared 15-minute indicator state (fetches only candles closed since its last update)
+            indicators = get_indicator_store().refresh(market, '15').snapshot()
 
-            # Get recent candles (15-minute candles, last 100)
-            candles = api.get_candles(market=market, interval='15', count=100)
-
-            if not candles or len(candles) < 20:
+            if indicators['candles'] < 20 or not indicators['price'] or not indicators['oldest_close']:
                 logger.warning(f"[SurgeAlert] Insufficient candle data for {coin}, allowing entry")
                 return False, "OK"
 
-            # Get current and historical prices
-            current_price = float(candles[0]['trade_price'])
-            price_24h_ago = float(candles[-1]['trade_price'])
+            # Get current and historical prices (window: last 100 candles)
+            current_price = indicators['price']
+            price_24h_ago = indicators['oldest_close']
 
             # Calculate 24h price change
             price_change_pct = ((current_price - price_24h_ago) / price_24h_ago) * 100
@@ -206,14 +270,13 @@ class SurgeAlertService:
                 return True, f"Price rose {price_change_pct:.1f}% in 24h (고점위험)"
 
             # Check 2: RSI > 70 (overbought)
-            rsi = self._calculate_rsi([float(c['trade_price']) for c in reversed(candles)], period=14)
+            rsi = indicators['rsi']
             if rsi and rsi > 70:
                 logger.info(f"[SurgeAlert] {coin} RSI {rsi:.1f} is overbought (>70) - too high for entry")
                 return True, f"RSI {rsi:.1f} overbought (고점위험)"
 
             # Check 3: Near recent high (within 2% of highest price in last 100 candles)
-            prices = [float(c['high_price']) for c in candles]
-            max_price = max(prices)
+            max_price = indicators['highest_high']
             if current_price >= max_price * 0.98:
                 logger.info(f"[SurgeAlert] {coin} at {current_price:,} near recent high {max_price:,} - too high for entry")
                 return True, f"Near recent high (고점위험)"
@@ -225,51 +288,15 @@ class SurgeAlertService:
             # On error, allow entry (fail-safe)
             return False, "OK"
 
-    def _calculate_rsi(self, prices: list, period: int = 14) -> float:
-        """
-        Calculate RSI (Relative Strength Index)
-
-        Args:
-            prices: List of prices (oldest to newest)
-            period: RSI period (default 14)
-
-        Returns:
-            RSI value (0-100)
-        """
-        try:
-            if len(prices) < period + 1:
-                return None
-
-            # Calculate price changes
-            deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-
-            # Separate gains and losses
-            gains = [d if d > 0 else 0 for d in deltas]
-            losses = [-d if d < 0 else 0 for d in deltas]
-
-            # Calculate average gain/loss
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-
-            if avg_loss == 0:
-                return 100.0
-
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-
-            return rsi
-
-        except Exception as e:
-            logger.error(f"[SurgeAlert] Error calculating RSI: {str(e)}")
-            return None
-
     def can_auto_trade(
         self,
         user_id: int,
         plan: str,
         settings: SurgeAutoTradingSettings,
         confidence: float,
-        coin: str
+        coin: str,
+        user_state: Optional[Dict] = None,
+        entry_checks: Optional[Dict] = None
     ) -> Tuple[bool, str]:
         """
         Check if auto-trade can be executed
@@ -280,6 +307,9 @@ class SurgeAlertService:
             settings: User's auto-trading settings
             confidence: Signal confidence
             coin: Coin symbol
+            user_state: Preloaded get_user_states() entry (default: query per check)
+            entry_checks: Shared {coin: (is_high_price, reason)} cache for the
+                          high-price entry filter (default: check every call)
 
         Returns:
             (can_trade: bool, reason: str)
@@ -295,7 +325,10 @@ class SurgeAlertService:
 
         # 3. Check weekly limit
         max_alerts = self.get_max_alerts_for_plan(plan)
-        current_count = self.get_weekly_alert_count(user_id, auto_traded_only=True)
+        if user_state is not None:
+            current_count = user_state['weekly_count']
+        else:
+            current_count = self.get_weekly_alert_count(user_id, auto_traded_only=True)
 
         # -1 means unlimited
         if max_alerts != -1 and current_count >= max_alerts:
@@ -310,7 +343,10 @@ class SurgeAlertService:
             return False, f"Confidence {confidence}% below threshold {settings.min_confidence}%"
 
         # 6. Check max positions
-        open_positions = self.get_open_positions_count(user_id)
+        if user_state is not None:
+            open_positions = sum(p['count'] for p in user_state['positions'].values())
+        else:
+            open_positions = self.get_open_positions_count(user_id)
         if open_positions >= settings.max_positions:
             return False, f"Maximum positions reached ({open_positions}/{settings.max_positions})"
 
@@ -321,7 +357,13 @@ class SurgeAlertService:
         # 7.5. Check high-price entry filter (avoid buying at peak)
         avoid_high_price = getattr(settings, 'avoid_high_price_entry', True)
         if avoid_high_price:
-            is_high_price, high_price_reason = self._check_high_price_entry(coin)
+            if entry_checks is None:
+                is_high_price, high_price_reason = self._check_high_price_entry(coin)
+            else:
+                # Same market data for every user: check each coin once per cycle
+                if coin not in entry_checks:
+                    entry_checks[coin] = self._check_high_price_entry(coin)
+                is_high_price, high_price_reason = entry_checks[coin]
             if is_high_price:
                 return False, f"High price entry avoided: {high_price_reason}"
 
@@ -333,7 +375,7 @@ class SurgeAlertService:
             allow_duplicates = getattr(settings, 'allow_duplicate_positions', False)
 
             if not allow_duplicates:
-                coin_info = self.get_coin_position_info(user_id, coin)
+                coin_info = self._coin_position_info(user_id, coin, user_state)
                 if coin_info['count'] > 0:
                     return False, f"Already have position in {coin} (single position strategy, no duplicates)"
 
@@ -342,7 +384,7 @@ class SurgeAlertService:
             max_amount_per_coin = getattr(settings, 'max_amount_per_coin', None)
 
             if max_amount_per_coin:
-                coin_info = self.get_coin_position_info(user_id, coin)
+                coin_info = self._coin_position_info(user_id, coin, user_state)
                 total_invested = coin_info['total_amount']
                 new_total = total_invested + settings.amount_per_trade
 
@@ -710,7 +752,10 @@ class SurgeAlertService:
         expected_return: float,
         entry_price: int = None,
         stop_loss_price: int = None,
-        telegram_chat_id: str = None
+        telegram_chat_id: str = None,
+        settings: Optional[SurgeAutoTradingSettings] = None,
+        user_state: Optional[Dict] = None,
+        entry_checks: Optional[Dict] = None
     ) -> Tuple[bool, Optional[SurgeAlert]]:
         """
         Send surge alert and optionally execute auto-trade
@@ -727,6 +772,10 @@ class SurgeAlertService:
             entry_price: Entry price from surge prediction (default: current_price)
             stop_loss_price: Stop loss price from surge prediction (optional)
             telegram_chat_id: Telegram chat ID (optional)
+            settings: Preloaded auto-trading settings (default: queried)
+            user_state: Preloaded get_user_states() entry; updated in place
+                        when an auto-trade is recorded (default: query per check)
+            entry_checks: Shared high-price entry cache, see can_auto_trade()
 
         Returns:
             (success: bool, alert: SurgeAlert or None)
@@ -736,14 +785,18 @@ class SurgeAlertService:
             entry_price = current_price
 
         # 1. Get user's auto-trading settings
-        settings = self.get_user_settings(user_id)
+        if settings is None:
+            settings = self.get_user_settings(user_id)
 
         # 2. Check if can auto-trade
         auto_traded = False
         trade_info = None
 
         if settings:
-            can_trade, reason = self.can_auto_trade(user_id, plan, settings, confidence, coin)
+            can_trade, reason = self.can_auto_trade(
+                user_id, plan, settings, confidence, coin,
+                user_state=user_state, entry_checks=entry_checks
+            )
 
             if can_trade:
                 # Execute auto-trade with surge prediction prices
@@ -809,6 +862,8 @@ class SurgeAlertService:
         )
 
         if alert:
+            if user_state is not None and auto_traded and alert.order_id == trade_info.get('order_id'):
+                self._apply_trade_to_state(user_state, coin, trade_info.get('amount'))
             logger.info(f"[SurgeAlert] Successfully processed alert for user {user_id}: {market} (auto_traded={auto_traded})")
             return True, alert
         else:
@@ -9,6 +9,7 @@ Surge Auto-Trading Background Worker
 import time
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Set
 from sqlalchemy import and_
@@ -18,10 +19,11 @@ from backend.database.models import User
 from backend.models.surge_alert_models import SurgeAutoTradingSettings, SurgeAlert
 from backend.models.surge_system_settings import SurgeSystemSettings
 from backend.models.subscription_models import Subscription
-from backend.services.surge_alert_service import get_surge_alert_service
+from backend.services.surge_alert_service import SurgeAlertService
 from backend.common import UpbitAPI, load_api_keys
 from backend.services.surge_predictor import SurgePredictor
 from backend.services.dynamic_market_selector import get_market_selector
+from backend.services.market_scan_service import get_market_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -36,16 +38,21 @@ class SurgeAutoTradingWorker:
     3. 조건을 만족하는 사용자에게 자동 매수 실행
     """
 
-    def __init__(self, check_interval: int = 300):
+    def __init__(self, check_interval: int = 300, dispatch_workers: int = 8):
         """
         Initialize worker
 
         Args:
             check_interval: Check interval in seconds (default: 300 = 5 minutes)
+            dispatch_workers: Users processed concurrently when sending alerts/orders
         """
         self.check_interval = check_interval
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Wakes the loop on stop()
+
+        # Bounded pool for per-user alert/order dispatch
+        self.executor = ThreadPoolExecutor(max_workers=dispatch_workers, thread_name_prefix='auto-trade')
 
         # Initialize Upbit API
         access_key, secret_key = load_api_keys()
@@ -112,46 +119,29 @@ class SurgeAutoTradingWorker:
         """
         candidates = []
 
-        for market in self.monitor_coins:
-            try:
-                # Get candle data
-                candle_data = self.upbit_api.get_candles_days(market=market, count=30)
-                if not candle_data or len(candle_data) < 20:
-                    continue
-
-                # Get current price
-                current_price = float(candle_data[0].get('trade_price', 0))
-                if current_price == 0:
-                    continue
-
-                # Analyze
-                analysis = self.predictor.analyze_coin(market, candle_data, current_price)
-
-                # Add to candidates if score >= base_min_score (user-specific filtering happens later)
-                if analysis['score'] >= self.base_min_score:
-                    coin = market.replace('KRW-', '')
-
-                    # Store analysis result for dynamic target calculation per user
-                    # (Target prices will be calculated per-user based on their settings)
-                    # For low-price coins (< 100), keep 2 decimal places
-                    price = round(current_price, 2) if current_price < 100 else int(current_price)
-
-                    candidates.append({
-                        'market': market,
-                        'coin': coin,
-                        'score': analysis['score'],
-                        'current_price': price,
-                        'analysis': analysis,  # Store full analysis for dynamic target calculation
-                        'signals': analysis['signals'],
-                        'recommendation': analysis['recommendation']
-                    })
-
-                # Rate limit (10 requests per second max)
-                time.sleep(0.1)
-
-            except Exception as e:
-                logger.error(f"[AutoTradingWorker] Error analyzing {market}: {e}")
-                continue
+        # Shared parallel scan (candles reused by other scanners in this cycle)
+        scan_results = get_market_scanner().scan(self.monitor_coins, self.predictor, min_score=self.base_min_score)
+
+        for result in scan_results:
+            market = result['market']
+            analysis = result['analysis']
+            current_price = result['current_price']
+            coin = market.replace('KRW-', '')
+
+            # Store analysis result for dynamic target calculation per user
+            # (Target prices will be calculated per-user based on their settings)
+            # For low-price coins (< 100), keep 2 decimal places
+            price = round(current_price, 2) if current_price < 100 else int(current_price)
+
+            candidates.append({
+                'market': market,
+                'coin': coin,
+                'score': analysis['score'],
+                'current_price': price,
+                'analysis': analysis,  # Store full analysis for dynamic target calculation
+                'signals': analysis['signals'],
+                'recommendation': analysis['recommendation']
+            })
 
         return candidates
 
@@ -192,6 +182,12 @@ class SurgeAutoTradingWorker:
     def process_candidates(self):
         """
         Process surge candidates and execute auto-trades for eligible users
+
+        Decision stage is batched: users' weekly counts and open positions are
+        loaded with a few grouped queries, score thresholds and target prices
+        are computed once per (candidate, settings) combination, and each
+        user's alerts/orders are dispatched on a bounded worker pool (one task
+        per user, so a user's limits are applied in candidate order).
         """
         logger.info("[AutoTradingWorker] Processing surge candidates...")
 
@@ -205,6 +201,9 @@ class SurgeAutoTradingWorker:
 
             logger.info(f"[AutoTradingWorker] Found {len(candidates)} candidates: {[c['market'] for c in candidates]}")
 
+            # Skip markets already alerted in this cycle
+            candidates = [c for c in candidates if c['market'] not in self.alerted_in_cycle]
+
             # 2. Get active users
             active_users = self.get_active_users()
 
@@ -212,103 +211,175 @@ class SurgeAutoTradingWorker:
                 logger.info("[AutoTradingWorker] No active users")
                 return
 
-            # 3. Get surge alert service
-            surge_service = get_surge_alert_service()
+            # 3. Bulk eligibility + targets -> per-user job lists
+            jobs = self.build_user_jobs(candidates, active_users)
 
-            # 4. Process each candidate for each user
+            # 4. Preload every user's trading state in a few grouped queries
+            session = get_db_session()
+            try:
+                user_states = SurgeAlertService(session).get_user_states(list(jobs.keys()))
+            finally:
+                session.close()
+
+            # 5. Dispatch per user on a bounded pool
+            entry_checks = {}  # coin -> high-price entry verdict, shared across users
             total_alerts = 0
             total_trades = 0
 
+            futures = [
+                self.executor.submit(self._dispatch_user_jobs, job, user_states[user_id], entry_checks)
+                for user_id, job in jobs.items()
+            ]
+            for future in as_completed(futures):
+                alerts, trades = future.result()
+                total_alerts += alerts
+                total_trades += trades
+
+            # Mark as alerted in this cycle
+            self.alerted_in_cycle.update(c['market'] for c in candidates)
+
+            logger.info(f"[AutoTradingWorker] ✅ Cycle complete: {total_alerts} alerts sent, {total_trades} auto-trades executed "
+                        f"({len(jobs)} users)")
+
+        except Exception as e:
+            logger.error(f"[AutoTradingWorker] Error in process_candidates: {e}")
+
+    def build_user_jobs(self, candidates: List[Dict], active_users: List[tuple]) -> Dict[int, Dict]:
+        """
+        Decide which candidates go to which users and compute their targets
+
+        Args:
+            candidates: Surge candidates (from get_surge_candidates)
+            active_users: (user, settings, subscription) tuples
+
+        Returns:
+            {user_id: {'user', 'settings', 'plan', 'items': [(candidate, target_result), ...]}}
+        """
+        jobs = {}
+        # (market, target settings) -> get_target_prices result
+        targets = {}
+
+        for user, settings, subscription in active_users:
+            if user.id in jobs:
+                continue  # Multiple subscription rows for one user
+
+            # Get user's plan from subscription
+            user_plan = subscription.plan if subscription else 'free'
+
+            # Check user's minimum confidence threshold
+            user_min_confidence = getattr(settings, 'min_confidence', 60.0)  # Default: 60% (stored as 60.0 in DB)
+
+            # Build settings dict from user's auto-trading settings
+            user_settings = {
+                'use_dynamic_target': getattr(settings, 'use_dynamic_target', True),
+                'target_calculation_mode': getattr(settings, 'target_calculation_mode', 'dynamic'),
+                'min_target_percent': getattr(settings, 'min_target_percent', 5.0),
+                'max_target_percent': getattr(settings, 'max_target_percent', 18.0),
+                'take_profit_percent': getattr(settings, 'take_profit_percent', 10.0),
+                'stop_loss_percent': getattr(settings, 'stop_loss_percent', -5.0)
+            }
+            settings_key = tuple(sorted(user_settings.items()))
+
+            items = []
             for candidate in candidates:
                 market = candidate['market']
 
-                # Skip if already alerted in this cycle
-                if market in self.alerted_in_cycle:
-                    logger.debug(f"[AutoTradingWorker] {market} already processed in this cycle")
+                if candidate['score'] < user_min_confidence:
+                    logger.debug(
+                        f"[AutoTradingWorker] User {user.id} (plan: {user_plan}) skipped {market}: "
+                        f"score {candidate['score']:.1f} < required {user_min_confidence:.1f}"
+                    )
                     continue
 
-                for user, settings, subscription in active_users:
-                    try:
-                        # Get user's plan from subscription
-                        user_plan = subscription.plan if subscription else 'free'
-
-                        # Check user's minimum confidence threshold
-                        user_min_confidence = getattr(settings, 'min_confidence', 60.0)  # Default: 60% (stored as 60.0 in DB)
-                        candidate_score = candidate['score']  # Score is already in 0-100 range
-
-                        if candidate_score < user_min_confidence:
-                            logger.debug(
-                                f"[AutoTradingWorker] User {user.id} (plan: {user_plan}) skipped {market}: "
-                                f"score {candidate_score:.1f} < required {user_min_confidence:.1f}"
-                            )
-                            continue
-
-                        # Calculate dynamic target prices based on user's settings
-                        analysis_result = candidate['analysis']
-                        current_price = candidate['current_price']
-
-                        # Build settings dict from user's auto-trading settings
-                        user_settings = {
-                            'use_dynamic_target': getattr(settings, 'use_dynamic_target', True),
-                            'target_calculation_mode': getattr(settings, 'target_calculation_mode', 'dynamic'),
-                            'min_target_percent': getattr(settings, 'min_target_percent', 5.0),
-                            'max_target_percent': getattr(settings, 'max_target_percent', 18.0),
-                            'take_profit_percent': getattr(settings, 'take_profit_percent', 10.0),
-                            'stop_loss_percent': getattr(settings, 'stop_loss_percent', -5.0)
-                        }
-
-                        # Calculate dynamic target and stop loss prices
-                        target_result = self.predictor.get_target_prices(
-                            entry_price=current_price,
-                            analysis_result=analysis_result,
-                            settings=user_settings
-                        )
-
-                        target_price = target_result['target_price']
-                        stop_loss_price = target_result['stop_loss_price']
-                        target_percent = target_result['target_percent']
-
-                        logger.info(
-                            f"[AutoTradingWorker] Dynamic target for user {user.id} (plan: {user_plan}) on {market}: "
-                            f"Entry={current_price:,}, Target={target_price:,} (+{target_percent:.2f}%), "
-                            f"Stop={stop_loss_price:,} ({target_result['stop_loss_percent']:.2f}%), "
-                            f"Mode={target_result['calculation_mode']}"
-                        )
-
-                        # Send alert and potentially execute trade with dynamic prices
-                        success, alert = surge_service.send_alert_to_user(
-                            user_id=user.id,
-                            plan=user_plan,
-                            market=market,
-                            coin=candidate['coin'],
-                            confidence=candidate['score'],
-                            current_price=current_price,
-                            target_price=target_price,
-                            expected_return=target_percent,
-                            entry_price=current_price,
-                            stop_loss_price=stop_loss_price,
-                            telegram_chat_id=user.telegram_chat_id if hasattr(user, 'telegram_chat_id') else None
-                        )
-
-                        if success:
-                            total_alerts += 1
-                            if alert and alert.auto_traded:
-                                total_trades += 1
-                                logger.info(f"[AutoTradingWorker] ✅ Auto-trade executed: User {user.id} bought {market}")
-                            else:
-                                logger.info(f"[AutoTradingWorker] 📧 Alert sent: User {user.id} notified about {market}")
-
-                    except Exception as e:
-                        logger.error(f"[AutoTradingWorker] Error processing user {user.id} for {market}: {e}")
-                        continue
-
-                # Mark as alerted in this cycle
-                self.alerted_in_cycle.add(market)
-
-            logger.info(f"[AutoTradingWorker] ✅ Cycle complete: {total_alerts} alerts sent, {total_trades} auto-trades executed")
+                # Calculate dynamic target and stop loss prices (once per distinct settings)
+                key = (market, settings_key)
+                if key not in targets:
+                    targets[key] = self.predictor.get_target_prices(
+                        entry_price=candidate['current_price'],
+                        analysis_result=candidate['analysis'],
+                        settings=user_settings
+                    )
+                items.append((candidate, targets[key]))
 
-        except Exception as e:
-            logger.error(f"[AutoTradingWorker] Error in process_candidates: {e}")
+            if items:
+                jobs[user.id] = {
+                    'user': user,
+                    'settings': settings,
+                    'plan': user_plan,
+                    'items': items
+                }
+
+        logger.info(f"[AutoTradingWorker] {sum(len(j['items']) for j in jobs.values())} user/candidate pairs "
+                    f"for {len(jobs)} users ({len(targets)} target calculations)")
+        return jobs
+
+    def _dispatch_user_jobs(self, job: Dict, user_state: Dict, entry_checks: Dict) -> tuple:
+        """
+        Send one user's alerts (and auto-trades) in candidate order
+
+        Runs on the worker pool with its own DB session.
+
+        Returns:
+            (alerts_sent, trades_executed)
+        """
+        user = job['user']
+        user_plan = job['plan']
+        alerts = 0
+        trades = 0
+
+        session = get_db_session()
+        try:
+            surge_service = SurgeAlertService(session)
+
+            for candidate, target_result in job['items']:
+                market = candidate['market']
+                try:
+                    current_price = candidate['current_price']
+                    target_price = target_result['target_price']
+                    stop_loss_price = target_result['stop_loss_price']
+                    target_percent = target_result['target_percent']
+
+                    logger.info(
+                        f"[AutoTradingWorker] Dynamic target for user {user.id} (plan: {user_plan}) on {market}: "
+                        f"Entry={current_price:,}, Target={target_price:,} (+{target_percent:.2f}%), "
+                        f"Stop={stop_loss_price:,} ({target_result['stop_loss_percent']:.2f}%), "
+                        f"Mode={target_result['calculation_mode']}"
+                    )
+
+                    # Send alert and potentially execute trade with dynamic prices
+                    success, alert = surge_service.send_alert_to_user(
+                        user_id=user.id,
+                        plan=user_plan,
+                        market=market,
+                        coin=candidate['coin'],
+                        confidence=candidate['score'],
+                        current_price=current_price,
+                        target_price=target_price,
+                        expected_return=target_percent,
+                        entry_price=current_price,
+                        stop_loss_price=stop_loss_price,
+                        telegram_chat_id=user.telegram_chat_id if hasattr(user, 'telegram_chat_id') else None,
+                        settings=job['settings'],
+                        user_state=user_state,
+                        entry_checks=entry_checks
+                    )
+
+                    if success:
+                        alerts += 1
+                        if alert and alert.auto_traded:
+                            trades += 1
+                            logger.info(f"[AutoTradingWorker] ✅ Auto-trade executed: User {user.id} bought {market}")
+                        else:
+                            logger.info(f"[AutoTradingWorker] 📧 Alert sent: User {user.id} notified about {market}")
+
+                except Exception as e:
+                    logger.error(f"[AutoTradingWorker] Error processing user {user.id} for {market}: {e}")
+                    continue
+
+        finally:
+            session.close()
+
+        return alerts, trades
 
     def run_worker_loop(self):
         """
@@ -326,12 +397,12 @@ class SurgeAutoTradingWorker:
 
                 # Wait for next cycle
                 logger.info(f"[AutoTradingWorker] Next check in {self.check_interval}s...")
-                time.sleep(self.check_interval)
+                self._stop_event.wait(self.check_interval)
 
             except Exception as e:
                 logger.error(f"[AutoTradingWorker] Error in worker loop: {e}")
                 # Wait and retry
-                time.sleep(60)
+                self._stop_event.wait(60)
 
     def start(self):
         """
@@ -342,6 +413,7 @@ class SurgeAutoTradingWorker:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self.run_worker_loop, daemon=True)
         self.thread.start()
 
@@ -356,9 +428,12 @@ class SurgeAutoTradingWorker:
             return
 
         self.running = False
+        self._stop_event.set()
 
+        # Wait for the current cycle to finish so a restart never overlaps it
         if self.thread:
-            self.thread.join(timeout=10)
+            self.thread.join()
+            self.thread = None
 
         logger.info("[AutoTradingWorker] ✅ Worker stopped")
 
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Surge Feature Kernel - Vectorized SurgePredictor scoring
+
+Columnar NumPy implementation of every Pattern A / Pattern B feature in
+SurgePredictor. Candles are converted to arrays once per market and all
+features are computed in a single pass over a 2-D (markets x candles)
+batch, so a whole universe can be scored at once.
+
+Results match SurgePredictor.analyze_coin() (same keys, scores and
+thresholds; float values agree to rounding precision).
+
+Array layout: newest candle first (Upbit order), shape (M, WINDOW).
+"""
+
+import numpy as np
+
+# Number of candles the features look at (analyze_coin requires >= 30)
+WINDOW = 30
+RSI_PERIOD = 14
+
+CANDLE_FIELDS = ('trade_price', 'high_price', 'low_price', 'candle_acc_trade_price')
+
+
+def candles_to_arrays(candle_data, window=WINDOW):
+    """
+    Convert one market's candle list to columnar arrays.
+
+    Args:
+        candle_data: Upbit candles (list of dicts, newest first)
+        window: Number of most recent candles to keep
+
+    Returns:
+        np.ndarray: shape (window, 4) - close, high, low, trade value
+
+    Raises:
+        ValueError: If there are fewer than `window` candles
+    """
+    rows = candle_data[:window]
+    if len(rows) < window:
+        raise ValueError(f"need {window} candles, got {len(rows)}")
+    return np.array([[float(c.get(f, 0)) for f in CANDLE_FIELDS] for c in rows], dtype=np.float64)
+
+
+def stack_markets(candle_lists, window=WINDOW):
+    """
+    Stack several markets into one batch.
+
+    Args:
+        candle_lists: List of candle lists (each with >= window candles)
+
+    Returns:
+        dict: close/high/low/value arrays of shape (M, window)
+    """
+    batch = np.stack([candles_to_arrays(c, window) for c in candle_lists])
+    return {
+        'close': batch[:, :, 0],
+        'high': batch[:, :, 1],
+        'low': batch[:, :, 2],
+        'value': batch[:, :, 3],
+    }
+
+
+def compute_batch_features(market_arrays, current_prices):
+    """
+    Stack per-market arrays from candles_to_arrays() and compute features.
+
+    Args:
+        market_arrays: List of (WINDOW, 4) arrays
+        current_prices: List of current prices, one per market
+
+    Returns:
+        dict of feature arrays (see compute_features)
+    """
+    batch = np.stack(market_arrays)
+    return compute_features(
+        batch[:, :, 0], batch[:, :, 1], batch[:, :, 2], batch[:, :, 3],
+        np.asarray(current_prices, dtype=np.float64)
+    )
+
+
+def _rsi(close, period=RSI_PERIOD):
+    """Simple-average RSI over the newest `period` changes (SurgePredictor._calculate_rsi)."""
+    change = close[:, :period] - close[:, 1:period + 1]
+    avg_gain = np.where(change > 0, change, 0.0).sum(axis=1) / period
+    avg_loss = np.where(change > 0, 0.0, -change).sum(axis=1) / period
+    safe_loss = np.where(avg_loss == 0, 1.0, avg_loss)
+    return np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / safe_loss)))
+
+
+def compute_features(close, high, low, value, current_price):
+    """
+    Compute all Pattern A and Pattern B features for a batch.
+
+    Args:
+        close, high, low, value: float arrays of shape (M, >= WINDOW), newest first
+        current_price: float array of shape (M,)
+
+    Returns:
+        dict of feature arrays, each of shape (M,)
+    """
+    current_price = np.asarray(current_price, dtype=np.float64)
+    f = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # ===== Shared =====
+        rsi = _rsi(close)
+        f['rsi'] = rsi
+        avg_value_7_21 = value[:, 7:21].mean(axis=1)
+
+        # ===== A1: Accumulation (0-25) =====
+        avg_value_7_30 = value[:, 7:30].mean(axis=1)
+        acc_ratio = value[:, 0] / avg_value_7_30
+        price_mean = close[:, :7].mean(axis=1)
+        price_std = close[:, :7].std(axis=1, ddof=1)
+        volatility = np.where(price_mean > 0, price_std / price_mean * 100, 0.0)
+        volume_score = np.select(
+            [(acc_ratio >= 1.5) & (acc_ratio < 2.5), (acc_ratio >= 2.5) & (acc_ratio < 4.0)], [15, 10], 0)
+        consolidation_score = np.select([volatility < 3, volatility < 5, volatility < 8], [10, 7, 3], 0)
+        f['acc_valid'] = avg_value_7_30 != 0
+        f['acc_ratio'] = acc_ratio
+        f['acc_volatility'] = volatility
+        f['acc_score'] = np.where(f['acc_valid'], np.minimum(25, volume_score + consolidation_score), 0)
+
+        # ===== A2: Support bounce (0-25) =====
+        support = low[:, :WINDOW].min(axis=1)
+        distance = (current_price - support) / support * 100
+        recent_lows = low[:, :3]
+        touched = (np.abs((recent_lows - support[:, None]) / support[:, None] * 100) < 2).any(axis=1)
+        recovering = current_price > recent_lows.min(axis=1) * 1.01
+        f['sup_valid'] = (support != 0) & (current_price != 0)
+        f['sup_level'] = support
+        f['sup_distance'] = distance
+        f['sup_touched'] = touched
+        f['sup_score'] = np.where(f['sup_valid'], np.select(
+            [(distance <= 3) & touched & recovering, (distance <= 5) & touched,
+             distance <= 5, distance <= 8, distance <= 12],
+            [25, 20, 15, 10, 5], 0), 0)
+
+        # ===== A3: Early momentum (0-20) =====
+        momentum = (close[:, 0] - close[:, 4]) / close[:, 4] * 100
+        in_sweet_spot = (momentum >= 3) & (momentum <= 8)
+        f['mom_valid'] = close[:, 4] != 0
+        f['mom_pct'] = momentum
+        f['mom_score'] = np.where(f['mom_valid'], np.select(
+            [in_sweet_spot & (rsi >= 40) & (rsi <= 55), in_sweet_spot & (rsi >= 35) & (rsi <= 60),
+             in_sweet_spot, (momentum >= 1) & (momentum < 3)],
+            [20, 15, 10, 8], 0), 0)
+
+        # ===== A4: Volume timing (0-20) =====
+        vt_ratio = value[:, 0] / avg_value_7_21
+        vt_yesterday = value[:, 1] / avg_value_7_21
+        first_spike = (vt_ratio >= 2.0) & (vt_yesterday < 2.0)
+        in_2_3 = (vt_ratio >= 2.0) & (vt_ratio < 3.0)
+        f['vt_valid'] = avg_value_7_21 != 0
+        f['vt_ratio'] = vt_ratio
+        f['vt_first_spike'] = first_spike
+        f['vt_score'] = np.where(f['vt_valid'], np.select(
+            [in_2_3 & first_spike, in_2_3, (vt_ratio >= 3.0) & (vt_ratio < 4.0),
+             vt_ratio >= 4.0, (vt_ratio >= 1.5) & (vt_ratio < 2.0)],
+            [20, 15, 12, 5, 8], 0), 0)
+
+        # ===== A5: Pattern (0-10) =====
+        higher_lows = (low[:, 0:3].min(axis=1) > low[:, 3:6].min(axis=1)) & \
+                      (low[:, 3:6].min(axis=1) > low[:, 6:9].min(axis=1))
+        higher_highs = (high[:, 0:3].max(axis=1) > high[:, 3:6].max(axis=1)) & \
+                       (high[:, 3:6].max(axis=1) > high[:, 6:9].max(axis=1))
+        f['pat_higher_lows'] = higher_lows
+        f['pat_higher_highs'] = higher_highs
+        f['pat_score'] = np.select(
+            [higher_lows & higher_highs, higher_lows, higher_highs], [10, 7, 5], 0)
+
+        # ===== B1: Oversold (0-30) =====
+        drop = (close[:, 0] - close[:, 5]) / close[:, 5] * 100
+        f['ovs_valid'] = close[:, 5] != 0
+        f['ovs_drop'] = drop
+        f['ovs_score'] = np.where(f['ovs_valid'], np.select(
+            [(rsi >= 15) & (rsi <= 25) & (drop >= -25) & (drop <= -15),
+             (rsi < 30) & (drop >= -25) & (drop <= -10),
+             (rsi < 35) & (drop >= -20) & (drop <= -10),
+             (rsi < 40) & (drop >= -15) & (drop <= -5)],
+            [30, 25, 20, 15], 0), 0)
+
+        # ===== B2: Volume reversal (0-35) =====
+        vr_ratio = value[:, 0] / avg_value_7_21
+        vr_yesterday = value[:, 1] / avg_value_7_21
+        increasing = vr_ratio > vr_yesterday * 1.2
+        f['vr_valid'] = (avg_value_7_21 != 0) & (value[:, 1] != 0)
+        f['vr_ratio'] = vr_ratio
+        f['vr_yesterday'] = vr_yesterday
+        f['vr_increasing'] = increasing
+        f['vr_score'] = np.where(f['vr_valid'], np.select(
+            [(vr_ratio >= 1.5) & (vr_ratio <= 2.5) & (vr_yesterday < 1.2) & increasing,
+             (vr_ratio >= 1.2) & (vr_ratio <= 2.5) & increasing,
+             (vr_ratio >= 0.8) & (vr_ratio <= 1.5),
+             vr_ratio < 0.8,
+             vr_ratio > 3.0],
+            [35, 30, 20, 10, 5], 0), 0)
+
+        # ===== B3: Panic recovery (0-35) =====
+        lows_5 = low[:, :5]
+        bottom_low = lows_5.min(axis=1)
+        bottom_day = lows_5.argmin(axis=1)
+        recovery = (current_price - bottom_low) / bottom_low * 100
+        pr_higher_lows = low[:, 0:2].min(axis=1) > low[:, 2:4].min(axis=1)
+        f['pr_valid'] = bottom_low != 0
+        f['pr_low'] = bottom_low
+        f['pr_recovery'] = recovery
+        f['pr_days'] = bottom_day
+        f['pr_higher_lows'] = pr_higher_lows
+        f['pr_score'] = np.where(f['pr_valid'], np.select(
+            [(bottom_day <= 2) & (recovery >= 2) & (recovery <= 5) & pr_higher_lows,
+             (bottom_day <= 3) & (recovery >= 1) & (recovery <= 8),
+             (recovery > 0) & (recovery <= 10),
+             (bottom_day <= 1) & (recovery <= 2),
+             recovery < 0,
+             recovery > 15],
+            [35, 30, 20, 25, 0, 5], 0), 0)
+
+        # ===== Totals =====
+        f['score_a'] = np.clip(f['acc_score'] + f['sup_score'] + f['mom_score'] + f['vt_score'] + f['pat_score'], 0, 100)
+        f['score_b'] = np.clip(f['ovs_score'] + f['vr_score'] + f['pr_score'], 0, 100)
+
+        # ===== Entry timing =====
+        mom_t = np.where(f['mom_valid'], momentum, 0.0)
+        vol_t = np.where(f['vt_valid'], vt_ratio, 0.0)
+        recent_high = high[:, :WINDOW].max(axis=1)
+        position = np.where(recent_high > 0, current_price / recent_high * 100, 0.0)
+        f['timing_a'] = np.select(
+            [(mom_t < 5) & (vol_t < 3) & (position < 80),
+             (mom_t < 8) & (vol_t < 4) & (position < 85),
+             (mom_t < 12) | (vol_t < 5) | (position < 90)],
+            ['early', 'good', 'late'], 'missed')
+
+        rsi_t = np.where(f['ovs_valid'], rsi, 50.0)
+        days_t = np.where(f['pr_valid'], bottom_day, 0)
+        f['timing_b'] = np.select(
+            [(rsi_t < 25) & (days_t <= 1), (rsi_t < 35) & (days_t <= 2), (rsi_t < 45) & (days_t <= 3)],
+            ['early', 'good', 'late'], 'missed')
+
+    return f
+
+
+def build_signals(f, i):
+    """
+    Build SurgePredictor-style signal dicts for market i of a feature batch.
+
+    Returns:
+        tuple: (signals_a, signals_b) with native Python values
+    """
+    signals_a = {}
+
+    if f['acc_valid'][i]:
+        ratio, vol = float(f['acc_ratio'][i]), float(f['acc_volatility'][i])
+        signals_a['accumulation'] = {
+            'score': int(f['acc_score'][i]),
+            'volume_ratio': ratio,
+            'volatility_pct': vol,
+            'description': f'Accumulation (vol: {ratio:.1f}x, volatility: {vol:.1f}%)'
+        }
+    else:
+        signals_a['accumulation'] = {'score': 0, 'description': 'No data'}
+
+    if f['sup_valid'][i]:
+        distance = float(f['sup_distance'][i])
+        signals_a['support_bounce'] = {
+            'score': int(f['sup_score'][i]),
+            'support_level': float(f['sup_level'][i]),
+            'distance_pct': distance,
+            'touched_support': bool(f['sup_touched'][i]),
+            'description': f'Support bounce ({distance:.1f}% above support)'
+        }
+    else:
+        signals_a['support_bounce'] = {'score': 0, 'description': 'No support data'}
+
+    if f['mom_valid'][i]:
+        momentum, rsi = float(f['mom_pct'][i]), float(f['rsi'][i])
+        signals_a['early_momentum'] = {
+            'score': int(f['mom_score'][i]),
+            'momentum_pct': momentum,
+            'rsi': rsi,
+            'description': f'Early momentum ({momentum:+.1f}%, RSI: {rsi:.0f})'
+        }
+    else:
+        signals_a['early_momentum'] = {'score': 0, 'description': 'Insufficient data'}
+
+    if f['vt_valid'][i]:
+        ratio, first = float(f['vt_ratio'][i]), bool(f['vt_first_spike'][i])
+        signals_a['volume_timing'] = {
+            'score': int(f['vt_score'][i]),
+            'volume_ratio': ratio,
+            'is_first_spike': first,
+            'description': f'Volume timing ({ratio:.1f}x, {"first spike" if first else "ongoing"})'
+        }
+    else:
+        signals_a['volume_timing'] = {'score': 0, 'description': 'No volume data'}
+
+    hl, hh = bool(f['pat_higher_lows'][i]), bool(f['pat_higher_highs'][i])
+    signals_a['pattern'] = {
+        'score': int(f['pat_score'][i]),
+        'higher_lows': hl,
+        'higher_highs': hh,
+        'description': f'Pattern (HL: {hl}, HH: {hh})'
+    }
+
+    signals_b = {}
+
+    if f['ovs_valid'][i]:
+        rsi, drop = float(f['rsi'][i]), float(f['ovs_drop'][i])
+        signals_b['oversold_detection'] = {
+            'score': int(f['ovs_score'][i]),
+            'rsi': rsi,
+            'drop_pct': drop,
+            'description': f'Oversold (RSI: {rsi:.0f}, drop: {drop:.1f}%)'
+        }
+    else:
+        signals_b['oversold_detection'] = {'score': 0, 'description': 'Insufficient data'}
+
+    if f['vr_valid'][i]:
+        ratio, yesterday, increasing = float(f['vr_ratio'][i]), float(f['vr_yesterday'][i]), bool(f['vr_increasing'][i])
+        signals_b['volume_reversal'] = {
+            'score': int(f['vr_score'][i]),
+            'current_ratio': ratio,
+            'yesterday_ratio': yesterday,
+            'volume_increasing': increasing,
+            'description': f'Volume reversal ({ratio:.1f}x, {"increasing" if increasing else "stable"})'
+        }
+    else:
+        signals_b['volume_reversal'] = {'score': 0, 'description': 'No volume data'}
+
+    if f['pr_valid'][i]:
+        days, recovery = int(f['pr_days'][i]), float(f['pr_recovery'][i])
+        signals_b['panic_recovery'] = {
+            'score': int(f['pr_score'][i]),
+            'recent_low': float(f['pr_low'][i]),
+            'recovery_pct': recovery,
+            'recovery_days': days,
+            'higher_lows': bool(f['pr_higher_lows'][i]),
+            'description': f'Panic recovery (bottom: {days}d ago, +{recovery:.1f}%)'
+        }
+    else:
+        signals_b['panic_recovery'] = {'score': 0, 'description': 'Error'}
+
+    return signals_a, signals_b
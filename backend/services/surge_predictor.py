@@ -12,6 +12,13 @@ Key difference from V1:
 
 import statistics
 
+try:
+    from backend.services import surge_feature_kernel as kernel
+    NUMPY_AVAILABLE = True
+except ImportError:
+    kernel = None
+    NUMPY_AVAILABLE = False
+
 
 class SurgePredictor:
     """
@@ -94,25 +101,11 @@ class SurgePredictor:
                 pattern_type = 'B_OversoldBounce'
                 entry_timing = self._assess_entry_timing_pattern_b(candle_data, current_price, signals_b)
 
-            # Generate recommendation
-            min_score = self.surge_config.get('min_surge_probability_score', 70)
-
-            if entry_timing == 'late' or entry_timing == 'missed':
-                recommendation = 'pass'  # Too late, don't chase
-            elif total_score >= min_score:
-                recommendation = 'strong_buy'
-            elif total_score >= 60:
-                recommendation = 'buy'
-            elif total_score >= 50:
-                recommendation = 'hold'
-            else:
-                recommendation = 'pass'
-
             return {
                 'coin': coin_symbol,
                 'score': total_score,
                 'signals': signals,
-                'recommendation': recommendation,
+                'recommendation': self._recommend(total_score, entry_timing),
                 'entry_timing': entry_timing,
                 'pattern_type': pattern_type,
                 'current_price': current_price
@@ -128,6 +121,83 @@ class SurgePredictor:
                 'entry_timing': 'unknown'
             }
 
+    def analyze_batch(self, market_candles, current_prices=None):
+        """
+        Analyze many coins at once with the vectorized feature kernel.
+
+        Candles are converted to NumPy arrays once per market and every
+        Pattern A/B feature is computed in one pass over the whole batch.
+        Falls back to analyze_coin() per market if NumPy is unavailable
+        or a market's candles cannot be converted.
+
+        Args:
+            market_candles: {market: candle_data} (Upbit candles, newest first)
+            current_prices: {market: price} (default: latest candle close)
+
+        Returns:
+            {market: result} with the same structure as analyze_coin()
+        """
+        current_prices = current_prices or {}
+        results = {}
+        batch_markets = []
+        batch_arrays = []
+
+        for market, candle_data in market_candles.items():
+            current_price = current_prices.get(market)
+            if current_price is None and candle_data:
+                current_price = float(candle_data[0].get('trade_price', 0))
+
+            if not NUMPY_AVAILABLE or not candle_data or len(candle_data) < 30:
+                results[market] = self.analyze_coin(market, candle_data, current_price)
+                continue
+
+            try:
+                batch_arrays.append(kernel.candles_to_arrays(candle_data))
+                batch_markets.append((market, current_price))
+            except (TypeError, ValueError):
+                results[market] = self.analyze_coin(market, candle_data, current_price)
+
+        if batch_markets:
+            features = kernel.compute_batch_features(batch_arrays, [price for _, price in batch_markets])
+
+            for i, (market, current_price) in enumerate(batch_markets):
+                signals_a, signals_b = kernel.build_signals(features, i)
+                score_a, score_b = int(features['score_a'][i]), int(features['score_b'][i])
+
+                if score_a >= score_b:
+                    total_score, signals, pattern_type = score_a, signals_a, 'A_Accumulation'
+                    entry_timing = str(features['timing_a'][i])
+                else:
+                    total_score, signals, pattern_type = score_b, signals_b, 'B_OversoldBounce'
+                    entry_timing = str(features['timing_b'][i])
+
+                results[market] = {
+                    'coin': market,
+                    'score': total_score,
+                    'signals': signals,
+                    'recommendation': self._recommend(total_score, entry_timing),
+                    'entry_timing': entry_timing,
+                    'pattern_type': pattern_type,
+                    'current_price': current_price
+                }
+
+        return results
+
+    def _recommend(self, total_score, entry_timing):
+        """Map score and entry timing to a recommendation."""
+        min_score = self.surge_config.get('min_surge_probability_score', 70)
+
+        if entry_timing == 'late' or entry_timing == 'missed':
+            return 'pass'  # Too late, don't chase
+        elif total_score >= min_score:
+            return 'strong_buy'
+        elif total_score >= 60:
+            return 'buy'
+        elif total_score >= 50:
+            return 'hold'
+        else:
+            return 'pass'
+
     def _detect_accumulation(self, candle_data):
         """
         Detect Accumulation Phase (축적 단계).
@@ -12,6 +12,7 @@ from sqlalchemy import text
 
 from backend.common import UpbitAPI, load_api_keys
 from backend.database.connection import get_db_session
+from backend.services.ticker_hub import get_ticker_hub
 
 logging.basicConfig(
     format='[%(asctime)s] %(name)s - %(levelname)s - %(message)s',
@@ -83,8 +84,8 @@ class SurgeStatusUpdater:
             target_price = alert['target_price']
             stop_loss_price = alert['stop_loss_price']
 
-            # Get current price from Upbit API
-            current_price = self.upbit_api.get_current_price(market)
+            # Get current price from the shared ticker hub
+            current_price = get_ticker_hub().get_price(market)
             if not current_price:
                 logger.warning(f"[SurgeStatusUpdater] Could not get price for {market}")
                 return False
@@ -173,9 +174,6 @@ class SurgeStatusUpdater:
                         elif result == 'lose':
                             stats['lose'] += 1
 
-                # Rate limit: avoid Upbit API throttling
-                time.sleep(0.2)
-
             except Exception as e:
                 logger.error(f"[SurgeStatusUpdater] Error processing alert {alert['id']}: {e}")
                 continue
@@ -20,6 +20,7 @@ from sqlalchemy import text
 from backend.common import UpbitAPI, load_api_keys
 from backend.database.connection import get_db_session
 from backend.services.auto_trading_service import AutoTradingService
+from backend.services.ticker_hub import get_ticker_hub
 
 # Telegram notification support
 try:
@@ -219,7 +220,7 @@ class SurgeTradingMonitor:
             stop_loss_price = position['stop_loss_price']
 
             # Get current price
-            current_price = self.upbit_api.get_current_price(market)
+            current_price = get_ticker_hub().get_price(market)
             if not current_price:
                 logger.warning(f"[SurgeTradingMonitor] Could not get price for {market}")
                 return False
@@ -415,9 +416,6 @@ class SurgeTradingMonitor:
                 if closed:
                     stats['closed'] += 1
 
-                # Rate limit to avoid API throttling
-                time.sleep(0.1)
-
             except Exception as e:
                 logger.error(f"[SurgeTradingMonitor] Error processing position {position['position_id']}: {e}")
                 continue
@@ -5,10 +5,13 @@
 """
 import os
 import asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict
 from datetime import datetime
 import logging
-from sqlalchemy import text
+
+from backend.services.telegram_broadcast import (
+    TelegramBroadcaster, get_telegram_plan_index, PRIORITY_SURGE_ALERT, TELEGRAM_BROADCAST_WORKERS
+)
 
 try:
     from telegram import Bot, Update
@@ -47,6 +50,8 @@ class SurgeTelegramBot:
         self.app = None
         self.bot = None
         self.subscribers = set()  # Set of chat_ids to send notifications
+        self.broadcaster = None  # Created with the bot in initialize()
+        self.owner_loop = None  # Event loop the bot's HTTP client lives on (TelegramUpdateWorker)
         self.min_score = 70  # Raised from 60 to improve signal quality
 
         logger.info("[TelegramBot] Initialized")
@@ -263,6 +268,7 @@ KRW-XLM: +110.51% (2024-11-20)
                     f"{self.base_url}/settings.html",
                     parse_mode='Markdown'
                 )
+                get_telegram_plan_index().invalidate()
                 logger.info(f"[TelegramBot] Account linked: chat_id={chat_id}, user={user_info.get('email')}")
             else:
                 error_message = data.get('error', 'Unknown error')
@@ -359,43 +365,17 @@ All trading decisions and risks are your own.
         except Exception as e:
             logger.error(f"[TelegramBot] Failed to send signal notification to {chat_id}: {e}")
 
-    def get_user_plan_by_chat_id(self, chat_id: str) -> Optional[str]:
+    async def _on_owner_loop(self, coro):
         """
-        Get user's subscription plan by telegram chat_id
-
-        Args:
-            chat_id: Telegram chat ID
+        Await a coroutine on the loop that owns the bot
 
-        Returns:
-            Plan code ('free', 'basic', 'pro') or None if not found
+        Callers on another loop (e.g. the surge alert scheduler thread) must
+        not drive the bot's HTTP client directly.
         """
-        try:
-            from backend.database.connection import get_db_session
-
-            with get_db_session() as session:
-                query = text("""
-                    SELECT us.plan
-                    FROM telegram_link_codes tlc
-                    JOIN user_subscriptions us ON tlc.user_id = us.user_id
-                    WHERE tlc.telegram_chat_id = :chat_id
-                    AND tlc.used = true
-                    AND us.status = 'active'
-                    ORDER BY us.started_at DESC
-                    LIMIT 1
-                """)
-
-                result = session.execute(query, {'chat_id': str(chat_id)}).fetchone()
-
-                if result:
-                    plan = result[0]
-                    return plan.lower() if plan else 'free'
-                else:
-                    # No active subscription found - return free
-                    return 'free'
-
-        except Exception as e:
-            logger.error(f"[TelegramBot] Error getting user plan for chat_id {chat_id}: {e}")
-            return 'free'  # Default to free on error
+        owner_loop = self.owner_loop
+        if owner_loop is None or owner_loop.is_closed() or owner_loop is asyncio.get_running_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, owner_loop))
 
     async def send_surge_alert(self, candidate: Dict):
         """
@@ -451,36 +431,26 @@ https://t.me/coinpulse_surge_sinsi_bot
 투자 책임은 본인에게 있습니다.
         """
 
-        # Send to subscribers with plan-based filtering
-        sent_count = 0
-        filtered_count = 0
+        # Plan-based filtering: ONLY Enterprise receives surge alerts
+        plans = get_telegram_plan_index().get_plans(list(self.subscribers))
+        recipients = [chat_id for chat_id, plan in plans.items() if plan == 'enterprise']
+        filtered_count = len(plans) - len(recipients)
 
-        for chat_id in list(self.subscribers):
-            try:
-                # Get user's plan
-                plan = self.get_user_plan_by_chat_id(chat_id)
-
-                # Plan-based filtering: ONLY Enterprise receives surge alerts
-                if plan != 'enterprise':
-                    logger.debug(f"[TelegramBot] Skipping {chat_id}: Only Enterprise receives surge alerts (current plan: {plan})")
-                    filtered_count += 1
-                    continue
-
-                # Send alert (use HTML mode for better special character handling)
-                await self.bot.send_message(
-                    chat_id=chat_id,
-                    text=alert_message,
-                    parse_mode=None  # Plain text to avoid Markdown parsing errors
-                )
-                sent_count += 1
-                logger.info(f"[TelegramBot] Alert sent to {chat_id} ({plan}): {market} ({score}점)")
+        result = await self._on_owner_loop(self.broadcaster.broadcast(
+            [(chat_id, alert_message) for chat_id in recipients],
+            priority=PRIORITY_SURGE_ALERT,
+            parse_mode=None  # Plain text to avoid Markdown parsing errors
+        ))
 
-            except Exception as e:
-                logger.error(f"[TelegramBot] Failed to send to {chat_id}: {e}")
-                # Remove invalid chat_id
-                self.subscribers.discard(chat_id)
+        # Only chats that blocked the bot or no longer exist are dropped
+        for chat_id in result['unreachable']:
+            self.subscribers.discard(chat_id)
 
-        logger.info(f"[TelegramBot] Surge alert summary: {sent_count} sent, {filtered_count} filtered by plan")
+        logger.info(
+            f"[TelegramBot] Surge alert summary: {market} ({score}점) {result['sent']} sent, "
+            f"{result['failed']} failed, {len(result['unreachable'])} unreachable, "
+            f"{filtered_count} filtered by plan in {result['duration']}s"
+        )
 
     async def send_execution_notification(self, data: Dict):
         """
@@ -609,8 +579,19 @@ https://t.me/coinpulse_surge_sinsi_bot
 
     async def initialize(self):
         """Initialize bot application"""
-        self.app = Application.builder().token(self.token).build()
+        builder = Application.builder().token(self.token)
+
+        # Local stub Bot API for tests (e.g. http://127.0.0.1:8081/bot)
+        api_base_url = os.getenv('TELEGRAM_API_BASE_URL')
+        if api_base_url:
+            builder = builder.base_url(api_base_url)
+
+        # One HTTP connection per concurrent broadcast worker
+        builder = builder.connection_pool_size(TELEGRAM_BROADCAST_WORKERS + 4).pool_timeout(10)
+
+        self.app = builder.build()
         self.bot = self.app.bot
+        self.broadcaster = TelegramBroadcaster(self.bot.send_message)
 
         # Register command handlers
         self.app.add_handler(CommandHandler("start", self.start_command))
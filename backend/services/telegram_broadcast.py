@@ -0,0 +1,391 @@
+"""
+텔레그램 브로드캐스트
+
+Concurrent, rate-aware delivery of one alert to many Telegram chats.
+
+- TelegramPlanIndex: chat_id -> subscription plan for every linked chat,
+  loaded with one query and refreshed when subscriptions change, after
+  /link, or when older than TELEGRAM_PLAN_INDEX_TTL.
+- TelegramBroadcaster: priority queue of outbound messages drained by a
+  bounded set of workers, paced to Telegram's global (~30 msg/s) and
+  per-chat (1 msg/s) limits. RetryAfter pauses every worker for the
+  requested time; transient errors are retried with backoff; messages
+  that still fail land in a dead-letter list. Only permanent errors
+  (bot blocked, chat not found) mark a chat unreachable.
+
+Any object with an async send_message(chat_id=..., text=..., parse_mode=...)
+works as the sender, and SurgeTelegramBot honours TELEGRAM_API_BASE_URL,
+so tests can run against a local stub Bot API.
+"""
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, text
+
+from backend.database import get_db_session
+from backend.models.subscription_models import Subscription
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 25))  # messages/second (Telegram: ~30)
+TELEGRAM_CHAT_INTERVAL = 1.0  # seconds between messages to one chat
+TELEGRAM_BROADCAST_WORKERS = int(os.getenv('TELEGRAM_BROADCAST_WORKERS', 16))
+TELEGRAM_PLAN_INDEX_TTL = int(os.getenv('TELEGRAM_PLAN_INDEX_TTL', 300))  # seconds
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5  # seconds, doubled per attempt
+DEAD_LETTER_SIZE = 1000
+
+# Message priorities (lower is sent first)
+PRIORITY_SURGE_ALERT = 0
+PRIORITY_NOTIFICATION = 5
+PRIORITY_BULK = 10
+
+# Telegram errors that will not succeed on retry
+_PERMANENT_ERRORS = ('Forbidden', 'Unauthorized', 'ChatMigrated')
+_PERMANENT_MESSAGES = ('chat not found', 'bot was blocked', 'user is deactivated', 'bot was kicked')
+
+
+# ==================== Plan index ====================
+
+class TelegramPlanIndex:
+    """
+    In-memory chat_id -> plan map (replaces a JOIN query per recipient)
+    """
+
+    def __init__(self, ttl: int = TELEGRAM_PLAN_INDEX_TTL):
+        self.ttl = ttl
+        self._plans: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Reload on next use (subscription or link changed)"""
+        self._stale = True
+
+    def _load(self) -> Dict[str, str]:
+        with get_db_session() as session:
+            rows = session.execute(text("""
+                SELECT tlc.telegram_chat_id, us.plan
+                FROM telegram_link_codes tlc
+                JOIN user_subscriptions us ON tlc.user_id = us.user_id
+                WHERE tlc.used = true
+                AND tlc.telegram_chat_id IS NOT NULL
+                AND us.status = 'active'
+                ORDER BY us.started_at DESC
+            """)).fetchall()
+
+        plans = {}
+        for chat_id, plan in rows:
+            # Latest active subscription wins
+            plans.setdefault(str(chat_id), (plan or 'free').lower())
+        return plans
+
+    def _ensure_loaded(self):
+        if not self._stale and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if not self._stale and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            self._stale = False
+            try:
+                self._plans = self._load()
+                self._loaded_at = time.monotonic()
+                logger.info(f"[TelegramPlanIndex] Loaded plans for {len(self._plans)} linked chats")
+            except Exception as e:
+                # Keep serving the previous index; retry on next use
+                self._stale = True
+                logger.error(f"[TelegramPlanIndex] Refresh failed: {e}")
+
+    def get_plan(self, chat_id) -> str:
+        """
+        Get a chat's plan
+
+        Returns:
+            Plan code ('free' when unlinked or without an active subscription)
+        """
+        self._ensure_loaded()
+        return self._plans.get(str(chat_id), 'free')
+
+    def get_plans(self, chat_ids: Iterable) -> Dict:
+        """
+        Get plans for many chats (at most one refresh)
+
+        Returns:
+            Dict of {chat_id: plan}
+        """
+        self._ensure_loaded()
+        plans = self._plans
+        return {chat_id: plans.get(str(chat_id), 'free') for chat_id in chat_ids}
+
+
+_plan_index = None
+_plan_index_lock = threading.Lock()
+
+
+def get_telegram_plan_index() -> TelegramPlanIndex:
+    """
+    Get or create plan index singleton
+
+    Returns:
+        TelegramPlanIndex instance
+    """
+    global _plan_index
+
+    with _plan_index_lock:
+        if _plan_index is None:
+            _plan_index = TelegramPlanIndex()
+
+    return _plan_index
+
+
+def _on_subscription_change(mapper, connection, target):
+    get_telegram_plan_index().invalidate()
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Subscription, _event_name, _on_subscription_change)
+
+
+# ==================== Rate limiting ====================
+
+class AsyncRateLimiter:
+    """
+    Slot-reservation rate limiter for coroutines
+
+    Each acquire() reserves the next free send slot and sleeps until it;
+    pause() pushes every future slot back (Telegram RetryAfter).
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.interval = 1.0 / rate
+        self.burst = burst
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now - self.interval * (self.burst - 1), self._next)
+            self._next = slot + self.interval
+            wait = slot - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+class _ChatPacer:
+    """Minimum spacing between messages to the same chat"""
+
+    def __init__(self, interval: float = TELEGRAM_CHAT_INTERVAL, max_chats: int = 50000):
+        self.interval = interval
+        self.max_chats = max_chats
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, chat_id):
+        key = str(chat_id)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(key, 0.0))
+            self._next[key] = slot + self.interval
+            if len(self._next) > self.max_chats:
+                # Forget chats whose slot has passed
+                self._next = {k: v for k, v in self._next.items() if v > now}
+        wait = slot - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _retry_after_seconds(error) -> Optional[float]:
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is None:
+        return None
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+def _is_permanent(error) -> bool:
+    if type(error).__name__ in _PERMANENT_ERRORS:
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in _PERMANENT_MESSAGES)
+
+
+# ==================== Broadcaster ====================
+
+Sender = Callable[..., Awaitable]
+
+
+class TelegramBroadcaster:
+    """
+    Priority-queued concurrent Telegram sender
+    """
+
+    def __init__(self, sender: Sender, workers: int = TELEGRAM_BROADCAST_WORKERS,
+                 global_rate: float = TELEGRAM_GLOBAL_RATE, chat_interval: float = TELEGRAM_CHAT_INTERVAL,
+                 max_attempts: int = MAX_ATTEMPTS):
+        """
+        Initialize broadcaster
+
+        Args:
+            sender: async callable(chat_id=..., text=..., parse_mode=...), e.g. Bot.send_message
+            workers: Concurrent sends
+            global_rate: Messages per second across all chats
+            chat_interval: Seconds between messages to one chat
+            max_attempts: Attempts per message before dead-lettering
+        """
+        self.sender = sender
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.limiter = AsyncRateLimiter(global_rate, burst=max(1, int(global_rate)))
+        self.pacer = _ChatPacer(chat_interval)
+
+        self.dead_letters = deque(maxlen=DEAD_LETTER_SIZE)
+        self._seq = itertools.count()
+        self._stats_lock = threading.Lock()
+        self.stats = {'sent': 0, 'retried': 0, 'rate_limited': 0, 'dead_lettered': 0, 'unreachable': 0}
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    async def broadcast(self, messages: Iterable[Tuple], priority: int = PRIORITY_BULK,
+                        parse_mode: Optional[str] = None) -> Dict:
+        """
+        Send messages concurrently and wait until each is sent or dead-lettered
+
+        Args:
+            messages: (chat_id, text) or (chat_id, text, priority) tuples
+            priority: Default priority (lower is sent first)
+            parse_mode: Telegram parse mode for every message
+
+        Returns:
+            dict: sent, failed, unreachable (chat ids to unsubscribe), duration
+        """
+        started = time.monotonic()
+        heap = []
+        for message in messages:
+            chat_id, text_body = message[0], message[1]
+            item_priority = message[2] if len(message) > 2 else priority
+            # (priority, ready_at, seq, chat_id, text, attempt)
+            heapq.heappush(heap, (item_priority, 0.0, next(self._seq), chat_id, text_body, 1))
+
+        if not heap:
+            return {'sent': 0, 'failed': 0, 'unreachable': [], 'duration': 0.0}
+
+        result = {'sent': 0, 'failed': 0, 'unreachable': []}
+        pending = len(heap)
+        wakeup = asyncio.Event()
+
+        async def worker():
+            nonlocal pending
+            while pending > 0:
+                if not heap:
+                    # Everything left is being retried by other workers
+                    wakeup.clear()
+                    await wakeup.wait()
+                    continue
+
+                item = heapq.heappop(heap)
+                item_priority, ready_at, _, chat_id, text_body, attempt = item
+                delay = ready_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                outcome = await self._send(chat_id, text_body, parse_mode, attempt)
+                if outcome == 'retry':
+                    backoff = BACKOFF_BASE * (2 ** (attempt - 1))
+                    heapq.heappush(heap, (item_priority, time.monotonic() + backoff, next(self._seq),
+                                          chat_id, text_body, attempt + 1))
+                else:
+                    pending -= 1
+                    if outcome == 'sent':
+                        result['sent'] += 1
+                    else:
+                        result['failed'] += 1
+                        if outcome == 'unreachable':
+                            result['unreachable'].append(chat_id)
+                wakeup.set()
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(heap)))))
+
+        result['duration'] = round(time.monotonic() - started, 2)
+        return result
+
+    async def _send(self, chat_id, text_body, parse_mode, attempt) -> str:
+        """
+        One delivery attempt
+
+        Returns:
+            'sent', 'retry', 'unreachable' or 'dead'
+        """
+        await self.pacer.acquire(chat_id)
+        await self.limiter.acquire()
+
+        try:
+            await self.sender(chat_id=chat_id, text=text_body, parse_mode=parse_mode)
+            self._count('sent')
+            return 'sent'
+
+        except Exception as e:
+            retry_after = _retry_after_seconds(e)
+            if retry_after is not None:
+                # Flood control applies to the whole bot: hold every worker
+                self.limiter.pause(retry_after)
+                self._count('rate_limited')
+                logger.warning(f"[TelegramBroadcaster] Rate limited, pausing {retry_after:.1f}s")
+                if attempt < self.max_attempts:
+                    self._count('retried')
+                    return 'retry'
+
+            elif _is_permanent(e):
+                self._count('unreachable')
+                self._dead_letter(chat_id, text_body, attempt, e)
+                return 'unreachable'
+
+            elif attempt < self.max_attempts:
+                self._count('retried')
+                logger.debug(f"[TelegramBroadcaster] Retry {attempt}/{self.max_attempts} for {chat_id}: {e}")
+                return 'retry'
+
+            self._dead_letter(chat_id, text_body, attempt, e)
+            return 'dead'
+
+    def _dead_letter(self, chat_id, text_body, attempt, error):
+        self._count('dead_lettered')
+        self.dead_letters.append({
+            'chat_id': chat_id,
+            'text': text_body[:200],
+            'attempts': attempt,
+            'error': f"{type(error).__name__}: {error}",
+            'failed_at': datetime.utcnow().isoformat()
+        })
+        logger.error(f"[TelegramBroadcaster] Gave up on {chat_id} after {attempt} attempts: {error}")
+
+    def get_dead_letters(self, limit: int = 100) -> List[Dict]:
+        """Most recent undeliverable messages (newest first)"""
+        return list(self.dead_letters)[::-1][:limit]
+
+    def get_stats(self) -> Dict:
+        """
+        Get broadcaster counters
+
+        Returns:
+            dict: sent, retried, rate_limited, dead_lettered, unreachable, dead_letter_size
+        """
+        with self._stats_lock:
+            return {**self.stats, 'dead_letter_size': len(self.dead_letters)}
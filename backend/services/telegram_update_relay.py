@@ -0,0 +1,168 @@
+"""
+Telegram Update Relay
+
+Carries Telegram webhook updates from the web processes to the process
+holding the 'alerts' lease, which owns the bot (and its subscriber list).
+
+- Web processes receive the webhook and only store the update
+  (store_update); a repeated update_id is a Telegram redelivery and is
+  reported as a duplicate.
+- TelegramUpdateRelay runs next to the bot in the lease holder, moves
+  stored updates into its TelegramUpdateWorker in update_id order and
+  deletes them once queued. While the worker's queue is full they stay in
+  the table, so a burst is absorbed by the DB instead of being rejected.
+"""
+
+import json
+import threading
+import logging
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import IntegrityError
+
+from backend.database import get_db_session
+from backend.services.telegram_update_worker import QUEUED, DUPLICATE, FULL
+
+logger = logging.getLogger(__name__)
+
+RELAY_POLL_INTERVAL = 1.0  # seconds between inbox checks
+RELAY_BATCH_SIZE = 100
+
+
+def store_update(update_data: Dict) -> str:
+    """
+    Store a webhook update for the bot owner
+
+    Args:
+        update_data: Update from Telegram (must have update_id)
+
+    Returns:
+        QUEUED or DUPLICATE (raises if the DB is unavailable)
+    """
+    session = get_db_session()
+    try:
+        session.execute(text("""
+            INSERT INTO telegram_update_inbox (update_id, payload, received_at)
+            VALUES (:update_id, :payload, :received_at)
+        """), {
+            'update_id': update_data['update_id'],
+            'payload': json.dumps(update_data, ensure_ascii=False),
+            'received_at': datetime.utcnow()
+        })
+        session.commit()
+        return QUEUED
+    except IntegrityError:
+        session.rollback()
+        return DUPLICATE
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def pending_count() -> int:
+    """Number of stored updates not yet handed to the bot"""
+    session = get_db_session()
+    try:
+        return session.execute(text("SELECT COUNT(*) FROM telegram_update_inbox")).scalar()
+    finally:
+        session.close()
+
+
+class TelegramUpdateRelay:
+    """
+    Moves stored updates into a TelegramUpdateWorker
+    """
+
+    DELETE_SQL = text(
+        "DELETE FROM telegram_update_inbox WHERE update_id IN :ids"
+    ).bindparams(bindparam('ids', expanding=True))
+
+    def __init__(self, update_worker, poll_interval: float = RELAY_POLL_INTERVAL,
+                 batch_size: int = RELAY_BATCH_SIZE):
+        """
+        Initialize relay
+
+        Args:
+            update_worker: Running TelegramUpdateWorker of the bot owner
+            poll_interval: Seconds between inbox checks when it is empty
+            batch_size: Updates read per query
+        """
+        self.update_worker = update_worker
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Start relaying in a background thread"""
+        if self.running:
+            return
+
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True, name='TelegramUpdateRelay')
+        self.thread.start()
+        logger.info("[TelegramUpdateRelay] Started")
+
+    def stop(self):
+        """Stop relaying; updates still stored are left for the next lease holder"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        logger.info("[TelegramUpdateRelay] Stopped")
+
+    def _loop(self):
+        while self.running:
+            try:
+                moved = self.relay_once()
+            except Exception as e:
+                logger.error(f"[TelegramUpdateRelay] Error relaying updates: {e}")
+                moved = 0
+
+            # Keep draining while there is a backlog
+            if moved < self.batch_size:
+                self._stop_event.wait(self.poll_interval)
+
+    def relay_once(self) -> int:
+        """
+        Hand one batch of stored updates to the worker
+
+        Returns:
+            Number of updates removed from the inbox
+        """
+        session = get_db_session()
+        try:
+            rows = session.execute(text("""
+                SELECT update_id, payload FROM telegram_update_inbox
+                ORDER BY update_id
+                LIMIT :limit
+            """), {'limit': self.batch_size}).fetchall()
+
+            done = []
+            for update_id, payload in rows:
+                status = self.update_worker.enqueue(json.loads(payload))
+                if status not in (QUEUED, DUPLICATE):
+                    # FULL: retry on the next pass; STOPPED: leave it for the next holder
+                    if status == FULL:
+                        logger.warning("[TelegramUpdateRelay] Update queue full, keeping backlog in the inbox")
+                    break
+                done.append(update_id)
+
+            if done:
+                session.execute(self.DELETE_SQL, {'ids': done})
+                session.commit()
+            return len(done)
+
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
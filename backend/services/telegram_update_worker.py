@@ -0,0 +1,228 @@
+"""
+텔레그램 업데이트 워커
+
+One long-lived asyncio loop thread that owns the Telegram bot and
+processes webhook updates.
+
+- Webhook updates arrive through TelegramUpdateRelay, which only enqueues
+  (enqueue() is thread-safe and never blocks); a fixed number of consumer
+  tasks on the bot loop run SurgeTelegramBot.process_update.
+- The queue is bounded: when it is full enqueue() returns 'full' and the
+  relay leaves the remaining updates in its inbox until there is room.
+- Telegram redelivers updates it did not see acknowledged in time, so
+  recently accepted update_ids are remembered and repeats are dropped.
+- Queue wait and processing latencies are kept for get_stats().
+"""
+import os
+import time
+import asyncio
+import threading
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_UPDATE_QUEUE_SIZE = int(os.getenv('TELEGRAM_UPDATE_QUEUE_SIZE', 1000))
+TELEGRAM_UPDATE_CONCURRENCY = int(os.getenv('TELEGRAM_UPDATE_CONCURRENCY', 8))
+TELEGRAM_UPDATE_TIMEOUT = 30  # seconds per update
+DEDUP_SIZE = 10000  # update_ids remembered
+LATENCY_SAMPLES = 1000
+
+# enqueue() results
+QUEUED = 'queued'
+DUPLICATE = 'duplicate'
+FULL = 'full'
+STOPPED = 'stopped'
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 1)
+
+
+class TelegramUpdateWorker:
+    """
+    Bot-owning event loop thread with a bounded update queue
+    """
+
+    def __init__(self, telegram_bot, max_queue: int = TELEGRAM_UPDATE_QUEUE_SIZE,
+                 concurrency: int = TELEGRAM_UPDATE_CONCURRENCY, timeout: float = TELEGRAM_UPDATE_TIMEOUT):
+        """
+        Initialize worker
+
+        Args:
+            telegram_bot: SurgeTelegramBot instance
+            max_queue: Updates waiting before enqueue() reports FULL
+            concurrency: Updates processed at the same time
+            timeout: Seconds before a single update is abandoned
+        """
+        self.telegram_bot = telegram_bot
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._running = False
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._seen = OrderedDict()  # update_id -> None (insertion ordered)
+
+        self._wait_times = deque(maxlen=LATENCY_SAMPLES)
+        self._process_times = deque(maxlen=LATENCY_SAMPLES)
+        self.stats = {'received': 0, 'processed': 0, 'failed': 0, 'timeouts': 0,
+                      'duplicates': 0, 'rejected': 0}
+
+    # ==================== Lifecycle ====================
+
+    def start(self, setup: Optional[Coroutine] = None):
+        """
+        Start the loop thread
+
+        Args:
+            setup: Coroutine run on the bot loop before any update is processed
+                   (e.g. telegram_bot.start_webhook(url)); updates queue up meanwhile
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(setup,), daemon=True,
+                                        name='TelegramUpdateWorker')
+        self._thread.start()
+        self._started.wait()
+        logger.info(f"[TelegramUpdateWorker] Started (queue: {self.max_queue}, concurrency: {self.concurrency})")
+
+    def _run(self, setup):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        # Sends from other threads (e.g. surge alerts) are handed to this loop
+        self.telegram_bot.owner_loop = self._loop
+        self._started.set()
+
+        try:
+            self._loop.run_until_complete(self._main(setup))
+        finally:
+            self._loop.close()
+
+    async def _main(self, setup):
+        if setup is not None:
+            try:
+                await setup
+            except Exception as e:
+                logger.error(f"[TelegramUpdateWorker] Bot setup failed: {e}")
+
+        consumers = [asyncio.ensure_future(self._consume()) for _ in range(self.concurrency)]
+        await asyncio.gather(*consumers)
+
+        try:
+            await self.telegram_bot.stop()
+        except Exception as e:
+            logger.error(f"[TelegramUpdateWorker] Error stopping bot: {e}")
+
+    def stop(self, timeout: float = 10):
+        """Finish queued updates, stop the bot and the loop thread"""
+        if not self._running:
+            return
+
+        self._running = False
+        for _ in range(self.concurrency):
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+        self._thread.join(timeout)
+        logger.info("[TelegramUpdateWorker] Stopped")
+
+    # ==================== Queue ====================
+
+    def enqueue(self, update_data: Dict) -> str:
+        """
+        Queue a webhook update (thread-safe, non-blocking)
+
+        Returns:
+            QUEUED, DUPLICATE, FULL (caller should retry later) or STOPPED
+        """
+        if not self._running:
+            return STOPPED
+
+        update_id = update_data.get('update_id')
+        with self._lock:
+            self.stats['received'] += 1
+            if update_id is not None and update_id in self._seen:
+                self.stats['duplicates'] += 1
+                return DUPLICATE
+            if self._pending >= self.max_queue:
+                self.stats['rejected'] += 1
+                return FULL
+
+            self._pending += 1
+            if update_id is not None:
+                self._seen[update_id] = None
+                if len(self._seen) > DEDUP_SIZE:
+                    self._seen.popitem(last=False)
+
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (update_data, time.monotonic()))
+        return QUEUED
+
+    async def _consume(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            update_data, enqueued_at = item
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self.telegram_bot.process_update(update_data), self.timeout)
+                outcome = 'processed'
+            except asyncio.TimeoutError:
+                outcome = 'timeouts'
+                logger.error(f"[TelegramUpdateWorker] Update {update_data.get('update_id')} timed out")
+            except Exception as e:
+                outcome = 'failed'
+                logger.error(f"[TelegramUpdateWorker] Error processing update {update_data.get('update_id')}: {e}")
+
+            finished = time.monotonic()
+            with self._lock:
+                self._pending -= 1
+                self.stats[outcome] += 1
+                self._wait_times.append(started - enqueued_at)
+                self._process_times.append(finished - started)
+
+    def run_coroutine(self, coro: Coroutine) -> Future:
+        """
+        Run a coroutine on the bot loop from any thread
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # ==================== Monitoring ====================
+
+    def get_stats(self) -> Dict:
+        """
+        Get queue counters and latencies
+
+        Returns:
+            dict: counters, queue depth, p50/p95 queue wait and processing time (ms)
+        """
+        with self._lock:
+            wait_times = list(self._wait_times)
+            process_times = list(self._process_times)
+            return {
+                **self.stats,
+                'running': self._running,
+                'queued': self._pending,
+                'max_queue': self.max_queue,
+                'wait_ms_p50': _percentile(wait_times, 0.5),
+                'wait_ms_p95': _percentile(wait_times, 0.95),
+                'process_ms_p50': _percentile(process_times, 0.5),
+                'process_ms_p95': _percentile(process_times, 0.95),
+            }
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Ticker Hub
+
+Single in-process source of current prices for every service.
+
+Instead of each monitor, scheduler and route polling /v1/ticker on its own
+loop, consumers read from one shared snapshot:
+
+- Markets any consumer asks for are polled together in batched calls
+  (up to 100 markets per request) by one background thread.
+- Markets nobody has asked for in `idle_timeout` seconds stop being polled.
+- Reads are served from memory; only missing or stale markets trigger a
+  synchronous fetch, so a cold read still returns fresh data.
+- Markets not listed on Upbit (MarketRegistry) are never requested, so a
+  delisted holding cannot fail a batch.
+- Other feeds (e.g. Upbit's websocket) can push tickers in via ingest();
+  the poller then skips markets that are already fresh.
+- Subscribers get a callback with the tickers updated in each refresh.
+"""
+
+import time
+import threading
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from backend.common import UpbitAPI
+from backend.services.market_registry import get_market_registry
+
+logger = logging.getLogger(__name__)
+
+UPBIT_TICKER_BATCH = 100
+
+
+class TickerHub:
+    """
+    Shared, batched ticker snapshot
+    """
+
+    def __init__(self, upbit_api: Optional[UpbitAPI] = None, poll_interval: float = 1.0,
+                 max_age: float = 5.0, idle_timeout: float = 120.0):
+        """
+        Initialize ticker hub
+
+        Args:
+            upbit_api: Upbit API client (default: public client)
+            poll_interval: Seconds between background refreshes
+            max_age: Default maximum snapshot age in seconds for reads
+            idle_timeout: Stop polling markets not requested for this many seconds
+        """
+        self.upbit_api = upbit_api or UpbitAPI(None, None)
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+
+        # market -> raw Upbit ticker
+        self._tickers: Dict[str, Dict] = {}
+        # market -> monotonic time the ticker was received
+        self._received: Dict[str, float] = {}
+        # market -> monotonic time a consumer last asked for it
+        self._requested: Dict[str, float] = {}
+        self._subscribers: List[Callable[[Dict[str, Dict]], None]] = []
+
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._auto_start = True
+
+        self.stats = {'reads': 0, 'fetches': 0, 'upstream_calls': 0, 'ingested': 0}
+
+    # ==================== Reads ====================
+
+    def get_tickers(self, markets: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Get tickers for many markets, fetching only missing or stale ones
+
+        Args:
+            markets: Market codes (e.g., ['KRW-BTC', 'KRW-ETH'])
+            max_age: Maximum acceptable age in seconds (default: self.max_age)
+
+        Returns:
+            Dict of {market: ticker} in Upbit /v1/ticker format;
+            markets without data are omitted
+        """
+        markets = list(dict.fromkeys(markets))
+        if not markets:
+            return {}
+
+        max_age = self.max_age if max_age is None else max_age
+        self.watch(markets)
+
+        stale = self._stale(markets, max_age)
+        if stale:
+            # Serialize on-demand fetches so concurrent cold reads share one call
+            with self._fetch_lock:
+                stale = self._stale(stale, max_age)
+                if stale:
+                    self._refresh(stale)
+
+        with self._lock:
+            self.stats['reads'] += 1
+            return {m: self._tickers[m] for m in markets if m in self._tickers}
+
+    def get_ticker(self, market: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        Get ticker for one market
+
+        Args:
+            market: Market code (e.g., 'KRW-BTC')
+            max_age: Maximum acceptable age in seconds (default: self.max_age)
+
+        Returns:
+            Ticker dict or None if unavailable
+        """
+        return self.get_tickers([market], max_age=max_age).get(market)
+
+    def get_prices(self, markets: Iterable[str], max_age: Optional[float] = None) -> Dict[str, float]:
+        """
+        Get current trade prices for many markets
+
+        Returns:
+            Dict of {market: trade_price}
+        """
+        return {
+            market: float(ticker['trade_price'])
+            for market, ticker in self.get_tickers(markets, max_age=max_age).items()
+            if ticker.get('trade_price')
+        }
+
+    def get_price(self, market: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Get current trade price for one market
+
+        Returns:
+            Price or None if unavailable
+        """
+        return self.get_prices([market], max_age=max_age).get(market)
+
+    def get_age(self, market: str) -> Optional[float]:
+        """
+        Get snapshot age for a market
+
+        Returns:
+            Seconds since the ticker was received, or None if never received
+        """
+        with self._lock:
+            received = self._received.get(market)
+        return None if received is None else time.monotonic() - received
+
+    # ==================== Interest / subscriptions ====================
+
+    def watch(self, markets: Iterable[str]):
+        """
+        Keep markets in the background refresh set (until idle_timeout)
+
+        Args:
+            markets: Market codes
+        """
+        now = time.monotonic()
+        with self._lock:
+            for market in markets:
+                self._requested[market] = now
+            auto_start = self._auto_start
+        if auto_start:
+            self.start()
+
+    def subscribe(self, callback: Callable[[Dict[str, Dict]], None]):
+        """
+        Register a callback receiving {market: ticker} after every update
+
+        Callbacks run on the refreshing thread and must not block.
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Dict]], None]):
+        """Remove a callback registered with subscribe()"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def ingest(self, tickers: Iterable[Dict]):
+        """
+        Store tickers from any feed and notify subscribers
+
+        Args:
+            tickers: Ticker dicts containing at least 'market' and 'trade_price'
+        """
+        now = time.monotonic()
+        updated = {}
+        with self._lock:
+            for ticker in tickers:
+                market = ticker.get('market') or ticker.get('code')
+                if not market:
+                    continue
+                self._tickers[market] = ticker
+                self._received[market] = now
+                updated[market] = ticker
+            self.stats['ingested'] += len(updated)
+            subscribers = list(self._subscribers)
+
+        if not updated:
+            return
+
+        for callback in subscribers:
+            try:
+                callback(updated)
+            except Exception as e:
+                logger.error(f"[TickerHub] Subscriber error: {e}")
+
+    # ==================== Background refresh ====================
+
+    def start(self):
+        """Start the background poller (no-op if already running)"""
+        with self._lock:
+            self._auto_start = True
+            if self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._poll_loop, name='ticker-hub', daemon=True)
+            self._thread.start()
+        logger.info("[TickerHub] Poller started")
+
+    def stop(self):
+        """Stop the background poller (reads keep working, fetching on demand)"""
+        with self._lock:
+            self._auto_start = False
+        self._stop_event.set()
+        logger.info("[TickerHub] Poller stopped")
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                markets = self._active_markets()
+                if markets:
+                    with self._fetch_lock:
+                        # Skip markets another feed or an on-demand read just refreshed
+                        stale = self._stale(markets, self.poll_interval / 2)
+                        if stale:
+                            self._refresh(stale)
+            except Exception as e:
+                logger.error(f"[TickerHub] Poll error: {e}")
+            self._stop_event.wait(self.poll_interval)
+
+    def _active_markets(self) -> List[str]:
+        """Markets requested recently and known to be valid; drops idle ones"""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            for market in [m for m, t in self._requested.items() if t < cutoff]:
+                del self._requested[market]
+            return [m for m in self._requested if m in self._tickers]
+
+    def _stale(self, markets: List[str], max_age: float) -> List[str]:
+        cutoff = time.monotonic() - max_age
+        with self._lock:
+            return [m for m in markets if self._received.get(m, float('-inf')) <= cutoff]
+
+    def _refresh(self, markets: List[str]):
+        """Fetch tickers in batches; caller holds _fetch_lock"""
+        # Delisted markets would fail their batch every time
+        markets = get_market_registry().filter_listed(markets)
+        with self._lock:
+            known = [m for m in markets if m in self._tickers]
+            # A single invalid market code fails its whole batch, so never-seen
+            # markets are fetched apart from the ones already known to be valid
+            unknown = [m for m in markets if m not in self._tickers]
+
+        fetched = []
+        for group in (known, unknown):
+            for i in range(0, len(group), UPBIT_TICKER_BATCH):
+                batch = group[i:i + UPBIT_TICKER_BATCH]
+                self.stats['upstream_calls'] += 1
+                try:
+                    fetched.extend(self.upbit_api.get_ticker(batch) or [])
+                except Exception as e:
+                    logger.error(f"[TickerHub] Ticker fetch failed ({len(batch)} markets): {e}")
+
+        self.stats['fetches'] += 1
+        self.ingest(fetched)
+
+    def get_stats(self) -> Dict:
+        """
+        Get hub counters
+
+        Returns:
+            Dict of counters plus tracked/polled market counts
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['tracked_markets'] = len(self._tickers)
+            stats['watched_markets'] = len(self._requested)
+            stats['subscribers'] = len(self._subscribers)
+        return stats
+
+
+# Global instance
+_ticker_hub = None
+_ticker_hub_lock = threading.Lock()
+
+
+def get_ticker_hub() -> TickerHub:
+    """
+    Get or create ticker hub singleton
+
+    Returns:
+        TickerHub instance
+    """
+    global _ticker_hub
+
+    with _ticker_hub_lock:
+        if _ticker_hub is None:
+            _ticker_hub = TickerHub()
+
+    return _ticker_hub
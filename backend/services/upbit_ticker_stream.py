@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Upbit Ticker Stream
+
+One persistent connection to Upbit's public websocket ticker feed.
+
+- The subscribed market set can change at any time; the full request is
+  re-sent on the open connection, no reconnect needed.
+- Every ticker received is pushed into the shared TickerHub (normalized to
+  the REST /v1/ticker field names), so all price consumers see it.
+- Dropped connections are retried with capped exponential backoff. While
+  disconnected nothing is ingested, so TickerHub readers fall back to REST
+  once the snapshot goes stale.
+
+The feed URL can point at scripts/fake_upbit_ws_server.py for local testing
+(set UPBIT_WS_URL=ws://127.0.0.1:8765).
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import threading
+import logging
+from typing import Iterable, Optional
+
+try:
+    import websocket  # websocket-client
+    WEBSOCKET_CLIENT_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_CLIENT_AVAILABLE = False
+    print("[UpbitTickerStream] websocket-client not installed. Run: pip install websocket-client")
+
+from backend.services.ticker_hub import TickerHub, get_ticker_hub
+
+logger = logging.getLogger(__name__)
+
+UPBIT_WS_URL = 'wss://api.upbit.com/websocket/v1'
+
+
+class UpbitTickerStream:
+    """
+    Background websocket client feeding a TickerHub
+    """
+
+    def __init__(self, hub: Optional[TickerHub] = None, url: Optional[str] = None,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, ping_interval: float = 60.0):
+        """
+        Initialize stream
+
+        Args:
+            hub: Ticker hub to ingest into (default: shared hub)
+            url: Websocket URL (default: UPBIT_WS_URL env or Upbit production)
+            backoff_base: First reconnect delay in seconds
+            backoff_max: Maximum reconnect delay in seconds
+            ping_interval: Seconds of silence before sending a keep-alive ping
+        """
+        if not WEBSOCKET_CLIENT_AVAILABLE:
+            raise ImportError("websocket-client is required. Install with: pip install websocket-client")
+
+        self.hub = hub or get_ticker_hub()
+        self.url = url or os.getenv('UPBIT_WS_URL', UPBIT_WS_URL)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.ping_interval = ping_interval
+
+        self.markets = set()
+        self.connected = False
+        self.last_message_at = None
+        self.stats = {'connects': 0, 'disconnects': 0, 'messages': 0, 'subscriptions': 0}
+
+        self._ws = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ==================== Control ====================
+
+    def start(self):
+        """Start the stream thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='upbit-ticker-stream', daemon=True)
+        self._thread.start()
+        logger.info(f"[UpbitTickerStream] Started ({self.url})")
+
+    def stop(self):
+        """Stop the stream and close the connection"""
+        self._stop_event.set()
+        self._close()
+        logger.info("[UpbitTickerStream] Stopped")
+
+    def is_live(self, max_silence: float = 10.0) -> bool:
+        """
+        Check whether the stream is connected and recently delivered data
+
+        Args:
+            max_silence: Seconds without any message before the stream is considered stale
+
+        Returns:
+            bool: True if tickers are flowing
+        """
+        if not self.connected:
+            return False
+        if not self.markets:
+            return True
+        return self.last_message_at is not None and time.monotonic() - self.last_message_at < max_silence
+
+    def set_markets(self, markets: Iterable[str]):
+        """
+        Replace the subscribed market set
+
+        Re-sends the subscription on the live connection only when the set changed.
+        """
+        markets = set(markets)
+        with self._lock:
+            if markets == self.markets:
+                return
+            self.markets = markets
+
+        if self.connected:
+            try:
+                self._subscribe()
+            except Exception as e:
+                logger.warning(f"[UpbitTickerStream] Resubscribe failed, reconnecting: {e}")
+                self._close()
+
+    # ==================== Connection loop ====================
+
+    def _run(self):
+        attempt = 0
+        while not self._stop_event.is_set():
+            try:
+                self._connect()
+                attempt = 0
+                self._receive_loop()
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    logger.warning(f"[UpbitTickerStream] Connection lost: {e}")
+            finally:
+                if self.connected:
+                    self.stats['disconnects'] += 1
+                self.connected = False
+                self._close()
+
+            if self._stop_event.is_set():
+                break
+
+            # Capped exponential backoff with jitter
+            delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+            delay *= random.uniform(0.5, 1.0)
+            attempt += 1
+            logger.info(f"[UpbitTickerStream] Reconnecting in {delay:.1f}s")
+            self._stop_event.wait(delay)
+
+    def _connect(self):
+        self._ws = websocket.create_connection(self.url, timeout=10, enable_multithread=True)
+        self._ws.settimeout(1.0)
+        self.connected = True
+        self.stats['connects'] += 1
+        self.last_message_at = time.monotonic()
+        self._subscribe()
+        logger.info(f"[UpbitTickerStream] Connected ({len(self.markets)} markets)")
+
+    def _receive_loop(self):
+        last_activity = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                message = self._ws.recv()
+            except websocket.WebSocketTimeoutException:
+                if time.monotonic() - last_activity >= self.ping_interval:
+                    with self._send_lock:
+                        self._ws.ping()
+                    last_activity = time.monotonic()
+                continue
+
+            if not message:
+                raise ConnectionError("connection closed by server")
+
+            last_activity = self.last_message_at = time.monotonic()
+            self.stats['messages'] += 1
+            self._handle_message(message)
+
+    def _handle_message(self, message):
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return  # Ignore non-JSON frames
+
+        items = data if isinstance(data, list) else [data]
+        tickers = []
+        for item in items:
+            if item.get('type') != 'ticker' or not item.get('code'):
+                continue
+            # Websocket payloads use 'code'; REST tickers use 'market'
+            ticker = dict(item)
+            ticker['market'] = item['code']
+            tickers.append(ticker)
+
+        if tickers:
+            self.hub.ingest(tickers)
+
+    def _subscribe(self):
+        with self._lock:
+            codes = sorted(self.markets)
+        if not codes or self._ws is None:
+            return
+
+        request = [
+            {'ticket': str(uuid.uuid4())},
+            {'type': 'ticker', 'codes': codes}
+        ]
+        with self._send_lock:
+            self._ws.send(json.dumps(request))
+        self.stats['subscriptions'] += 1
+
+    def _close(self):
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> dict:
+        """
+        Get connection counters
+
+        Returns:
+            dict: connects, disconnects, messages, subscriptions, connected, markets
+        """
+        stats = dict(self.stats)
+        stats['connected'] = self.connected
+        stats['markets'] = len(self.markets)
+        return stats
@@ -7,6 +7,14 @@ Provides real-time streaming for:
 - Position changes
 
 Uses Flask-SocketIO for WebSocket communication.
+
+Price ingestion modes (PRICE_FEED_MODE):
+- rest (default): poll the shared TickerHub every second
+- websocket: stream tickers from Upbit's public websocket and push each
+  update as it arrives; falls back to REST polling while the stream is down
+
+Price updates go out through PriceBroadcaster as coalesced, delta-only
+'price_batch' frames at each client's chosen rate (set_update_rate).
 """
 
 import os
@@ -14,10 +22,12 @@ import time
 import threading
 from datetime import datetime
 from typing import Dict, Set, Optional
-import requests
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
 from flask import request
 
+from backend.services.ticker_hub import get_ticker_hub
+from backend.services.price_broadcaster import PriceBroadcaster
+
 # Global SocketIO instance (will be initialized by app)
 socketio = None
 
@@ -25,7 +35,7 @@ socketio = None
 class WebSocketService:
     """Manages WebSocket connections and real-time updates"""
 
-    def __init__(self, socketio_instance: SocketIO):
+    def __init__(self, socketio_instance: SocketIO, feed_mode: Optional[str] = None):
         global socketio
         socketio = socketio_instance
         self.socketio = socketio_instance
@@ -34,6 +44,13 @@ class WebSocketService:
         self.price_subscribers: Dict[str, Set[str]] = {}  # {market: set of session_ids}
         self.user_sessions: Dict[int, Set[str]] = {}  # {user_id: set of session_ids}
 
+        # Price ingestion: 'rest' polling or 'websocket' streaming
+        self.feed_mode = (feed_mode or os.getenv('PRICE_FEED_MODE', 'rest')).lower()
+        self.ticker_stream = None
+
+        # Coalesced delta fan-out to Socket.IO clients
+        self.price_broadcaster = PriceBroadcaster(socketio_instance)
+
         # Background threads
         self.price_update_thread = None
         self.is_running = False
@@ -46,6 +63,11 @@ class WebSocketService:
 
         self.is_running = True
 
+        self.price_broadcaster.start()
+
+        if self.feed_mode == 'websocket':
+            self._start_ticker_stream()
+
         # Start price update thread
         self.price_update_thread = threading.Thread(
             target=self._price_update_loop,
@@ -58,8 +80,38 @@ class WebSocketService:
     def stop(self):
         """Stop background threads"""
         self.is_running = False
+        self.price_broadcaster.stop()
+        if self.ticker_stream:
+            get_ticker_hub().unsubscribe(self._on_tickers)
+            self.ticker_stream.stop()
         print("[WebSocket] Service stopped")
 
+    def _start_ticker_stream(self):
+        """Start Upbit websocket ingestion (falls back to REST polling if unavailable)"""
+        try:
+            from backend.services.upbit_ticker_stream import UpbitTickerStream
+
+            self.ticker_stream = UpbitTickerStream()
+            get_ticker_hub().subscribe(self._on_tickers)
+            self.ticker_stream.set_markets(self.price_subscribers.keys())
+            self.ticker_stream.start()
+            print("[WebSocket] Price feed: Upbit websocket stream")
+        except ImportError as e:
+            self.ticker_stream = None
+            print(f"[WebSocket] Websocket price feed unavailable, using REST polling: {e}")
+
+    def _stream_is_live(self) -> bool:
+        return self.ticker_stream is not None and self.ticker_stream.is_live()
+
+    def _on_tickers(self, tickers: Dict[str, dict]):
+        """TickerHub callback: push updated subscribed markets to their rooms"""
+        for market, ticker in tickers.items():
+            if market in self.price_subscribers:
+                try:
+                    self._broadcast_price_update(market, self._format_price(market, ticker))
+                except Exception as e:
+                    print(f"[WebSocket] Error broadcasting {market}: {str(e)}")
+
     def _price_update_loop(self):
         """Background thread that fetches and broadcasts price updates"""
         print("[WebSocket] Price update loop started")
@@ -69,7 +121,13 @@ class WebSocketService:
                 # Get all subscribed markets
                 markets = list(self.price_subscribers.keys())
 
-                if markets:
+                if self.ticker_stream:
+                    # Streamed updates are pushed by _on_tickers; poll only while the
+                    # stream is down (REST results reach _on_tickers via the hub too)
+                    if markets and not self._stream_is_live():
+                        get_ticker_hub().get_tickers(markets, max_age=1.0)
+
+                elif markets:
                     # Fetch prices for all subscribed markets
                     prices = self._fetch_prices(markets)
 
@@ -85,29 +143,14 @@ class WebSocketService:
                 time.sleep(5)  # Wait longer on error
 
     def _fetch_prices(self, markets: list) -> Dict:
-        """Fetch current prices from Upbit API"""
+        """Get current prices from the shared ticker hub"""
         try:
-            # Upbit ticker API (supports multiple markets)
-            markets_param = ','.join(markets)
-            url = f"https://api.upbit.com/v1/ticker?markets={markets_param}"
-
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-
-            tickers = response.json()
+            tickers = get_ticker_hub().get_tickers(markets, max_age=1.0)
 
             # Format price data
             prices = {}
-            for ticker in tickers:
-                market = ticker['market']
-                prices[market] = {
-                    'market': market,
-                    'price': ticker['trade_price'],
-                    'change': ticker['signed_change_rate'] * 100,  # Percentage
-                    'change_price': ticker['signed_change_price'],
-                    'volume': ticker['acc_trade_volume_24h'],
-                    'timestamp': datetime.utcnow().isoformat()
-                }
+            for market, ticker in tickers.items():
+                prices[market] = self._format_price(market, ticker)
 
             return prices
 
@@ -115,15 +158,22 @@ class WebSocketService:
             print(f"[WebSocket] Error fetching prices: {str(e)}")
             return {}
 
+    @staticmethod
+    def _format_price(market: str, ticker: dict) -> dict:
+        """Format a REST or websocket ticker for the price_update event"""
+        return {
+            'market': market,
+            'price': ticker['trade_price'],
+            'change': ticker['signed_change_rate'] * 100,  # Percentage
+            'change_price': ticker['signed_change_price'],
+            'volume': ticker['acc_trade_volume_24h'],
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
     def _broadcast_price_update(self, market: str, price_data: dict):
-        """Broadcast price update to all subscribers of a market"""
+        """Queue price update for subscribers of a market (sent on the next broadcaster flush)"""
         if market in self.price_subscribers:
-            # Emit to market room
-            self.socketio.emit(
-                'price_update',
-                price_data,
-                room=f"market:{market}"
-            )
+            self.price_broadcaster.update(market, price_data)
 
     def subscribe_to_market(self, session_id: str, market: str):
         """Subscribe a session to market price updates"""
@@ -132,8 +182,11 @@ class WebSocketService:
 
         self.price_subscribers[market].add(session_id)
 
-        # Join Socket.IO room
-        join_room(f"market:{market}")
+        # Join the broadcaster group for this session's market set
+        self.price_broadcaster.subscribe(session_id, market)
+
+        if self.ticker_stream:
+            self.ticker_stream.set_markets(self.price_subscribers.keys())
 
         print(f"[WebSocket] Session {session_id[:8]} subscribed to {market}")
 
@@ -145,12 +198,20 @@ class WebSocketService:
             # Clean up empty market
             if not self.price_subscribers[market]:
                 del self.price_subscribers[market]
+                if self.ticker_stream:
+                    self.ticker_stream.set_markets(self.price_subscribers.keys())
 
-            # Leave Socket.IO room
-            leave_room(f"market:{market}")
+            # Move to the broadcaster group for the remaining markets
+            self.price_broadcaster.unsubscribe(session_id, market)
 
             print(f"[WebSocket] Session {session_id[:8]} unsubscribed from {market}")
 
+    def set_update_rate(self, session_id: str, interval: float) -> float:
+        """Set how often a session receives price frames (seconds, clamped)"""
+        interval = self.price_broadcaster.set_interval(session_id, interval)
+        print(f"[WebSocket] Session {session_id[:8]} update rate: {interval}s")
+        return interval
+
     def register_user_session(self, user_id: int, session_id: str):
         """Register a user session for notifications"""
         if user_id not in self.user_sessions:
@@ -297,6 +358,7 @@ def setup_socketio_handlers(socketio_instance: SocketIO):
         # Remove from all market subscriptions
         for market in list(ws.price_subscribers.keys()):
             ws.unsubscribe_from_market(session_id, market)
+        ws.price_broadcaster.remove_session(session_id)
 
         # Remove from user sessions
         for user_id in list(ws.user_sessions.keys()):
@@ -338,6 +400,25 @@ def setup_socketio_handlers(socketio_instance: SocketIO):
             'timestamp': datetime.utcnow().isoformat()
         })
 
+    @socketio_instance.on('set_update_rate')
+    def handle_set_update_rate(data):
+        """Handle price update rate change (seconds between frames)"""
+        session_id = request.sid
+
+        try:
+            interval = float(data.get('interval'))
+        except (TypeError, ValueError):
+            emit('error', {'message': 'Numeric interval parameter required'})
+            return
+
+        ws = get_websocket_service()
+        interval = ws.set_update_rate(session_id, interval)
+
+        emit('update_rate_set', {
+            'interval': interval,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
     @socketio_instance.on('authenticate')
     def handle_authenticate(data):
         """Handle user authentication for notifications"""
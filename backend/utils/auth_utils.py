@@ -147,7 +147,8 @@ def decode_token(token: str) -> dict:
 def require_auth(f):
     """
     Decorator to protect routes with JWT authentication.
-    Passes current_user object to the decorated function.
+    Passes current_user (a cached Principal exposing id, email, username,
+    is_active, is_admin and plan) to the decorated function.
 
     Usage:
         @app.route('/api/protected')
@@ -186,36 +187,30 @@ def require_auth(f):
                     'message': 'Invalid token type'
                 }), 401
 
-            # Get user from database
-            from backend.database.connection import get_db_session
-            from backend.database.models import User
+            # Get user (cached principal: one query per user every few seconds)
+            from backend.middleware.principal import get_principal
 
-            session = get_db_session()
-            try:
-                user = session.query(User).filter(User.id == payload.get('user_id')).first()
-
-                if not user:
-                    return jsonify({
-                        'success': False,
-                        'message': 'User not found'
-                    }), 401
+            user = get_principal(payload.get('user_id'))
 
-                if not user.is_active:
-                    return jsonify({
-                        'success': False,
-                        'message': 'User account is inactive'
-                    }), 401
+            if not user:
+                return jsonify({
+                    'success': False,
+                    'message': 'User not found'
+                }), 401
 
-                # Attach user info to request for backward compatibility
-                request.user_id = user.id
-                request.user_email = user.email
-                request.user_username = user.username
+            if not user.is_active:
+                return jsonify({
+                    'success': False,
+                    'message': 'User account is inactive'
+                }), 401
 
-                # Pass user object to route
-                return f(user, *args, **kwargs)
+            # Attach user info to request for backward compatibility
+            request.user_id = user.id
+            request.user_email = user.email
+            request.user_username = user.username
 
-            finally:
-                session.close()
+            # Pass user principal to route
+            return f(user, *args, **kwargs)
 
         except Exception as e:
             return jsonify({
@@ -290,31 +285,25 @@ def admin_required(f):
             token = auth_header.split(' ')[1]
             payload = decode_token(token)
 
-            # Get user from database to check admin status
-            from backend.database.connection import get_db_session
-            from backend.database.models import User
+            # Get user (cached principal) to check admin status
+            from backend.middleware.principal import get_principal
 
-            session = get_db_session()
-            try:
-                user = session.query(User).filter(User.id == payload.get('user_id')).first()
-
-                if not user:
-                    return jsonify({
-                        'success': False,
-                        'message': 'User not found'
-                    }), 401
+            user = get_principal(payload.get('user_id'))
 
-                if not user.is_admin:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Admin access required'
-                    }), 403
+            if not user:
+                return jsonify({
+                    'success': False,
+                    'message': 'User not found'
+                }), 401
 
-                # Pass user object to route
-                return f(user, *args, **kwargs)
+            if not user.is_admin:
+                return jsonify({
+                    'success': False,
+                    'message': 'Admin access required'
+                }), 403
 
-            finally:
-                session.close()
+            # Pass user principal to route
+            return f(user, *args, **kwargs)
 
         except Exception as e:
             return jsonify({
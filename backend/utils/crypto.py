@@ -4,9 +4,14 @@ Uses Fernet symmetric encryption
 """
 
 import os
+import threading
 from cryptography.fernet import Fernet
 from typing import Tuple
 
+# Process-wide Fernet instance (see get_fernet)
+_fernet = None
+_fernet_lock = threading.Lock()
+
 
 def get_encryption_key() -> bytes:
     """
@@ -44,6 +49,25 @@ def get_encryption_key() -> bytes:
     return new_key
 
 
+def get_fernet() -> Fernet:
+    """
+    Get the process-wide Fernet instance
+
+    The key is read (and .env loaded) once per process instead of on every
+    encrypt/decrypt call. Restart the server after changing ENCRYPTION_KEY.
+
+    Returns:
+        Fernet instance for ENCRYPTION_KEY
+    """
+    global _fernet
+
+    with _fernet_lock:
+        if _fernet is None:
+            _fernet = Fernet(get_encryption_key())
+
+    return _fernet
+
+
 def encrypt_api_key(plain_key: str) -> str:
     """
     Encrypt API key using Fernet symmetric encryption
@@ -57,11 +81,8 @@ def encrypt_api_key(plain_key: str) -> str:
     if not plain_key:
         raise ValueError("API key cannot be empty")
 
-    encryption_key = get_encryption_key()
-    fernet = Fernet(encryption_key)
-
     # Encrypt and return as string
-    encrypted = fernet.encrypt(plain_key.encode())
+    encrypted = get_fernet().encrypt(plain_key.encode())
     return encrypted.decode()
 
 
@@ -82,11 +103,8 @@ def decrypt_api_key(encrypted_key: str) -> str:
         raise ValueError("Encrypted key cannot be empty")
 
     try:
-        encryption_key = get_encryption_key()
-        fernet = Fernet(encryption_key)
-
         # Decrypt and return as string
-        decrypted = fernet.decrypt(encrypted_key.encode())
+        decrypted = get_fernet().decrypt(encrypted_key.encode())
         return decrypted.decode()
 
     except Exception as e:
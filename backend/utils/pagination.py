@@ -0,0 +1,51 @@
+"""
+Keyset Pagination Utilities
+Opaque cursors for listings ordered by (timestamp, unique key).
+
+A cursor encodes the sort values of the last row of a page; the next page
+is everything strictly after it, so page N costs the same as page 1
+(no OFFSET scan).
+"""
+
+import json
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(timestamp: Optional[datetime], key) -> str:
+    """
+    Encode the last row's (timestamp, key) as an opaque cursor
+
+    Args:
+        timestamp: Sort timestamp of the last row (datetime or ISO string, may be None)
+        key: Unique tie-breaker of the last row (id, uuid)
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    payload = json.dumps([timestamp or None, key], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], object]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        (timestamp or None, key)
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, key = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return (datetime.fromisoformat(timestamp) if timestamp else None), key
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,212 @@
+"""
+Streaming Export Utilities
+Turns a database query into CSV / NDJSON / Parquet chunks for a streamed
+Flask response, so an export holds one batch of rows in memory no matter
+how large the table is.
+
+- iter_query_batches(): server-side cursor (yield_per) over a text() query
+- csv_chunks() / ndjson_chunks(): one encoded chunk per batch
+- parquet_chunks(): one compressed Parquet row group per batch (requires pyarrow)
+- gzip_chunks(): incremental gzip of any chunk stream
+
+Columns are (name, header, kind) tuples; kind is one of
+'int', 'float', 'str', 'bool', 'datetime'.
+"""
+
+import io
+import csv
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from backend.database.connection import get_db_session
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_BATCH_SIZE = 1000
+
+# format -> (content type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+Column = Tuple[str, str, str]
+
+
+def iter_query_batches(sql: str, params: Optional[Dict] = None,
+                       batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence]:
+    """
+    Run a query through a server-side cursor and yield row batches
+
+    The session stays open while the caller consumes the generator and is
+    closed when it is exhausted or closed (e.g. the client disconnects).
+
+    Args:
+        sql: SELECT statement (bind parameters as :name)
+        params: Bind parameters
+        batch_size: Rows fetched per round-trip
+
+    Yields:
+        List of rows (tuples in SELECT column order)
+    """
+    session = get_db_session()
+    try:
+        result = session.execute(text(sql).execution_options(yield_per=batch_size), params or {})
+        for partition in result.partitions():
+            yield partition
+    finally:
+        session.close()
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def csv_chunks(columns: List[Column], batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """
+    Encode row batches as CSV (header row first)
+
+    Yields:
+        UTF-8 bytes per batch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    writer.writerow([header for _, header, _ in columns])
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    # Header only when the query returned nothing
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def ndjson_chunks(columns: List[Column], batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """
+    Encode row batches as newline-delimited JSON objects keyed by column name
+
+    Yields:
+        UTF-8 bytes per batch
+    """
+    names = [name for name, _, _ in columns]
+    for batch in batches:
+        lines = [
+            json.dumps({name: _json_value(value) for name, value in zip(names, row)}, ensure_ascii=False)
+            for row in batch
+        ]
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+if PYARROW_AVAILABLE:
+    _ARROW_TYPES = {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'str': pa.string(),
+        'bool': pa.bool_(),
+        'datetime': pa.timestamp('us'),
+    }
+
+_CONVERTERS = {
+    'int': int,
+    'float': float,
+    'str': str,
+    'bool': bool,
+    'datetime': lambda v: v,
+}
+
+
+def parquet_chunks(columns: List[Column], batches: Iterable[Sequence],
+                   compression: str = 'zstd') -> Iterator[bytes]:
+    """
+    Encode row batches as a Parquet file, one row group per batch
+
+    Args:
+        columns: Column specs (kind decides the Parquet type)
+        batches: Row batches
+        compression: Parquet codec (zstd, snappy, gzip)
+
+    Yields:
+        File bytes as each row group is written (footer last)
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = pa.schema([(name, _ARROW_TYPES[kind]) for name, _, kind in columns])
+    converters = [_CONVERTERS[kind] for _, _, kind in columns]
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            arrays = [
+                pa.array([None if row[i] is None else convert(row[i]) for row in batch], type=field.type)
+                for i, (field, convert) in enumerate(zip(schema, converters))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip a chunk stream incrementally
+
+    Yields:
+        Compressed bytes (gzip member, trailer last)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
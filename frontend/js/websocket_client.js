@@ -27,6 +27,12 @@ class CoinPulseWebSocket {
 
         // Subscribed markets
         this.subscribedMarkets = new Set();
+
+        // Latest full price data per market (server sends deltas)
+        this.prices = {};
+
+        // Seconds between price frames (null = server default)
+        this.updateRate = null;
     }
 
     /**
@@ -65,6 +71,10 @@ class CoinPulseWebSocket {
             this.reconnectAttempts = 0;
 
             // Re-subscribe to markets after reconnection
+            this.prices = {};
+            if (this.updateRate !== null) {
+                this.socket.emit('set_update_rate', { interval: this.updateRate });
+            }
             this.subscribedMarkets.forEach(market => {
                 this._subscribe(market);
             });
@@ -96,10 +106,17 @@ class CoinPulseWebSocket {
             console.log('[WebSocket] Server welcome:', data);
         });
 
-        this.socket.on('price_update', (data) => {
-            if (this.onPriceUpdate) {
-                this.onPriceUpdate(data);
-            }
+        // One frame per tick with only the changed fields of changed markets
+        this.socket.on('price_batch', (batch) => {
+            Object.entries(batch.prices || {}).forEach(([market, delta]) => {
+                const base = batch.full ? {} : (this.prices[market] || {});
+                const data = Object.assign({}, base, delta, { market: market, timestamp: batch.timestamp });
+                this.prices[market] = data;
+
+                if (this.onPriceUpdate) {
+                    this.onPriceUpdate(data);
+                }
+            });
         });
 
         this.socket.on('order_notification', (data) => {
@@ -157,10 +174,22 @@ class CoinPulseWebSocket {
         }
 
         this.subscribedMarkets.delete(market);
+        delete this.prices[market];
         this.socket.emit('unsubscribe_market', { market: market });
         console.log('[WebSocket] Unsubscribed from:', market);
     }
 
+    /**
+     * Set how often price updates are delivered (seconds between frames)
+     */
+    setUpdateRate(seconds) {
+        this.updateRate = seconds;
+
+        if (this.isConnected) {
+            this.socket.emit('set_update_rate', { interval: seconds });
+        }
+    }
+
     /**
      * Authenticate for user-specific notifications
      */
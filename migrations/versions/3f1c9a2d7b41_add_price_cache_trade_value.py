@@ -0,0 +1,52 @@
+"""Add trade_value to price_cache for the local candle store
+
+Revision ID: 3f1c9a2d7b41
+Revises: e7aa0867203d
+Create Date: 2026-10-16 10:12:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2d7b41'
+down_revision: Union[str, None] = 'e7aa0867203d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # price_cache may not exist yet if it was never created via create_all()
+    if 'price_cache' not in inspector.get_table_names():
+        op.create_table('price_cache',
+        sa.Column('market', sa.String(length=20), nullable=False, comment='Market code'),
+        sa.Column('timeframe', sa.String(length=10), nullable=False, comment='1m/5m/1h/1d'),
+        sa.Column('timestamp', sa.DateTime(), nullable=False, comment='Candle timestamp'),
+        sa.Column('open', sa.Numeric(precision=20, scale=8), nullable=True, comment='Open price'),
+        sa.Column('high', sa.Numeric(precision=20, scale=8), nullable=True, comment='High price'),
+        sa.Column('low', sa.Numeric(precision=20, scale=8), nullable=True, comment='Low price'),
+        sa.Column('close', sa.Numeric(precision=20, scale=8), nullable=True, comment='Close price'),
+        sa.Column('volume', sa.Numeric(precision=20, scale=8), nullable=True, comment='Trading volume'),
+        sa.Column('trade_value', sa.Numeric(precision=30, scale=8), nullable=True, comment='Accumulated trade value (KRW)'),
+        sa.Column('cached_at', sa.DateTime(), nullable=True, comment='When cached'),
+        sa.PrimaryKeyConstraint('market', 'timeframe', 'timestamp')
+        )
+        with op.batch_alter_table('price_cache', schema=None) as batch_op:
+            batch_op.create_index('idx_market_timeframe_timestamp', ['market', 'timeframe', 'timestamp'], unique=False)
+        return
+
+    columns = [c['name'] for c in inspector.get_columns('price_cache')]
+    if 'trade_value' not in columns:
+        with op.batch_alter_table('price_cache', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('trade_value', sa.Numeric(precision=30, scale=8), nullable=True, comment='Accumulated trade value (KRW)'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('price_cache', schema=None) as batch_op:
+        batch_op.drop_column('trade_value')
@@ -0,0 +1,47 @@
+"""Add service_leases and telegram_update_inbox
+
+Revision ID: 8d4e61b0c2fa
+Revises: 3f1c9a2d7b41
+Create Date: 2026-10-16 15:42:08.517230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e61b0c2fa'
+down_revision: Union[str, None] = '3f1c9a2d7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    # Either table may already exist if it was created via create_all()
+    if 'service_leases' not in tables:
+        op.create_table('service_leases',
+        sa.Column('job', sa.String(length=64), nullable=False, comment='Job name'),
+        sa.Column('holder', sa.String(length=128), nullable=False, comment='Holder id (host:pid:random)'),
+        sa.Column('acquired_at', sa.DateTime(), nullable=False, comment='When the current holder took the lease'),
+        sa.Column('expires_at', sa.DateTime(), nullable=False, comment='Lease expiry unless renewed'),
+        sa.PrimaryKeyConstraint('job')
+        )
+
+    if 'telegram_update_inbox' not in tables:
+        op.create_table('telegram_update_inbox',
+        sa.Column('update_id', sa.BigInteger(), autoincrement=False, nullable=False, comment='Telegram update_id'),
+        sa.Column('payload', sa.Text(), nullable=False, comment='Update JSON'),
+        sa.Column('received_at', sa.DateTime(), nullable=False, comment='When the webhook delivered it'),
+        sa.PrimaryKeyConstraint('update_id')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('telegram_update_inbox')
+    op.drop_table('service_leases')
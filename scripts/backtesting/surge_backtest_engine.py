@@ -0,0 +1,108 @@
+"""
+급등 예측 백테스트 (로컬 캔들 저장소 기반)
+
+BacktestEngine으로 전체 기간을 한 번에 처리
+- 마켓별 일봉을 한 번만 로드 (price_cache 우선, 없는 캔들만 Upbit 호출)
+- 모든 마켓 x 모든 날짜를 한 번에 점수 계산
+- 익절/손절/기간 만료 규칙으로 거래 재생
+- 결과를 backtest_results / backtest_summaries 테이블에 일괄 저장 (--save)
+
+Usage:
+    python scripts/backtesting/surge_backtest_engine.py --start 2024-09-01 --end 2024-12-01
+    python scripts/backtesting/surge_backtest_engine.py --start 2024-11-13 --end 2024-12-04 --step-days 7 --save
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from backend.common import UpbitAPI
+from backend.services.backtest_engine import BacktestEngine, DEFAULT_PARAMS
+
+
+def get_krw_markets():
+    """모든 KRW 마켓"""
+    markets = UpbitAPI(None, None).get_markets()
+    return [m['market'] for m in markets if m.get('market', '').startswith('KRW-')]
+
+
+def main():
+    today = datetime.now().date()
+    parser = argparse.ArgumentParser(description='Surge strategy backtest over the local candle store')
+    parser.add_argument('--start', default=(today - timedelta(days=90)).isoformat(), help='First signal date (YYYY-MM-DD)')
+    parser.add_argument('--end', default=(today - timedelta(days=DEFAULT_PARAMS['holding_days'] + 1)).isoformat(),
+                        help='Last signal date (YYYY-MM-DD)')
+    parser.add_argument('--markets', nargs='*', help='Markets to test (default: all KRW markets)')
+    parser.add_argument('--step-days', type=int, default=1, help='Test every Nth day (7 = weekly)')
+    parser.add_argument('--min-score', type=int, default=DEFAULT_PARAMS['min_score'])
+    parser.add_argument('--take-profit', type=float, default=DEFAULT_PARAMS['take_profit_percent'])
+    parser.add_argument('--stop-loss', type=float, default=DEFAULT_PARAMS['stop_loss_percent'])
+    parser.add_argument('--holding-days', type=int, default=DEFAULT_PARAMS['holding_days'])
+    parser.add_argument('--output', default='docs/backtest_results/engine_backtest.json')
+    parser.add_argument('--save', action='store_true', help='Write results to the database')
+    parser.add_argument('--replace', action='store_true', help='With --save: replace stored results of the same period')
+    args = parser.parse_args()
+
+    markets = args.markets or get_krw_markets()
+    print("\n" + "="*60)
+    print("SURGE BACKTEST ENGINE")
+    print("="*60)
+    print(f"Period: {args.start} ~ {args.end} (every {args.step_days} day(s))")
+    print(f"Markets: {len(markets)}")
+    print(f"Min score: {args.min_score}, TP: {args.take_profit}%, SL: {args.stop_loss}%, Hold: {args.holding_days}d")
+    print("="*60)
+
+    engine = BacktestEngine()
+
+    started = time.time()
+    dataset = engine.load_dataset(markets, args.start, args.end, args.holding_days)
+    print(f"[LOAD] {len(dataset.markets)} markets x {dataset.num_days} days ({time.time() - started:.1f}s)")
+
+    started = time.time()
+    result = engine.run(
+        markets, args.start, args.end,
+        step_days=args.step_days,
+        dataset=dataset,
+        min_score=args.min_score,
+        take_profit_percent=args.take_profit,
+        stop_loss_percent=args.stop_loss,
+        holding_days=args.holding_days
+    )
+    print(f"[RUN] {len(result['trades'])} trades ({time.time() - started:.2f}s)")
+
+    summary = result['summary']
+    print("\n" + "="*60)
+    print(f"Total Trades: {summary['total_trades']}")
+    print(f"Wins: {summary['winning_trades']} ({summary['win_rate']:.2f}%)")
+    print(f"Losses: {summary['losing_trades']}")
+    print(f"\nAverage Return: {summary['avg_return']:+.2f}%")
+    print(f"Average Win: {summary['avg_win']:+.2f}%")
+    print(f"Average Loss: {summary['avg_loss']:+.2f}%")
+    if summary['total_trades']:
+        print(f"Best / Worst: {summary['best_trade']:+.2f}% / {summary['worst_trade']:+.2f}%")
+    print("="*60)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'params': result['params'],
+            'start_date': result['start_date'].isoformat(),
+            'end_date': result['end_date'].isoformat(),
+            'step_days': args.step_days,
+            'markets': dataset.markets,
+            'summary': summary,
+            'trades': [dict(t, trade_date=t['trade_date'].isoformat()) for t in result['trades']]
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n[SAVE] Results saved to: {args.output}")
+
+    if args.save:
+        engine.save(result, replace=args.replace)
+
+
+if __name__ == '__main__':
+    main()
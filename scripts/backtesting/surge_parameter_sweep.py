@@ -0,0 +1,112 @@
+"""
+급등 전략 파라미터 탐색 (그리드 / 랜덤)
+
+- 캔들 데이터셋과 점수 행렬을 한 번만 계산해 .npy로 저장
+- 모든 CPU 코어의 프로세스 풀이 같은 파일을 memory-map으로 공유
+- 조합별 평균 수익률 / 적중률 / 최대 낙폭으로 순위를 매겨 리더보드 출력
+
+Usage:
+    python scripts/backtesting/surge_parameter_sweep.py --start 2024-09-01 --end 2024-12-01
+    python scripts/backtesting/surge_parameter_sweep.py --random 200 --reuse --output docs/backtest_results/sweep.json
+"""
+
+import sys
+import os
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from backend.common import UpbitAPI
+from backend.services.backtest_engine import BacktestEngine
+from backend.services.parameter_sweep import (
+    DEFAULT_GRID, ParameterSweep, grid_combinations, random_combinations, rank_results
+)
+
+
+def get_krw_markets():
+    """모든 KRW 마켓"""
+    markets = UpbitAPI(None, None).get_markets()
+    return [m['market'] for m in markets if m.get('market', '').startswith('KRW-')]
+
+
+def parse_values(text, cast):
+    return [cast(v) for v in text.split(',')] if text else None
+
+
+def main():
+    today = datetime.now().date()
+    max_holding = max(DEFAULT_GRID['holding_days'])
+    parser = argparse.ArgumentParser(description='Parallel parameter sweep for the surge strategy')
+    parser.add_argument('--start', default=(today - timedelta(days=90)).isoformat(), help='First signal date (YYYY-MM-DD)')
+    parser.add_argument('--end', default=(today - timedelta(days=max_holding + 1)).isoformat(),
+                        help='Last signal date (YYYY-MM-DD)')
+    parser.add_argument('--markets', nargs='*', help='Markets to test (default: all KRW markets)')
+    parser.add_argument('--min-score', help='Comma-separated values (default: %s)' % DEFAULT_GRID['min_score'])
+    parser.add_argument('--take-profit', help='Comma-separated values')
+    parser.add_argument('--stop-loss', help='Comma-separated values')
+    parser.add_argument('--holding-days', help='Comma-separated values')
+    parser.add_argument('--random', type=int, default=0, help='Sample N random combinations instead of the full grid')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--min-trades', type=int, default=10, help='Minimum trades for a combination to be ranked')
+    parser.add_argument('--data-dir', default='data/backtest_sweep', help='Memory-mapped dataset directory')
+    parser.add_argument('--reuse', action='store_true', help='Reuse the dataset already in --data-dir')
+    parser.add_argument('--output', default='docs/backtest_results/parameter_sweep.csv', help='.csv or .json')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    grid = {
+        'min_score': parse_values(args.min_score, int) or DEFAULT_GRID['min_score'],
+        'take_profit_percent': parse_values(args.take_profit, float) or DEFAULT_GRID['take_profit_percent'],
+        'stop_loss_percent': parse_values(args.stop_loss, float) or DEFAULT_GRID['stop_loss_percent'],
+        'holding_days': parse_values(args.holding_days, int) or DEFAULT_GRID['holding_days'],
+    }
+    combinations = random_combinations(grid, args.random, args.seed) if args.random else grid_combinations(grid)
+
+    sweep = ParameterSweep(args.data_dir, workers=args.workers)
+
+    print("\n" + "="*60)
+    print("SURGE PARAMETER SWEEP")
+    print("="*60)
+    print(f"Period: {args.start} ~ {args.end}")
+    print(f"Combinations: {len(combinations)}, Workers: {sweep.workers}")
+    print("="*60)
+
+    if not args.reuse:
+        engine = BacktestEngine()
+        markets = args.markets or get_krw_markets()
+        started = time.time()
+        dataset = engine.load_dataset(markets, args.start, args.end, max(grid['holding_days']))
+        sweep.prepare(dataset, args.start, args.end, engine)
+        print(f"[PREPARE] {len(dataset.markets)} markets x {dataset.num_days} days ({time.time() - started:.1f}s)")
+
+    started = time.time()
+    results = sweep.run(combinations)
+    print(f"[SWEEP] {len(results)} combinations ({time.time() - started:.1f}s)")
+
+    leaderboard = rank_results(results, min_trades=args.min_trades)
+    sweep.export(leaderboard, args.output)
+    print(f"[SAVE] Leaderboard saved to: {args.output}")
+
+    if not leaderboard:
+        print(f"\n[WARN] No combination reached {args.min_trades} trades")
+        return
+
+    print("\n" + "="*60)
+    print(f"{'#':>3} {'score':>5} {'TP':>5} {'SL':>6} {'hold':>4} {'trades':>6} {'win%':>6} {'avg%':>6} {'MDD%':>7}")
+    for r in leaderboard[:args.top]:
+        print(f"{r['rank']:>3} {r['min_score']:>5} {r['take_profit_percent']:>5} {r['stop_loss_percent']:>6} "
+              f"{r['holding_days']:>4} {r['total_trades']:>6} {r['win_rate']:>6.2f} {r['avg_return']:>+6.2f} "
+              f"{r['max_drawdown']:>7.2f}")
+    print("="*60)
+
+    best = leaderboard[0]
+    print("\n[BEST] analysis_config.min_surge_probability_score / telegram_min_score:", best['min_score'])
+    print(f"[BEST] take_profit_percent: {best['take_profit_percent']}, stop_loss_percent: {best['stop_loss_percent']}, "
+          f"holding_days: {best['holding_days']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Fake Upbit websocket ticker feed for local testing
+
+Speaks just enough RFC 6455 (standard library only) to stand in for
+wss://api.upbit.com/websocket/v1:
+- accepts Upbit-style subscription requests
+  [{"ticket": ...}, {"type": "ticker", "codes": [...]}]
+- streams random-walk ticker messages (binary JSON frames, like Upbit)
+  for the subscribed codes
+- answers pings; --drop-after closes connections to exercise reconnects
+
+Usage:
+    python scripts/fake_upbit_ws_server.py --port 8765 --interval 0.2
+    UPBIT_WS_URL=ws://127.0.0.1:8765 PRICE_FEED_MODE=websocket python app.py
+"""
+import json
+import time
+import base64
+import random
+import socket
+import struct
+import hashlib
+import argparse
+import threading
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+def handshake(conn):
+    """Read the HTTP upgrade request and answer with 101"""
+    data = b''
+    while b'\r\n\r\n' not in data:
+        chunk = conn.recv(4096)
+        if not chunk:
+            raise ConnectionError('closed during handshake')
+        data += chunk
+
+    headers = {}
+    for line in data.decode('latin-1').split('\r\n')[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    accept = base64.b64encode(hashlib.sha1((headers['sec-websocket-key'] + WS_GUID).encode()).digest()).decode()
+    conn.sendall((
+        'HTTP/1.1 101 Switching Protocols\r\n'
+        'Upgrade: websocket\r\n'
+        'Connection: Upgrade\r\n'
+        f'Sec-WebSocket-Accept: {accept}\r\n\r\n'
+    ).encode())
+
+
+def recv_exact(conn, size):
+    data = b''
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('closed')
+        data += chunk
+    return data
+
+
+def read_frame(conn):
+    """Read one client frame; returns (opcode, payload)"""
+    first, second = recv_exact(conn, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('>H', recv_exact(conn, 2))[0]
+    elif length == 127:
+        length = struct.unpack('>Q', recv_exact(conn, 8))[0]
+    mask = recv_exact(conn, 4) if second & 0x80 else None
+    payload = recv_exact(conn, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def send_frame(conn, opcode, payload=b''):
+    """Send one unmasked server frame"""
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack('>H', length)
+    else:
+        header += bytes([127]) + struct.pack('>Q', length)
+    conn.sendall(header + payload)
+
+
+def make_ticker(code, state):
+    """Random-walk one market and return an Upbit websocket ticker message"""
+    prev_close = state.setdefault('prev_close', random.choice([1000.0, 50000.0, 90000000.0]))
+    price = state.get('price', prev_close) * (1 + random.uniform(-0.002, 0.002))
+    state['price'] = price
+    state['volume'] = state.get('volume', 0.0) + random.uniform(0, 10)
+
+    return {
+        'type': 'ticker',
+        'code': code,
+        'opening_price': prev_close,
+        'high_price': max(price, prev_close),
+        'low_price': min(price, prev_close),
+        'trade_price': round(price, 2),
+        'prev_closing_price': prev_close,
+        'change': 'RISE' if price > prev_close else 'FALL' if price < prev_close else 'EVEN',
+        'change_price': round(abs(price - prev_close), 2),
+        'signed_change_price': round(price - prev_close, 2),
+        'change_rate': abs(price - prev_close) / prev_close,
+        'signed_change_rate': (price - prev_close) / prev_close,
+        'trade_volume': random.uniform(0, 1),
+        'acc_trade_volume_24h': state['volume'],
+        'acc_trade_price_24h': state['volume'] * price,
+        'trade_timestamp': int(time.time() * 1000),
+        'timestamp': int(time.time() * 1000),
+        'stream_type': 'REALTIME'
+    }
+
+
+def serve_client(conn, addr, interval, drop_after):
+    codes = set()
+    codes_lock = threading.Lock()
+    closed = threading.Event()
+    send_lock = threading.Lock()
+    started = time.time()
+
+    def send(opcode, payload=b''):
+        with send_lock:
+            send_frame(conn, opcode, payload)
+
+    def reader():
+        try:
+            while not closed.is_set():
+                opcode, payload = read_frame(conn)
+                if opcode == OP_CLOSE:
+                    break
+                if opcode == OP_PING:
+                    send(OP_PONG, payload)
+                elif opcode in (OP_TEXT, OP_BINARY):
+                    try:
+                        request = json.loads(payload.decode('utf-8'))
+                    except ValueError:
+                        continue
+                    for item in request:
+                        if item.get('type') == 'ticker':
+                            with codes_lock:
+                                codes.clear()
+                                codes.update(item.get('codes', []))
+                            print(f"[FakeUpbitWS] {addr[0]}:{addr[1]} subscribed {sorted(codes)}")
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            closed.set()
+
+    try:
+        handshake(conn)
+        print(f"[FakeUpbitWS] Client connected: {addr[0]}:{addr[1]}")
+        threading.Thread(target=reader, daemon=True).start()
+
+        states = {}
+        while not closed.is_set():
+            if drop_after and time.time() - started >= drop_after:
+                print(f"[FakeUpbitWS] Dropping {addr[0]}:{addr[1]}")
+                send(OP_CLOSE, struct.pack('>H', 1001))
+                break
+            with codes_lock:
+                current = list(codes)
+            for code in current:
+                message = make_ticker(code, states.setdefault(code, {}))
+                send(OP_BINARY, json.dumps(message).encode('utf-8'))
+            time.sleep(interval)
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        closed.set()
+        conn.close()
+        print(f"[FakeUpbitWS] Client disconnected: {addr[0]}:{addr[1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Upbit websocket ticker feed')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between ticker rounds')
+    parser.add_argument('--drop-after', type=float, default=0, help='Close each connection after N seconds (0 = never)')
+    args = parser.parse_args()
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((args.host, args.port))
+    server.listen()
+    print(f"[FakeUpbitWS] Listening on ws://{args.host}:{args.port}")
+
+    try:
+        while True:
+            conn, addr = server.accept()
+            threading.Thread(
+                target=serve_client,
+                args=(conn, addr, args.interval, args.drop_after),
+                daemon=True
+            ).start()
+    except KeyboardInterrupt:
+        print("\n[FakeUpbitWS] Stopped")
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
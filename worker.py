@@ -0,0 +1,54 @@
+"""
+CoinPulse Background Worker
+
+Hosts the trading loops, schedulers and Telegram bot outside the web
+process, so the web tier only serves the API and Socket.IO.
+
+Each job runs only while this process holds its DB lease (service_leases),
+so several worker instances can be deployed: one is active per job and the
+others take over when it stops renewing.
+
+Usage:
+    python worker.py
+"""
+
+import signal
+import logging
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from backend.database import init_database
+from backend.services.background_jobs import create_supervisor
+
+logging.basicConfig(
+    format='[%(asctime)s] %(name)s - %(levelname)s - %(message)s',
+    level=logging.INFO
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run the background job supervisor until SIGTERM/SIGINT"""
+    init_database()
+
+    supervisor = create_supervisor()
+
+    def shutdown(signum, frame):
+        logger.info(f"[Worker] Signal {signum} received, releasing leases...")
+        # Ends run_forever(); jobs are stopped and leases released below
+        supervisor.request_stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    logger.info("[Worker] Starting background job supervisor")
+    supervisor.run_forever()
+    supervisor.stop()
+    logger.info("[Worker] Stopped")
+
+
+if __name__ == '__main__':
+    main()